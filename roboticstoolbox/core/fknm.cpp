@@ -18,6 +18,12 @@
 #include <math.h>
 #include <Eigen/Dense>
 #include <iostream>
+#include <algorithm>
+#include <atomic>
+#include <functional>
+#include <random>
+#include <thread>
+#include <vector>
 
 static PyMethodDef fknmMethods[] = {
     {"IK_GN",
@@ -40,6 +46,14 @@ static PyMethodDef fknmMethods[] = {
      (PyCFunction)IK_LM_Sugihara,
      METH_VARARGS,
      "Link"},
+    {"IK_Batch",
+     (PyCFunction)IK_Batch,
+     METH_VARARGS,
+     "Link"},
+    {"RNE",
+     (PyCFunction)RNE,
+     METH_VARARGS,
+     "Link"},
     {"Robot_link_T",
      (PyCFunction)Robot_link_T,
      METH_VARARGS,
@@ -60,6 +74,10 @@ static PyMethodDef fknmMethods[] = {
      (PyCFunction)ETS_jacob0,
      METH_VARARGS,
      "Link"},
+    {"ETS_kinematics",
+     (PyCFunction)ETS_kinematics,
+     METH_VARARGS,
+     "Link"},
     {"ETS_fkine",
      (PyCFunction)ETS_fkine,
      METH_VARARGS,
@@ -101,6 +119,139 @@ PyMODINIT_FUNC PyInit_fknm(void)
     return PyModule_Create(&fknmmodule);
 }
 
+// Run job over the range [0, m) using n_threads native threads. The range
+// is handed out in small blocks so that uneven work (such as IK random
+// restarts) stays balanced. n_threads < 1 uses every hardware thread.
+// Must be called with the GIL released.
+static void _parallel_range(int m, int n_threads, const std::function<void(int, int)> &job)
+{
+    if (n_threads < 1)
+    {
+        n_threads = (int)std::thread::hardware_concurrency();
+    }
+
+    n_threads = std::min(std::max(n_threads, 1), std::max(m, 1));
+
+    if (n_threads == 1)
+    {
+        job(0, m);
+        return;
+    }
+
+    int grain = std::max(1, m / (8 * n_threads));
+    std::atomic<int> next(0);
+    std::vector<std::thread> workers;
+
+    auto worker = [&]()
+    {
+        int start;
+        while ((start = next.fetch_add(grain)) < m)
+        {
+            job(start, std::min(start + grain, m));
+        }
+    };
+
+    for (int t = 0; t < n_threads - 1; t++)
+    {
+        workers.emplace_back(worker);
+    }
+
+    // The calling thread does its share of the work too
+    worker();
+
+    for (auto &w : workers)
+    {
+        w.join();
+    }
+}
+
+// Get the seed for the IK random restarts. A Python int gives a repeatable
+// sequence while None draws a fresh seed from the system entropy source.
+static int _get_seed(PyObject *py_seed, uint64_t *seed)
+{
+    if (py_seed == NULL || py_seed == Py_None)
+    {
+        std::random_device rd;
+        *seed = ((uint64_t)rd() << 32) | (uint64_t)rd();
+        return 1;
+    }
+
+    *seed = (uint64_t)PyLong_AsUnsignedLongLongMask(py_seed);
+
+    if (PyErr_Occurred())
+        return 0;
+
+    return 1;
+}
+
+// Number of joint configurations held by the C ordered array q, using the
+// same rules as ETS_fkine. A 2D q with more than one row and column is a
+// trajectory and qstride is set to its row length, otherwise q is a single
+// configuration.
+static int _ETS_trajn(PyObject *py_np_q, int *qstride)
+{
+    PyArrayObject *np_q = (PyArrayObject *)py_np_q;
+    npy_intp *q_shape = PyArray_SHAPE(np_q);
+
+    *qstride = 0;
+
+    if (PyArray_NDIM(np_q) == 2 && q_shape[0] != 1 && q_shape[1] != 1)
+    {
+        *qstride = (int)q_shape[1];
+        return (int)q_shape[0];
+    }
+
+    return 1;
+}
+
+// Jacobians and Hessians along a trajectory. Row i of the C ordered
+// (trajn, qstride) array q gives the row major (6, n) block i of J and the
+// (n, 6, n) block i of H. Either of J or H may be NULL. If q is NULL the
+// Jacobians are read from J instead of being computed. Must be called
+// with the GIL released.
+static void _ETS_jacob_traj(
+    ETS *ets, npy_float64 *q, int qstride, npy_float64 *tool, int base_frame,
+    int trajn, npy_float64 *J, npy_float64 *H, int n_threads)
+{
+    int n = ets->n;
+
+    _parallel_range(
+        trajn, n_threads,
+        [&](int start, int end)
+        {
+            MatrixJc Jk(6, n);
+            MapMatrixJc eJk(Jk.data(), 6, n);
+
+            for (int i = start; i < end; i++)
+            {
+                if (q == NULL)
+                {
+                    MapMatrixJr eJ(J + 6 * n * i, 6, n);
+                    eJk = eJ;
+                }
+                else
+                {
+                    if (base_frame)
+                        _ETS_jacob0(ets, q + qstride * i, tool, eJk);
+                    else
+                        _ETS_jacobe(ets, q + qstride * i, tool, eJk);
+
+                    if (J != NULL)
+                    {
+                        MapMatrixJr eJ(J + 6 * n * i, 6, n);
+                        eJ = eJk;
+                    }
+                }
+
+                if (H != NULL)
+                {
+                    MapMatrixHr eH(H + 6 * n * n * i, n * 6, n);
+                    _ETS_hessian(n, eJk, eH);
+                }
+            }
+        });
+}
+
 extern "C"
 {
 
@@ -110,7 +261,8 @@ extern "C"
         npy_float64 *np_Tep, *np_ret, *np_q0, *np_we;
         PyArrayObject *py_np_Tep;
         PyObject *py_ets, *py_ret, *py_Tep, *py_q0, *py_np_q0, *py_we, *py_np_we;
-        PyObject *py_tup, *py_it, *py_search, *py_solution, *py_E;
+        PyObject *py_tup, *py_it, *py_search, *py_solution, *py_E, *py_seed = NULL;
+        uint64_t seed;
         npy_intp dim[1] = {1};
         int ilimit, slimit, q0_used = 0, we_used = 0, reject_jl, use_pinv;
         double tol, E, pinv_damping;
@@ -118,7 +270,7 @@ extern "C"
         int it = 0, search = 1, solution = 0;
 
         if (!PyArg_ParseTuple(
-                args, "OOOiidiOid",
+                args, "OOOiidiOid|O",
                 &py_ets,
                 &py_Tep,
                 &py_q0,
@@ -128,7 +280,11 @@ extern "C"
                 &reject_jl,
                 &py_we,
                 &use_pinv,
-                &pinv_damping))
+                &pinv_damping,
+                &py_seed))
+            return NULL;
+
+        if (!_get_seed(py_seed, &seed))
             return NULL;
 
         if (!_check_array_type(py_Tep))
@@ -187,7 +343,11 @@ extern "C"
         np_ret = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_ret);
         MapVectorX ret(np_ret, ets->n);
 
-        _IK_GN(ets, Tep, q0, ilimit, slimit, tol, reject_jl, ret, &it, &search, &solution, &E, we, use_pinv, pinv_damping);
+        Py_BEGIN_ALLOW_THREADS
+            std::mt19937_64 rng;
+            _seed_rng(rng, seed, 0);
+            _IK_GN(ets, Tep, q0, ilimit, slimit, tol, reject_jl, ret, &it, &search, &solution, &E, we, use_pinv, pinv_damping, rng);
+        Py_END_ALLOW_THREADS
 
         // Free the memory
         Py_DECREF(py_np_Tep);
@@ -225,7 +385,8 @@ extern "C"
         npy_float64 *np_Tep, *np_ret, *np_q0, *np_we;
         PyArrayObject *py_np_Tep;
         PyObject *py_ets, *py_ret, *py_Tep, *py_q0, *py_np_q0, *py_we, *py_np_we;
-        PyObject *py_tup, *py_it, *py_search, *py_solution, *py_E;
+        PyObject *py_tup, *py_it, *py_search, *py_solution, *py_E, *py_seed = NULL;
+        uint64_t seed;
         npy_intp dim[1] = {1};
         int ilimit, slimit, q0_used = 0, we_used = 0, reject_jl, use_pinv;
         double tol, E, pinv_damping;
@@ -233,7 +394,7 @@ extern "C"
         int it = 0, search = 1, solution = 0;
 
         if (!PyArg_ParseTuple(
-                args, "OOOiidiOid",
+                args, "OOOiidiOid|O",
                 &py_ets,
                 &py_Tep,
                 &py_q0,
@@ -243,7 +404,11 @@ extern "C"
                 &reject_jl,
                 &py_we,
                 &use_pinv,
-                &pinv_damping))
+                &pinv_damping,
+                &py_seed))
+            return NULL;
+
+        if (!_get_seed(py_seed, &seed))
             return NULL;
 
         if (!_check_array_type(py_Tep))
@@ -302,7 +467,11 @@ extern "C"
         np_ret = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_ret);
         MapVectorX ret(np_ret, ets->n);
 
-        _IK_NR(ets, Tep, q0, ilimit, slimit, tol, reject_jl, ret, &it, &search, &solution, &E, we, use_pinv, pinv_damping);
+        Py_BEGIN_ALLOW_THREADS
+            std::mt19937_64 rng;
+            _seed_rng(rng, seed, 0);
+            _IK_NR(ets, Tep, q0, ilimit, slimit, tol, reject_jl, ret, &it, &search, &solution, &E, we, use_pinv, pinv_damping, rng);
+        Py_END_ALLOW_THREADS
 
         // Free the memory
         Py_DECREF(py_np_Tep);
@@ -340,7 +509,8 @@ extern "C"
         npy_float64 *np_Tep, *np_ret, *np_q0, *np_we;
         PyArrayObject *py_np_Tep;
         PyObject *py_ets, *py_ret, *py_Tep, *py_q0, *py_np_q0, *py_we, *py_np_we;
-        PyObject *py_tup, *py_it, *py_search, *py_solution, *py_E;
+        PyObject *py_tup, *py_it, *py_search, *py_solution, *py_E, *py_seed = NULL;
+        uint64_t seed;
         npy_intp dim[1] = {1};
         int ilimit, slimit, q0_used = 0, we_used = 0, reject_jl;
         double tol, E, lambda;
@@ -348,7 +518,7 @@ extern "C"
         int it = 0, search = 1, solution = 0;
 
         if (!PyArg_ParseTuple(
-                args, "OOOiidiOd",
+                args, "OOOiidiOd|O",
                 &py_ets,
                 &py_Tep,
                 &py_q0,
@@ -357,7 +527,11 @@ extern "C"
                 &tol,
                 &reject_jl,
                 &py_we,
-                &lambda))
+                &lambda,
+                &py_seed))
+            return NULL;
+
+        if (!_get_seed(py_seed, &seed))
             return NULL;
 
         if (!_check_array_type(py_Tep))
@@ -419,7 +593,11 @@ extern "C"
         // std::cout << Tep << std::endl;
         // std::cout << ret << std::endl;
 
-        _IK_LM_Chan(ets, Tep, q0, ilimit, slimit, tol, reject_jl, ret, &it, &search, &solution, &E, lambda, we);
+        Py_BEGIN_ALLOW_THREADS
+            std::mt19937_64 rng;
+            _seed_rng(rng, seed, 0);
+            _IK_LM_Chan(ets, Tep, q0, ilimit, slimit, tol, reject_jl, ret, &it, &search, &solution, &E, lambda, we, rng);
+        Py_END_ALLOW_THREADS
 
         // Free the memory
         Py_DECREF(py_np_Tep);
@@ -457,7 +635,8 @@ extern "C"
         npy_float64 *np_Tep, *np_ret, *np_q0, *np_we;
         PyArrayObject *py_np_Tep;
         PyObject *py_ets, *py_ret, *py_Tep, *py_q0, *py_np_q0, *py_we, *py_np_we;
-        PyObject *py_tup, *py_it, *py_search, *py_solution, *py_E;
+        PyObject *py_tup, *py_it, *py_search, *py_solution, *py_E, *py_seed = NULL;
+        uint64_t seed;
         npy_intp dim[1] = {1};
         int ilimit, slimit, q0_used = 0, we_used = 0, reject_jl;
         double tol, E, lambda;
@@ -465,7 +644,7 @@ extern "C"
         int it = 0, search = 1, solution = 0;
 
         if (!PyArg_ParseTuple(
-                args, "OOOiidiOd",
+                args, "OOOiidiOd|O",
                 &py_ets,
                 &py_Tep,
                 &py_q0,
@@ -474,7 +653,11 @@ extern "C"
                 &tol,
                 &reject_jl,
                 &py_we,
-                &lambda))
+                &lambda,
+                &py_seed))
+            return NULL;
+
+        if (!_get_seed(py_seed, &seed))
             return NULL;
 
         if (!_check_array_type(py_Tep))
@@ -536,7 +719,11 @@ extern "C"
         // std::cout << Tep << std::endl;
         // std::cout << ret << std::endl;
 
-        _IK_LM_Wampler(ets, Tep, q0, ilimit, slimit, tol, reject_jl, ret, &it, &search, &solution, &E, lambda, we);
+        Py_BEGIN_ALLOW_THREADS
+            std::mt19937_64 rng;
+            _seed_rng(rng, seed, 0);
+            _IK_LM_Wampler(ets, Tep, q0, ilimit, slimit, tol, reject_jl, ret, &it, &search, &solution, &E, lambda, we, rng);
+        Py_END_ALLOW_THREADS
 
         // Free the memory
         Py_DECREF(py_np_Tep);
@@ -574,7 +761,8 @@ extern "C"
         npy_float64 *np_Tep, *np_ret, *np_q0, *np_we;
         PyArrayObject *py_np_Tep;
         PyObject *py_ets, *py_ret, *py_Tep, *py_q0, *py_np_q0, *py_we, *py_np_we;
-        PyObject *py_tup, *py_it, *py_search, *py_solution, *py_E;
+        PyObject *py_tup, *py_it, *py_search, *py_solution, *py_E, *py_seed = NULL;
+        uint64_t seed;
         npy_intp dim[1] = {1};
         int ilimit, slimit, q0_used = 0, we_used = 0, reject_jl;
         double tol, E, lambda;
@@ -582,7 +770,7 @@ extern "C"
         int it = 0, search = 1, solution = 0;
 
         if (!PyArg_ParseTuple(
-                args, "OOOiidiOd",
+                args, "OOOiidiOd|O",
                 &py_ets,
                 &py_Tep,
                 &py_q0,
@@ -591,7 +779,11 @@ extern "C"
                 &tol,
                 &reject_jl,
                 &py_we,
-                &lambda))
+                &lambda,
+                &py_seed))
+            return NULL;
+
+        if (!_get_seed(py_seed, &seed))
             return NULL;
 
         if (!_check_array_type(py_Tep))
@@ -653,7 +845,11 @@ extern "C"
         // std::cout << Tep << std::endl;
         // std::cout << ret << std::endl;
 
-        _IK_LM_Sugihara(ets, Tep, q0, ilimit, slimit, tol, reject_jl, ret, &it, &search, &solution, &E, lambda, we);
+        Py_BEGIN_ALLOW_THREADS
+            std::mt19937_64 rng;
+            _seed_rng(rng, seed, 0);
+            _IK_LM_Sugihara(ets, Tep, q0, ilimit, slimit, tol, reject_jl, ret, &it, &search, &solution, &E, lambda, we, rng);
+        Py_END_ALLOW_THREADS
 
         // Free the memory
         Py_DECREF(py_np_Tep);
@@ -685,6 +881,280 @@ extern "C"
         return py_tup;
     }
 
+    static PyObject *IK_Batch(PyObject *self, PyObject *args)
+    {
+        ETS *ets;
+        npy_float64 *np_Tep, *np_ret, *np_q0 = NULL, *np_we, *np_E;
+        PyArrayObject *py_np_Tep;
+        PyObject *py_ets, *py_Tep, *py_q0, *py_np_q0, *py_we, *py_np_we;
+        PyObject *py_ret, *py_it, *py_search, *py_solution, *py_E, *py_tup, *py_seed = NULL;
+        uint64_t seed;
+        npy_intp dim1[1] = {1}, dim2[2] = {1, 1};
+        int method, ilimit, slimit, q0_used = 0, we_used = 0, reject_jl, use_pinv;
+        int m, q0_stride = 0, n_threads = 1, traj = 0;
+        int *np_it, *np_search, *np_solution;
+        double tol, lambda, pinv_damping, dq_max = 0.0;
+
+        if (!PyArg_ParseTuple(
+                args, "iOOOiidiOdid|iOid",
+                &method,
+                &py_ets,
+                &py_Tep,
+                &py_q0,
+                &ilimit,
+                &slimit,
+                &tol,
+                &reject_jl,
+                &py_we,
+                &lambda,
+                &use_pinv,
+                &pinv_damping,
+                &n_threads,
+                &py_seed,
+                &traj,
+                &dq_max))
+            return NULL;
+
+        if (!_get_seed(py_seed, &seed))
+            return NULL;
+
+        if (method < IK_METHOD_NR || method > IK_METHOD_LM_SUGIHARA)
+        {
+            PyErr_SetString(PyExc_ValueError, "Unknown IK method");
+            return NULL;
+        }
+
+        if (!_check_array_type(py_Tep))
+            return NULL;
+
+        // Extract the ETS object from the python object
+        if (!(ets = (ETS *)PyCapsule_GetPointer(py_ets, "ETS")))
+            return NULL;
+
+        // Tep must be an (m, 4, 4) array of poses
+        py_np_Tep = (PyArrayObject *)PyArray_FROMANY(py_Tep, NPY_DOUBLE, 3, 3, NPY_ARRAY_DEFAULT);
+        if (py_np_Tep == NULL)
+            return NULL;
+
+        if (PyArray_DIM(py_np_Tep, 1) != 4 || PyArray_DIM(py_np_Tep, 2) != 4)
+        {
+            Py_DECREF(py_np_Tep);
+            PyErr_SetString(PyExc_ValueError, "Tep must have shape (m, 4, 4)");
+            return NULL;
+        }
+
+        np_Tep = (npy_float64 *)PyArray_DATA(py_np_Tep);
+        m = (int)PyArray_DIM(py_np_Tep, 0);
+
+        // Assign empty we
+        MapVectorX we(NULL, 0);
+
+        // Check if q0 is None
+        // q0 can be a single (n) seed used for every pose
+        // or an (m, n) array with one seed per pose
+        if (py_q0 != Py_None)
+        {
+            if (!_check_array_type(py_q0))
+            {
+                Py_DECREF(py_np_Tep);
+                return NULL;
+            }
+
+            py_np_q0 = (PyObject *)PyArray_FROMANY(py_q0, NPY_DOUBLE, 1, 2, NPY_ARRAY_DEFAULT);
+            if (py_np_q0 == NULL)
+            {
+                Py_DECREF(py_np_Tep);
+                return NULL;
+            }
+            q0_used = 1;
+
+            if (traj && PyArray_SIZE((PyArrayObject *)py_np_q0) != ets->n)
+            {
+                Py_DECREF(py_np_Tep);
+                Py_DECREF(py_np_q0);
+                PyErr_SetString(PyExc_ValueError, "q0 must have shape (n) for a trajectory");
+                return NULL;
+            }
+
+            if (PyArray_NDIM((PyArrayObject *)py_np_q0) == 2 && PyArray_DIM((PyArrayObject *)py_np_q0, 0) != 1)
+            {
+                if (PyArray_DIM((PyArrayObject *)py_np_q0, 0) != m || PyArray_DIM((PyArrayObject *)py_np_q0, 1) != ets->n)
+                {
+                    Py_DECREF(py_np_Tep);
+                    Py_DECREF(py_np_q0);
+                    PyErr_SetString(PyExc_ValueError, "q0 must have shape (n) or (m, n)");
+                    return NULL;
+                }
+                q0_stride = ets->n;
+            }
+            else if (PyArray_SIZE((PyArrayObject *)py_np_q0) != ets->n)
+            {
+                Py_DECREF(py_np_Tep);
+                Py_DECREF(py_np_q0);
+                PyErr_SetString(PyExc_ValueError, "q0 must have shape (n) or (m, n)");
+                return NULL;
+            }
+
+            np_q0 = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_q0);
+        }
+
+        // Check if we is None
+        if (py_we != Py_None)
+        {
+            if (!_check_array_type(py_we))
+            {
+                Py_DECREF(py_np_Tep);
+                if (q0_used)
+                    Py_DECREF(py_np_q0);
+                return NULL;
+            }
+            we_used = 1;
+            py_np_we = (PyObject *)PyArray_FROMANY(py_we, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
+            np_we = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_we);
+            new (&we) MapVectorX(np_we, 6);
+        }
+
+        // Allocate the return arrays
+        dim2[0] = m;
+        dim2[1] = ets->n;
+        dim1[0] = m;
+
+        py_ret = PyArray_EMPTY(2, dim2, NPY_DOUBLE, 0);
+        py_solution = PyArray_EMPTY(1, dim1, NPY_INT, 0);
+        py_it = PyArray_EMPTY(1, dim1, NPY_INT, 0);
+        py_search = PyArray_EMPTY(1, dim1, NPY_INT, 0);
+        py_E = PyArray_EMPTY(1, dim1, NPY_DOUBLE, 0);
+
+        np_ret = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_ret);
+        np_solution = (int *)PyArray_DATA((PyArrayObject *)py_solution);
+        np_it = (int *)PyArray_DATA((PyArrayObject *)py_it);
+        np_search = (int *)PyArray_DATA((PyArrayObject *)py_search);
+        np_E = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_E);
+
+        // Do the job, splitting the poses over n_threads without the GIL.
+        // A trajectory is solved in order, each pose seeded by the last
+        Py_BEGIN_ALLOW_THREADS
+        if (traj)
+        {
+            _IK_Traj(
+                method, ets, np_Tep, m, np_q0,
+                ilimit, slimit, tol, reject_jl, dq_max,
+                np_ret, np_it, np_search, np_solution, np_E,
+                we, lambda, use_pinv, pinv_damping, seed);
+        }
+        else
+        {
+            _parallel_range(
+                m, n_threads,
+                [&](int start, int end)
+                {
+                    _IK_Batch(
+                        method, ets, np_Tep + 16 * start, end - start,
+                        np_q0 == NULL ? NULL : np_q0 + q0_stride * start, q0_stride,
+                        ilimit, slimit, tol, reject_jl,
+                        np_ret + ets->n * start, np_it + start, np_search + start,
+                        np_solution + start, np_E + start,
+                        we, lambda, use_pinv, pinv_damping, seed, start);
+                });
+        }
+        Py_END_ALLOW_THREADS
+
+        // Free the memory
+        Py_DECREF(py_np_Tep);
+
+        if (q0_used)
+        {
+            Py_DECREF(py_np_q0);
+        }
+
+        if (we_used)
+        {
+            Py_DECREF(py_np_we);
+        }
+
+        // Build the return tuple
+        py_tup = PyTuple_Pack(5, py_ret, py_solution, py_it, py_search, py_E);
+
+        Py_DECREF(py_ret);
+        Py_DECREF(py_solution);
+        Py_DECREF(py_it);
+        Py_DECREF(py_search);
+        Py_DECREF(py_E);
+
+        return py_tup;
+    }
+
+    static PyObject *RNE(PyObject *self, PyObject *args)
+    {
+        // Inverse dynamics of a tree of rigid bodies for each row of a
+        // trajectory. The model arrays are C contiguous, as prepared by
+        // ERobot._rbd_model, and the torques are written to tau (m, n).
+        PyArrayObject *py_q, *py_qd, *py_qdd, *py_P, *py_Q, *py_axis, *py_flip;
+        PyArrayObject *py_parent, *py_jindex, *py_S, *py_I, *py_Ia, *py_B, *py_G;
+        PyArrayObject *py_Tc, *py_a0, *py_tau;
+        int friction, n_threads = 1;
+
+        if (!PyArg_ParseTuple(
+                args, "O!O!O!O!O!O!O!O!O!O!O!O!O!O!O!O!iO!|i",
+                &PyArray_Type, &py_q,
+                &PyArray_Type, &py_qd,
+                &PyArray_Type, &py_qdd,
+                &PyArray_Type, &py_P,
+                &PyArray_Type, &py_Q,
+                &PyArray_Type, &py_axis,
+                &PyArray_Type, &py_flip,
+                &PyArray_Type, &py_parent,
+                &PyArray_Type, &py_jindex,
+                &PyArray_Type, &py_S,
+                &PyArray_Type, &py_I,
+                &PyArray_Type, &py_Ia,
+                &PyArray_Type, &py_B,
+                &PyArray_Type, &py_G,
+                &PyArray_Type, &py_Tc,
+                &PyArray_Type, &py_a0,
+                &friction,
+                &PyArray_Type, &py_tau,
+                &n_threads))
+            return NULL;
+
+        int m = (int)PyArray_DIM(py_q, 0);
+        int n = (int)PyArray_DIM(py_q, 1);
+        int nb = (int)PyArray_DIM(py_axis, 0);
+
+        npy_float64 *q = (npy_float64 *)PyArray_DATA(py_q);
+        npy_float64 *qd = (npy_float64 *)PyArray_DATA(py_qd);
+        npy_float64 *qdd = (npy_float64 *)PyArray_DATA(py_qdd);
+        npy_float64 *P = (npy_float64 *)PyArray_DATA(py_P);
+        npy_float64 *Q = (npy_float64 *)PyArray_DATA(py_Q);
+        int *axis = (int *)PyArray_DATA(py_axis);
+        int *flip = (int *)PyArray_DATA(py_flip);
+        int *parent = (int *)PyArray_DATA(py_parent);
+        int *jindex = (int *)PyArray_DATA(py_jindex);
+        npy_float64 *S = (npy_float64 *)PyArray_DATA(py_S);
+        npy_float64 *I = (npy_float64 *)PyArray_DATA(py_I);
+        npy_float64 *Ia = (npy_float64 *)PyArray_DATA(py_Ia);
+        npy_float64 *B = (npy_float64 *)PyArray_DATA(py_B);
+        npy_float64 *G = (npy_float64 *)PyArray_DATA(py_G);
+        npy_float64 *Tc = (npy_float64 *)PyArray_DATA(py_Tc);
+        npy_float64 *a0 = (npy_float64 *)PyArray_DATA(py_a0);
+        npy_float64 *tau = (npy_float64 *)PyArray_DATA(py_tau);
+
+        Py_BEGIN_ALLOW_THREADS
+            _parallel_range(
+                m, n_threads,
+                [&](int start, int end)
+                {
+                    for (int k = start; k < end; k++)
+                    {
+                        _RNE(nb, n, P, Q, axis, flip, parent, jindex, S, I, Ia, B, G, Tc, a0,
+                             friction, q + n * k, qd + n * k, qdd + n * k, tau + n * k);
+                    }
+                });
+        Py_END_ALLOW_THREADS
+
+        Py_RETURN_NONE;
+    }
+
     static PyObject *Robot_link_T(PyObject *self, PyObject *args)
     {
         ETS *ets;
@@ -718,20 +1188,32 @@ extern "C"
         }
 
         n_links = PyList_GET_SIZE(ets_list);
+        std::vector<ETS *> link_ets(n_links);
+        std::vector<npy_float64 *> link_T(n_links);
+
         for (int i = 0; i < n_links; i++)
         {
             PyObject *py_ets = PyList_GET_ITEM(ets_list, i);
             // Extract the ETS object from the python object
             if (!(ets = (ETS *)PyCapsule_GetPointer(py_ets, "ETS")))
+            {
+                if (q_used)
+                    Py_DECREF(py_np_q);
                 return NULL;
+            }
 
-            npy_float64 *T = (npy_float64 *)PyArray_DATA((PyArrayObject *)PyList_GET_ITEM(T_list, i));
-            MapMatrix4dc eT(T);
-
-            // TODO Add this back
-            _ETS_fkine(ets, q, NULL, NULL, eT);
+            link_ets[i] = ets;
+            link_T[i] = (npy_float64 *)PyArray_DATA((PyArrayObject *)PyList_GET_ITEM(T_list, i));
         }
 
+        Py_BEGIN_ALLOW_THREADS
+            for (int i = 0; i < n_links; i++)
+            {
+                MapMatrix4dc eT(link_T[i]);
+                _ETS_fkine(link_ets[i], q, NULL, NULL, eT);
+            }
+        Py_END_ALLOW_THREADS
+
         // Free the memory
         if (q_used)
         {
@@ -744,25 +1226,25 @@ extern "C"
     static PyObject *ETS_hessian0(PyObject *self, PyObject *args)
     {
         ETS *ets;
-        npy_float64 *H, *J, *q, *tool = NULL;
-        PyObject *py_q, *py_J, *py_tool, *py_np_q, *py_np_tool, *py_np_J;
+        npy_float64 *H, *J = NULL, *q = NULL, *tool = NULL;
+        PyObject *py_q, *py_J, *py_tool, *py_H;
+        PyObject *py_np_q = NULL, *py_np_tool = NULL, *py_np_J = NULL;
         PyObject *py_ets;
-        int tool_used = 0, J_used = 0, q_used = 0;
+        int trajn, qstride = 0, n_threads = 1;
 
         if (!PyArg_ParseTuple(
-                args, "OOOO",
+                args, "OOOO|i",
                 &py_ets,
                 &py_q,
                 &py_J,
-                &py_tool))
+                &py_tool,
+                &n_threads))
             return NULL;
 
         // Extract the ETS object from the python object
         if (!(ets = (ETS *)PyCapsule_GetPointer(py_ets, "ETS")))
             return NULL;
 
-        MapMatrixJc eJ(NULL, 6, ets->n);
-
         // Check if J is None
         // Make sure J is number array
         // Cast to numpy array
@@ -771,11 +1253,15 @@ extern "C"
         {
             if (!_check_array_type(py_J))
                 return NULL;
-            J_used = 1;
-            py_np_J = (PyObject *)PyArray_FROMANY(py_J, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
+            // J is C ordered so that each Jacobian of a trajectory is
+            // a contiguous row major block
+            py_np_J = (PyObject *)PyArray_FROMANY(py_J, NPY_DOUBLE, 1, 3, NPY_ARRAY_DEFAULT);
             J = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_J);
-            // MapMatrixJc eJ(J, 6, ets->n);
-            new (&eJ) MapMatrixJc(J, 6, ets->n);
+
+            if (PyArray_NDIM((PyArrayObject *)py_np_J) == 3)
+                trajn = (int)PyArray_SHAPE((PyArrayObject *)py_np_J)[0];
+            else
+                trajn = 1;
         }
         else
         {
@@ -785,16 +1271,10 @@ extern "C"
             // Get data out
             if (!_check_array_type(py_q))
                 return NULL;
-            q_used = 1;
-            py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
+            // q is C ordered so that each row of a trajectory is contiguous
+            py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_DEFAULT);
             q = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_q);
-
-            // Make our empty Jacobian
-            npy_intp dimsJ[2] = {6, ets->n};
-            PyObject *py_J = PyArray_EMPTY(2, dimsJ, NPY_DOUBLE, 1);
-            J = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_J);
-            // MapMatrixJc eJ(J, 6, ets->n);
-            new (&eJ) MapMatrixJc(J, 6, ets->n);
+            trajn = _ETS_trajn(py_np_q, &qstride);
 
             // Check if tool is None
             // Make sure tool is number array
@@ -803,67 +1283,63 @@ extern "C"
             if (py_tool != Py_None)
             {
                 if (!_check_array_type(py_tool))
+                {
+                    Py_DECREF(py_np_q);
                     return NULL;
-                tool_used = 1;
+                }
                 py_np_tool = (PyObject *)PyArray_FROMANY(py_tool, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
                 tool = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_tool);
             }
-
-            // Calculate the Jacobian
-            _ETS_jacob0(ets, q, tool, eJ);
         }
 
-        // Make our empty Hessian
-        npy_intp dimsH[3] = {ets->n, 6, ets->n};
-        PyObject *py_H = PyArray_EMPTY(3, dimsH, NPY_DOUBLE, 0);
-        H = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_H);
-        MapMatrixHr eH(H, ets->n * 6, ets->n);
-
-        // Do the job
-        _ETS_hessian(ets->n, eJ, eH);
-
-        // Free the memory
-        if (q_used)
+        // Make our empty Hessian, one (n, 6, n) block per configuration
+        if (trajn == 1)
         {
-            Py_DECREF(py_np_q);
+            npy_intp dimsH[3] = {ets->n, 6, ets->n};
+            py_H = PyArray_EMPTY(3, dimsH, NPY_DOUBLE, 0);
         }
-
-        if (J_used)
+        else
         {
-            Py_DECREF(py_np_J);
+            npy_intp dimsH[4] = {trajn, ets->n, 6, ets->n};
+            py_H = PyArray_EMPTY(4, dimsH, NPY_DOUBLE, 0);
         }
+        H = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_H);
 
-        if (tool_used)
-        {
-            Py_DECREF(py_np_tool);
-        }
+        // Do the job, computing the Jacobians first if they were not given
+        Py_BEGIN_ALLOW_THREADS
+            _ETS_jacob_traj(ets, q, qstride, tool, 1, trajn, J, H, n_threads);
+        Py_END_ALLOW_THREADS
+
+        // Free the memory
+        Py_XDECREF(py_np_q);
+        Py_XDECREF(py_np_J);
+        Py_XDECREF(py_np_tool);
 
         return py_H;
-        // return Py_None;
     }
 
     static PyObject *ETS_hessiane(PyObject *self, PyObject *args)
     {
         ETS *ets;
-        npy_float64 *H, *J, *q, *tool = NULL;
-        PyObject *py_q, *py_J, *py_tool, *py_np_q, *py_np_tool, *py_np_J;
+        npy_float64 *H, *J = NULL, *q = NULL, *tool = NULL;
+        PyObject *py_q, *py_J, *py_tool, *py_H;
+        PyObject *py_np_q = NULL, *py_np_tool = NULL, *py_np_J = NULL;
         PyObject *py_ets;
-        int tool_used = 0, J_used = 0, q_used = 0;
+        int trajn, qstride = 0, n_threads = 1;
 
         if (!PyArg_ParseTuple(
-                args, "OOOO",
+                args, "OOOO|i",
                 &py_ets,
                 &py_q,
                 &py_J,
-                &py_tool))
+                &py_tool,
+                &n_threads))
             return NULL;
 
         // Extract the ETS object from the python object
         if (!(ets = (ETS *)PyCapsule_GetPointer(py_ets, "ETS")))
             return NULL;
 
-        MapMatrixJc eJ(NULL, 6, ets->n);
-
         // Check if J is None
         // Make sure J is number array
         // Cast to numpy array
@@ -872,11 +1348,15 @@ extern "C"
         {
             if (!_check_array_type(py_J))
                 return NULL;
-            J_used = 1;
-            py_np_J = (PyObject *)PyArray_FROMANY(py_J, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
+            // J is C ordered so that each Jacobian of a trajectory is
+            // a contiguous row major block
+            py_np_J = (PyObject *)PyArray_FROMANY(py_J, NPY_DOUBLE, 1, 3, NPY_ARRAY_DEFAULT);
             J = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_J);
-            // MapMatrixJc eJ(J, 6, ets->n);
-            new (&eJ) MapMatrixJc(J, 6, ets->n);
+
+            if (PyArray_NDIM((PyArrayObject *)py_np_J) == 3)
+                trajn = (int)PyArray_SHAPE((PyArrayObject *)py_np_J)[0];
+            else
+                trajn = 1;
         }
         else
         {
@@ -886,16 +1366,10 @@ extern "C"
             // Get data out
             if (!_check_array_type(py_q))
                 return NULL;
-            q_used = 1;
-            py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
+            // q is C ordered so that each row of a trajectory is contiguous
+            py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_DEFAULT);
             q = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_q);
-
-            // Make our empty Jacobian
-            npy_intp dimsJ[2] = {6, ets->n};
-            PyObject *py_J = PyArray_EMPTY(2, dimsJ, NPY_DOUBLE, 1);
-            J = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_J);
-            // MapMatrixJc eJ(J, 6, ets->n);
-            new (&eJ) MapMatrixJc(J, 6, ets->n);
+            trajn = _ETS_trajn(py_np_q, &qstride);
 
             // Check if tool is None
             // Make sure tool is number array
@@ -904,58 +1378,55 @@ extern "C"
             if (py_tool != Py_None)
             {
                 if (!_check_array_type(py_tool))
+                {
+                    Py_DECREF(py_np_q);
                     return NULL;
-                tool_used = 1;
+                }
                 py_np_tool = (PyObject *)PyArray_FROMANY(py_tool, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
                 tool = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_tool);
             }
-
-            // Calculate the Jacobian
-            _ETS_jacobe(ets, q, tool, eJ);
         }
 
-        // Make our empty Hessian
-        npy_intp dimsH[3] = {ets->n, 6, ets->n};
-        PyObject *py_H = PyArray_EMPTY(3, dimsH, NPY_DOUBLE, 0);
-        H = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_H);
-        MapMatrixHr eH(H, ets->n * 6, ets->n);
-
-        // Do the job
-        _ETS_hessian(ets->n, eJ, eH);
-
-        // Free the memory
-        if (q_used)
+        // Make our empty Hessian, one (n, 6, n) block per configuration
+        if (trajn == 1)
         {
-            Py_DECREF(py_np_q);
+            npy_intp dimsH[3] = {ets->n, 6, ets->n};
+            py_H = PyArray_EMPTY(3, dimsH, NPY_DOUBLE, 0);
         }
-
-        if (J_used)
+        else
         {
-            Py_DECREF(py_np_J);
+            npy_intp dimsH[4] = {trajn, ets->n, 6, ets->n};
+            py_H = PyArray_EMPTY(4, dimsH, NPY_DOUBLE, 0);
         }
+        H = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_H);
 
-        if (tool_used)
-        {
-            Py_DECREF(py_np_tool);
-        }
+        // Do the job, computing the Jacobians first if they were not given
+        Py_BEGIN_ALLOW_THREADS
+            _ETS_jacob_traj(ets, q, qstride, tool, 0, trajn, J, H, n_threads);
+        Py_END_ALLOW_THREADS
+
+        // Free the memory
+        Py_XDECREF(py_np_q);
+        Py_XDECREF(py_np_J);
+        Py_XDECREF(py_np_tool);
 
         return py_H;
-        // return Py_None;
     }
 
     static PyObject *ETS_jacob0(PyObject *self, PyObject *args)
     {
         ETS *ets;
         npy_float64 *J, *q, *tool = NULL;
-        PyObject *py_q, *py_tool, *py_np_q, *py_np_tool;
+        PyObject *py_q, *py_tool, *py_np_q, *py_np_tool, *py_J;
         PyObject *py_ets;
-        int tool_used = 0;
+        int tool_used = 0, trajn, qstride, n_threads = 1;
 
         if (!PyArg_ParseTuple(
-                args, "OOO",
+                args, "OOO|i",
                 &py_ets,
                 &py_q,
-                &py_tool))
+                &py_tool,
+                &n_threads))
             return NULL;
 
         // Extract the ETS object from the python object
@@ -966,22 +1437,19 @@ extern "C"
         // None - Even q
         // Not arrays - Will raise exception
         // Have symbolic data - Will raise exception
-        // q can be 1D or 2D, assumes dimesnions correct (n, 1xn or nx1)
+        // q can be 1D or 2D, assumes dimesnions correct (n, 1xn, nx1 or
+        // a trajectory mxn)
         // tool can be SE3s or 4x4 numpy array
 
-        // Make our empty Jacobian
-        npy_intp dims[2] = {6, ets->n};
-        PyObject *py_J = PyArray_EMPTY(2, dims, NPY_DOUBLE, 1);
-        J = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_J);
-        MapMatrixJc eJ(J, 6, ets->n);
-
         // Make sure q is number array
         // Cast to numpy array
         // Get data out
         if (!_check_array_type(py_q))
             return NULL;
-        py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
+        // q is C ordered so that each row of a trajectory is contiguous
+        py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_DEFAULT);
         q = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_q);
+        trajn = _ETS_trajn(py_np_q, &qstride);
 
         // Check if tool is None
         // Make sure tool is number array
@@ -990,14 +1458,40 @@ extern "C"
         if (py_tool != Py_None)
         {
             if (!_check_array_type(py_tool))
+            {
+                Py_DECREF(py_np_q);
                 return NULL;
+            }
             tool_used = 1;
             py_np_tool = (PyObject *)PyArray_FROMANY(py_tool, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
             tool = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_tool);
         }
 
-        // Do the job
-        _ETS_jacob0(ets, q, tool, eJ);
+        if (trajn == 1)
+        {
+            // Make our empty Jacobian
+            npy_intp dims[2] = {6, ets->n};
+            py_J = PyArray_EMPTY(2, dims, NPY_DOUBLE, 1);
+            J = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_J);
+            MapMatrixJc eJ(J, 6, ets->n);
+
+            // Do the job
+            Py_BEGIN_ALLOW_THREADS
+                _ETS_jacob0(ets, q, tool, eJ);
+            Py_END_ALLOW_THREADS
+        }
+        else
+        {
+            // C ordered so that each Jacobian is a contiguous block
+            npy_intp dims[3] = {trajn, 6, ets->n};
+            py_J = PyArray_EMPTY(3, dims, NPY_DOUBLE, 0);
+            J = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_J);
+
+            // Do the job, splitting the trajectory over n_threads
+            Py_BEGIN_ALLOW_THREADS
+                _ETS_jacob_traj(ets, q, qstride, tool, 1, trajn, J, NULL, n_threads);
+            Py_END_ALLOW_THREADS
+        }
 
         // Free the memory
         Py_DECREF(py_np_q);
@@ -1014,15 +1508,16 @@ extern "C"
     {
         ETS *ets;
         npy_float64 *J, *q, *tool = NULL;
-        PyObject *py_q, *py_tool, *py_np_q, *py_np_tool;
+        PyObject *py_q, *py_tool, *py_np_q, *py_np_tool, *py_J;
         PyObject *py_ets;
-        int tool_used = 0;
+        int tool_used = 0, trajn, qstride, n_threads = 1;
 
         if (!PyArg_ParseTuple(
-                args, "OOO",
+                args, "OOO|i",
                 &py_ets,
                 &py_q,
-                &py_tool))
+                &py_tool,
+                &n_threads))
             return NULL;
 
         // Extract the ETS object from the python object
@@ -1033,22 +1528,19 @@ extern "C"
         // None - Even q
         // Not arrays - Will raise exception
         // Have symbolic data - Will raise exception
-        // q can be 1D or 2D, assumes dimesnions correct (n, 1xn or nx1)
+        // q can be 1D or 2D, assumes dimesnions correct (n, 1xn, nx1 or
+        // a trajectory mxn)
         // tool can be SE3s or 4x4 numpy array
 
-        // Make our empty Jacobian
-        npy_intp dims[2] = {6, ets->n};
-        PyObject *py_J = PyArray_EMPTY(2, dims, NPY_DOUBLE, 1);
-        J = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_J);
-        MapMatrixJc eJ(J, 6, ets->n);
-
         // Make sure q is number array
         // Cast to numpy array
         // Get data out
         if (!_check_array_type(py_q))
             return NULL;
-        py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
+        // q is C ordered so that each row of a trajectory is contiguous
+        py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_DEFAULT);
         q = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_q);
+        trajn = _ETS_trajn(py_np_q, &qstride);
 
         // Check if tool is None
         // Make sure tool is number array
@@ -1057,18 +1549,40 @@ extern "C"
         if (py_tool != Py_None)
         {
             if (!_check_array_type(py_tool))
+            {
+                Py_DECREF(py_np_q);
                 return NULL;
+            }
             tool_used = 1;
             py_np_tool = (PyObject *)PyArray_FROMANY(py_tool, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
             tool = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_tool);
         }
 
-        // Do the job
-        // for (int i = 0; i < 1000000; i++)
-        // {
-        //     _ETS_jacobe(ets, q, tool, eJ);
-        // }
-        _ETS_jacobe(ets, q, tool, eJ);
+        if (trajn == 1)
+        {
+            // Make our empty Jacobian
+            npy_intp dims[2] = {6, ets->n};
+            py_J = PyArray_EMPTY(2, dims, NPY_DOUBLE, 1);
+            J = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_J);
+            MapMatrixJc eJ(J, 6, ets->n);
+
+            // Do the job
+            Py_BEGIN_ALLOW_THREADS
+                _ETS_jacobe(ets, q, tool, eJ);
+            Py_END_ALLOW_THREADS
+        }
+        else
+        {
+            // C ordered so that each Jacobian is a contiguous block
+            npy_intp dims[3] = {trajn, 6, ets->n};
+            py_J = PyArray_EMPTY(3, dims, NPY_DOUBLE, 0);
+            J = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_J);
+
+            // Do the job, splitting the trajectory over n_threads
+            Py_BEGIN_ALLOW_THREADS
+                _ETS_jacob_traj(ets, q, qstride, tool, 0, trajn, J, NULL, n_threads);
+            Py_END_ALLOW_THREADS
+        }
 
         // Free the memory
         Py_DECREF(py_np_q);
@@ -1081,23 +1595,144 @@ extern "C"
         return py_J;
     }
 
+    static PyObject *ETS_kinematics(PyObject *self, PyObject *args)
+    {
+        ETS *ets;
+        npy_float64 *q, *tool = NULL, *T = NULL, *J0 = NULL, *Je = NULL, *H0 = NULL, *Jm = NULL;
+        npy_float64 m = 0.0;
+        PyObject *py_q, *py_tool, *py_np_q, *py_np_tool = NULL;
+        PyObject *py_ets, *py_ret;
+        PyObject *py_T = Py_None, *py_J0 = Py_None, *py_Je = Py_None;
+        PyObject *py_H0 = Py_None, *py_m = Py_None, *py_Jm = Py_None;
+        int which;
+
+        if (!PyArg_ParseTuple(
+                args, "OOOi",
+                &py_ets,
+                &py_q,
+                &py_tool,
+                &which))
+            return NULL;
+
+        // Extract the ETS object from the python object
+        if (!(ets = (ETS *)PyCapsule_GetPointer(py_ets, "ETS")))
+            return NULL;
+
+        // Make sure q is number array
+        // Cast to numpy array
+        // Get data out
+        if (!_check_array_type(py_q))
+            return NULL;
+        py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_DEFAULT);
+        q = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_q);
+
+        // Check if tool is None
+        // Make sure tool is number array
+        // Cast to numpy array
+        // Get data out
+        if (py_tool != Py_None)
+        {
+            if (!_check_array_type(py_tool))
+            {
+                Py_DECREF(py_np_q);
+                return NULL;
+            }
+            py_np_tool = (PyObject *)PyArray_FROMANY(py_tool, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
+            tool = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_tool);
+        }
+
+        // Allocate only what was asked for, with the same layouts as
+        // ETS_fkine, ETS_jacob0, ETS_jacobe and ETS_hessian0
+        if (which & KIN_T)
+        {
+            npy_intp dims[2] = {4, 4};
+            py_T = PyArray_EMPTY(2, dims, NPY_DOUBLE, 1);
+            T = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_T);
+        }
+
+        if (which & KIN_J0)
+        {
+            npy_intp dims[2] = {6, ets->n};
+            py_J0 = PyArray_EMPTY(2, dims, NPY_DOUBLE, 1);
+            J0 = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_J0);
+        }
+
+        if (which & KIN_JE)
+        {
+            npy_intp dims[2] = {6, ets->n};
+            py_Je = PyArray_EMPTY(2, dims, NPY_DOUBLE, 1);
+            Je = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_Je);
+        }
+
+        if (which & KIN_H0)
+        {
+            npy_intp dims[3] = {ets->n, 6, ets->n};
+            py_H0 = PyArray_EMPTY(3, dims, NPY_DOUBLE, 0);
+            H0 = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_H0);
+        }
+
+        if (which & KIN_JM)
+        {
+            npy_intp dims[2] = {ets->n, 1};
+            py_Jm = PyArray_EMPTY(2, dims, NPY_DOUBLE, 1);
+            Jm = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_Jm);
+        }
+
+        MapMatrix4dc eT(T);
+        MapMatrixJc eJ0(J0, 6, ets->n);
+        MapMatrixJc eJe(Je, 6, ets->n);
+        MapMatrixHr eH0(H0, ets->n * 6, ets->n);
+        MapMatrixJc eJm(Jm, ets->n, 1);
+
+        // Do the job
+        Py_BEGIN_ALLOW_THREADS
+            _ETS_kinematics(ets, q, tool, which, eT, eJ0, eJe, eH0, &m, eJm);
+        Py_END_ALLOW_THREADS
+
+        if (which & KIN_MANIP)
+            py_m = PyFloat_FromDouble(m);
+
+        // The tuple takes over the new references, None is borrowed
+        if (py_T == Py_None)
+            Py_INCREF(Py_None);
+        if (py_J0 == Py_None)
+            Py_INCREF(Py_None);
+        if (py_Je == Py_None)
+            Py_INCREF(Py_None);
+        if (py_H0 == Py_None)
+            Py_INCREF(Py_None);
+        if (py_m == Py_None)
+            Py_INCREF(Py_None);
+        if (py_Jm == Py_None)
+            Py_INCREF(Py_None);
+
+        py_ret = Py_BuildValue("(NNNNNN)", py_T, py_J0, py_Je, py_H0, py_m, py_Jm);
+
+        // Free the memory
+        Py_DECREF(py_np_q);
+        Py_XDECREF(py_np_tool);
+
+        return py_ret;
+    }
+
     static PyObject *ETS_fkine(PyObject *self, PyObject *args)
     {
         ETS *ets;
         npy_intp dim2[2] = {4, 4}, dim3[3] = {1, 4, 4};
-        int include_base, n = 0, q_nd, trajn = 1, tool_used = 0, base_used = 0;
-        npy_float64 *ret, *retp, *q, *qp, *base = NULL, *tool = NULL;
+        int include_base, n = 0, q_nd, trajn = 1, tool_used = 0, base_used = 0, n_threads = 1;
+        npy_float64 *ret, *q, *base = NULL, *tool = NULL;
         PyObject *py_q, *py_base, *py_tool, *py_np_q, *py_np_tool, *py_np_base;
         PyObject *py_ret, *py_ets;
         npy_intp *q_shape;
 
         if (!PyArg_ParseTuple(
-                args, "OOOOi",
+                args, "OOOOi|i",
                 &py_ets,
                 &py_q,
                 &py_base,
                 &py_tool,
-                &include_base))
+                &include_base,
+                &n_threads))
             return NULL;
 
         // Extract the ETS object from the python object
@@ -1116,7 +1751,8 @@ extern "C"
         // Get data out
         if (!_check_array_type(py_q))
             return NULL;
-        py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_F_CONTIGUOUS);
+        // q is C ordered so that each row of a trajectory is contiguous
+        py_np_q = (PyObject *)PyArray_FROMANY(py_q, NPY_DOUBLE, 1, 2, NPY_ARRAY_DEFAULT);
         q = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_q);
 
         // Check the dimesnions of q
@@ -1153,8 +1789,9 @@ extern "C"
         }
         else
         {
+            // C ordered so that each pose is a contiguous block
             dim3[0] = trajn;
-            py_ret = PyArray_EMPTY(3, dim3, NPY_DOUBLE, 1);
+            py_ret = PyArray_EMPTY(3, dim3, NPY_DOUBLE, 0);
         }
 
         // Get numpy reference to return array
@@ -1186,15 +1823,29 @@ extern "C"
             tool = (npy_float64 *)PyArray_DATA((PyArrayObject *)py_np_tool);
         }
 
-        // Do the actual job
-        for (int i = 0; i < trajn; i++)
-        {
-            // Get pointers to the new section of return array and q array
-            retp = ret + (4 * 4 * i);
-            MapMatrix4dc e_retp(retp);
-            qp = q + (n * i);
-            _ETS_fkine(ets, qp, base, tool, e_retp);
-        }
+        // Do the actual job, splitting a trajectory over n_threads
+        // without the GIL
+        Py_BEGIN_ALLOW_THREADS
+            _parallel_range(
+                trajn, n_threads,
+                [&](int start, int end)
+                {
+                    for (int i = start; i < end; i++)
+                    {
+                        // Get pointers to the new section of return array and q array
+                        npy_float64 *retp = ret + (4 * 4 * i);
+                        MapMatrix4dc e_retp(retp);
+                        npy_float64 *qp = q + (n * i);
+                        _ETS_fkine(ets, qp, base, tool, e_retp);
+
+                        // Each pose within the (trajn, 4, 4) array is row major
+                        if (trajn > 1)
+                        {
+                            e_retp.transposeInPlace();
+                        }
+                    }
+                });
+        Py_END_ALLOW_THREADS
 
         // Free memory
         Py_DECREF(py_np_q);
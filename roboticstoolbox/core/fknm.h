@@ -21,12 +21,15 @@ extern "C"
     static PyObject *IK_LM_Chan(PyObject *self, PyObject *args);
     static PyObject *IK_LM_Wampler(PyObject *self, PyObject *args);
     static PyObject *IK_LM_Sugihara(PyObject *self, PyObject *args);
+    static PyObject *IK_Batch(PyObject *self, PyObject *args);
 
+    static PyObject *RNE(PyObject *self, PyObject *args);
     static PyObject *Robot_link_T(PyObject *self, PyObject *args);
 
     static PyObject *ETS_hessian0(PyObject *self, PyObject *args);
     static PyObject *ETS_hessiane(PyObject *self, PyObject *args);
     static PyObject *ETS_jacob0(PyObject *self, PyObject *args);
+    static PyObject *ETS_kinematics(PyObject *self, PyObject *args);
     static PyObject *ETS_jacobe(PyObject *self, PyObject *args);
     static PyObject *ETS_fkine(PyObject *self, PyObject *args);
     static PyObject *ETS_init(PyObject *self, PyObject *args);
@@ -21,18 +21,26 @@
  * 
  *  An external force/moment acting on the end of the manipulator may 
  *  also be specified by a 6-element vector FEXT [Fx Fy Fz Mx My Mz].
- * 
+ *
+ *  FCORIOLIS(ROBOT*, Q, QD, C)
+ *
+ *  Computes the Coriolis matrix for each row of Q (m,n) and QD (m,n)
+ *  into C (m,n,n).
  *
  */
 
+#define NPY_NO_DEPRECATED_API NPY_1_7_API_VERSION
+
 #include <math.h>
 #include <Python.h>
+#include <numpy/arrayobject.h>
 #include "frne.h"
 
 // forward defines
 static PyObject *init(PyObject *self, PyObject *args);
 static PyObject *frne(PyObject *self, PyObject *args);
 static PyObject *delete(PyObject *self, PyObject *args);
+static PyObject *fcoriolis(PyObject *self, PyObject *args);
 static void rot_mat (Link *l, double th, double d, DHType type);
 
 
@@ -58,6 +66,12 @@ static PyMethodDef frneMethods[] = {
         METH_VARARGS,
         "Delete robot memory"
     },
+    {
+        "fcoriolis",
+        (PyCFunction)fcoriolis,
+        METH_VARARGS,
+        "Fast Coriolis matrix"
+    },
     {NULL, NULL, 0, NULL} /* Sentinel */
 };
 
@@ -73,6 +87,7 @@ static struct PyModuleDef frnemodule =
 
 PyMODINIT_FUNC PyInit_frne(void)
 {
+    import_array();
     return PyModule_Create(&frnemodule);
 }
 
@@ -103,17 +118,25 @@ static PyObject *delete(PyObject *self, PyObject *args) {
 }
 
 
+/**
+ * Inverse dynamics for each row of a trajectory.
+ *
+ * q, qd, qdd and tau are C contiguous float64 arrays (m,n) and the torques
+ * are written into tau, so that a caller can reuse the output buffer.  The
+ * gravity vector and end-effector wrench are the same for every row.
+ */
 static PyObject *frne(PyObject *self, PyObject *args) {
 
     Robot *robot;
-    PyObject *rO, *qO, *qdO, *qddO, *gravO, *fextO, *temp;
-    // PyObject *python_float;
-    double  *q, *qd, *qdd, *fext;
-    // Vect *grav;
-    int nq = 1; //, nqd = njoints, nqdd = njoints;
-    int njoints;
-
-    if (!PyArg_ParseTuple(args, "OOOOOO", &rO, &qO, &qdO, &qddO, &gravO, &fextO)) {
+    PyObject *rO;
+    PyArrayObject *py_q, *py_qd, *py_qdd, *py_grav, *py_fext, *py_tau;
+    double *q, *qd, *qdd, *grav, *fext, *tau;
+    int njoints, m;
+
+    if (!PyArg_ParseTuple(args, "OO!O!O!O!O!O!", &rO,
+        &PyArray_Type, &py_q, &PyArray_Type, &py_qd, &PyArray_Type, &py_qdd,
+        &PyArray_Type, &py_grav, &PyArray_Type, &py_fext,
+        &PyArray_Type, &py_tau)) {
         return NULL;
     }
 
@@ -122,103 +145,161 @@ static PyObject *frne(PyObject *self, PyObject *args) {
     }
 
     njoints = robot->njoints;
+    m = (int)PyArray_DIM(py_q, 0);
+
+    q = (double *)PyArray_DATA(py_q);
+    qd = (double *)PyArray_DATA(py_qd);
+    qdd = (double *)PyArray_DATA(py_qdd);
+    grav = (double *)PyArray_DATA(py_grav);
+    fext = (double *)PyArray_DATA(py_fext);
+    tau = (double *)PyArray_DATA(py_tau);
+
+    robot->gravity->x = grav[0];
+    robot->gravity->y = grav[1];
+    robot->gravity->z = grav[2];
+
+    // For each point in the input trajectory
+    for (int p = 0; p < m; p++) {
+        double *qp = &q[p * njoints];
+
+        // Update all position dependent variables
+        for (int j = 0; j < njoints; j++) {
+            Link *l = &robot->links[j];
+
+            switch (l->jointtype) {
+            case REVOLUTE:
+                rot_mat(l, qp[j]+l->offset, l->D, robot->dhtype);
+                break;
+            case PRISMATIC:
+                rot_mat(l, l->theta, qp[j]+l->offset, robot->dhtype);
+                break;
+            default:
+                perror("Invalid joint type %d (expecting 'R' or 'P')");
+            }
+        }
 
-    // Allocate memory for joints
-    q = (double *)PyMem_RawCalloc(njoints, sizeof(double));
-    qd = (double *)PyMem_RawCalloc(njoints, sizeof(double));
-    qdd = (double *)PyMem_RawCalloc(njoints, sizeof(double));
-    fext = (double *)PyMem_RawCalloc(6, sizeof(double));
-
-    // Create iterators for arrays
-    PyObject *iq = PyObject_GetIter(qO);
-    PyObject *iqd = PyObject_GetIter(qdO);
-    PyObject *iqdd = PyObject_GetIter(qddO);
-    PyObject *igrav = PyObject_GetIter(gravO);
-    PyObject *ifext = PyObject_GetIter(fextO);
-
-    // Create the gravity vector
-    temp = PyIter_Next(igrav);
-    robot->gravity->x = PyFloat_AsDouble(temp);
-    Py_DECREF(temp);
-
-    temp = PyIter_Next(igrav);
-    robot->gravity->y = PyFloat_AsDouble(temp);
-    Py_DECREF(temp);
-
-    temp = PyIter_Next(igrav);
-    robot->gravity->z = PyFloat_AsDouble(temp);
-    Py_DECREF(temp);
+        newton_euler(robot, &tau[p * njoints], &qd[p * njoints],
+            &qdd[p * njoints], fext, 1);
+    }
 
+    Py_RETURN_NONE;
+}
 
-    // Create the joint arrays
-    for (int i = 0; i < njoints; i++) {
-        temp = PyIter_Next(iq);
-        q[i] = PyFloat_AsDouble(temp);
-        Py_DECREF(temp);
 
-        temp = PyIter_Next(iqd);
-        qd[i] = PyFloat_AsDouble(temp);
-        Py_DECREF(temp);
+/**
+ * Coriolis matrix by differencing the velocity product torques.
+ *
+ * With zero gravity, acceleration and friction the RNE torque is a quadratic
+ * form in the joint velocity, tau_i = qd' G_i qd, and the Coriolis matrix is
+ * C_ij = (qd' G_i)_j.  Column j is therefore exactly
+ * (tau(qd + e_j) - tau(qd - e_j)) / 4, which costs 2n RNE evaluations of
+ * O(n) each.  The link rotation matrices depend only on q and are computed
+ * once per row.
+ */
+static PyObject *fcoriolis(PyObject *self, PyObject *args) {
 
-        temp = PyIter_Next(iqdd);
-        qdd[i] = PyFloat_AsDouble(temp);
-        Py_DECREF(temp);
+    Robot *robot;
+    PyObject *rO;
+    PyArrayObject *py_q, *py_qd, *py_C;
+    double *q, *qd, *C, *qdj, *qdd, *tau_p, *tau_m;
+    double *B, *Tc;
+    Vect grav;
+    int njoints, m;
+
+    if (!PyArg_ParseTuple(args, "OO!O!O!", &rO, &PyArray_Type, &py_q,
+        &PyArray_Type, &py_qd, &PyArray_Type, &py_C)) {
+        return NULL;
     }
 
-    // Create the fext array
-    for (int i = 0; i < 6; i++) {
-        temp = PyIter_Next(ifext);
-        fext[i] = PyFloat_AsDouble(temp);
-        Py_DECREF(temp);
+    if (!(robot = (Robot*) PyCapsule_GetPointer(rO, "Robot"))) {
+        return NULL;
     }
 
-    // Create a matrix for the return argument */
-    double  *tau;
-    tau = (double *)PyMem_RawCalloc(njoints, sizeof(double));
+    njoints = robot->njoints;
+    m = (int)PyArray_DIM(py_q, 0);
 
-    #define MEL(x,R,C)  (x[(R)+(C)*nq])
+    q = (double *)PyArray_DATA(py_q);
+    qd = (double *)PyArray_DATA(py_qd);
+    C = (double *)PyArray_DATA(py_C);
 
-    // // For each point in the input trajectory
-    // for (int p = 0; p < nq; p++) {
-    int p = 0;
+    qdj = (double *)PyMem_RawCalloc(njoints, sizeof(double));
+    qdd = (double *)PyMem_RawCalloc(njoints, sizeof(double));
+    tau_p = (double *)PyMem_RawCalloc(njoints, sizeof(double));
+    tau_m = (double *)PyMem_RawCalloc(njoints, sizeof(double));
+    B = (double *)PyMem_RawCalloc(njoints, sizeof(double));
+    Tc = (double *)PyMem_RawCalloc(2 * njoints, sizeof(double));
+
+    // Remove gravity and friction, restored below
+    grav = *robot->gravity;
+    robot->gravity->x = 0.0;
+    robot->gravity->y = 0.0;
+    robot->gravity->z = 0.0;
 
-    // Update all position dependent variables
     for (int j = 0; j < njoints; j++) {
         Link *l = &robot->links[j];
+        B[j] = l->B;
+        Tc[2 * j] = l->Tc[0];
+        Tc[2 * j + 1] = l->Tc[1];
+        l->B = 0.0;
+        l->Tc[0] = 0.0;
+        l->Tc[1] = 0.0;
+    }
 
-        switch (l->jointtype) {
-        case REVOLUTE:
-            rot_mat(l, MEL(q,p,j)+l->offset, l->D, robot->dhtype);
-            break;
-        case PRISMATIC:
-            rot_mat(l, l->theta, MEL(q,p,j)+l->offset, robot->dhtype);
-            break;
-        default:
-            perror("Invalid joint type %d (expecting 'R' or 'P')");
+    for (int p = 0; p < m; p++) {
+        double *qp = &q[p * njoints];
+        double *qdp = &qd[p * njoints];
+        double *Cp = &C[p * njoints * njoints];
+
+        // Update all position dependent variables
+        for (int j = 0; j < njoints; j++) {
+            Link *l = &robot->links[j];
+
+            switch (l->jointtype) {
+            case REVOLUTE:
+                rot_mat(l, qp[j]+l->offset, l->D, robot->dhtype);
+                break;
+            case PRISMATIC:
+                rot_mat(l, l->theta, qp[j]+l->offset, robot->dhtype);
+                break;
+            default:
+                perror("Invalid joint type %d (expecting 'R' or 'P')");
+            }
         }
-    }
 
-    newton_euler(robot, tau, qd, qdd, fext, nq);
+        for (int j = 0; j < njoints; j++) {
+            for (int i = 0; i < njoints; i++) {
+                qdj[i] = qdp[i];
+            }
 
-    PyMem_RawFree(q);
-    PyMem_RawFree(qd);
-    PyMem_RawFree(qdd);
-    PyMem_RawFree(fext);
+            qdj[j] = qdp[j] + 1.0;
+            newton_euler(robot, tau_p, qdj, qdd, NULL, 1);
 
-    Py_DECREF(iq);
-    Py_DECREF(iqd);
-    Py_DECREF(iqdd);
-    Py_DECREF(igrav);
-    Py_DECREF(ifext);
+            qdj[j] = qdp[j] - 1.0;
+            newton_euler(robot, tau_m, qdj, qdd, NULL, 1);
 
-    PyObject* ret = PyList_New(njoints);
-    for (int i = 0; i < njoints; ++i) {
-        PyList_SetItem(ret, i, Py_BuildValue("d", tau[i]));
+            for (int i = 0; i < njoints; i++) {
+                Cp[i * njoints + j] = (tau_p[i] - tau_m[i]) / 4.0;
+            }
+        }
     }
 
-    PyMem_RawFree(tau);
+    *robot->gravity = grav;
 
-    return ret;
+    for (int j = 0; j < njoints; j++) {
+        Link *l = &robot->links[j];
+        l->B = B[j];
+        l->Tc[0] = Tc[2 * j];
+        l->Tc[1] = Tc[2 * j + 1];
+    }
+
+    PyMem_RawFree(qdj);
+    PyMem_RawFree(qdd);
+    PyMem_RawFree(tau_p);
+    PyMem_RawFree(tau_m);
+    PyMem_RawFree(B);
+    PyMem_RawFree(Tc);
+
+    Py_RETURN_NONE;
 }
 
 
@@ -21,7 +21,7 @@ extern "C"
         ETS *ets, Matrix4dc Tep,
         MapVectorX q0, int ilimit, int slimit, double tol, int reject_jl,
         MapVectorX q, int *it, int *search, int *solution, double *E,
-        MapVectorX we, int use_pinv, double pinv_damping)
+        MapVectorX we, int use_pinv, double pinv_damping, std::mt19937_64 &rng)
     {
         int iter = 1;
 
@@ -69,7 +69,7 @@ extern "C"
         }
         else
         {
-            _rand_q(ets, q);
+            _rand_q(ets, q, rng);
         }
 
         // Global search up to slimit
@@ -91,11 +91,8 @@ extern "C"
                 {
                     // We have arrived
 
-                    // wrap q to +- pi
-                    for (int i = 0; i < ets->n; i++)
-                    {
-                        q(i) = std::fmod(q(i), PI);
-                    }
+                    // wrap revolute joints into their limits
+                    _wrap_q(ets, q);
 
                     // Check for joint limit violation
                     if (reject_jl)
@@ -138,16 +135,16 @@ extern "C"
             *it += iter;
             iter = 0;
             *search += 1;
-            _rand_q(ets, q);
+            _rand_q(ets, q, rng);
         }
 
-        free(np_e);
-        free(np_Te);
-        free(np_J);
+        PyMem_RawFree(np_e);
+        PyMem_RawFree(np_Te);
+        PyMem_RawFree(np_J);
 
         if (use_pinv)
         {
-            free(np_pinv);
+            PyMem_RawFree(np_pinv);
         }
     }
 
@@ -155,7 +152,7 @@ extern "C"
         ETS *ets, Matrix4dc Tep,
         MapVectorX q0, int ilimit, int slimit, double tol, int reject_jl,
         MapVectorX q, int *it, int *search, int *solution, double *E,
-        MapVectorX we, int use_pinv, double pinv_damping)
+        MapVectorX we, int use_pinv, double pinv_damping, std::mt19937_64 &rng)
     {
         int iter = 1;
 
@@ -203,7 +200,7 @@ extern "C"
         }
         else
         {
-            _rand_q(ets, q);
+            _rand_q(ets, q, rng);
         }
 
         // Global search up to slimit
@@ -225,11 +222,8 @@ extern "C"
                 {
                     // We have arrived
 
-                    // wrap q to +- pi
-                    for (int i = 0; i < ets->n; i++)
-                    {
-                        q(i) = std::fmod(q(i), PI);
-                    }
+                    // wrap revolute joints into their limits
+                    _wrap_q(ets, q);
 
                     // Check for joint limit violation
                     if (reject_jl)
@@ -272,16 +266,16 @@ extern "C"
             *it += iter;
             iter = 0;
             *search += 1;
-            _rand_q(ets, q);
+            _rand_q(ets, q, rng);
         }
 
-        free(np_e);
-        free(np_Te);
-        free(np_J);
+        PyMem_RawFree(np_e);
+        PyMem_RawFree(np_Te);
+        PyMem_RawFree(np_J);
 
         if (use_pinv)
         {
-            free(np_J_pinv);
+            PyMem_RawFree(np_J_pinv);
         }
     }
 
@@ -289,7 +283,7 @@ extern "C"
         ETS *ets, Matrix4dc Tep,
         MapVectorX q0, int ilimit, int slimit, double tol, int reject_jl,
         MapVectorX q, int *it, int *search, int *solution, double *E,
-        double lambda, MapVectorX we)
+        double lambda, MapVectorX we, std::mt19937_64 &rng)
     {
         int iter = 1;
 
@@ -326,7 +320,7 @@ extern "C"
         }
         else
         {
-            _rand_q(ets, q);
+            _rand_q(ets, q, rng);
         }
 
         // Global search up to slimit
@@ -348,11 +342,8 @@ extern "C"
                 {
                     // We have arrived
 
-                    // wrap q to +- pi
-                    for (int i = 0; i < ets->n; i++)
-                    {
-                        q(i) = std::fmod(q(i), PI);
-                    }
+                    // wrap revolute joints into their limits
+                    _wrap_q(ets, q);
 
                     // Check for joint limit violation
                     if (reject_jl)
@@ -392,19 +383,19 @@ extern "C"
             *it += iter;
             iter = 0;
             *search += 1;
-            _rand_q(ets, q);
+            _rand_q(ets, q, rng);
         }
 
-        free(np_e);
-        free(np_Te);
-        free(np_J);
+        PyMem_RawFree(np_e);
+        PyMem_RawFree(np_Te);
+        PyMem_RawFree(np_J);
     }
 
     void _IK_LM_Wampler(
         ETS *ets, Matrix4dc Tep,
         MapVectorX q0, int ilimit, int slimit, double tol, int reject_jl,
         MapVectorX q, int *it, int *search, int *solution, double *E,
-        double lambda, MapVectorX we)
+        double lambda, MapVectorX we, std::mt19937_64 &rng)
     {
         int iter = 1;
 
@@ -440,7 +431,7 @@ extern "C"
         }
         else
         {
-            _rand_q(ets, q);
+            _rand_q(ets, q, rng);
         }
 
         // Global search up to slimit
@@ -462,11 +453,8 @@ extern "C"
                 {
                     // We have arrived
 
-                    // wrap q to +- pi
-                    for (int i = 0; i < ets->n; i++)
-                    {
-                        q(i) = std::fmod(q(i), PI);
-                    }
+                    // wrap revolute joints into their limits
+                    _wrap_q(ets, q);
 
                     // Check for joint limit violation
                     if (reject_jl)
@@ -503,19 +491,19 @@ extern "C"
             *it += iter;
             iter = 0;
             *search += 1;
-            _rand_q(ets, q);
+            _rand_q(ets, q, rng);
         }
 
-        free(np_e);
-        free(np_Te);
-        free(np_J);
+        PyMem_RawFree(np_e);
+        PyMem_RawFree(np_Te);
+        PyMem_RawFree(np_J);
     }
 
     void _IK_LM_Sugihara(
         ETS *ets, Matrix4dc Tep,
         MapVectorX q0, int ilimit, int slimit, double tol, int reject_jl,
         MapVectorX q, int *it, int *search, int *solution, double *E,
-        double lambda, MapVectorX we)
+        double lambda, MapVectorX we, std::mt19937_64 &rng)
     {
         int iter = 1;
 
@@ -552,7 +540,7 @@ extern "C"
         }
         else
         {
-            _rand_q(ets, q);
+            _rand_q(ets, q, rng);
         }
 
         // Global search up to slimit
@@ -574,11 +562,8 @@ extern "C"
                 {
                     // We have arrived
 
-                    // wrap q to +- pi
-                    for (int i = 0; i < ets->n; i++)
-                    {
-                        q(i) = std::fmod(q(i), PI);
-                    }
+                    // wrap revolute joints into their limits
+                    _wrap_q(ets, q);
 
                     // Check for joint limit violation
                     if (reject_jl)
@@ -618,12 +603,154 @@ extern "C"
             *it += iter;
             iter = 0;
             *search += 1;
-            _rand_q(ets, q);
+            _rand_q(ets, q, rng);
         }
 
-        free(np_e);
-        free(np_Te);
-        free(np_J);
+        PyMem_RawFree(np_e);
+        PyMem_RawFree(np_Te);
+        PyMem_RawFree(np_J);
+    }
+
+    void _IK_Solve(
+        int method, ETS *ets, Matrix4dc Tep,
+        MapVectorX q0, int ilimit, int slimit, double tol, int reject_jl,
+        MapVectorX q, int *it, int *search, int *solution, double *E,
+        MapVectorX we, double lambda, int use_pinv, double pinv_damping,
+        std::mt19937_64 &rng)
+    {
+        if (method == IK_METHOD_NR)
+        {
+            _IK_NR(ets, Tep, q0, ilimit, slimit, tol, reject_jl, q, it, search, solution, E, we, use_pinv, pinv_damping, rng);
+        }
+        else if (method == IK_METHOD_GN)
+        {
+            _IK_GN(ets, Tep, q0, ilimit, slimit, tol, reject_jl, q, it, search, solution, E, we, use_pinv, pinv_damping, rng);
+        }
+        else if (method == IK_METHOD_LM_CHAN)
+        {
+            _IK_LM_Chan(ets, Tep, q0, ilimit, slimit, tol, reject_jl, q, it, search, solution, E, lambda, we, rng);
+        }
+        else if (method == IK_METHOD_LM_WAMPLER)
+        {
+            _IK_LM_Wampler(ets, Tep, q0, ilimit, slimit, tol, reject_jl, q, it, search, solution, E, lambda, we, rng);
+        }
+        else if (method == IK_METHOD_LM_SUGIHARA)
+        {
+            _IK_LM_Sugihara(ets, Tep, q0, ilimit, slimit, tol, reject_jl, q, it, search, solution, E, lambda, we, rng);
+        }
+    }
+
+    void _IK_Batch(
+        int method, ETS *ets, double *Tep, int m,
+        double *q0, int q0_stride, int ilimit, int slimit, double tol, int reject_jl,
+        double *q, int *it, int *search, int *solution, double *E,
+        MapVectorX we, double lambda, int use_pinv, double pinv_damping,
+        uint64_t seed, int index0)
+    {
+        std::mt19937_64 rng;
+
+        for (int i = 0; i < m; i++)
+        {
+            // Every pose gets its own random stream, selected by its index
+            // within the whole batch, so results do not depend on how the
+            // batch is split between threads
+            _seed_rng(rng, seed, index0 + i);
+
+            // Tep is a contiguous (m, 4, 4) row major array from Python
+            MapMatrix4dr row_Tep(Tep + 16 * i);
+            Matrix4dc e_Tep = row_Tep;
+
+            // An empty q0 tells the solvers to start from a random q
+            MapVectorX q0i(NULL, 0);
+            if (q0 != NULL)
+            {
+                new (&q0i) MapVectorX(q0 + q0_stride * i, ets->n);
+            }
+
+            MapVectorX qi(q + ets->n * i, ets->n);
+
+            it[i] = 0;
+            search[i] = 1;
+            solution[i] = 0;
+
+            _IK_Solve(method, ets, e_Tep, q0i, ilimit, slimit, tol, reject_jl, qi, &it[i], &search[i], &solution[i], &E[i], we, lambda, use_pinv, pinv_damping, rng);
+        }
+    }
+
+    void _IK_Traj(
+        int method, ETS *ets, double *Tep, int m,
+        double *q0, int ilimit, int slimit, double tol, int reject_jl, double dq_max,
+        double *q, int *it, int *search, int *solution, double *E,
+        MapVectorX we, double lambda, int use_pinv, double pinv_damping,
+        uint64_t seed)
+    {
+        std::mt19937_64 rng;
+        VectorX q_jump(ets->n);
+        double E_jump = 0.0;
+        double *prev = q0;
+
+        _seed_rng(rng, seed, 0);
+
+        for (int i = 0; i < m; i++)
+        {
+            MapMatrix4dr row_Tep(Tep + 16 * i);
+            Matrix4dc e_Tep = row_Tep;
+
+            MapVectorX qi(q + ets->n * i, ets->n);
+
+            // a solution which is not within dq_max of the previous one
+            int jump = 0;
+
+            it[i] = 0;
+            search[i] = 0;
+            solution[i] = 0;
+
+            // The first search starts from the previous solution, the
+            // following ones from random configurations
+            while (search[i] < slimit)
+            {
+                MapVectorX q0i(NULL, 0);
+                if (search[i] == 0 && prev != NULL)
+                {
+                    new (&q0i) MapVectorX(prev, ets->n);
+                }
+
+                int its = 0, srch = 1, sol = 0;
+                _IK_Solve(method, ets, e_Tep, q0i, ilimit, 1, tol, reject_jl, qi, &its, &srch, &sol, &E[i], we, lambda, use_pinv, pinv_damping, rng);
+
+                it[i] += its;
+                search[i] += 1;
+
+                if (sol)
+                {
+                    if (prev == NULL || dq_max <= 0.0 || (qi - MapVectorX(prev, ets->n)).cwiseAbs().maxCoeff() <= dq_max)
+                    {
+                        solution[i] = 1;
+                        break;
+                    }
+                    else if (!jump)
+                    {
+                        q_jump = qi;
+                        E_jump = E[i];
+                        jump = 1;
+                    }
+                }
+            }
+
+            // Fall back to a discontinuous solution rather than none
+            if (!solution[i] && jump)
+            {
+                qi = q_jump;
+                E[i] = E_jump;
+                solution[i] = 1;
+            }
+
+            // A failed pose does not seed the next one
+            if (solution[i])
+            {
+                prev = q + ets->n * i;
+            }
+        }
     }
 
     void _pseudo_inverse(Eigen::Map<Eigen::MatrixXd> J, Eigen::Map<Eigen::MatrixXd> J_pinv, double damping)
@@ -642,6 +769,42 @@ extern "C"
         J_pinv = svd.matrixV() * S.transpose() * svd.matrixU().transpose();
     }
 
+    void _wrap_q(ETS *ets, MapVectorX q)
+    {
+        ET *et;
+        double w;
+        int j = 0;
+
+        for (int i = 0; i < ets->m; i++)
+        {
+            et = ets->ets[i];
+
+            if (!et->isjoint)
+            {
+                continue;
+            }
+
+            // axis 0 to 2 are rotations, 3 to 5 translations
+            if (et->axis < 3 && (q(j) < ets->qlim_l[j] || q(j) > ets->qlim_h[j]))
+            {
+                // the smallest equivalent angle above the lower limit, if it
+                // is within the limits use it, otherwise wrap to +- pi
+                w = q(j) - 2 * PI * std::floor((q(j) - ets->qlim_l[j]) / (2 * PI));
+
+                if (w <= ets->qlim_h[j])
+                {
+                    q(j) = w;
+                }
+                else
+                {
+                    q(j) = std::remainder(q(j), 2 * PI);
+                }
+            }
+
+            j += 1;
+        }
+    }
+
     int _check_lim(ETS *ets, MapVectorX q)
     {
         for (int i = 0; i < ets->n; i++)
@@ -703,17 +866,22 @@ extern "C"
         }
     }
 
-    void _rand_q(ETS *ets, MapVectorX q)
+    void _rand_q(ETS *ets, MapVectorX q, std::mt19937_64 &rng)
     {
-        Eigen::Map<Eigen::ArrayXd> qlim_l(ets->qlim_l, ets->n);
-        Eigen::Map<Eigen::ArrayXd> q_range2(ets->q_range2, ets->n);
-
-        q = VectorX::Random(ets->n);
+        std::uniform_real_distribution<double> dist(-1.0, 1.0);
 
-        q = (q.array() + 1) * q_range2;
-        q = q.array() + qlim_l;
+        for (int i = 0; i < ets->n; i++)
+        {
+            q(i) = (dist(rng) + 1) * ets->q_range2[i] + ets->qlim_l[i];
+        }
+    }
 
-        // return q;
+    void _seed_rng(std::mt19937_64 &rng, uint64_t seed, uint64_t stream)
+    {
+        std::seed_seq seq{
+            (uint32_t)seed, (uint32_t)(seed >> 32),
+            (uint32_t)stream, (uint32_t)(stream >> 32)};
+        rng.seed(seq);
     }
 
 } /* extern "C" */
\ No newline at end of file
@@ -9,6 +9,8 @@
 #define _IK_H_
 
 #include <Python.h>
+#include <random>
+#include <stdint.h>
 #include "structs.h"
 #include "linalg.h"
 
@@ -17,38 +19,68 @@ extern "C"
 {
 #endif /* __cplusplus */
 
+// Solver codes used by the batched IK entry point
+#define IK_METHOD_NR 0
+#define IK_METHOD_GN 1
+#define IK_METHOD_LM_CHAN 2
+#define IK_METHOD_LM_WAMPLER 3
+#define IK_METHOD_LM_SUGIHARA 4
+
     void _IK_GN(
         ETS *ets, Matrix4dc Tep,
         MapVectorX q0, int ilimit, int slimit, double tol, int reject_jl,
         MapVectorX q, int *it, int *search, int *solution, double *E,
-        MapVectorX we, int use_pinv, double pinv_damping);
+        MapVectorX we, int use_pinv, double pinv_damping, std::mt19937_64 &rng);
 
     void _IK_NR(
         ETS *ets, Matrix4dc Tep,
         MapVectorX q0, int ilimit, int slimit, double tol, int reject_jl,
         MapVectorX q, int *it, int *search, int *solution, double *E,
-        MapVectorX we, int use_pinv, double pinv_damping);
+        MapVectorX we, int use_pinv, double pinv_damping, std::mt19937_64 &rng);
 
     void _IK_LM_Chan(
         ETS *ets, Matrix4dc Tep,
         MapVectorX q0, int ilimit, int slimit, double tol, int reject_jl,
         MapVectorX q, int *it, int *search, int *solution, double *E,
-        double lambda, MapVectorX we);
+        double lambda, MapVectorX we, std::mt19937_64 &rng);
 
     void _IK_LM_Wampler(
         ETS *ets, Matrix4dc Tep,
         MapVectorX q0, int ilimit, int slimit, double tol, int reject_jl,
         MapVectorX q, int *it, int *search, int *solution, double *E,
-        double lambda, MapVectorX we);
+        double lambda, MapVectorX we, std::mt19937_64 &rng);
 
     void _IK_LM_Sugihara(
         ETS *ets, Matrix4dc Tep,
         MapVectorX q0, int ilimit, int slimit, double tol, int reject_jl,
         MapVectorX q, int *it, int *search, int *solution, double *E,
-        double lambda, MapVectorX we);
+        double lambda, MapVectorX we, std::mt19937_64 &rng);
+
+    void _IK_Solve(
+        int method, ETS *ets, Matrix4dc Tep,
+        MapVectorX q0, int ilimit, int slimit, double tol, int reject_jl,
+        MapVectorX q, int *it, int *search, int *solution, double *E,
+        MapVectorX we, double lambda, int use_pinv, double pinv_damping,
+        std::mt19937_64 &rng);
+
+    void _IK_Batch(
+        int method, ETS *ets, double *Tep, int m,
+        double *q0, int q0_stride, int ilimit, int slimit, double tol, int reject_jl,
+        double *q, int *it, int *search, int *solution, double *E,
+        MapVectorX we, double lambda, int use_pinv, double pinv_damping,
+        uint64_t seed, int index0);
+
+    void _IK_Traj(
+        int method, ETS *ets, double *Tep, int m,
+        double *q0, int ilimit, int slimit, double tol, int reject_jl, double dq_max,
+        double *q, int *it, int *search, int *solution, double *E,
+        MapVectorX we, double lambda, int use_pinv, double pinv_damping,
+        uint64_t seed);
 
     void _pseudo_inverse(Eigen::Map<Eigen::MatrixXd> J, Eigen::Map<Eigen::MatrixXd> J_pinv, double damping);
-    void _rand_q(ETS *ets, MapVectorX q);
+    void _rand_q(ETS *ets, MapVectorX q, std::mt19937_64 &rng);
+    void _seed_rng(std::mt19937_64 &rng, uint64_t seed, uint64_t stream);
+    void _wrap_q(ETS *ets, MapVectorX q);
     int _check_lim(ETS *ets, MapVectorX q);
     void _angle_axis(MapMatrix4dc Te, Matrix4dc Tep, MapVectorX e);
 
@@ -9,6 +9,7 @@
 #include <iostream>
 #include <Eigen/Dense>
 #include <Eigen/QR>
+#include <vector>
 
 extern "C"
 {
@@ -109,92 +110,31 @@ extern "C"
         //     }
         // }
 
-        ET *et;
-        Eigen::Matrix<double, 6, Eigen::Dynamic> tJ(6, ets->n);
-        double T[16];
-        MapMatrix4dc eT(T);
-        Matrix4dc U = Eigen::Matrix4d::Identity();
-        Matrix4dc invU;
-        Matrix4dc temp;
-        Matrix4dc ret;
-        int j = ets->n - 1;
-
-        if (tool != NULL)
-        {
-            Matrix4dc e_tool(tool);
-            temp = e_tool * U;
-            U = temp;
-        }
+        Matrix4dc U;
 
-        for (int i = ets->m - 1; i >= 0; i--)
-        {
-            et = ets->ets[i];
-
-            if (et->isjoint)
-            {
-                if (et->axis == 0)
-                {
-                    tJ(Eigen::seq(0, 2), j) = U(2, Eigen::seq(0, 2)) * U(1, 3) - U(1, Eigen::seq(0, 2)) * U(2, 3);
-                    tJ(Eigen::seq(3, 5), j) = U(0, Eigen::seq(0, 2));
-                }
-                else if (et->axis == 1)
-                {
-                    tJ(Eigen::seq(0, 2), j) = U(0, Eigen::seq(0, 2)) * U(2, 3) - U(2, Eigen::seq(0, 2)) * U(0, 3);
-                    tJ(Eigen::seq(3, 5), j) = U(1, Eigen::seq(0, 2));
-                }
-                else if (et->axis == 2)
-                {
-                    tJ(Eigen::seq(0, 2), j) = U(1, Eigen::seq(0, 2)) * U(0, 3) - U(0, Eigen::seq(0, 2)) * U(1, 3);
-                    tJ(Eigen::seq(3, 5), j) = U(2, Eigen::seq(0, 2));
-                }
-                else if (et->axis == 3)
-                {
-                    tJ(Eigen::seq(0, 2), j) = U(0, Eigen::seq(0, 2));
-                    tJ(Eigen::seq(3, 5), j) = Eigen::Vector3d::Zero();
-                }
-                else if (et->axis == 4)
-                {
-                    tJ(Eigen::seq(0, 2), j) = U(1, Eigen::seq(0, 2));
-                    tJ(Eigen::seq(3, 5), j) = Eigen::Vector3d::Zero();
-                }
-                else if (et->axis == 5)
-                {
-                    tJ(Eigen::seq(0, 2), j) = U(2, Eigen::seq(0, 2));
-                    tJ(Eigen::seq(3, 5), j) = Eigen::Vector3d::Zero();
-                }
-
-                _ET_T(et, &ret(0), q[et->jindex]);
-                temp = ret * U;
-                U = temp;
-                j--;
-            }
-            else
-            {
-                _ET_T(et, &ret(0), q[et->jindex]);
-                temp = ret * U;
-                U = temp;
-            }
-        }
-
-        Eigen::Matrix<double, 6, 6> ev;
-        ev.topLeftCorner<3, 3>() = U.topLeftCorner<3, 3>();
-        ev.topRightCorner<3, 3>() = Eigen::Matrix3d::Zero();
-        ev.bottomLeftCorner<3, 3>() = Eigen::Matrix3d::Zero();
-        ev.bottomRightCorner<3, 3>() = U.topLeftCorner<3, 3>();
-        eJ = ev * tJ;
+        // The end-effector frame Jacobian, rotated into the base frame
+        _ETS_jacobe_T(ets, q, tool, eJ, U);
+        eJ.topRows<3>() = U.topLeftCorner<3, 3>() * eJ.topRows<3>();
+        eJ.bottomRows<3>() = U.topLeftCorner<3, 3>() * eJ.bottomRows<3>();
     }
 
     void _ETS_jacobe(ETS *ets, double *q, double *tool, MapMatrixJc &eJ)
+    {
+        Matrix4dc U;
+        _ETS_jacobe_T(ets, q, tool, eJ, U);
+    }
+
+    // The end-effector frame Jacobian eJ, working from the tool back to the
+    // base so that U is the forward kinematics (including the tool) on exit
+    void _ETS_jacobe_T(ETS *ets, double *q, double *tool, MapMatrixJc &eJ, Matrix4dc &U)
     {
         ET *et;
-        double T[16];
-        MapMatrix4dc eT(T);
-        Matrix4dc U = Eigen::Matrix4d::Identity();
-        Matrix4dc invU;
         Matrix4dc temp;
         Matrix4dc ret;
         int j = ets->n - 1;
 
+        U = Eigen::Matrix4d::Identity();
+
         if (tool != NULL)
         {
             Matrix4dc e_tool(tool);
@@ -253,6 +193,68 @@ extern "C"
         }
     }
 
+    void _ETS_kinematics(ETS *ets, double *q, double *tool, int which,
+                         MapMatrix4dc &eT, MapMatrixJc &eJ0, MapMatrixJc &eJe,
+                         MapMatrixHr &eH0, double *m, MapMatrixJc &eJm)
+    {
+        int n = ets->n;
+        Matrix4dc U;
+        MatrixJc Je(6, n), J0(6, n);
+        MatrixHr H0(n * 6, n);
+        MapMatrixJc mJe(Je.data(), 6, n), mJ0(J0.data(), 6, n);
+        MapMatrixHr mH0(H0.data(), n * 6, n);
+        Eigen::Matrix<double, 6, 6> JJt, b;
+        double manip;
+
+        // One traversal gives the pose and the end-effector frame Jacobian,
+        // everything else is derived from those
+        _ETS_jacobe_T(ets, q, tool, mJe, U);
+
+        if (which & KIN_T)
+            eT = U;
+
+        if (which & KIN_JE)
+            eJe = Je;
+
+        if (!(which & (KIN_J0 | KIN_H0 | KIN_MANIP | KIN_JM)))
+            return;
+
+        J0.topRows<3>() = U.topLeftCorner<3, 3>() * Je.topRows<3>();
+        J0.bottomRows<3>() = U.topLeftCorner<3, 3>() * Je.bottomRows<3>();
+
+        if (which & KIN_J0)
+            eJ0 = J0;
+
+        if (which & (KIN_H0 | KIN_JM))
+        {
+            _ETS_hessian(n, mJ0, mH0);
+
+            if (which & KIN_H0)
+                eH0 = H0;
+        }
+
+        if (!(which & (KIN_MANIP | KIN_JM)))
+            return;
+
+        // Yoshikawa's manipulability over all six axes
+        JJt = J0 * J0.transpose();
+        manip = sqrt(fabs(JJt.determinant()));
+
+        if (which & KIN_MANIP)
+            *m = manip;
+
+        if (which & KIN_JM)
+        {
+            // dm/dq_i = m vec(J H_i^T)^T vec((J J^T)^-1)
+            b = JJt.inverse();
+
+            for (int i = 0; i < n; i++)
+            {
+                eJm(i, 0) = manip * (J0 * H0.middleRows(i * 6, 6).transpose()).cwiseProduct(b).sum();
+            }
+        }
+    }
+
     void _ETS_fkine(ETS *ets, double *q, double *base, double *tool, MapMatrix4dc &e_ret)
     {
         ET *et;
@@ -307,4 +309,122 @@ extern "C"
         et->op(ret, eta);
     }
 
+    void _RNE(int nb, int n, double *P, double *Q, int *axis, int *flip, int *parent,
+              int *jindex, double *S, double *I, double *Ia, double *B, double *G,
+              double *Tc, double *a0, int friction, double *q, double *qd,
+              double *qdd, double *tau)
+    {
+        // Recursive Newton-Euler for a tree of nb bodies, spatial vectors
+        // are ordered (v, omega). Body i moves relative to body parent[i]
+        // (-1 for the world) by P[i] E(q) Q[i] where E is the elementary
+        // transform axis[i] of joint jindex[i].
+        typedef Eigen::Matrix<double, 6, 1> Vector6d;
+        typedef Eigen::Matrix<double, 6, 6, Eigen::RowMajor> Matrix6dr;
+
+        std::vector<Eigen::Matrix3d> R(nb);
+        std::vector<Eigen::Vector3d> p(nb);
+        std::vector<Vector6d> v(nb), a(nb), f(nb);
+
+        Matrix4dr E;
+        Eigen::Vector3d lin, pa;
+
+        for (int i = 0; i < nb; i++)
+        {
+            MapMatrix4dr eP(P + 16 * i);
+            MapMatrix4dr eQ(Q + 16 * i);
+            Eigen::Map<Vector6d> s(S + 6 * i);
+            Eigen::Map<Matrix6dr> eI(I + 36 * i);
+
+            int j = jindex[i];
+            double eta = flip[i] ? -q[j] : q[j];
+            double c = cos(eta), sn = sin(eta);
+
+            E.setIdentity();
+            switch (axis[i])
+            {
+            case 0:
+                E(1, 1) = c;
+                E(1, 2) = -sn;
+                E(2, 1) = sn;
+                E(2, 2) = c;
+                break;
+            case 1:
+                E(0, 0) = c;
+                E(0, 2) = sn;
+                E(2, 0) = -sn;
+                E(2, 2) = c;
+                break;
+            case 2:
+                E(0, 0) = c;
+                E(0, 1) = -sn;
+                E(1, 0) = sn;
+                E(1, 1) = c;
+                break;
+            default:
+                E(axis[i] - 3, 3) = eta;
+            }
+
+            Matrix4dr T = eP * E * eQ;
+            R[i] = T.block<3, 3>(0, 0);
+            p[i] = T.block<3, 1>(0, 3);
+
+            // transform the parent's velocity and acceleration to this body
+            if (parent[i] < 0)
+            {
+                lin = Eigen::Map<Vector6d>(a0).head<3>();
+                pa = Eigen::Map<Vector6d>(a0).tail<3>();
+                v[i].setZero();
+                a[i].head<3>() = R[i].transpose() * (lin - p[i].cross(pa));
+                a[i].tail<3>() = R[i].transpose() * pa;
+            }
+            else
+            {
+                Vector6d &vp = v[parent[i]];
+                Vector6d &ap = a[parent[i]];
+                v[i].head<3>() = R[i].transpose() * (vp.head<3>() - p[i].cross(vp.tail<3>()));
+                v[i].tail<3>() = R[i].transpose() * vp.tail<3>();
+                a[i].head<3>() = R[i].transpose() * (ap.head<3>() - p[i].cross(ap.tail<3>()));
+                a[i].tail<3>() = R[i].transpose() * ap.tail<3>();
+            }
+
+            Vector6d vJ = s * qd[j];
+            v[i] += vJ;
+
+            // a = X a_parent + S qdd + v x vJ
+            a[i] += s * qdd[j];
+            a[i].head<3>() += v[i].tail<3>().cross(vJ.head<3>()) + v[i].head<3>().cross(vJ.tail<3>());
+            a[i].tail<3>() += v[i].tail<3>().cross(vJ.tail<3>());
+
+            // f = I a + v x* I v
+            Vector6d h = eI * v[i];
+            f[i] = eI * a[i];
+            f[i].head<3>() += v[i].tail<3>().cross(h.head<3>());
+            f[i].tail<3>() += v[i].head<3>().cross(h.head<3>()) + v[i].tail<3>().cross(h.tail<3>());
+        }
+
+        for (int i = nb - 1; i >= 0; i--)
+        {
+            Eigen::Map<Vector6d> s(S + 6 * i);
+            int j = jindex[i];
+
+            double t = s.dot(f[i]) + Ia[i] * qdd[j];
+
+            if (friction)
+            {
+                t += G[i] * G[i] * B[i] * qd[j];
+                t += fabs(G[i]) * ((qd[j] > 0 ? Tc[2 * i] : 0.0) + (qd[j] < 0 ? Tc[2 * i + 1] : 0.0));
+            }
+
+            tau[j] = t;
+
+            // transform the force on this body to the parent
+            if (parent[i] >= 0)
+            {
+                Eigen::Vector3d fl = R[i] * f[i].head<3>();
+                f[parent[i]].head<3>() += fl;
+                f[parent[i]].tail<3>() += R[i] * f[i].tail<3>() + p[i].cross(fl);
+            }
+        }
+    }
+
 } /* extern "C" */
\ No newline at end of file
@@ -12,6 +12,14 @@
 #include "structs.h"
 #include "linalg.h"
 
+// Quantities computed by _ETS_kinematics, combined as a bit mask
+#define KIN_T 1
+#define KIN_J0 2
+#define KIN_JE 4
+#define KIN_H0 8
+#define KIN_MANIP 16
+#define KIN_JM 32
+
 #ifdef __cplusplus
 extern "C"
 {
@@ -22,8 +30,16 @@ extern "C"
     void _ETS_hessian(int n, MapMatrixJc &J, MapMatrixHr &H);
     void _ETS_jacob0(ETS *ets, double *q, double *tool, MapMatrixJc &eJ);
     void _ETS_jacobe(ETS *ets, double *q, double *tool, MapMatrixJc &eJ);
+    void _ETS_jacobe_T(ETS *ets, double *q, double *tool, MapMatrixJc &eJ, Matrix4dc &U);
+    void _ETS_kinematics(ETS *ets, double *q, double *tool, int which,
+                         MapMatrix4dc &eT, MapMatrixJc &eJ0, MapMatrixJc &eJe,
+                         MapMatrixHr &eH0, double *m, MapMatrixJc &eJm);
     void _ETS_fkine(ETS *ets, double *q, double *base, double *tool, MapMatrix4dc &e_ret);
     void _ET_T(ET *et, double *ret, double eta);
+    void _RNE(int nb, int n, double *P, double *Q, int *axis, int *flip, int *parent,
+              int *jindex, double *S, double *I, double *Ia, double *B, double *G,
+              double *Tc, double *a0, int friction, double *q, double *qd,
+              double *qdd, double *tau);
 
 #ifdef __cplusplus
 } /* extern "C" */
@@ -25,8 +25,9 @@ dt = 0.05
 while not arrived:
 
     start = time.time()
-    v, arrived = rtb.p_servo(panda.fkine(panda.q), Tep, 1)
-    panda.qd = np.linalg.pinv(panda.jacobe(panda.q)) @ v
+    k = panda.kinematics(panda.q, ["T", "Je"])
+    v, arrived = rtb.p_servo(k.T, Tep, 1)
+    panda.qd = np.linalg.pinv(k.Je) @ v
     env.step(dt)
     stop = time.time()
 
@@ -48,8 +48,10 @@ Tep.A[:3, 3] = target.T[:3, -1]
 
 
 def step():
-    # The pose of the Panda's end-effector
-    Te = panda.fkine(panda.q)
+    # The pose of the Panda's end-effector, its Jacobian and the
+    # manipulability Jacobian from one pass over the kinematics
+    k = panda.kinematics(panda.q, ["T", "Je", "jacobm"])
+    Te = sm.SE3(k.T, check=False)
 
     # Transform from the end-effector to desired pose
     eTep = Te.inv() * Tep
@@ -74,7 +76,7 @@ def step():
     Q[n:, n:] = (1 / e) * np.eye(6)
 
     # The equality contraints
-    Aeq = np.c_[panda.jacobe(panda.q), np.eye(6)]
+    Aeq = np.c_[k.Je, np.eye(6)]
     beq = v.reshape((6,))
 
     # The inequality constraints for joint limit avoidance
@@ -92,32 +94,26 @@ def step():
     # Form the joint limit velocity damper
     Ain[:n, :n], bin[:n] = panda.joint_velocity_damper(ps, pi, n)
 
-    # For each collision in the scene
-    for collision in collisions:
-
-        # Form the velocity damper inequality contraint for each collision
-        # object on the robot to the collision in the scene
-        c_Ain, c_bin = panda.link_collision_damper(
-            collision,
-            panda.q[:n],
-            0.3,
-            0.05,
-            1.0,
-            start=panda.link_dict["panda_link1"],
-            end=panda.link_dict["panda_hand"],
-        )
-
-        # If there are any parts of the robot within the influence distance
-        # to the collision in the scene
-        if c_Ain is not None and c_bin is not None:
-            c_Ain = np.c_[c_Ain, np.zeros((c_Ain.shape[0], 6))]
-
-            # Stack the inequality constraints
-            Ain = np.r_[Ain, c_Ain]
-            bin = np.r_[bin, c_bin]
+    # Form the velocity damper inequality contraints for each collision
+    # object on the robot to all of the collisions in the scene
+    c_Ain, c_bin = panda.link_collision_damper_batch(
+        collisions,
+        panda.q[:n],
+        0.3,
+        0.05,
+        1.0,
+        start=panda.link_dict["panda_link1"],
+        end=panda.link_dict["panda_hand"],
+    )
+
+    # Stack the inequality constraints, there is one row for each part of
+    # the robot within the influence distance to a collision in the scene
+    c_Ain = np.c_[c_Ain, np.zeros((c_Ain.shape[0], 6))]
+    Ain = np.r_[Ain, c_Ain]
+    bin = np.r_[bin, c_bin]
 
     # Linear component of objective function: the manipulability Jacobian
-    c = np.r_[-panda.jacobm(panda.q).reshape((n,)), np.zeros(6)]
+    c = np.r_[-k.jacobm.reshape((n,)), np.zeros(6)]
 
     # The lower and upper bounds on the joint velocity and slack variable
     lb = -np.r_[panda.qdlim[:n], 10 * np.ones(6)]
@@ -0,0 +1,235 @@
+import numpy as np
+from math import inf
+
+
+def bounding_radius(shape):
+    """
+    Radius of a bounding sphere of a shape
+
+    :param shape: collision shape
+    :type shape: Shape
+    :return: radius of a sphere, centred at the shape origin, which
+        encloses the shape
+    :rtype: float
+
+    Spheres, cuboids and cylinders are supported.  For other shapes, such as
+    meshes, the radius is infinite and the shape is never culled.
+    """
+    stype = getattr(shape, "stype", None)
+
+    if stype == "sphere":
+        return shape.radius
+    elif stype == "cuboid":
+        return 0.5 * np.linalg.norm(shape.scale)
+    elif stype == "cylinder":
+        return np.hypot(shape.radius, 0.5 * shape.length)
+    else:
+        return inf
+
+
+class BroadPhase:
+    """
+    Broad-phase collision culling
+
+    :param shapes: shapes in the scene, defaults to no shapes
+    :type shapes: list of Shape, optional
+
+    Holds a set of shapes, typically the obstacles in a scene, each bounded
+    by an axis-aligned box derived from a bounding sphere.  The boxes are
+    sorted along the x-axis so that the shapes which may be within a given
+    distance of a query box are found by sweep and prune, without testing
+    every shape.
+
+    The structure is reused across queries, only the box positions need to
+    be refreshed with :func:`update` when shapes move.  For example::
+
+        scene = BroadPhase(obstacles)
+
+        for q in traj.q:
+            scene.update()
+            if robot.iscollided(q, scene):
+                ...
+
+    A candidate only means that the bounding volumes overlap, the exact
+    distance must be found by a narrow-phase test such as
+    ``Shape.closest_point``.
+
+    :seealso: :func:`bounding_radius`, :func:`Robot.iscollided`,
+        :func:`Robot.closest_point`
+    """
+
+    def __init__(self, shapes=None):
+        self._shapes = []
+        self._radius = np.zeros(0)
+        self._centre = np.zeros((0, 3))
+        self._order = np.zeros(0, dtype=int)
+        self._xmin = np.zeros(0)
+
+        if shapes is not None:
+            self.add(shapes)
+
+    def __len__(self):
+        """
+        Number of shapes
+
+        :return: number of shapes in the broad phase
+        :rtype: int
+        """
+        return len(self._shapes)
+
+    def __str__(self):
+        return f"BroadPhase({len(self)} shapes)"
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def shapes(self):
+        """
+        Shapes in the broad phase
+
+        :return: the shapes, in the order they were added
+        :rtype: list of Shape
+        """
+        return self._shapes
+
+    def add(self, shapes):
+        """
+        Add shapes
+
+        :param shapes: shape or shapes to add
+        :type shapes: Shape or list of Shape
+
+        The bounding radius of each shape is computed once, when it is added.
+        """
+        if not isinstance(shapes, (list, tuple)):
+            shapes = [shapes]
+
+        self._shapes.extend(shapes)
+        self._radius = np.r_[self._radius, [bounding_radius(s) for s in shapes]]
+        self.update()
+
+    def update(self, propagate=False):
+        """
+        Refresh the bounding boxes from the shape poses
+
+        :param propagate: update the world transform of each shape from its
+            scene tree first, defaults to False
+        :type propagate: bool
+
+        Must be called after the shapes have moved.
+        """
+        if propagate:
+            for shape in self._shapes:
+                shape._propogate_scene_tree()
+
+        if self._shapes:
+            self._centre = np.array([shape._wT[:3, 3] for shape in self._shapes])
+        else:
+            self._centre = np.zeros((0, 3))
+
+        # sweep and prune axis, shapes sorted by the lower x bound
+        xmin = self._centre[:, 0] - self._radius
+        self._order = np.argsort(xmin, kind="stable")
+        self._xmin = xmin[self._order]
+
+    def candidates(self, centre, radius, margin=0.0):
+        """
+        Shapes near a set of bounding spheres
+
+        :param centre: centres of the query spheres
+        :type centre: ndarray(m,3)
+        :param radius: radii of the query spheres
+        :type radius: ndarray(m)
+        :param margin: distance by which the query is enlarged, defaults to 0
+        :type margin: float
+        :return: for each query sphere, indices of the shapes whose bounding
+            box is within ``margin`` of its bounding box
+        :rtype: list of ndarray
+
+        A shape further than ``margin`` from the bounding box of a query
+        sphere can not be within ``margin`` of the sphere, so is culled.
+
+        :seealso: :func:`overlaps`
+        """
+        centre = np.atleast_2d(centre)
+        if centre.shape[0] == 0:
+            return []
+
+        k, i = self.overlaps(centre, radius, margin)
+        return np.split(i, np.cumsum(np.bincount(k, minlength=len(centre)))[:-1])
+
+    def overlaps(self, centre, radius, margin=0.0):
+        """
+        Query spheres and shapes which may be near each other
+
+        :param centre: centres of the query spheres
+        :type centre: ndarray(m,3)
+        :param radius: radii of the query spheres
+        :type radius: ndarray(m)
+        :param margin: distance by which the query is enlarged, defaults to 0
+        :type margin: float
+        :return: index of the query sphere and of the shape for each
+            candidate, sorted by query sphere
+        :rtype: ndarray(p), ndarray(p)
+
+        As :func:`candidates` but the result is not split per query sphere,
+        which is cheaper when there are many query spheres and few
+        candidates.
+        """
+        centre = np.atleast_2d(centre)
+
+        extent = np.asarray(radius, dtype=float) + margin
+        lo = centre - extent[:, np.newaxis]
+        hi = centre + extent[:, np.newaxis]
+
+        # shapes with xmin <= hi_x form a prefix of the sorted order, test
+        # all queries against the longest prefix at once
+        end = np.searchsorted(self._xmin, hi[:, 0], side="right")
+        idx = self._order[: end.max(initial=0)]
+
+        smin = self._centre[idx] - self._radius[idx, np.newaxis]
+        smax = self._centre[idx] + self._radius[idx, np.newaxis]
+
+        ok = (
+            np.all(smax[np.newaxis, :, :] >= lo[:, np.newaxis, :], axis=2)
+            & np.all(smin[np.newaxis, :, :] <= hi[:, np.newaxis, :], axis=2)
+            & (np.arange(len(idx)) < end[:, np.newaxis])
+        )
+
+        k, i = np.nonzero(ok)
+        return k, idx[i]
+
+    def pairs(self, margin=0.0):
+        """
+        Pairs of shapes which may be near each other
+
+        :param margin: distance by which the bounding boxes are enlarged,
+            defaults to 0
+        :type margin: float
+        :return: index pairs ``(i, j)`` with ``i < j`` of shapes whose
+            bounding boxes are within ``margin`` of each other
+        :rtype: ndarray(p,2)
+
+        Used for collision checks between the shapes in the set, such as
+        self-collision.
+        """
+        n = len(self._shapes)
+        if n < 2:
+            return np.zeros((0, 2), dtype=int)
+
+        order = self._order
+        smin = self._centre[order] - self._radius[order, np.newaxis]
+        smax = self._centre[order] + self._radius[order, np.newaxis] + margin
+
+        # sweep: in sorted order, shape k can only overlap the shapes after
+        # it up to the first one that starts beyond its upper x bound
+        end = np.searchsorted(self._xmin, smax[:, 0], side="right")
+        count = np.maximum(end - np.arange(1, n + 1), 0)
+        k = np.repeat(np.arange(n), count)
+        m = k + 1 + np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+
+        ok = np.all(smin[m] <= smax[k], axis=1) & np.all(smax[m] >= smin[k], axis=1)
+
+        pairs = np.sort(np.c_[order[k[ok]], order[m[ok]]], axis=1)
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
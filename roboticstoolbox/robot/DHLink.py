@@ -171,6 +171,41 @@ class DHLink(Link):
         self.mesh = None
         self.number = None
 
+    def _update_ets(self):
+        """
+        Rebuild the ETS after a change of a kinematic parameter
+
+        The joint limits and index are carried over to the new joint, and the
+        robot owning the link is told that its kinematics have changed.
+        """
+        # the constructor sets the parameters one at a time, offset is last
+        if "_offset" not in self.__dict__:
+            return
+
+        v = self.v
+        ets = self._to_ets(
+            self.sigma,
+            self.theta,
+            self.d,
+            self.alpha,
+            self.a,
+            self.offset,
+            v.isflip,
+            self.mdh,
+        )
+
+        for et in ets:
+            if et.isjoint:
+                et.qlim = v.qlim
+                et.jindex = v.jindex
+                self._v = et
+                break
+
+        self._ets = ets
+
+        if self._robot is not None:
+            self._robot.kinchanged()
+
     def _to_ets(self, sigma, theta, d, alpha, a, offset, flip: bool, mdh):
         ets = ETS()
 
@@ -456,6 +491,7 @@ class DHLink(Link):
             raise ValueError("theta is not valid for revolute joints")
         else:
             self._theta = theta_new
+            self._update_ets()
 
     # -------------------------------------------------------------------------- #
 
@@ -479,6 +515,7 @@ class DHLink(Link):
             raise ValueError("f is not valid for prismatic joints")
         else:
             self._d = d_new
+            self._update_ets()
 
     # -------------------------------------------------------------------------- #
 
@@ -499,6 +536,7 @@ class DHLink(Link):
     @_listen_dyn
     def a(self, a_new):
         self._a = a_new
+        self._update_ets()
 
     # -------------------------------------------------------------------------- #
 
@@ -519,6 +557,7 @@ class DHLink(Link):
     @_listen_dyn
     def alpha(self, alpha_new):
         self._alpha = alpha_new
+        self._update_ets()
 
     # -------------------------------------------------------------------------- #
 
@@ -542,6 +581,7 @@ class DHLink(Link):
     @_listen_dyn
     def sigma(self, sigma_new):
         self._sigma = sigma_new
+        self._update_ets()
 
     # -------------------------------------------------------------------------- #
 
@@ -565,6 +605,7 @@ class DHLink(Link):
     @_listen_dyn
     def mdh(self, mdh_new):
         self._mdh = int(mdh_new)
+        self._update_ets()
 
     # -------------------------------------------------------------------------- #
 
@@ -590,6 +631,7 @@ class DHLink(Link):
     @offset.setter
     def offset(self, offset_new):
         self._offset = offset_new
+        self._update_ets()
 
     # -------------------------------------------------------------------------- #
 
@@ -637,7 +679,7 @@ class DHLink(Link):
         sa = _sin(self.alpha)
         ca = _cos(self.alpha)
 
-        if self.ets[-1].isflip:
+        if self.isflip:
             q = -q + self.offset
         else:
             q = q + self.offset
@@ -9,10 +9,12 @@ import warnings
 import copy
 import numpy as np
 from roboticstoolbox.robot.Robot import Robot  # DHLink
+from roboticstoolbox.robot.Dynamics import _RBDModel, _spatial_inertia, _adjoint_inv
 from roboticstoolbox.robot.ETS import ETS, ET
 from roboticstoolbox.robot.DHLink import DHLink
+from roboticstoolbox.robot.IKAnalytic import analytic_solver
 from roboticstoolbox import rtb_set_param
-from spatialmath.base.argcheck import getvector, isscalar, verifymatrix, getmatrix
+from spatialmath.base.argcheck import getvector, isscalar, getmatrix
 
 # from spatialmath import base
 from spatialmath.base import (
@@ -22,6 +24,10 @@ from spatialmath.base import (
     t2r,
     trlog,
     rotvelxform,
+    transl,
+    trotx,
+    trotz,
+    angdiff,
 )
 from spatialmath import SE3, Twist3
 import spatialmath.base.symbolic as sym
@@ -31,7 +37,7 @@ from ansitable import ANSITable, Column
 from scipy.linalg import block_diag
 from roboticstoolbox.robot.DHLink import _check_rne, DHLink
 from roboticstoolbox import rtb_get_param
-from frne import init, frne, delete
+from frne import init, frne, delete, fcoriolis
 from numpy import any
 from typing import Union, Tuple
 
@@ -80,6 +86,9 @@ class DHRobot(Robot):
 
         all_links = []
         self._n = 0
+        self._ets_cache = None
+        self._kin_symbolic = None
+        self._ik_analytic = None
 
         # If we are given a list of standard DH Links, we must convert
         # them to modified DH links
@@ -869,8 +878,18 @@ class DHRobot(Robot):
             >>> import roboticstoolbox as rtb
             >>> puma = rtb.models.DH.Puma560()
             >>> puma.ets()
+
+        .. note:: The ETS, and its compiled representation, is built once
+            and cached until the kinematic parameters, base or tool change.
+            It is used by :func:`fkine`, :func:`jacob0`, :func:`jacobe` and
+            :func:`hessian0` for numeric joint coordinates.
         """
 
+        key = (self.base.A.tobytes(), self.tool.A.tobytes())
+
+        if self._ets_cache is not None and self._ets_cache[0] == key:
+            return self._ets_cache[1]
+
         # optionally start with the base transform
         if np.array_equal(self.base.A, np.eye(4)):
             base = None
@@ -895,8 +914,58 @@ class DHRobot(Robot):
         if tool is not None:
             ets *= ET.SE3(tool)
 
+        self._ets_cache = (key, ets)
         return ets
 
+    def kinchanged(self):
+        """
+        Kinematic parameters have changed
+
+        Clears the cached ETS and closed-form inverse kinematic solver of the
+        robot, so that they are rebuilt on next use.
+        Called from a property setter when a kinematic parameter of a link
+        changes.
+
+        :seealso: :func:`ets`
+        """
+        self._ets_cache = None
+        self._kin_symbolic = None
+        self._ik_analytic = None
+        super().kinchanged()
+
+    def _fast_q(self, q):
+        """
+        Joint coordinates for the compiled kinematics
+
+        :param q: Joint coordinates
+        :type q: ndarray(n) or ndarray(m,n)
+        :return: ``q`` as a float array (m,n) or None if ``q`` or the
+            kinematic parameters are symbolic
+        :rtype: ndarray(m,n) or None
+        """
+        if isinstance(q, np.ndarray) and q.shape == (self.n, 1):
+            # column vector, a single configuration
+            q = q.T
+
+        q = getmatrix(q, (None, self.n))
+
+        if q.dtype.kind not in "biuf":
+            return None
+
+        if self._kin_symbolic is None:
+            self._kin_symbolic = any(
+                [
+                    sym.issymbol(x)
+                    for link in self
+                    for x in (link.theta, link.d, link.a, link.alpha, link.offset)
+                ]
+            )
+
+        if self._kin_symbolic:
+            return None
+
+        return q.astype(np.float64)
+
     def fkine(self, q, **kwargs):
         """
         Forward kinematics
@@ -928,8 +997,14 @@ class DHRobot(Robot):
               into the result.
             - Joint offsets, if defined, are added to ``q`` before the forward
               kinematics are computed.
+            - Numeric joint coordinates are evaluated by the compiled ETS of
+              the robot, see :func:`ets`.
         """
 
+        qf = self._fast_q(q)
+        if qf is not None:
+            return self.ets().fkine(qf)
+
         if np.array_equal(self.base.A, np.eye(4)):
             base = None
         else:
@@ -1048,11 +1123,11 @@ class DHRobot(Robot):
         Manipulator Jacobian in end-effector frame
 
         :param q: Joint coordinate vector
-        :type q: ndarray(n)
+        :type q: ndarray(n) or ndarray(m,n)
         :param half: return half Jacobian: 'trans' or 'rot'
         :type half: str
         :return J: The manipulator Jacobian in the end-effector frame
-        :rtype: ndarray(6,n)
+        :rtype: ndarray(6,n) or ndarray(m,6,n)
 
         - ``robot.jacobe(q)`` is the manipulator Jacobian matrix which maps
           joint  velocity to end-effector spatial velocity.
@@ -1072,8 +1147,26 @@ class DHRobot(Robot):
             Corke, Spong etal., Siciliano etal.  The end-effector velocity is
             described in terms of translational and angular velocity, not a
             velocity twist as per the text by Lynch & Park.
+
+        If ``q`` is a matrix (m,n) the result is an array (m,6,n) of the
+        Jacobians for each row of ``q``, computed in a single call to the
+        compiled kinematics. This requires numeric joint coordinates and
+        DH parameters.
         """  # noqa
 
+        qf = self._fast_q(q)
+        if qf is not None:
+            J = self.ets().jacobe(qf)
+
+            if half == "trans":
+                return J[..., :3, :]
+            elif half == "rot":
+                return J[..., 3:, :]
+            elif half is not None:
+                raise ValueError("bad half specified")
+
+            return J
+
         q = getvector(q, self.n)
 
         n = self.n
@@ -1124,13 +1217,13 @@ class DHRobot(Robot):
         Manipulator Jacobian in world frame
 
         :param q: Joint coordinate vector
-        :type q: ndarray(n)
+        :type q: ndarray(n) or ndarray(m,n)
         :param T: Forward kinematics if known, SE(3 matrix)
         :type T: SE3 instance
         :param half: return half Jacobian: 'trans' or 'rot'
         :type half: str
         :return J: The manipulator Jacobian in the world frame
-        :rtype: ndarray(6,n)
+        :rtype: ndarray(6,n) or ndarray(m,6,n)
 
         - ``robot.jacob0(q)`` is the manipulator geometric Jacobian matrix which maps
           joint velocity to end-effector spatial velocity.
@@ -1151,28 +1244,37 @@ class DHRobot(Robot):
             described in terms of translational and angular velocity, not a
             velocity twist as per the text by Lynch & Park.
 
+        If ``q`` is a matrix (m,n) the result is an array (m,6,n) of the
+        Jacobians for each row of ``q``, computed in a single call to the
+        compiled kinematics. This requires numeric joint coordinates and
+        DH parameters.
+
         .. note:: ``T`` can be passed in to save the cost of computing forward
             kinematics which is needed to transform velocity from end-effector
             frame to world frame.
 
         """  # noqa
-        q = getvector(q, self.n)
+        qf = self._fast_q(q)
+        if qf is not None:
+            J0 = self.ets().jacob0(qf)
+        else:
+            q = getvector(q, self.n)
 
-        if T is None:
-            T = self.fkine(q)
-        T = T.A
+            if T is None:
+                T = self.fkine(q)
+            T = T.A
 
-        # compute Jacobian in EE frame and transform to world frame
-        J0 = tr2jac(T) @ self.jacobe(q)
+            # compute Jacobian in EE frame and transform to world frame
+            J0 = tr2jac(T) @ self.jacobe(q)
 
         # TODO optimize computation above if half matrix is returned
 
         # return top or bottom half if asked
         if half is not None:
             if half == "trans":
-                J0 = J0[:3, :]
+                J0 = J0[..., :3, :]
             elif half == "rot":
-                J0 = J0[3:, :]
+                J0 = J0[..., 3:, :]
             else:
                 raise ValueError("bad half specified")
         return J0
@@ -1259,11 +1361,11 @@ class DHRobot(Robot):
         Manipulator Hessian in base frame
 
         :param q: joint coordinates
-        :type q: array_like
+        :type q: array_like(n) or ndarray(m,n)
         :param J0: Jacobian in {0} frame
-        :type J0: ndarray(6,n)
+        :type J0: ndarray(6,n) or ndarray(m,6,n)
         :return: Hessian matrix
-        :rtype: ndarray(6,n,n)
+        :rtype: ndarray(n,6,n) or ndarray(m,n,6,n)
 
         This method calculcates the Hessisan in the base frame. One of ``J0`` or
         ``q`` is required. If ``J0`` is already calculated for the joint
@@ -1310,6 +1412,35 @@ class DHRobot(Robot):
 
         return self.ets().hessian0(q, J0)
 
+    def kinematics(self, q, which=("T", "J0")):
+        """
+        Forward kinematics and its derivatives in one pass
+
+        :param q: Joint coordinate vector
+        :type q: ndarray(n)
+        :param which: the quantities to compute, any of ``"T"``, ``"J0"``,
+            ``"Je"``, ``"H0"``, ``"manipulability"`` and ``"jacobm"``
+        :type which: str or list of str
+        :return: a named tuple with the fields ``T``, ``J0``, ``Je``, ``H0``,
+            ``manipulability`` and ``jacobm``. Quantities not listed in
+            ``which`` are None.
+        :rtype: KinematicBundle
+
+        The robot's base and tool are included, so ``T`` equals
+        ``fkine(q).A``.
+
+        :seealso: :func:`ETS.kinematics`
+        """
+        return self.ets().kinematics(getvector(q, self.n), which)
+
+    def _jacob0_traj(self, q, **kwargs):
+        # jacob0 handles a numeric trajectory in one call
+        if self._fast_q(q) is None:
+            return super()._jacob0_traj(q, **kwargs)
+
+        J = self.jacob0(q, **kwargs)
+        return J.reshape((-1,) + J.shape[-2:])
+
     def _get_limit_links(self, end=None, start=None):
         # For compatibility with ERobot
 
@@ -1351,7 +1482,16 @@ class DHRobot(Robot):
             self._rne_ob = None
 
     @_check_rne
-    def rne(self, q, qd=None, qdd=None, gravity=None, fext=None, base_wrench=False):
+    def rne(
+        self,
+        q,
+        qd=None,
+        qdd=None,
+        gravity=None,
+        fext=None,
+        base_wrench=False,
+        out=None,
+    ):
         r"""
         Inverse dynamics
 
@@ -1367,6 +1507,8 @@ class DHRobot(Robot):
         :param fext: Specify wrench acting on the end-effector
                      :math:`W=[F_x F_y F_z M_x M_y M_z]`
         :type fext: ndarray(6)
+        :param out: array into which the joint torques are written
+        :type out: ndarray(n) or ndarray(m,n)
 
         ``tau = rne(q, qd, qdd, grav, fext)`` is the joint torque required for
         the robot to achieve the specified joint position ``q`` (1xn), velocity
@@ -1376,7 +1518,13 @@ class DHRobot(Robot):
         Trajectory operation:
         If q, qd and qdd (mxn) are matrices with m cols representing a
         trajectory then tau (mxn) is a matrix with cols corresponding to each
-        trajectory step.
+        trajectory step.  The whole trajectory is computed in one call of the
+        C code.
+
+        If ``out`` is given, a C-contiguous float64 array with one element
+        per joint torque, the result is written into it and ``out`` is
+        returned.  This avoids an allocation per call, for instance in a
+        feedforward control loop.
 
         .. note::
             - The torque computed contains a contribution due to armature
@@ -1391,17 +1539,18 @@ class DHRobot(Robot):
                 q, qd, qdd, gravity=gravity, fext=fext, base_wrench=base_wrench
             )
 
-        trajn = 1
+        q = getmatrix(q, (None, self.n))
+        trajn = q.shape[0]
 
-        try:
-            q = getvector(q, self.n, "row")
-            qd = getvector(qd, self.n, "row")
-            qdd = getvector(qdd, self.n, "row")
-        except ValueError:
-            trajn = q.shape[0]
-            verifymatrix(q, (trajn, self.n))
-            verifymatrix(qd, (trajn, self.n))
-            verifymatrix(qdd, (trajn, self.n))
+        if qd is None:
+            qd = np.zeros((trajn, self.n))
+        if qdd is None:
+            qdd = np.zeros((trajn, self.n))
+
+        qd = getmatrix(qd, (None, self.n))
+        qdd = getmatrix(qdd, (None, self.n))
+        if qd.shape[0] != trajn or qdd.shape[0] != trajn:
+            raise ValueError("q, qd and qdd must have the same number of rows")
 
         if gravity is None:
             gravity = self.gravity
@@ -1415,26 +1564,156 @@ class DHRobot(Robot):
         if fext is None:
             fext = np.zeros(6)
         else:
-            fext = getvector(fext, 6)
+            fext = getvector(fext, 6, dtype=np.float64)
 
-        tau = np.zeros((trajn, self.n))
-
-        for i in range(trajn):
-            tau[i, :] = frne(
-                # we negate gravity here, since the C code has the sign wrong
-                self._rne_ob,
-                q[i, :],
-                qd[i, :],
-                qdd[i, :],
-                -gravity,
-                fext,
-            )
+        if out is None:
+            tau = np.empty((trajn, self.n))
+        else:
+            if (
+                not isinstance(out, np.ndarray)
+                or out.dtype != np.float64
+                or not out.flags.c_contiguous
+                or out.size != trajn * self.n
+            ):
+                raise ValueError(
+                    f"out must be a C-contiguous float64 array of {trajn * self.n} "
+                    "elements"
+                )
+            tau = out.reshape((trajn, self.n))
+
+        frne(
+            self._rne_ob,
+            np.ascontiguousarray(q, dtype=np.float64),
+            np.ascontiguousarray(qd, dtype=np.float64),
+            np.ascontiguousarray(qdd, dtype=np.float64),
+            # we negate gravity here, since the C code has the sign wrong
+            np.ascontiguousarray(-gravity, dtype=np.float64),
+            np.ascontiguousarray(fext, dtype=np.float64),
+            tau,
+        )
 
-        if trajn == 1:
+        if out is not None:
+            return out
+        elif trajn == 1:
             return tau[0, :]
         else:
             return tau
 
+    @_check_rne
+    def coriolis(self, q, qd):
+        r"""
+        Coriolis and centripetal term
+
+        :param q: Joint coordinates
+        :type q: ndarray(n) or ndarray(m,n)
+        :param qd: Joint velocity
+        :type qd: ndarray(n) or ndarray(m,n)
+        :return: Velocity matrix
+        :rtype: ndarray(n,n) or ndarray(m,n,n)
+
+        ``coriolis(q, qd)`` calculates the Coriolis/centripetal matrix (n,n)
+        for the robot in configuration ``q`` and velocity ``qd``, where ``n``
+        is the number of joints.
+
+        Example:
+
+        .. runblock:: pycon
+
+            >>> import roboticstoolbox as rtb
+            >>> puma = rtb.models.DH.Puma560()
+            >>> puma.coriolis(puma.qz, 0.5 * np.ones((6,)))
+
+        **Trajectory operation**
+
+        If ``q`` and `qd` are matrices (m,n), each row is interpretted as a
+        joint configuration, and the result (m,n,n) is a 3d-matrix where
+        each plane corresponds to a row of ``q`` and ``qd``.
+
+        .. note::
+            - Computed by the C RNE code, with the link transforms evaluated
+              once per row and :math:`2n` velocity product evaluations per
+              row, see :func:`DynamicsMixin.coriolis`.
+            - Joint friction is eliminated in the computation of this value.
+
+        :seealso: :func:`rne`, :func:`DynamicsMixin.coriolis`
+        """
+
+        q = np.ascontiguousarray(getmatrix(q, (None, self.n)), dtype=np.float64)
+        qd = np.ascontiguousarray(getmatrix(qd, (None, self.n)), dtype=np.float64)
+        if q.shape[0] != qd.shape[0]:
+            raise ValueError("q and qd must have the same number of rows")
+
+        C = np.zeros((q.shape[0], self.n, self.n))
+
+        fcoriolis(self._rne_ob, q, qd, C)
+
+        if q.shape[0] == 1:
+            return C[0, :, :]
+        else:
+            return C
+
+    def _rbd_model(self):
+        """
+        Spatial rigid-body model of the robot
+
+        :return: the bodies of the robot, one per link
+        :rtype: _RBDModel
+
+        Each link frame is a body whose pose relative to the previous link
+        frame is split into the joint transform and the constant transforms
+        either side of it.  Used by the ``"crba"`` and ``"aba"`` methods of
+        :func:`inertia` and :func:`accel`.
+        """
+        P = []
+        Q = []
+        axis = []
+        S = []
+
+        for link in self:
+            if link.mdh:
+                pre = transl(link.a, 0, 0) @ trotx(link.alpha)
+                if link.isrevolute:
+                    P.append(pre @ trotz(link.offset))
+                    Q.append(transl(0, 0, link.d))
+                else:
+                    P.append(pre @ trotz(link.theta) @ transl(0, 0, link.offset))
+                    Q.append(np.eye(4))
+            else:
+                post = transl(link.a, 0, 0) @ trotx(link.alpha)
+                if link.isrevolute:
+                    P.append(trotz(link.offset))
+                    Q.append(transl(0, 0, link.d) @ post)
+                else:
+                    P.append(trotz(link.theta) @ transl(0, 0, link.offset))
+                    Q.append(post)
+
+            if link.isrevolute:
+                axis.append("Rz")
+                s = np.r_[0, 0, 0, 0, 0, 1.0]
+            else:
+                axis.append("tz")
+                s = np.r_[0, 0, 1.0, 0, 0, 0]
+
+            if link.isflip:
+                s = -s
+
+            S.append(_adjoint_inv(Q[-1]) @ s)
+
+        return _RBDModel(
+            jindex=list(range(self.n)),
+            parent=list(range(-1, self.n - 1)),
+            P=P,
+            Q=Q,
+            axis=axis,
+            flip=[link.isflip for link in self],
+            S=np.array(S),
+            I=np.array([_spatial_inertia(link.m, link.r, link.I) for link in self]),
+            Ia=np.array([link.G**2 * link.Jm for link in self]),
+            B=np.array([link.B for link in self]),
+            G=np.array([link.G for link in self]),
+            Tc=np.array([link.Tc for link in self]),
+        )
+
     def rne_python(
         self,
         Q,
@@ -1853,6 +2132,180 @@ class DHRobot(Robot):
                 [sol.reason for sol in solutions],
             )
 
+    def ikine_a(self, T, config=None, q0=None):
+        """
+        Analytic inverse kinematic solution
+
+        :param T: end-effector pose or poses
+        :type T: SE3 instance or ndarray(4,4) or ndarray(m,4,4)
+        :param config: arm configuration, for a robot with a hand-written
+            solution
+        :type config: str, optional
+        :param q0: joint coordinates used to choose the solution, defaults to
+            the current configuration
+        :type q0: array_like(6) or ndarray(m,6), optional
+        :raises ValueError: if the robot is not solvable in closed form, or
+            ``config`` is given
+        :return: inverse kinematic solution
+        :rtype: IKsolution named tuple
+
+        Robots with a hand-written solution, such as the Puma 560, override
+        this method and choose the solution by the configuration string
+        ``config``, see :func:`ikine_6s`.  For other robots the solutions
+        are generated from the kinematic structure by :func:`ikine_analytic`
+        and the one nearest ``q0`` is returned.
+
+        .. runblock:: pycon
+
+            >>> import roboticstoolbox as rtb
+            >>> robot = rtb.models.DH.UR5()
+            >>> T = robot.fkine([0.1, -1, 1, 0.2, 0.3, 0.4])
+            >>> robot.ikine_a(T, q0=[0, -1, 1, 0, 0, 0])
+
+        :seealso: :func:`ikine_analytic`
+        """
+        if config is not None:
+            raise ValueError(
+                f"{self.name} has no hand-written solution, use q0 to choose one"
+            )
+
+        if q0 is None:
+            q0 = self.q
+        return self.ikine_analytic(T, q0=q0)
+
+    def isanalytic(self):
+        """
+        Test for closed-form inverse kinematics
+
+        :return: True if :func:`ikine_analytic` can solve the robot
+        :rtype: bool
+
+        Tests if the robot has 6 revolute joints, standard DH parameters and
+        one of the kinematic structures recognised by :func:`ikine_analytic`.
+
+        .. runblock:: pycon
+
+            >>> import roboticstoolbox as rtb
+            >>> robot = rtb.models.DH.UR5()
+            >>> robot.isanalytic()
+
+        """
+        return self._analytic_solver() is not None
+
+    def ikine_analytic(self, T, q0=None, tol=1e-6):
+        """
+        Closed-form inverse kinematics
+
+        :param T: end-effector pose or poses
+        :type T: SE3 instance or ndarray(4,4) or ndarray(m,4,4)
+        :param q0: joint coordinates used to choose one solution for each
+            pose, defaults to returning all solutions
+        :type q0: array_like(6) or ndarray(m,6), optional
+        :param tol: largest element-wise error of the pose of a solution,
+            defaults to 1e-6
+        :type tol: float
+        :raises ValueError: if the robot is not solvable in closed form
+        :return: all solutions, or the solution nearest ``q0``
+        :rtype: ndarray(k,6) or list of ndarray(k,6), or IKsolution named
+            tuple
+
+        ``robot.ikine_analytic(T)`` are all the joint coordinates, up to 8,
+        which achieve the end-effector pose ``T``.  If ``T`` holds ``m``
+        poses the result is a list of ``m`` such arrays.  Poses out of reach
+        have no solutions.
+
+        ``robot.ikine_analytic(T, q0)`` is the solution nearest to ``q0``, as
+        a named tuple (q, success, reason) like :func:`ikine_6s`.  This gives
+        a repeatable choice of branch, for example the one nearest the
+        current configuration.  For ``m`` poses ``q0`` may also give one
+        configuration per pose.
+
+        The kinematic structure is recognised from the DH parameters, the
+        supported structures are:
+
+        - a spherical wrist, see :func:`isspherical`, with the first axis
+          perpendicular to the second and the second parallel to the third,
+          for example the Puma 560, IRB140 or KR5
+        - three parallel axes, joints 2 to 4, with joint 5 perpendicular to
+          joints 4 and 6, for example the UR3, UR5 or UR10
+
+        The solver for the structure is created once and cached, it is
+        created again if the kinematic parameters change.  All branches of
+        all poses are evaluated by NumPy array operations, without iteration,
+        and each solution is checked by forward kinematics.  Joint
+        coordinates are in the range [-pi, pi) and joint limits are not
+        applied.  At a wrist singularity a pose has a continuum of solutions,
+        one of them is returned for each branch.
+
+        .. runblock:: pycon
+
+            >>> import roboticstoolbox as rtb
+            >>> robot = rtb.models.DH.UR5()
+            >>> T = robot.fkine([0.1, -1, 1, 0.2, 0.3, 0.4])
+            >>> robot.ikine_analytic(T)
+
+        :seealso: :func:`isanalytic`, :func:`ikine_a`, :func:`ikine_6s`
+        """
+        solver = self._analytic_solver()
+        if solver is None:
+            raise ValueError("robot kinematic structure has no closed-form solver")
+
+        if isinstance(T, SE3):
+            T = T.A
+        T = np.array(T, dtype=np.float64).reshape(-1, 4, 4)
+
+        # remove the base and tool transforms
+        T06 = T
+        if not np.array_equal(self.base.A, np.eye(4)):
+            T06 = np.linalg.inv(self.base.A) @ T06
+        if not np.array_equal(self.tool.A, np.eye(4)):
+            T06 = T06 @ np.linalg.inv(self.tool.A)
+
+        Q = solver.solve(T06)
+
+        # keep the branches whose forward kinematics are the pose
+        m, nb, n = Q.shape
+        valid = ~np.isnan(Q).any(axis=2)
+        if valid.any():
+            Tq = np.reshape(self.ets().eval(Q[valid]), (-1, 4, 4))
+            err = np.abs(Tq - np.repeat(T, nb, axis=0)[valid.ravel()])
+            valid[valid] = err.max(axis=(1, 2)) <= tol
+
+        if q0 is None:
+            sols = []
+            for Qk, vk in zip(Q, valid):
+                # a singular pose may give the same solution twice
+                sols.append(np.unique(Qk[vk].round(12), axis=0))
+            return sols[0] if m == 1 else sols
+
+        q0 = np.array(q0, dtype=np.float64)
+        if q0.ndim == 2:
+            q0 = getmatrix(q0, (m, n))[:, np.newaxis, :]
+        else:
+            q0 = getvector(q0, n)
+        dist = np.where(valid, np.linalg.norm(angdiff(Q, q0), axis=2), np.inf)
+        best = np.argmin(dist, axis=1)
+        success = valid[np.arange(m), best]
+        q = Q[np.arange(m), best]
+        q[~success] = np.nan
+        reason = ["" if ok else "Out of reach" for ok in success]
+
+        if m == 1:
+            return iksol(q[0], bool(success[0]), reason[0])
+        return iksol(q, success, reason)
+
+    def _analytic_solver(self):
+        """
+        Get the cached closed-form solver
+
+        :return: solver for the robot, or None
+        :rtype: _AnalyticIK subclass instance or None
+        """
+        if self._ik_analytic is None:
+            solver = analytic_solver(self)
+            self._ik_analytic = False if solver is None else solver
+        return self._ik_analytic or None
+
     def config_validate(self, config, allowables):
         """
         Validate a configuration string
@@ -1909,6 +2362,8 @@ class DHRobot(Robot):
         reject_jl: bool = True,
         we: Union[np.ndarray, None] = None,
         λ: float = 1.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
     ) -> Tuple[np.ndarray, int, int, int, float]:
         """
         Numerical inverse kinematics by Levenberg-Marquadt optimization (Chan's Method)
@@ -1926,6 +2381,10 @@ class DHRobot(Robot):
             Corresponds to translation in X, Y and Z and rotation about X, Y and Z
             respectively
         :param λ: value of lambda for the damping matrix Wn
+        :param n_threads: number of native threads used to solve a batch of
+            poses, a value less than 1 uses all available cores
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
 
         :return: inverse kinematic solution
         :rtype: tuple (q, success, iterations, searches, residual)
@@ -2002,7 +2461,7 @@ class DHRobot(Robot):
             TODO
         """
 
-        return self.ets().ik_lm_chan(Tep, q0, ilimit, slimit, tol, reject_jl, we, λ)
+        return self.ets().ik_lm_chan(Tep, q0, ilimit, slimit, tol, reject_jl, we, λ, n_threads=n_threads, seed=seed)
 
     def ik_lm_wampler(
         self,
@@ -2014,6 +2473,8 @@ class DHRobot(Robot):
         reject_jl: bool = True,
         we: Union[np.ndarray, None] = None,
         λ: float = 1.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
     ) -> Tuple[np.ndarray, int, int, int, float]:
         """
         Numerical inverse kinematics by Levenberg-Marquadt optimization (Wamplers's Method)
@@ -2031,6 +2492,10 @@ class DHRobot(Robot):
             Corresponds to translation in X, Y and Z and rotation about X, Y and Z
             respectively
         :param λ: value of lambda for the damping matrix Wn
+        :param n_threads: number of native threads used to solve a batch of
+            poses, a value less than 1 uses all available cores
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
 
         :return: inverse kinematic solution
         :rtype: tuple (q, success, iterations, searches, residual)
@@ -2107,7 +2572,7 @@ class DHRobot(Robot):
             TODO
         """
 
-        return self.ets().ik_lm_wampler(Tep, q0, ilimit, slimit, tol, reject_jl, we, λ)
+        return self.ets().ik_lm_wampler(Tep, q0, ilimit, slimit, tol, reject_jl, we, λ, n_threads=n_threads, seed=seed)
 
     def ik_lm_sugihara(
         self,
@@ -2119,6 +2584,8 @@ class DHRobot(Robot):
         reject_jl: bool = True,
         we: Union[np.ndarray, None] = None,
         λ: float = 1.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
     ) -> Tuple[np.ndarray, int, int, int, float]:
         """
         Numerical inverse kinematics by Levenberg-Marquadt optimization (Sugihara's Method)
@@ -2136,6 +2603,10 @@ class DHRobot(Robot):
             Corresponds to translation in X, Y and Z and rotation about X, Y and Z
             respectively
         :param λ: value of lambda for the damping matrix Wn
+        :param n_threads: number of native threads used to solve a batch of
+            poses, a value less than 1 uses all available cores
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
 
         :return: inverse kinematic solution
         :rtype: tuple (q, success, iterations, searches, residual)
@@ -2212,7 +2683,7 @@ class DHRobot(Robot):
             TODO
         """
 
-        return self.ets().ik_lm_sugihara(Tep, q0, ilimit, slimit, tol, reject_jl, we, λ)
+        return self.ets().ik_lm_sugihara(Tep, q0, ilimit, slimit, tol, reject_jl, we, λ, n_threads=n_threads, seed=seed)
 
     def ik_nr(
         self,
@@ -2225,6 +2696,8 @@ class DHRobot(Robot):
         we: Union[np.ndarray, None] = None,
         use_pinv: int = True,
         pinv_damping: float = 0.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
     ) -> Tuple[np.ndarray, int, int, int, float]:
         """
         Numerical inverse kinematics by Levenberg-Marquadt optimization (Newton-Raphson Method)
@@ -2242,6 +2715,10 @@ class DHRobot(Robot):
             Corresponds to translation in X, Y and Z and rotation about X, Y and Z
             respectively
         :param λ: value of lambda for the damping matrix Wn
+        :param n_threads: number of native threads used to solve a batch of
+            poses, a value less than 1 uses all available cores
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
 
         :return: inverse kinematic solution
         :rtype: tuple (q, success, iterations, searches, residual)
@@ -2318,7 +2795,7 @@ class DHRobot(Robot):
             TODO
         """
 
-        return self.ets().ik_nr(Tep, q0, ilimit, slimit, tol, reject_jl, we, use_pinv, pinv_damping)
+        return self.ets().ik_nr(Tep, q0, ilimit, slimit, tol, reject_jl, we, use_pinv, pinv_damping, n_threads=n_threads, seed=seed)
 
     def ik_gn(
         self,
@@ -2331,6 +2808,8 @@ class DHRobot(Robot):
         we: Union[np.ndarray, None] = None,
         use_pinv: int = True,
         pinv_damping: float = 0.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
     ) -> Tuple[np.ndarray, int, int, int, float]:
         """
         Numerical inverse kinematics by Levenberg-Marquadt optimization (Gauss-Newton Method)
@@ -2348,6 +2827,10 @@ class DHRobot(Robot):
             Corresponds to translation in X, Y and Z and rotation about X, Y and Z
             respectively
         :param λ: value of lambda for the damping matrix Wn
+        :param n_threads: number of native threads used to solve a batch of
+            poses, a value less than 1 uses all available cores
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
 
         :return: inverse kinematic solution
         :rtype: tuple (q, success, iterations, searches, residual)
@@ -2424,7 +2907,81 @@ class DHRobot(Robot):
             TODO
         """
 
-        return self.ets().ik_gn(Tep, q0, ilimit, slimit, tol, reject_jl, we, use_pinv, pinv_damping)
+        return self.ets().ik_gn(Tep, q0, ilimit, slimit, tol, reject_jl, we, use_pinv, pinv_damping, n_threads=n_threads, seed=seed)
+
+    def ik_traj(
+        self,
+        Tep: Union[np.ndarray, SE3],
+        q0: Union[np.ndarray, None] = None,
+        method: str = "lm_chan",
+        ilimit: int = 30,
+        slimit: int = 100,
+        tol: float = 1e-6,
+        reject_jl: bool = True,
+        we: Union[np.ndarray, None] = None,
+        λ: float = 1.0,
+        use_pinv: int = True,
+        pinv_damping: float = 0.0,
+        dq_max: float = 0.5,
+        seed: Union[int, None] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Numerical inverse kinematics along a pose trajectory
+
+        :param Tep: The desired end-effector pose trajectory
+        :param q0: initial joint configuration for the first pose (default to
+            random valid joint configuration contrained by the joint limits of
+            the robot)
+        :param method: the solver, one of ``"lm_chan"``, ``"lm_wampler"``,
+            ``"lm_sugihara"``, ``"nr"`` or ``"gn"``
+        :param ilimit: maximum number of iterations per search
+        :param slimit: maximum number of search attempts per pose
+        :param tol: final error tolerance
+        :param reject_jl: constrain the solution to being within the joint limits of
+            the robot
+        :param we: a mask vector which weights the end-effector error priority.
+            Corresponds to translation in X, Y and Z and rotation about X, Y and Z
+            respectively
+        :param λ: value of lambda for the damping matrix Wn, for the
+            Levenberg-Marquadt solvers
+        :param use_pinv: use the pseudo-inverse of the Jacobian, for the
+            ``"nr"`` and ``"gn"`` solvers
+        :param pinv_damping: damping of the pseudo-inverse, for the ``"nr"``
+            and ``"gn"`` solvers
+        :param dq_max: largest change of any joint coordinate between
+            consecutive poses, a value of 0 does not check continuity
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
+
+        :return: inverse kinematic solutions
+        :rtype: tuple (q(m,n), success(m), iterations(m), searches(m), residual(m))
+
+        ``sol = robot.ik_traj(Tep)`` solves the poses of ``Tep`` in order, each
+        seeded by the solution of the previous pose.  Random restarts are
+        only used if that search fails, or if its solution jumps by more than
+        ``dq_max`` in any joint.  For example::
+
+            Ts = rtb.ctraj(T0, T1, 100)
+            q, success, *_ = robot.ik_traj(Ts, q0=robot.qr)
+
+        :seealso: :func:`ETS.ik_traj`
+        """
+
+        return self.ets().ik_traj(
+            Tep,
+            q0,
+            method,
+            ilimit,
+            slimit,
+            tol,
+            reject_jl,
+            we,
+            λ,
+            use_pinv,
+            pinv_damping,
+            dq_max,
+            seed,
+        )
 
 
 
@@ -16,11 +16,78 @@ from spatialmath.base import getvector, verifymatrix, isscalar, getmatrix, t2r,
 from scipy import integrate, interpolate
 from spatialmath.base import symbolic as sym
 from roboticstoolbox import rtb_get_param
+from roboticstoolbox.robot.ET import _et_batch
 
 from ansitable import ANSITable, Column
 import warnings
 
 
+# Spatial rigid-body model used by the CRBA and ABA methods.  Each body is
+# the moving link of a joint, with any static links rigidly attached to it
+# lumped in.  Bodies are ordered so that a parent precedes its children.
+#
+#   jindex  index of the body's joint in q
+#   parent  index of the parent body, -1 for a body attached to the base
+#   P, Q    constant transforms before and after the joint, the pose of the
+#           body relative to its parent is P @ E(q) @ Q
+#   axis    the joint's elementary transform, one of "Rx", ..., "tz"
+#   flip    joint moves in the opposite direction
+#   S       joint motion subspace in body coordinates, ndarray(nb,6)
+#   I       spatial inertia in body coordinates, ndarray(nb,6,6)
+#   Ia      armature inertia G^2 Jm, ndarray(nb)
+#   B, G, Tc  friction parameters, as per Link.friction
+_RBDModel = namedtuple("_RBDModel", "jindex parent P Q axis flip S I Ia B G Tc")
+
+
+def _spatial_inertia(m, r, I):  # noqa
+    """
+    Spatial inertia from mass, centre of mass and inertia about the centre
+    of mass, for spatial vectors ordered as (v, omega)
+    """
+    C = np.array([[0, -r[2], r[1]], [r[2], 0, -r[0]], [-r[1], r[0], 0]])
+    return np.block([[m * np.eye(3), m * C.T], [m * C, I + m * C @ C.T]])
+
+
+def _adjoint_inv(T):
+    """
+    Adjoint of the inverse of a batch of SE(3) matrices T (m,4,4), this
+    transforms spatial motion vectors from the parent to the child frame
+    """
+    R = T[..., :3, :3].swapaxes(-1, -2)
+    t = -R @ T[..., :3, 3:]
+    X = np.zeros(T.shape[:-2] + (6, 6))
+    X[..., :3, :3] = R
+    X[..., 3:, 3:] = R
+    X[..., :3, 3:] = np.cross(t, R, axis=-2)
+    return X
+
+
+def _crm(v, u):
+    """
+    Spatial motion cross product v x u, over the last axis
+    """
+    return np.concatenate(
+        (
+            np.cross(v[..., 3:], u[..., :3]) + np.cross(v[..., :3], u[..., 3:]),
+            np.cross(v[..., 3:], u[..., 3:]),
+        ),
+        axis=-1,
+    )
+
+
+def _crf(v, f):
+    """
+    Spatial force cross product v x* f, over the last axis
+    """
+    return np.concatenate(
+        (
+            np.cross(v[..., 3:], f[..., :3]),
+            np.cross(v[..., :3], f[..., :3]) + np.cross(v[..., 3:], f[..., 3:]),
+        ),
+        axis=-1,
+    )
+
+
 class DynamicsMixin:
 
     # --------------------------------------------------------------------- #
@@ -193,6 +260,7 @@ class DynamicsMixin:
         solver_args={},
         dt=None,
         progress=False,
+        method="rne",
     ):
         """
         Integrate forward dynamics
@@ -200,15 +268,16 @@ class DynamicsMixin:
         :param T: integration time
         :type T: float
         :param q0: initial joint coordinates
-        :type q0: array_like
+        :type q0: array_like(n) or ndarray(m,n)
         :param qd0: initial joint velocities, assumed zero if not given
-        :type qd0: array_like
+        :type qd0: array_like(n) or ndarray(m,n)
         :param torque: a function that computes torque as a function of time
         and/or state
         :type torque: callable
         :param torque_args: positional arguments passed to ``torque``
         :type torque_args: dict
-        :type solver: name of scipy solver to use, RK45 is the default
+        :type solver: name of scipy solver to use, RK45 is the default, or
+            "rk4" or "euler" for a fixed-step solver
         :param solver: str
         :type solver_args: arguments passed to the solver
         :param solver_args: dict
@@ -216,6 +285,8 @@ class DynamicsMixin:
         :param dt: float
         :param progress: show progress bar, default False
         :type progress: bool
+        :param method: forward dynamics algorithm, see :func:`accel`
+        :type method: str
 
         :return: robot trajectory
         :rtype: namedtuple
@@ -276,6 +347,30 @@ class DynamicsMixin:
         want to animate the result.  If ``dt`` is specified then the solver
         results are interpolated in time steps of ``dt``.
 
+        **Fixed-step and batch operation**
+
+        If ``solver`` is ``"rk4"`` (classical Runge-Kutta) or ``"euler"``
+        (semi-implicit Euler) the dynamics are integrated with a fixed step of
+        ``dt``, which must be given, into preallocated arrays without
+        interpolation.  In this mode ``q0`` and ``qd0`` may be matrices (m,n)
+        where each row is the initial state of one of m simulations, which
+        are advanced together with one call of :func:`accel` per derivative
+        evaluation.  The torque function is then called with, and must return,
+        matrices (m,n) and the result has elements:
+
+            - ``t`` the time vector (M,)
+            - ``q`` the joint coordinates (m,M,n)
+            - ``qd`` the joint velocities (m,M,n)
+
+        where ``tg.q[k]`` is the trajectory of the k'th simulation.  The
+        ``"aba"`` method of :func:`accel` evaluates all simulations at once and
+        is recommended for large batches.
+
+        Example::
+
+            q0 = robot.qz + np.random.normal(scale=0.1, size=(1000, robot.n))
+            tg = robot.fdyn(1, q0, solver="rk4", dt=0.01, method="aba")
+
         .. note::
 
             - This function performs poorly with non-linear joint friction,
@@ -297,14 +392,20 @@ class DynamicsMixin:
 
         if not isscalar(T):
             raise ValueError("T must be a scalar")
+        if torque is not None:
+            if not callable(torque):
+                raise ValueError("torque function must be callable")
+
+        if solver in ("rk4", "euler"):
+            return self._fdyn_fixed(
+                T, q0, qd0, torque, torque_args, solver, dt, progress, method
+            )
+
         q0 = getvector(q0, n)
         if qd0 is None:
             qd0 = np.zeros((n,))
         else:
             qd0 = getvector(qd0, n)
-        if torque is not None:
-            if not callable(torque):
-                raise ValueError("torque function must be callable")
 
         # concatenate q and qd into the initial state vector
         x0 = np.r_[q0, qd0]
@@ -313,7 +414,7 @@ class DynamicsMixin:
         scipy_integrator = integrate.__dict__[solver]
 
         integrator = scipy_integrator(
-            lambda t, y: self._fdyn(t, y, torque, torque_args),
+            lambda t, y: self._fdyn(t, y, torque, torque_args, method),
             t0=0.0,
             y0=x0,
             t_bound=T,
@@ -362,7 +463,104 @@ class DynamicsMixin:
         else:
             return namedtuple("fdyn", "t q qd")(tarray, xarray[:, :n], xarray[:, n:])
 
-    def _fdyn(self, t, x, torqfun, targs):
+    def _fdyn_fixed(self, T, q0, qd0, torqfun, targs, solver, dt, progress, method):
+        """
+        Private function called by fdyn for the fixed-step solvers
+
+        :param T: integration time
+        :type T: float
+        :param q0: initial joint coordinates
+        :type q0: array_like(n) or ndarray(m,n)
+        :param qd0: initial joint velocities, zero if None
+        :type qd0: array_like(n) or ndarray(m,n)
+        :param torqfun: a function that computes torque as a function of time
+        and/or state
+        :type torqfun: callable
+        :param targs: argumments passed to ``torqfun``
+        :type targs: dict
+        :param solver: "rk4" or "euler"
+        :type solver: str
+        :param dt: time step
+        :type dt: float
+        :param progress: show progress bar
+        :type progress: bool
+        :param method: forward dynamics algorithm, see :func:`accel`
+        :type method: str
+
+        :return: robot trajectory
+        :rtype: namedtuple
+
+        All simulations are advanced together, the state for each time step
+        is written into arrays allocated once.
+        """
+        n = self.n
+
+        if dt is None:
+            raise ValueError("dt must be given for a fixed-step solver")
+
+        batch = np.ndim(q0) == 2
+        q0 = getmatrix(q0, (None, n))
+        m = q0.shape[0]
+        if qd0 is None:
+            qd0 = np.zeros((m, n))
+        else:
+            qd0 = np.broadcast_to(getmatrix(qd0, (None, n)), (m, n))
+
+        nsteps = int(round(T / dt))
+        t = np.arange(nsteps + 1) * dt
+        q = np.empty((m, nsteps + 1, n))
+        qd = np.empty((m, nsteps + 1, n))
+        q[:, 0, :] = q0
+        qd[:, 0, :] = qd0
+
+        def qdd(t, q, qd):
+            if torqfun is None:
+                tau = np.zeros((m, n))
+            elif batch:
+                tau = np.broadcast_to(torqfun(self, t, q, qd, **targs), (m, n))
+            else:
+                tau = getmatrix(torqfun(self, t, q[0], qd[0], **targs), (1, n))
+
+            return self.accel(q, qd, tau, method=method).reshape((m, n))
+
+        if progress:
+            _printProgressBar(0, prefix="Progress:", suffix="complete", length=60)
+
+        for k in range(nsteps):
+            tk = t[k]
+            qk = q[:, k, :]
+            qdk = qd[:, k, :]
+
+            if solver == "euler":
+                # semi-implicit, the new velocity updates the position
+                qd[:, k + 1, :] = qdk + dt * qdd(tk, qk, qdk)
+                q[:, k + 1, :] = qk + dt * qd[:, k + 1, :]
+            else:
+                a1 = qdd(tk, qk, qdk)
+                v2 = qdk + dt / 2 * a1
+                a2 = qdd(tk + dt / 2, qk + dt / 2 * qdk, v2)
+                v3 = qdk + dt / 2 * a2
+                a3 = qdd(tk + dt / 2, qk + dt / 2 * v2, v3)
+                v4 = qdk + dt * a3
+                a4 = qdd(tk + dt, qk + dt * v3, v4)
+
+                q[:, k + 1, :] = qk + dt / 6 * (qdk + 2 * v2 + 2 * v3 + v4)
+                qd[:, k + 1, :] = qdk + dt / 6 * (a1 + 2 * a2 + 2 * a3 + a4)
+
+            if progress:
+                _printProgressBar(
+                    (k + 1) / nsteps, prefix="Progress:", suffix="complete", length=60
+                )
+
+        if progress:
+            print("\r" + " " * 90 + "\r")
+
+        if batch:
+            return namedtuple("fdyn", "t q qd")(t, q, qd)
+        else:
+            return namedtuple("fdyn", "t q qd")(t, q[0], qd[0])
+
+    def _fdyn(self, t, x, torqfun, targs, method="rne"):
         """
         Private function called by fdyn
 
@@ -375,6 +573,8 @@ class DynamicsMixin:
         :type torqfun: callable
         :param targs: argumments passed to ``torqfun``
         :type targs: dict
+        :param method: forward dynamics algorithm, see :func:`accel`
+        :type method: str
 
         :return: derivative of current state [qd, qdd]
         :rtype: numpy array (2n,)
@@ -397,11 +597,11 @@ class DynamicsMixin:
                     "torque function must return vector with N real elements"
                 )
 
-        qdd = self.accel(q, qd, tau)
+        qdd = self.accel(q, qd, tau, method=method)
 
         return np.r_[qd, qdd]
 
-    def accel(self, q, qd, torque, gravity=None):
+    def accel(self, q, qd, torque, gravity=None, method="rne"):
         r"""
         Compute acceleration due to applied torque
 
@@ -414,6 +614,8 @@ class DynamicsMixin:
         :param gravity: Gravitational acceleration (Optional, if not supplied will
             use the ``gravity`` attribute of self).
         :type gravity: ndarray(3)
+        :param method: forward dynamics algorithm, "rne" [default] or "aba"
+        :type method: str
         :return: Joint accelerations of the robot
         :rtype: ndarray(n)
 
@@ -440,13 +642,22 @@ class DynamicsMixin:
         where each row is the acceleration corresponding to the equivalent rows
         of q, qd, torque.
 
+        **Algorithm**
+
+        ``method`` selects the algorithm:
+
+        =========  ============================================================
+        ``"rne"``  method 1 of Walker and Orin, n+1 invocations of RNE and a
+                   linear solve per row
+        ``"aba"``  Featherstone's articulated body algorithm, O(n) and
+                   evaluated for all rows at once
+        =========  ============================================================
+
         .. note::
             - Useful for simulation of manipulator dynamics, in
               conjunction with a numerical integration function.
-            - Uses the method 1 of Walker and Orin to compute the forward
-              dynamics.
             - Featherstone's method is more efficient for robots with large
-              numbers of joints.
+              numbers of joints, and for long trajectories.
             - Joint friction is considered.
 
         :references:
@@ -454,13 +665,25 @@ class DynamicsMixin:
               M. W. Walker and D. E. Orin,
               ASME Journa of Dynamic Systems, Measurement and Control, vol.
               104, no. 3, pp. 205-211, 1982.
+            - Rigid Body Dynamics Algorithms, R. Featherstone, Springer, 2008.
 
+        :seealso: :func:`inertia`, :func:`fdyn`
         """  # noqa
 
         q = getmatrix(q, (None, self.n))
         qd = getmatrix(qd, (None, self.n))
         torque = getmatrix(torque, (None, self.n))
 
+        if method == "aba":
+            qdd = self._aba(q, qd, torque, gravity=gravity)
+
+            if q.shape[0] == 1:
+                return qdd[0, :]
+            else:
+                return qdd
+        elif method != "rne":
+            raise ValueError("method must be one of 'rne' or 'aba'")
+
         qdd = np.zeros((q.shape[0], self.n))
 
         for k, (qk, qdk, tauk) in enumerate(zip(q, qd, torque)):
@@ -484,6 +707,180 @@ class DynamicsMixin:
         else:
             return qdd
 
+    def _rbd_model(self):
+        """
+        Spatial rigid-body model of the robot
+
+        :return: the bodies of the robot, or None if the robot class does not
+            provide a model
+        :rtype: _RBDModel or None
+
+        Robot classes provide a model to support the ``"crba"`` and ``"aba"``
+        methods.
+
+        :seealso: :func:`_crba`, :func:`_aba`
+        """
+        return None
+
+    @staticmethod
+    def _rbd_xup(model, q):
+        """
+        Motion transforms from parent to body for each body of the model,
+        a list of ndarray(m,6,6) for joint coordinates q (m,n)
+        """
+        Xup = []
+
+        for i, j in enumerate(model.jindex):
+            qj = -q[:, j] if model.flip[i] else q[:, j]
+            T = model.P[i] @ _et_batch(model.axis[i], qj) @ model.Q[i]
+            Xup.append(_adjoint_inv(T))
+
+        return Xup
+
+    def _crba(self, q):
+        """
+        Inertia matrix by the composite rigid body algorithm
+
+        :param q: Joint coordinates
+        :type q: ndarray(m,n)
+        :return: The inertia matrices
+        :rtype: ndarray(m,n,n)
+
+        :seealso: :func:`inertia`
+        """
+        model = self._rbd_model()
+        if model is None:
+            raise ValueError(
+                f"{self.__class__.__name__} does not provide a rigid-body model"
+            )
+        Xup = self._rbd_xup(model, q)
+        nb = len(model.jindex)
+
+        # composite inertia of each body and its descendants
+        Ic = [np.broadcast_to(I, (q.shape[0], 6, 6)).copy() for I in model.I]
+
+        for i in reversed(range(nb)):
+            p = model.parent[i]
+            if p >= 0:
+                Ic[p] += Xup[i].swapaxes(1, 2) @ Ic[i] @ Xup[i]
+
+        M = np.zeros((q.shape[0], self.n, self.n))
+
+        for i in range(nb):
+            ji = model.jindex[i]
+            F = Ic[i] @ model.S[i]
+            M[:, ji, ji] = F @ model.S[i] + model.Ia[i]
+
+            k = i
+            while model.parent[k] >= 0:
+                F = np.einsum("kba,kb->ka", Xup[k], F)
+                k = model.parent[k]
+                jk = model.jindex[k]
+                M[:, jk, ji] = M[:, ji, jk] = F @ model.S[k]
+
+        return M
+
+    def _aba(self, q, qd, tau, gravity=None):
+        """
+        Forward dynamics by the articulated body algorithm
+
+        :param q: Joint coordinates
+        :type q: ndarray(m,n)
+        :param qd: Joint velocity
+        :type qd: ndarray(m,n)
+        :param tau: Joint torques
+        :type tau: ndarray(m,n)
+        :param gravity: Gravitational acceleration, defaults to the
+            ``gravity`` attribute of self
+        :type gravity: ndarray(3)
+        :return: Joint accelerations
+        :rtype: ndarray(m,n)
+
+        :seealso: :func:`accel`
+        """
+        model = self._rbd_model()
+        if model is None:
+            raise ValueError(
+                f"{self.__class__.__name__} does not provide a rigid-body model"
+            )
+        Xup = self._rbd_xup(model, q)
+        nb = len(model.jindex)
+        m = q.shape[0]
+
+        if gravity is None:
+            gravity = self.gravity
+
+        # the base accelerates upward rather than applying gravity to each body
+        a0 = np.r_[-(self.base.R.T @ getvector(gravity, 3)), 0, 0, 0]
+
+        # joint friction opposes the applied torque, as per rne()
+        qdj = qd[:, model.jindex]
+        Ga = np.abs(model.G)
+        friction = model.B * model.G**2 * qdj + Ga * (
+            np.where(qdj > 0, model.Tc[:, 0], 0.0)
+            + np.where(qdj < 0, model.Tc[:, 1], 0.0)
+        )
+        tau = tau[:, model.jindex] - friction
+
+        v = [None] * nb
+        c = [None] * nb
+        IA = [None] * nb
+        pA = [None] * nb
+
+        # forward pass, velocities and velocity product terms
+        for i in range(nb):
+            vJ = qdj[:, i, None] * model.S[i]
+            p = model.parent[i]
+
+            if p < 0:
+                v[i] = vJ
+                c[i] = np.zeros((m, 6))
+            else:
+                v[i] = np.einsum("kab,kb->ka", Xup[i], v[p]) + vJ
+                c[i] = _crm(v[i], vJ)
+
+            IA[i] = np.broadcast_to(model.I[i], (m, 6, 6)).copy()
+            pA[i] = _crf(v[i], v[i] @ model.I[i].T)
+
+        U = [None] * nb
+        d = [None] * nb
+        u = [None] * nb
+
+        # backward pass, articulated body inertias and bias forces
+        for i in reversed(range(nb)):
+            U[i] = IA[i] @ model.S[i]
+            d[i] = U[i] @ model.S[i] + model.Ia[i]
+            u[i] = tau[:, i] - pA[i] @ model.S[i]
+
+            p = model.parent[i]
+            if p >= 0:
+                Ia = IA[i] - U[i][:, :, None] * U[i][:, None, :] / d[i][:, None, None]
+                pa = (
+                    pA[i]
+                    + np.einsum("kab,kb->ka", Ia, c[i])
+                    + U[i] * (u[i] / d[i])[:, None]
+                )
+                IA[p] += Xup[i].swapaxes(1, 2) @ Ia @ Xup[i]
+                pA[p] += np.einsum("kba,kb->ka", Xup[i], pa)
+
+        a = [None] * nb
+        qdd = np.zeros((m, self.n))
+
+        # forward pass, accelerations
+        for i in range(nb):
+            p = model.parent[i]
+
+            if p < 0:
+                a[i] = Xup[i] @ a0 + c[i]
+            else:
+                a[i] = np.einsum("kab,kb->ka", Xup[i], a[p]) + c[i]
+
+            qddi = (u[i] - np.einsum("ka,ka->k", U[i], a[i])) / d[i]
+            a[i] += qddi[:, None] * model.S[i]
+            qdd[:, model.jindex[i]] = qddi
+
+        return qdd
+
     def pay(self, W, q=None, J=None, frame=1):
         """
         tau = pay(W, J) Returns the generalised joint force/torques due to a
@@ -649,12 +1046,14 @@ class DynamicsMixin:
         """
         warnings.warn("cinertia is deprecated, use inertia_x", DeprecationWarning)
 
-    def inertia(self, q):
+    def inertia(self, q, method="rne"):
         """
         Manipulator inertia matrix
 
         :param q: Joint coordinates
         :type q: ndarray(n) or ndarray(m,n)
+        :param method: algorithm, "rne" [default] or "crba"
+        :type method: str
 
         :return: The inertia matrix
         :rtype: ndarray(n,n) or ndarray(m,n,n)
@@ -674,9 +1073,19 @@ class DynamicsMixin:
         **Trajectory operation**
 
         If ``q`` is a matrix (m,n), each row is interpretted as a joint state
-        vector, and the result is a 3d-matrix (nxnxk) where each plane
+        vector, and the result is a 3d-matrix (m,n,n) where each plane
         corresponds to the inertia for the corresponding row of q.
 
+        **Algorithm**
+
+        ``method`` selects the algorithm:
+
+        ==========  ===========================================================
+        ``"rne"``   n invocations of RNE with unit joint accelerations
+        ``"crba"``  Featherstone's composite rigid body algorithm, evaluated
+                    for all rows at once
+        ==========  ===========================================================
+
         .. note::
             - The diagonal elements ``M[j,j]`` are the inertia seen by joint
               actuator ``j``.
@@ -686,10 +1095,23 @@ class DynamicsMixin:
             - The diagonal terms include the motor inertia reflected through
               the gear ratio.
 
-        :seealso: :func:`cinertia`
+        :references:
+            - Rigid Body Dynamics Algorithms, R. Featherstone, Springer, 2008.
+
+        :seealso: :func:`cinertia`, :func:`accel`
         """
         q = getmatrix(q, (None, self.n))
 
+        if method == "crba":
+            In = self._crba(q)
+
+            if q.shape[0] == 1:
+                return In[0, :, :]
+            else:
+                return In
+        elif method != "rne":
+            raise ValueError("method must be one of 'rne' or 'crba'")
+
         In = np.zeros((q.shape[0], self.n, self.n))
 
         for k, qk in enumerate(q):
@@ -738,13 +1160,28 @@ class DynamicsMixin:
         **Trajectory operation**
 
         If ``q`` and `qd` are matrices (m,n), each row is interpretted as a
-        joint configuration, and the result (n,n,m) is a 3d-matrix where
+        joint configuration, and the result (m,n,n) is a 3d-matrix where
         each plane corresponds to a row of ``q`` and ``qd``.
 
+        **Algorithm**
+
+        With zero gravity, acceleration and friction the inverse dynamics
+        torque is a quadratic form in the joint velocity, and column :math:`j`
+        of the Coriolis matrix is exactly
+
+        .. math::
+
+            \mathbf{C}_{:,j} = \frac{1}{4} \left(
+                \tau(q, \dot{q} + e_j) - \tau(q, \dot{q} - e_j) \right)
+
+        which requires :math:`2n` invocations of RNE rather than
+        :math:`n(n+1)/2`.  ``DHRobot`` and ``ERobot`` override this with
+        implementations that evaluate all :math:`2n` velocities in a single
+        pass.
+
         .. note::
             - Joint viscous friction is also a joint force proportional to
               velocity but it is eliminated in the computation of this value.
-            - Computationally slow, involves :math:`n^2/2` invocations of RNE.
         """
 
         q = getmatrix(q, (None, self.n))
@@ -757,40 +1194,19 @@ class DynamicsMixin:
         r1 = self.nofriction(True, True)
 
         C = np.zeros((q.shape[0], self.n, self.n))
-        Csq = np.zeros((q.shape[0], self.n, self.n))
+        z = np.zeros(self.n)
 
-        # Find the torques that depend on a single finite joint speed,
-        # these are due to the squared (centripetal) terms
-        # set QD = [1 0 0 ...] then resulting torque is due to qd_1^2
-        for k, qk in enumerate(q):
-            for i in range(self.n):
-                QD = np.zeros(self.n)
-                QD[i] = 1
-                tau = r1.rne(qk, QD, np.zeros(self.n), gravity=[0, 0, 0])
-                Csq[k, :, i] = Csq[k, :, i] + tau
-
-        # Find the torques that depend on a pair of finite joint speeds,
-        # these are due to the product (Coriolis) terms
-        # set QD = [1 1 0 ...] then resulting torque is due to
-        # qd_1 qd_2 + qd_1^2 + qd_2^2
         for k, (qk, qdk) in enumerate(zip(q, qd)):
-            for i in range(self.n):
-                for j in range(i + 1, self.n):
-                    # Find a product term  qd_i * qd_j
-                    QD = np.zeros(self.n)
-                    QD[i] = 1
-                    QD[j] = 1
-                    tau = r1.rne(qk, QD, np.zeros(self.n), gravity=[0, 0, 0])
+            for j in range(self.n):
+                QD = qdk.copy()
 
-                    C[k, :, j] = (
-                        C[k, :, j] + (tau - Csq[k, :, j] - Csq[k, :, i]) * qdk[i] / 2
-                    )
+                QD[j] = qdk[j] + 1
+                tau_p = r1.rne(qk, QD, z, gravity=[0, 0, 0])
 
-                    C[k, :, i] = (
-                        C[k, :, i] + (tau - Csq[k, :, j] - Csq[k, :, i]) * qdk[j] / 2
-                    )
+                QD[j] = qdk[j] - 1
+                tau_m = r1.rne(qk, QD, z, gravity=[0, 0, 0])
 
-            C[k, :, :] = C[k, :, :] + Csq[k, :, :] @ np.diag(qdk)
+                C[k, :, j] = (tau_p - tau_m) / 4
 
         if q.shape[0] == 1:
             return C[0, :, :]
@@ -971,9 +1387,8 @@ class DynamicsMixin:
 
         .. math::
 
-            \mathbf{C}_x = \mathbf{J}(q)^{-T} \left(
-                \mathbf{C}(q) - \mathbf{M}_x(q) \mathbf{J})(q)
-                \right) \mathbf{J}(q)^{-1}
+            \mathbf{C}_x = \mathbf{J}(q)^{-T} \mathbf{C}(q) \mathbf{J}(q)^{-1}
+                - \mathbf{M}_x(q) \dot{\mathbf{J}}(q) \mathbf{J}(q)^{-1}
 
         The product :math:`\mathbf{C} \dot{x}` is the operational space wrench
         due to joint velocity coupling. This matrix is also known as the
@@ -1003,13 +1418,14 @@ class DynamicsMixin:
         **Trajectory operation**
 
         If ``q`` and `qd` are matrices (m,n), each row is interpretted as a
-        joint configuration, and the result (n,n,m) is a 3d-matrix where
-        each plane corresponds to a row of ``q`` and ``qd``.
+        joint configuration, and the result (m,6,6) is a 3d-matrix where
+        each plane corresponds to a row of ``q`` and ``qd``.  The joint-space
+        Coriolis matrices for all rows are computed by a single call to
+        :func:`coriolis`.
 
         .. note::
             - Joint viscous friction is also a joint force proportional to
               velocity but it is eliminated in the computation of this value.
-            - Computationally slow, involves :math:`n^2/2` invocations of RNE.
             - If the robot is not 6 DOF the ``pinv`` option is set True.
             - ``pinv()`` is around 5x slower than ``inv()``
 
@@ -1036,26 +1452,26 @@ class DynamicsMixin:
             if Mx is None:
                 Mx = self.inertia_x(q[0, :], Ji=Ji)
             if Jd is None:
-                Jd = self.jacob_dot(q[0, :], qd[0, :], J0=Ja)
-            return Ji.T @ (C - Mx @ Jd) @ Ji
+                Jd = self.jacob0_dot(q[0, :], qd[0, :], representation=representation)
+            return Ji.T @ C @ Ji - Mx @ Jd @ Ji
         else:
             # trajectory case
             Ct = np.zeros((q.shape[0], 6, 6))
 
-            for k, (qk, qdk) in enumerate(zip(q, qd)):
+            if C is None:
+                C = self.coriolis(q, qd)
 
-                if Ji is None:
-                    Ja = self.jacob0_analytical(q[0, :], representation)
-                    if pinv:
-                        Ji = np.linalg.pinv(Ja)
-                    else:
-                        Ji = np.linalg.inv(Ja)
+            for k, (qk, qdk) in enumerate(zip(q, qd)):
+                Ja = self.jacob0_analytical(qk, representation)
+                if pinv:
+                    Ji = np.linalg.pinv(Ja)
+                else:
+                    Ji = np.linalg.inv(Ja)
 
-                C = self.coriolis(qk, qdk)
                 Mx = self.inertia_x(qk, Ji=Ji)
-                Jd = self.jacob_dot(qk, qdk, J0=J)
+                Jd = self.jacob0_dot(qk, qdk, representation=representation)
 
-                Ct[k, :, :] = Ji.T @ (C - Mx @ Jd) @ Ji
+                Ct[k, :, :] = Ji.T @ C[k, :, :] @ Ji - Mx @ Jd @ Ji
 
             return Ct
 
@@ -1204,17 +1620,15 @@ class DynamicsMixin:
 
         **Trajectory operation**
 
-        If `q`, `qd`, torque are matrices (m,n) then ``qdd`` is a matrix (m,n)
+        If `q`, `xd`, wrench are matrices (m,n) then ``xdd`` is a matrix (m,6)
         where each row is the acceleration corresponding to the equivalent rows
         of q, qd, wrench.
 
         .. note::
             - Useful for simulation of manipulator dynamics, in
               conjunction with a numerical integration function.
-            - Uses the method 1 of Walker and Orin to compute the forward
-              dynamics.
-            - Featherstone's method is more efficient for robots with large
-              numbers of joints.
+            - The velocity terms for all rows are computed by a single call
+              to :func:`coriolis`.
             - Joint friction is considered.
 
         :seealso: :func:`accel`
@@ -1226,45 +1640,43 @@ class DynamicsMixin:
         if q.shape[1] != 6:
             pinv = True
 
-        xdd = np.zeros((q.shape[0], self.n))
-
-        for k, (qk, xdk, wk) in enumerate(zip(q, xd, w)):
+        Ja = np.zeros((q.shape[0], 6, self.n))
+        qd = np.zeros((q.shape[0], self.n))
 
-            Ja = self.jacob0(qk, analytical=representation)
+        for k, (qk, xdk) in enumerate(zip(q, xd)):
+            Ja[k, :, :] = self.jacob0_analytical(qk, representation)
             if pinv:
-                Ji = np.linalg.pinv(Ja)
+                Ji = np.linalg.pinv(Ja[k, :, :])
             else:
-                Ji = np.linalg.inv(Ja)
+                Ji = np.linalg.inv(Ja[k, :, :])
 
-            # Compute current manipulator inertia tensor
-            # shortcut from torques resulting from unit
-            # acceleration of each joint with zero gravity and zero velocity
-            qI = (np.c_[qk] @ np.ones((1, self.n))).T
-            qdI = np.zeros((self.n, self.n))
-            qddI = np.eye(self.n)
-            M = self.rne(qI, qdI, qddI, gravity=[0, 0, 0])
+            qd[k, :] = Ji @ xdk
 
-            # Compute gravity and coriolis torque torques resulting from zero
-            # acceleration at given velocity & with gravity acting.
-            tau_rne = self.rne(qk, Ji @ xdk, np.zeros((1, self.n)), gravity=gravity)
+        C = self.coriolis(q, qd)
+        if q.shape[0] == 1:
+            C = C[np.newaxis, :, :]
+
+        xdd = np.zeros((q.shape[0], 6))
+
+        for k, (qk, qdk, wk) in enumerate(zip(q, qd, w)):
+            M = self.inertia(qk)
+
+            #   qdd = M^-1 (J' w - C(q,qd) qd - G(q) - F(qd))
+            tau = (
+                Ja[k, :, :].T @ wk
+                - C[k, :, :] @ qdk
+                - self.gravload(qk, gravity=gravity)
+                + self.friction(qdk)
+            )
 
             # solve is faster than inv() which is faster than pinv()
-            #   tau_rne = C(q,qd) + G(q)
-            #   qdd = M^-1 (tau - C(q,qd) - G(q))
-            qdd = np.linalg.solve(M, J.T @ wk - tau_rne)
+            qdd = np.linalg.solve(M, tau)
 
             # xd = Ja qd
             # xdd = Jad qd + Ja qdd
-            #
-            # Ja = T J
-            # Jad = Td J + T Jd
-            # assume Td = 0, not sure how valid that is
-
-            # need Jacobian dot
-            qdk = Ji @ xdk
-            Jd = self.jacob_dot(qk, qdk, J0=J)
+            Jd = self.jacob0_dot(qk, qdk, representation=representation)
 
-            xdd[k, :] = T @ (Jd @ qdk + J @ qdd)
+            xdd[k, :] = Jd @ qdk + Ja[k, :, :] @ qdd
 
         if q.shape[0] == 1:
             return xdd[0, :]
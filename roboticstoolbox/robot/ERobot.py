@@ -20,11 +20,16 @@ from numpy import (
     cross,
     arccos,
     dot,
+    repeat,
+    ascontiguousarray,
+    float64,
+    intc,
 )
 from numpy.linalg import norm as npnorm, inv
 from spatialmath import SE3, SE2
 from spatialgeometry import Cylinder
-from spatialmath.base.argcheck import getvector, islistof
+from spatialmath.base.argcheck import getvector, getmatrix, islistof
+from spatialmath.base import skew
 from roboticstoolbox.robot.Link import Link, Link2, BaseLink
 from roboticstoolbox.robot.ETS import ETS, ETS2
 from roboticstoolbox.robot.ET import ET
@@ -32,6 +37,11 @@ from roboticstoolbox.robot.DHRobot import DHRobot
 from roboticstoolbox.tools import xacro
 from roboticstoolbox.tools import URDF
 from roboticstoolbox.robot.Robot import Robot
+from roboticstoolbox.robot.Dynamics import (
+    _RBDModel,
+    _spatial_inertia,
+    _adjoint_inv,
+)
 from roboticstoolbox.robot.Gripper import Gripper
 from roboticstoolbox.tools.data import rtb_path_to_datafile
 from roboticstoolbox.tools.params import rtb_get_param
@@ -43,12 +53,18 @@ from spatialmath import (
     SpatialInertia,
     SpatialForce,
 )
-from functools import lru_cache
+from collections import namedtuple
 from typing import Union, overload, Dict, List, Tuple, Optional
 from copy import deepcopy
+from fknm import RNE
 
 ArrayLike = Union[list, ndarray, tuple, set]
 
+ETSCacheInfo = namedtuple("ETSCacheInfo", "hits misses currsize")
+
+# joint axis codes of the fknm extension
+_AXIS = ["Rx", "Ry", "Rz", "tx", "ty", "tz"]
+
 
 class BaseERobot(Robot):
 
@@ -127,6 +143,11 @@ class BaseERobot(Robot):
     def __init__(self, links, gripper_links=None, checkjindex=True, **kwargs):
         self._path_cache_fknm = {}
         self._path_cache = {}
+        self._ets_cache = {}
+        self._rbd_cache = None
+        self._rbd_cache_fknm = None
+        self._ets_cache_hits = 0
+        self._ets_cache_misses = 0
         self._eye_fknm = eye(4)
 
         self._linkdict = {}
@@ -534,6 +555,7 @@ class BaseERobot(Robot):
     def base_link(self, link):
         if isinstance(link, Link):
             self._base_link = link
+            self.kinchanged()
         else:
             raise TypeError("Must be a Link")
 
@@ -560,6 +582,8 @@ class BaseERobot(Robot):
         else:
             raise TypeError("expecting a Link or list of Links")
 
+        self.kinchanged()
+
     # --------------------------------------------------------------------- #
 
     @property
@@ -670,6 +694,21 @@ class BaseERobot(Robot):
                 if p is not None:
                     return p
 
+    def _gripper_tool_key(self, start, end) -> Tuple[bytes, ...]:
+        """
+        Privade method which will find the tool transforms of the grippers
+        which are part of the ETS from start to end, as a hashable key
+        """
+        grippers = [g for g in (start, end) if isinstance(g, Gripper)]
+
+        if end is None and len(self.grippers) > 0:
+            grippers.append(self.grippers[0])
+
+        return tuple(
+            (g.tool.A if isinstance(g.tool, SE3) else array(g.tool)).tobytes()
+            for g in grippers
+        )
+
     def _gripper_ets(self, gripper: Gripper) -> ETS:
         """
         Privade method which will find the ETS of a gripper
@@ -677,7 +716,6 @@ class BaseERobot(Robot):
         # return gripper.links[0].ets * ET.SE3(gripper.tool)
         return ETS(ET.SE3(gripper.tool))
 
-    @lru_cache(maxsize=32)
     def ets(
         self,
         start: Union[Link, Gripper, str, None] = None,
@@ -707,6 +745,40 @@ class BaseERobot(Robot):
             >>> import roboticstoolbox as rtb
             >>> panda = rtb.models.ETS.Panda()
             >>> panda.ets()
+
+        .. note:: The resolved ETS is cached per ``(start, end)`` pair, and
+            per gripper tool transform, so repeated calls do not repeat the
+            path search.  The cache is cleared by :func:`kinchanged`, which
+            is called when a link's ETS, joint index or joint limits change,
+            or when ``base_link`` or ``ee_links`` are set.  Changes made
+            directly to an ``ET`` within a link are not detected, call
+            :func:`kinchanged` explicitly in that case.
+
+        :seealso: :func:`ets_cache_info`
+        """
+
+        key = (start, end, self._gripper_tool_key(start, end))
+
+        try:
+            ets = self._ets_cache[key]
+        except KeyError:
+            self._ets_cache_misses += 1
+        else:
+            self._ets_cache_hits += 1
+            return ets
+
+        ets = self._resolve_ets(start, end)
+        self._ets_cache[key] = ets
+        return ets
+
+    def _resolve_ets(
+        self,
+        start: Union[Link, Gripper, str, None] = None,
+        end: Union[Link, Gripper, str, None] = None,
+    ) -> ETS:
+        """
+        Privade method which will find the ETS between start and end
+        see ets()
         """
 
         # ets to stand and end incase of grippers
@@ -763,6 +835,62 @@ class BaseERobot(Robot):
 
         return ets
 
+    def ets_cache_info(self) -> ETSCacheInfo:
+        """
+        Statistics of the ETS cache
+
+        :return: hits, misses and current size of the cache
+        :rtype: ETSCacheInfo named tuple
+
+        ``robot.ets_cache_info()`` reports the number of calls to
+        :func:`ets` that were answered from the cache (``hits``), the number
+        that required a path search (``misses``) and the number of cached
+        ETS (``currsize``).
+
+        .. runblock:: pycon
+            >>> import roboticstoolbox as rtb
+            >>> panda = rtb.models.ETS.Panda()
+            >>> panda.fkine(panda.qr)
+            >>> panda.fkine(panda.qz)
+            >>> panda.ets_cache_info()
+
+        :seealso: :func:`ets`, :func:`kinchanged`
+        """
+        return ETSCacheInfo(
+            self._ets_cache_hits, self._ets_cache_misses, len(self._ets_cache)
+        )
+
+    def kinchanged(self):
+        """
+        Kinematic parameters have changed
+
+        Clears the cache of resolved ETS, link paths and the rigid-body model,
+        so that they are recomputed on next use.  Called from a property setter when the
+        kinematic structure of the robot changes.
+
+        :seealso: :func:`ets`, :func:`ets_cache_info`
+        """
+        self._ets_cache.clear()
+        self._path_cache.clear()
+        self._path_cache_fknm.clear()
+        self._rbd_cache = None
+        self._rbd_cache_fknm = None
+        super().kinchanged()
+
+    def dynchanged(self, what=None):
+        """
+        Dynamic parameters have changed
+
+        Clears the cached rigid-body model used by the dynamics methods, so
+        that it is rebuilt on next use.
+
+        :seealso: :func:`roboticstoolbox.Link._listen_dyn`
+        """
+        super().dynchanged(what)
+        if what != "gravity":
+            self._rbd_cache = None
+            self._rbd_cache_fknm = None
+
     # --------------------------------------------------------------------- #
 
     def segments(self) -> List[List[Union[Link, None]]]:
@@ -1525,6 +1653,7 @@ class ERobot(BaseERobot):
         start: Union[str, Link, Gripper, None] = None,
         tool: Union[ndarray, SE3, None] = None,
         include_base: bool = True,
+        n_threads: int = 1,
     ) -> SE3:
         """
         Forward kinematics
@@ -1534,6 +1663,8 @@ class ERobot(BaseERobot):
         :param end: end-effector or gripper to compute forward kinematics to
         :param start: the link to compute forward kinematics from
         :param tool: tool transform, optional
+        :param n_threads: number of native threads used to evaluate a
+            trajectory, a value less than 1 uses all available cores
 
         :return: The transformation matrix representing the pose of the
             end-effector
@@ -1560,7 +1691,11 @@ class ERobot(BaseERobot):
         """
         return SE3(
             self.ets(start, end).fkine(
-                q, base=self._T, tool=tool, include_base=include_base
+                q,
+                base=self._T,
+                tool=tool,
+                include_base=include_base,
+                n_threads=n_threads,
             ),
             check=False,
         )
@@ -1598,6 +1733,9 @@ class ERobot(BaseERobot):
             >>> puma = rtb.models.ETS.Puma560()
             >>> puma.jacobe([0, 0, 0, 0, 0, 0])
 
+        If ``q`` is a matrix (m,n) the result is an array (m,6,n) of the
+        Jacobians for each row of ``q``, computed in a single call.
+
         .. warning:: This is the geometric Jacobian as described in texts by
             Corke, Spong etal., Siciliano etal.  The end-effector velocity is
             described in terms of translational and angular velocity, not a
@@ -1640,6 +1778,9 @@ class ERobot(BaseERobot):
             >>> puma = rtb.models.ETS.Puma560()
             >>> puma.jacobe([0, 0, 0, 0, 0, 0])
 
+        If ``q`` is a matrix (m,n) the result is an array (m,6,n) of the
+        Jacobians for each row of ``q``, computed in a single call.
+
         .. warning:: This is the **geometric Jacobian** as described in texts by
             Corke, Spong etal., Siciliano etal.  The end-effector velocity is
             described in terms of translational and angular velocity, not a
@@ -1676,6 +1817,9 @@ class ERobot(BaseERobot):
             end of end, defaults to None
         
         :return: The manipulator Hessian in 0 frame
+
+        If ``q`` is a matrix (m,n) the result is an array (m,n,6,n) of the
+        Hessians for each row of ``q``.
         
         This method computes the manipulator Hessian in the base frame.  If
         we take the time derivative of the differential kinematic relationship
@@ -1729,6 +1873,9 @@ class ERobot(BaseERobot):
             end of end, defaults to None
         
         :return: The manipulator Hessian in ee frame
+
+        If ``q`` is a matrix (m,n) the result is an array (m,n,6,n) of the
+        Hessians for each row of ``q``.
         
         This method computes the manipulator Hessian in the ee frame.  If
         we take the time derivative of the differential kinematic relationship
@@ -1756,6 +1903,67 @@ class ERobot(BaseERobot):
         """
         return self.ets(start, end).hessiane(q, Je=Je, tool=tool)
 
+    def kinematics(
+        self,
+        q: ArrayLike,
+        which: Union[str, List[str], Tuple[str, ...]] = ("T", "J0"),
+        end: Union[str, Link, Gripper, None] = None,
+        start: Union[str, Link, Gripper, None] = None,
+        tool: Union[ndarray, SE3, None] = None,
+    ):
+        r"""
+        Forward kinematics and its derivatives in one pass
+
+        :param q: Joint coordinate vector
+        :type q: ArrayLike
+        :param which: the quantities to compute, any of ``"T"``, ``"J0"``,
+            ``"Je"``, ``"H0"``, ``"manipulability"`` and ``"jacobm"``
+        :param end: the final link or gripper, defaults to the end-effector
+            if only one is present
+        :param start: the link considered as the base frame, defaults to the
+            robots's base frame
+        :param tool: a static tool transformation matrix to apply to the
+            end of end, defaults to None
+
+        :return: a named tuple with the fields ``T``, ``J0``, ``Je``, ``H0``,
+            ``manipulability`` and ``jacobm``. Quantities not listed in
+            ``which`` are None.
+        :rtype: KinematicBundle
+
+        ``robot.kinematics(q, which)`` returns the same values as
+        ``fkine(q).A``, ``jacob0``, ``jacobe``, ``hessian0``,
+        ``manipulability`` and ``jacobm`` from a single traversal of the
+        robot's ETS. This suits controllers which need several of these
+        every cycle.
+
+        Example:
+
+        .. runblock:: pycon
+
+            >>> import roboticstoolbox as rtb
+            >>> panda = rtb.models.Panda()
+            >>> k = panda.kinematics(panda.qr, ["T", "Je", "jacobm"])
+            >>> k.manipulability
+
+        :seealso: :func:`ETS.kinematics`
+        """  # noqa
+        k = self.ets(start, end).kinematics(q, which, tool=tool)
+
+        if k.T is not None:
+            k = k._replace(T=self._T @ k.T)
+
+        return k
+
+    def _jacob0_traj(self, q, **kwargs):
+        # jacob0 handles a numeric trajectory in one call
+        q = getmatrix(q, (None, self.n))
+
+        if q.dtype.kind not in "biuf":
+            return super()._jacob0_traj(q, **kwargs)
+
+        J = self.jacob0(q, **kwargs)
+        return J.reshape((q.shape[0],) + J.shape[-2:])
+
     def partial_fkine0(
         self,
         q: ArrayLike,
@@ -1891,6 +2099,118 @@ class ERobot(BaseERobot):
 
         return Ain, bin
 
+    def link_collision_damper_batch(
+        self,
+        shapes,
+        q=None,
+        di=0.3,
+        ds=0.05,
+        xi=1.0,
+        end=None,
+        start=None,
+        collision_list=None,
+    ):
+        """
+        Velocity damper constraints for a set of obstacles
+
+        :param shapes: The obstacles to avoid
+        :type shapes: list of Shape
+        :param q: Joint coordinates, defaults to ``self.q``
+        :type q: ndarray(n)
+        :param di: The influence distance in which the velocity
+            damper becomes active
+        :type di: float
+        :param ds: The minimum distance in which a joint is allowed to
+            approach the collision object shape
+        :type ds: float
+        :param xi: The gain for the velocity damper
+        :type xi: float
+        :param end: the final link to consider, defaults to the end-effector
+        :type end: str or Link
+        :param start: the first link to consider, defaults to the base link
+        :type start: str or Link
+        :param collision_list: collision shapes to use for each joint, in
+            place of the link collision shapes
+        :type collision_list: list of lists of Shape
+        :returns: Ain, Bin as the inequality contraints for an omptimisor
+        :rtype: ndarray(m,n), ndarray(m)
+
+        Computes the same constraints as calling :func:`link_collision_damper`
+        for each shape in ``shapes`` and stacking the results, with one row
+        for each pair of robot collision shape and obstacle that are closer
+        than ``di``.  The link transforms are not updated, as for
+        :func:`link_collision_damper`.
+
+        The Jacobian of a link is computed once, by a single call to
+        :func:`ETS.kinematics`, and shared by all of its collision shapes
+        and all obstacles.  It is only computed if one of its collision
+        shapes is within the influence distance of an obstacle.  The
+        constraint matrices are allocated once for the worst case and
+        trimmed, if no obstacle is within range they have zero rows.
+
+        :seealso: :func:`link_collision_damper`
+        """
+
+        end, start, _ = self._get_limit_links(start=start, end=end)
+
+        links, n, _ = self.get_path(start=start, end=end)
+
+        if q is None:
+            q = self.q
+
+        # robot collision shapes and the link they belong to
+        pairs = []
+        j = 0
+        for link in links:
+            if link.isjoint:
+                j += 1
+
+            if collision_list is None:
+                col_list = link.collision
+            else:
+                col_list = collision_list[j - 1]
+
+            pairs.extend((link, link_col) for link_col in col_list)
+
+        Ain = zeros((len(pairs) * len(shapes), n))
+        bin = zeros(len(pairs) * len(shapes))
+        v = [shape.v[:3] for shape in shapes]
+
+        # link pose and world-frame Jacobian, keyed by link
+        kin = {}
+        k = 0
+
+        for link, link_col in pairs:
+            Jc = None
+
+            for shape, vs in zip(shapes, v):
+                d, wTlp, wTcp = link_col.closest_point(shape, di)
+
+                if d is None:
+                    continue
+
+                if Jc is None:
+                    if link not in kin:
+                        kin[link] = self.ets(start=self.base_link, end=link).kinematics(
+                            q, ("T", "J0")
+                        )
+                    T, J0 = kin[link][:2]
+
+                    # translational Jacobian of the collision shape in its
+                    # own frame, as jacobe() with tool=link_col.T
+                    R = T[:3, :3]
+                    Tc = link_col.T
+                    Jv = J0[:3, :] - skew(R @ Tc[:3, 3]) @ J0[3:, :]
+                    Jc = (R @ Tc[:3, :3]).T @ Jv
+
+                norm = (wTcp - wTlp) / d
+
+                Ain[k, : Jc.shape[1]] = norm @ Jc
+                bin[k] = (xi * (d - ds) / (di - ds)) + norm @ vs
+                k += 1
+
+        return Ain[:k], bin[:k]
+
     def vision_collision_damper(
         self,
         shape,
@@ -2041,7 +2361,123 @@ class ERobot(BaseERobot):
         return Ain, bin
 
     # inverse dynamics (recursive Newton-Euler) using spatial vector notation
-    def rne(self, q, qd, qdd, symbolic=False, gravity=None):
+    def rne(self, q, qd, qdd, symbolic=False, gravity=None, n_threads=1):
+        r"""
+        Inverse dynamics
+
+        :param q: Joint coordinates
+        :type q: ndarray(n) or ndarray(m,n)
+        :param qd: Joint velocity
+        :type qd: ndarray(n) or ndarray(m,n)
+        :param qdd: The joint accelerations of the robot
+        :type qdd: ndarray(n) or ndarray(m,n)
+        :param symbolic: compute symbolically, see :func:`rne_python`
+        :type symbolic: bool
+        :param gravity: Gravitational acceleration to override robot's gravity
+            value
+        :type gravity: ndarray(3)
+        :param n_threads: number of native threads used to evaluate a
+            trajectory, a value less than 1 uses all available cores
+        :type n_threads: int
+        :return: Joint torques
+        :rtype: ndarray(n) or ndarray(m,n)
+
+        ``rne(q, qd, qdd)`` is the joint torque required for the robot to
+        achieve the specified joint position ``q``, velocity ``qd`` and
+        acceleration ``qdd``.
+
+        **Trajectory operation**
+
+        If ``q``, ``qd`` and ``qdd`` are matrices (m,n), each row is
+        interpretted as a joint state, and the result (m,n) has rows
+        corresponding to each row of the trajectory.
+
+        .. note::
+            - Computed by the compiled RNE of the ``fknm`` extension, on the
+              rigid-body model of the robot which may be branched, see
+              :func:`_rbd_model`.
+            - The torque computed contains a contribution due to armature
+              inertia and joint friction.
+            - The gravity vector is given in the world frame, and rotated
+              into the frame of the robot's base.
+
+        :seealso: :func:`rne_python`
+        """
+
+        if symbolic:
+            return self.rne_python(q, qd, qdd, symbolic=True, gravity=gravity)
+
+        q = ascontiguousarray(getmatrix(q, (None, self.n)), dtype=float64)
+        qd = ascontiguousarray(getmatrix(qd, (None, self.n)), dtype=float64)
+        qdd = ascontiguousarray(getmatrix(qdd, (None, self.n)), dtype=float64)
+        if not q.shape[0] == qd.shape[0] == qdd.shape[0]:
+            raise ValueError("q, qd and qdd must have the same number of rows")
+
+        if gravity is None:
+            gravity = self.gravity
+
+        tau = self._rne_fknm(q, qd, qdd, gravity, True, n_threads)
+
+        if q.shape[0] == 1:
+            return tau[0, :]
+        else:
+            return tau
+
+    def _rne_fknm(self, q, qd, qdd, gravity, friction, n_threads=1):
+        """
+        Compiled RNE for contiguous ndarray(m,n) joint states, returns the
+        joint torques ndarray(m,n)
+        """
+        model = self._rbd_model()
+
+        if self._rbd_cache_fknm is None:
+            self._rbd_cache_fknm = (
+                ascontiguousarray(model.P),
+                ascontiguousarray(model.Q),
+                array([_AXIS.index(axis) for axis in model.axis], dtype=intc),
+                array(model.flip, dtype=intc),
+                array(model.parent, dtype=intc),
+                array(model.jindex, dtype=intc),
+                ascontiguousarray(model.S),
+                ascontiguousarray(model.I),
+                ascontiguousarray(model.Ia, dtype=float64),
+                ascontiguousarray(model.B, dtype=float64),
+                ascontiguousarray(model.G, dtype=float64),
+                ascontiguousarray(model.Tc, dtype=float64),
+            )
+
+        # the base accelerates upward rather than applying gravity to each body
+        a0 = zeros(6)
+        a0[:3] = -(self.base.R.T @ getvector(gravity, 3))
+
+        tau = zeros(q.shape)
+        RNE(q, qd, qdd, *self._rbd_cache_fknm, a0, int(friction), tau, n_threads)
+
+        return tau
+
+    def rne_python(self, q, qd, qdd, symbolic=False, gravity=None):
+        """
+        Inverse dynamics, Python implementation
+
+        :param q: Joint coordinates
+        :type q: ndarray(n)
+        :param qd: Joint velocity
+        :type qd: ndarray(n)
+        :param qdd: The joint accelerations of the robot
+        :type qdd: ndarray(n)
+        :param symbolic: compute symbolically
+        :type symbolic: bool
+        :param gravity: Gravitational acceleration to override robot's gravity
+            value
+        :type gravity: ndarray(3)
+        :return: Joint torques
+        :rtype: ndarray(n)
+
+        .. note:: This implementation is slow, and it assumes that every link
+            is a joint and uses only the mass and centre of mass of each link.
+
+        :seealso: :func:`rne`
+        """
 
         n = self.n
 
@@ -2124,6 +2560,145 @@ class ERobot(BaseERobot):
 
         return Q
 
+    def coriolis(self, q, qd):
+        r"""
+        Coriolis and centripetal term
+
+        :param q: Joint coordinates
+        :type q: ndarray(n) or ndarray(m,n)
+        :param qd: Joint velocity
+        :type qd: ndarray(n) or ndarray(m,n)
+        :return: Velocity matrix
+        :rtype: ndarray(n,n) or ndarray(m,n,n)
+
+        ``coriolis(q, qd)`` calculates the Coriolis/centripetal matrix (n,n)
+        for the robot in configuration ``q`` and velocity ``qd``, where ``n``
+        is the number of joints.
+
+        **Trajectory operation**
+
+        If ``q`` and `qd` are matrices (m,n), each row is interpretted as a
+        joint configuration, and the result (m,n,n) is a 3d-matrix where
+        each plane corresponds to a row of ``q`` and ``qd``.
+
+        .. note::
+            - This is the velocity product part of :func:`rne`, evaluated for
+              the :math:`2n` velocities :math:`\dot{q} \pm e_j` of all rows
+              in one call of the compiled RNE, see
+              :func:`DynamicsMixin.coriolis`.
+            - Joint friction is eliminated in the computation of this value.
+
+        :seealso: :func:`rne`, :func:`DynamicsMixin.coriolis`
+        """
+
+        q = getmatrix(q, (None, self.n))
+        qd = getmatrix(qd, (None, self.n))
+        if q.shape[0] != qd.shape[0]:
+            raise ValueError("q and qd must have the same number of rows")
+
+        n = self.n
+        m = q.shape[0]
+
+        # joint velocities qd + e_j and qd - e_j for every row, (m,2n,n)
+        E = eye(n)
+        QD = concatenate((qd[:, None, :] + E, qd[:, None, :] - E), axis=1)
+
+        # velocity product torques, zero gravity, acceleration and friction
+        Q = self._rne_fknm(
+            ascontiguousarray(repeat(q, 2 * n, axis=0), dtype=float64),
+            ascontiguousarray(QD.reshape(-1, n), dtype=float64),
+            zeros((2 * n * m, n)),
+            zeros(3),
+            False,
+        ).reshape(m, 2 * n, n)
+
+        C = (Q[:, :n, :] - Q[:, n:, :]).transpose(0, 2, 1) / 4
+
+        if m == 1:
+            return C[0, :, :]
+        else:
+            return C
+
+    def _rbd_model(self):
+        """
+        Spatial rigid-body model of the robot
+
+        :return: the bodies of the robot, one per joint
+        :rtype: _RBDModel
+
+        Each joint link is a body, with the constant part of its ETS, and that
+        of any static links between it and its parent joint, preceding the
+        joint transform.  The mass of a static link is lumped into the body of
+        the joint it is rigidly attached to, static links before the first
+        joint are fixed to the world and ignored.  Gripper links are not
+        included.  Used by the ``"crba"`` and ``"aba"`` methods of
+        :func:`inertia` and :func:`accel`.
+
+        The model is cached until the kinematic or dynamic parameters of the
+        robot change.
+        """
+        if self._rbd_cache is not None:
+            return self._rbd_cache
+
+        links = set(id(link) for link in self.links)
+
+        jindex = []
+        parent = []
+        P = []
+        axis = []
+        flip = []
+        S = []
+        I = []  # noqa
+        link_joints = []
+
+        # depth first, so that parents precede their children
+        stack = [(self.base_link, -1, eye(4))]
+
+        while stack:
+            link, body, T = stack.pop()
+
+            if link.isjoint:
+                P.append(T @ link.Ts)
+                jindex.append(link.jindex)
+                parent.append(body)
+                axis.append(link.v.axis)
+                flip.append(link.v.isflip)
+                S.append(-link.v.s if link.v.isflip else link.v.s)
+                I.append(_spatial_inertia(link.m, link.r, link.I))
+                link_joints.append(link)
+
+                body = len(jindex) - 1
+                T = eye(4)
+            else:
+                T = T @ link.Ts
+
+                if body >= 0:
+                    # lump the static link into the body it is fixed to
+                    X = _adjoint_inv(T)
+                    Is = _spatial_inertia(link.m, link.r, link.I)
+                    I[body] = I[body] + X.T @ Is @ X
+
+            for child in reversed(link.children):
+                if id(child) in links:
+                    stack.append((child, body, T))
+
+        self._rbd_cache = _RBDModel(
+            jindex=jindex,
+            parent=parent,
+            P=array(P),
+            Q=array([eye(4)] * len(jindex)),
+            axis=axis,
+            flip=flip,
+            S=array(S, dtype=float),
+            I=array(I),
+            Ia=array([link.G**2 * link.Jm for link in link_joints]),
+            B=array([link.B for link in link_joints]),
+            G=array([link.G for link in link_joints]),
+            Tc=array([link.Tc for link in link_joints]),
+        )
+
+        return self._rbd_cache
+
     # --------------------------------------------------------------------- #
 
     def ik_lm_chan(
@@ -2138,6 +2713,8 @@ class ERobot(BaseERobot):
         reject_jl: bool = True,
         we: Union[ndarray, None] = None,
         λ: float = 1.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
     ) -> Tuple[ndarray, int, int, int, float]:
         """
         Numerical inverse kinematics by Levenberg-Marquadt optimization (Chan's Method)
@@ -2157,6 +2734,10 @@ class ERobot(BaseERobot):
             Corresponds to translation in X, Y and Z and rotation about X, Y and Z
             respectively
         :param λ: value of lambda for the damping matrix Wn
+        :param n_threads: number of native threads used to solve a batch of
+            poses, a value less than 1 uses all available cores
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
 
         :return: inverse kinematic solution
         :rtype: tuple (q, success, iterations, searches, residual)
@@ -2233,7 +2814,7 @@ class ERobot(BaseERobot):
             TODO
         """
 
-        return self.ets(start, end).ik_lm_chan(Tep, q0, ilimit, slimit, tol, reject_jl, we, λ)
+        return self.ets(start, end).ik_lm_chan(Tep, q0, ilimit, slimit, tol, reject_jl, we, λ, n_threads=n_threads, seed=seed)
 
     def ik_lm_wampler(
         self,
@@ -2247,6 +2828,8 @@ class ERobot(BaseERobot):
         reject_jl: bool = True,
         we: Union[ndarray, None] = None,
         λ: float = 1.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
     ) -> Tuple[ndarray, int, int, int, float]:
         """
         Numerical inverse kinematics by Levenberg-Marquadt optimization (Wamplers's Method)
@@ -2266,6 +2849,10 @@ class ERobot(BaseERobot):
             Corresponds to translation in X, Y and Z and rotation about X, Y and Z
             respectively
         :param λ: value of lambda for the damping matrix Wn
+        :param n_threads: number of native threads used to solve a batch of
+            poses, a value less than 1 uses all available cores
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
 
         :return: inverse kinematic solution
         :rtype: tuple (q, success, iterations, searches, residual)
@@ -2342,7 +2929,7 @@ class ERobot(BaseERobot):
             TODO
         """
 
-        return self.ets(start, end).ik_lm_wampler(Tep, q0, ilimit, slimit, tol, reject_jl, we, λ)
+        return self.ets(start, end).ik_lm_wampler(Tep, q0, ilimit, slimit, tol, reject_jl, we, λ, n_threads=n_threads, seed=seed)
 
     def ik_lm_sugihara(
         self,
@@ -2356,6 +2943,8 @@ class ERobot(BaseERobot):
         reject_jl: bool = True,
         we: Union[ndarray, None] = None,
         λ: float = 1.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
     ) -> Tuple[ndarray, int, int, int, float]:
         """
         Numerical inverse kinematics by Levenberg-Marquadt optimization (Sugihara's Method)
@@ -2375,6 +2964,10 @@ class ERobot(BaseERobot):
             Corresponds to translation in X, Y and Z and rotation about X, Y and Z
             respectively
         :param λ: value of lambda for the damping matrix Wn
+        :param n_threads: number of native threads used to solve a batch of
+            poses, a value less than 1 uses all available cores
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
 
         :return: inverse kinematic solution
         :rtype: tuple (q, success, iterations, searches, residual)
@@ -2451,7 +3044,7 @@ class ERobot(BaseERobot):
             TODO
         """
 
-        return self.ets(start, end).ik_lm_sugihara(Tep, q0, ilimit, slimit, tol, reject_jl, we, λ)
+        return self.ets(start, end).ik_lm_sugihara(Tep, q0, ilimit, slimit, tol, reject_jl, we, λ, n_threads=n_threads, seed=seed)
 
     def ik_nr(
         self,
@@ -2466,6 +3059,8 @@ class ERobot(BaseERobot):
         we: Union[ndarray, None] = None,
         use_pinv: int = True,
         pinv_damping: float = 0.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
     ) -> Tuple[ndarray, int, int, int, float]:
         """
         Numerical inverse kinematics by Levenberg-Marquadt optimization (Newton-Raphson Method)
@@ -2485,6 +3080,10 @@ class ERobot(BaseERobot):
             Corresponds to translation in X, Y and Z and rotation about X, Y and Z
             respectively
         :param λ: value of lambda for the damping matrix Wn
+        :param n_threads: number of native threads used to solve a batch of
+            poses, a value less than 1 uses all available cores
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
 
         :return: inverse kinematic solution
         :rtype: tuple (q, success, iterations, searches, residual)
@@ -2561,7 +3160,7 @@ class ERobot(BaseERobot):
             TODO
         """
 
-        return self.ets(start, end).ik_nr(Tep, q0, ilimit, slimit, tol, reject_jl, we, use_pinv, pinv_damping)
+        return self.ets(start, end).ik_nr(Tep, q0, ilimit, slimit, tol, reject_jl, we, use_pinv, pinv_damping, n_threads=n_threads, seed=seed)
 
     def ik_gn(
         self,
@@ -2576,6 +3175,8 @@ class ERobot(BaseERobot):
         we: Union[ndarray, None] = None,
         use_pinv: int = True,
         pinv_damping: float = 0.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
     ) -> Tuple[ndarray, int, int, int, float]:
         """
         Numerical inverse kinematics by Levenberg-Marquadt optimization (Gauss-NewtonMethod)
@@ -2595,6 +3196,10 @@ class ERobot(BaseERobot):
             Corresponds to translation in X, Y and Z and rotation about X, Y and Z
             respectively
         :param λ: value of lambda for the damping matrix Wn
+        :param n_threads: number of native threads used to solve a batch of
+            poses, a value less than 1 uses all available cores
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
 
         :return: inverse kinematic solution
         :rtype: tuple (q, success, iterations, searches, residual)
@@ -2671,7 +3276,85 @@ class ERobot(BaseERobot):
             TODO
         """
 
-        return self.ets(start, end).ik_gn(Tep, q0, ilimit, slimit, tol, reject_jl, we, use_pinv, pinv_damping)
+        return self.ets(start, end).ik_gn(Tep, q0, ilimit, slimit, tol, reject_jl, we, use_pinv, pinv_damping, n_threads=n_threads, seed=seed)
+
+    def ik_traj(
+        self,
+        Tep: Union[ndarray, SE3],
+        end: Union[str, Link, Gripper, None] = None,
+        start: Union[str, Link, Gripper, None] = None,
+        q0: Union[ndarray, None] = None,
+        method: str = "lm_chan",
+        ilimit: int = 30,
+        slimit: int = 100,
+        tol: float = 1e-6,
+        reject_jl: bool = True,
+        we: Union[ndarray, None] = None,
+        λ: float = 1.0,
+        use_pinv: int = True,
+        pinv_damping: float = 0.0,
+        dq_max: float = 0.5,
+        seed: Union[int, None] = None,
+    ) -> Tuple[ndarray, ndarray, ndarray, ndarray, ndarray]:
+        """
+        Numerical inverse kinematics along a pose trajectory
+
+        :param Tep: The desired end-effector pose trajectory
+        :param end: the particular link or gripper to compute the pose of
+        :param start: the link considered as the base frame, defaults to the robots's base frame
+        :param q0: initial joint configuration for the first pose (default to
+            random valid joint configuration contrained by the joint limits of
+            the robot)
+        :param method: the solver, one of ``"lm_chan"``, ``"lm_wampler"``,
+            ``"lm_sugihara"``, ``"nr"`` or ``"gn"``
+        :param ilimit: maximum number of iterations per search
+        :param slimit: maximum number of search attempts per pose
+        :param tol: final error tolerance
+        :param reject_jl: constrain the solution to being within the joint limits of
+            the robot
+        :param we: a mask vector which weights the end-effector error priority.
+            Corresponds to translation in X, Y and Z and rotation about X, Y and Z
+            respectively
+        :param λ: value of lambda for the damping matrix Wn, for the
+            Levenberg-Marquadt solvers
+        :param use_pinv: use the pseudo-inverse of the Jacobian, for the
+            ``"nr"`` and ``"gn"`` solvers
+        :param pinv_damping: damping of the pseudo-inverse, for the ``"nr"``
+            and ``"gn"`` solvers
+        :param dq_max: largest change of any joint coordinate between
+            consecutive poses, a value of 0 does not check continuity
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
+
+        :return: inverse kinematic solutions
+        :rtype: tuple (q(m,n), success(m), iterations(m), searches(m), residual(m))
+
+        ``sol = robot.ik_traj(Tep)`` solves the poses of ``Tep`` in order, each
+        seeded by the solution of the previous pose.  Random restarts are
+        only used if that search fails, or if its solution jumps by more than
+        ``dq_max`` in any joint.  For example::
+
+            Ts = rtb.ctraj(T0, T1, 100)
+            q, success, *_ = robot.ik_traj(Ts, q0=robot.qr)
+
+        :seealso: :func:`ETS.ik_traj`
+        """
+
+        return self.ets(start, end).ik_traj(
+            Tep,
+            q0,
+            method,
+            ilimit,
+            slimit,
+            tol,
+            reject_jl,
+            we,
+            λ,
+            use_pinv,
+            pinv_damping,
+            dq_max,
+            seed,
+        )
 
 
 
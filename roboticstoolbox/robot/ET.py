@@ -4,7 +4,7 @@
 @author: Jesse Haviland
 """
 
-from numpy import array, ndarray, deg2rad, eye, pi
+from numpy import array, ndarray, deg2rad, eye, pi, zeros, cos, sin
 from numpy.linalg import inv as npinv
 import roboticstoolbox as rtb
 from spatialmath.base import (
@@ -35,6 +35,28 @@ except ImportError:  # pragma: no cover
     Sym = float
 
 
+def _et_batch(axis, q):
+    """
+    SE(3) matrices (m,4,4) of an elementary transform for a vector of joint
+    coordinates q (m)
+    """
+    T = zeros((q.shape[0], 4, 4))
+    T[:, 0, 0] = T[:, 1, 1] = T[:, 2, 2] = T[:, 3, 3] = 1.0
+
+    i = "xyz".index(axis[1])
+    if axis[0] == "R":
+        j, k = (i + 1) % 3, (i + 2) % 3
+        c = cos(q)
+        s = sin(q)
+        T[:, j, j] = c
+        T[:, k, k] = c
+        T[:, j, k] = -s
+        T[:, k, j] = s
+    else:
+        T[:, i, 3] = q
+    return T
+
+
 class BaseET:
     def __init__(
         self,
@@ -5,7 +5,7 @@
 @author: Peter Corke
 """
 
-from collections import UserList
+from collections import UserList, namedtuple
 from numpy import (
     pi,
     where,
@@ -22,8 +22,9 @@ from numpy import (
     cross,
     flip,
     concatenate,
+    broadcast_to,
 )
-from numpy.random import uniform
+from numpy.random import uniform, default_rng
 from numpy.linalg import inv, det, cond, pinv, matrix_rank, svd, eig
 from spatialmath import SE3, SE2
 from spatialmath.base import (
@@ -47,15 +48,17 @@ from fknm import (
     ETS_jacobe,
     ETS_hessian0,
     ETS_hessiane,
+    ETS_kinematics,
     IK_NR,
     IK_GN,
     IK_LM_Chan,
     IK_LM_Wampler,
     IK_LM_Sugihara,
+    IK_Batch,
 )
 from copy import deepcopy
 from roboticstoolbox import rtb_get_param
-from roboticstoolbox.robot.ET import ET, ET2
+from roboticstoolbox.robot.ET import ET, ET2, _et_batch
 from spatialmath.base import getvector
 from spatialmath import SE3
 from typing import Union, overload, List, Set, Tuple
@@ -63,6 +66,18 @@ from sys import version_info
 
 ArrayLike = Union[list, ndarray, tuple, set]
 
+# Solver codes understood by fknm.IK_Batch
+_IK_NR = 0
+_IK_GN = 1
+_IK_LM_CHAN = 2
+_IK_LM_WAMPLER = 3
+_IK_LM_SUGIHARA = 4
+
+# Quantities computed by fknm.ETS_kinematics, combined as a bit mask
+_KIN = {"T": 1, "J0": 2, "Je": 4, "H0": 8, "manipulability": 16, "jacobm": 32}
+
+KinematicBundle = namedtuple("KinematicBundle", "T J0 Je H0 manipulability jacobm")
+
 py_ver = version_info
 
 if version_info >= (3, 9):
@@ -588,14 +603,17 @@ class BaseETS(UserList):
 
         robot.teach(*args, **kwargs)
 
-    def random_q(self, i: int = 1) -> ndarray:
+    def random_q(self, i: int = 1, seed: Union[int, None] = None) -> ndarray:
         """
         Generate a random valid joint configuration
 
         :param i: number of configurations to generate
+        :param seed: seed for a private random number generator, if None the
+            global NumPy random state is used
 
         Generates a random q vector within the joint limits defined by
-        `self.qlim`.
+        `self.qlim`. Passing ``seed`` gives a repeatable result which is
+        independent of any other use of NumPy's random state.
 
         Example:
 
@@ -609,20 +627,17 @@ class BaseETS(UserList):
 
         """
 
-        if i == 1:
-            q = zeros(self.n)
-
-            for i in range(self.n):
-                q[i] = uniform(self.qlim[0, i], self.qlim[1, i])
-
+        if seed is None:
+            rand = uniform
         else:
-            q = zeros((i, self.n))
+            rand = default_rng(seed).uniform
 
-            for j in range(i):
-                for i in range(self.n):
-                    q[j, i] = uniform(self.qlim[0, i], self.qlim[1, i])
+        qlim = self.qlim
 
-        return q
+        if i == 1:
+            return rand(qlim[0, :], qlim[1, :], size=(self.n,))
+        else:
+            return rand(qlim[0, :], qlim[1, :], size=(i, self.n))
 
 
 class ETS(BaseETS):
@@ -834,6 +849,7 @@ class ETS(BaseETS):
         base: Union[ndarray, SE3, None] = None,
         tool: Union[ndarray, SE3, None] = None,
         include_base: bool = True,
+        n_threads: int = 1,
     ) -> SE3:
         """
         Forward kinematics
@@ -842,6 +858,8 @@ class ETS(BaseETS):
         :type q: ArrayLike
         :param base: base transform, optional
         :param tool: tool transform, optional
+        :param n_threads: number of native threads used to evaluate a
+            trajectory, a value less than 1 uses all available cores
 
         :return: The transformation matrix representing the pose of the
             end-effector
@@ -862,7 +880,7 @@ class ETS(BaseETS):
         """
 
         ret = SE3.Empty()
-        fk = self.eval(q, base, tool, include_base)
+        fk = self.eval(q, base, tool, include_base, n_threads)
 
         if fk.dtype == "O":
             # symbolic
@@ -882,6 +900,7 @@ class ETS(BaseETS):
         base: Union[ndarray, SE3, None] = None,
         tool: Union[ndarray, SE3, None] = None,
         include_base: bool = True,
+        n_threads: int = 1,
     ) -> ndarray:
         """
         Forward kinematics
@@ -890,6 +909,8 @@ class ETS(BaseETS):
         :type q: ArrayLike
         :param base: base transform, optional
         :param tool: tool transform, optional
+        :param n_threads: number of native threads used to evaluate a
+            trajectory, a value less than 1 uses all available cores
 
         :return: The transformation matrix representing the pose of the
             end-effector
@@ -910,7 +931,7 @@ class ETS(BaseETS):
         """
 
         try:
-            return ETS_fkine(self._fknm, q, base, tool, include_base)
+            return ETS_fkine(self._fknm, q, base, tool, include_base, n_threads)
         except BaseException:
             pass
 
@@ -938,6 +959,15 @@ class ETS(BaseETS):
         else:  # pragma: nocover
             tools = tool
 
+        if q.dtype.kind in "biuf":
+            # numeric, evaluate all configurations at once
+            T = self._eval_numpy(q, bases if include_base else None, tools)
+
+            if l > 1:
+                return T
+            else:
+                return T[0]
+
         if l > 1:
             T = zeros((l, 4, 4), dtype=object)
         else:
@@ -977,6 +1007,95 @@ class ETS(BaseETS):
 
         return T
 
+    def _eval_numpy(
+        self,
+        q: ndarray,
+        base: Union[ndarray, None] = None,
+        tool: Union[ndarray, None] = None,
+    ) -> ndarray:
+        """
+        Forward kinematics with NumPy
+
+        :param q: Joint coordinates
+        :type q: ArrayLike(n) or ndarray(m,n)
+        :param base: base transform, optional
+        :param tool: tool transform, optional
+
+        :return: The transformation matrices representing the pose of the
+            end-effector for each row of ``q``
+        :rtype: ndarray(m,4,4)
+
+        All configurations are evaluated at once, each elementary transform
+        is stacked into an (m,4,4) array and the stacks are multiplied with
+        ``matmul``.  This is the fallback of :func:`eval` when the compiled
+        extension cannot evaluate ``q``, and a reference for it.
+        """
+        q = array(getmatrix(q, (None, None)), dtype=float)
+
+        if base is None:
+            T = broadcast_to(eye(4), (q.shape[0], 4, 4))
+        else:
+            T = broadcast_to(array(base, dtype=float), (q.shape[0], 4, 4))
+
+        for et in self.data:
+            if et.isjoint:
+                jindex = 0 if et.jindex is None else et.jindex
+                qj = -q[:, jindex] if et.isflip else q[:, jindex]
+                T = T @ _et_batch(et.axis, qj)
+            else:
+                T = T @ et.A()
+
+        if tool is not None:
+            T = T @ tool
+
+        return T
+
+    def _jacob0_numpy(self, q: ndarray) -> Tuple[ndarray, ndarray]:
+        r"""
+        Jacobian in base frame with NumPy
+
+        :param q: Joint coordinates
+        :type q: ArrayLike(n) or ndarray(m,n)
+
+        :return: The end-effector pose and the Jacobian in the base frame
+            for each row of ``q``
+        :rtype: ndarray(m,4,4), ndarray(m,6,n)
+
+        As :func:`_eval_numpy` all configurations are evaluated at once.
+        Each column of the Jacobian is found from the axis and origin of the
+        joint frame, for a revolute joint it is :math:`(z \times (p_e - p),
+        z)` and for a prismatic joint :math:`(z, 0)`.  This suits building
+        statistics over many configurations, such as a reachability map.
+        """
+        q = array(getmatrix(q, (None, None)), dtype=float)
+        m = q.shape[0]
+
+        T = broadcast_to(eye(4), (m, 4, 4))
+        joints = []
+
+        for et in self.data:
+            if et.isjoint:
+                jindex = 0 if et.jindex is None else et.jindex
+                qj = -q[:, jindex] if et.isflip else q[:, jindex]
+                T = T @ _et_batch(et.axis, qj)
+                joints.append((et, jindex, T))
+            else:
+                T = T @ et.A()
+
+        J = zeros((m, 6, self.n))
+        for et, jindex, Tj in joints:
+            z = Tj[:, :3, "xyz".index(et.axis[1])]
+            if et.isflip:
+                z = -z
+
+            if et.isrotation:
+                J[:, :3, jindex] += cross(z, T[:, :3, 3] - Tj[:, :3, 3])
+                J[:, 3:, jindex] += z
+            else:
+                J[:, :3, jindex] += z
+
+        return T, J
+
     def jacob0(
         self,
         q: ArrayLike,
@@ -1009,6 +1128,12 @@ class ETS(BaseETS):
            {}^0 \nu = {}^0 \mathbf{J}(q) \dot{q} \in \mathbb{R}^6
         This velocity can be expressed relative to the {0} frame or the {e}
         frame.
+
+        **Trajectory operation**:
+        If ``q`` is a matrix (m,n) the result is an array (m,6,n) where
+        ``J[k]`` is the Jacobian for the configuration ``q[k,:]``. The
+        whole trajectory is computed in a single call to the C extension.
+
         :references:
             - `Kinematic Derivatives using the Elementary Transform Sequence, J. Haviland and P. Corke <https://arxiv.org/abs/2010.08696>`_
         :seealso: :func:`jacobe`, :func:`hessian0`
@@ -1112,6 +1237,10 @@ class ETS(BaseETS):
             Corke, Spong etal., Siciliano etal.  The end-effector velocity is
             described in terms of translational and angular velocity, not a
             velocity twist as per the text by Lynch & Park.
+
+        **Trajectory operation**:
+        If ``q`` is a matrix (m,n) the result is an array (m,6,n) where
+        ``J[k]`` is the Jacobian for the configuration ``q[k,:]``.
         """  # noqa
 
         # Use c extension
@@ -1165,6 +1294,12 @@ class ETS(BaseETS):
         Similarly, we can write
         .. math::
             \mat{J}_{i,j} = \frac{d u_i}{d q_j}
+
+        **Trajectory operation**:
+        If ``q`` is a matrix (m,n), or ``J0`` is an array (m,6,n) of
+        Jacobians, the result is an array (m,n,6,n) where ``H[k]`` is the
+        Hessian for the k'th configuration.
+
         :references:
             - Kinematic Derivatives using the Elementary Transform
               Sequence, J. Haviland and P. Corke
@@ -1245,6 +1380,12 @@ class ETS(BaseETS):
         Similarly, we can write
         .. math::
             \mat{J}_{i,j} = \frac{d u_i}{d q_j}
+
+        **Trajectory operation**:
+        If ``q`` is a matrix (m,n), or ``Je`` is an array (m,6,n) of
+        Jacobians, the result is an array (m,n,6,n) where ``H[k]`` is the
+        Hessian for the k'th configuration.
+
         :references:
             - Kinematic Derivatives using the Elementary Transform
               Sequence, J. Haviland and P. Corke
@@ -1283,6 +1424,113 @@ class ETS(BaseETS):
 
         return H
 
+    def kinematics(
+        self,
+        q: ArrayLike,
+        which: Union[str, List[str], Tuple[str, ...]] = ("T", "J0"),
+        tool: Union[ndarray, SE3, None] = None,
+    ):
+        r"""
+        Forward kinematics and its derivatives in one pass
+
+        :param q: Joint coordinate vector
+        :type q: ArrayLike
+        :param which: the quantities to compute, any of ``"T"``, ``"J0"``,
+            ``"Je"``, ``"H0"``, ``"manipulability"`` and ``"jacobm"``
+        :param tool: a static tool transformation matrix to apply to the
+            end of end, defaults to None
+        :raises ValueError: if ``which`` names an unknown quantity, or ``q``
+            is a trajectory
+
+        :return: a named tuple with the fields ``T``, ``J0``, ``Je``, ``H0``,
+            ``manipulability`` and ``jacobm``. Quantities not listed in
+            ``which`` are None.
+        :rtype: KinematicBundle
+
+        ``ets.kinematics(q, which)`` returns the same values as the separate
+        calls to ``eval``, ``jacob0``, ``jacobe``, ``hessian0``,
+        ``manipulability`` (Yoshikawa, all axes) and ``jacobm``. A single
+        traversal of the ETS gives the pose and the end-effector Jacobian.
+        The base frame Jacobian, Hessian, manipulability and its Jacobian are
+        derived from those rather than recomputing the partial transforms.
+        This suits controllers which need several of these every cycle.
+
+        Example:
+
+        .. runblock:: pycon
+
+            >>> import roboticstoolbox as rtb
+            >>> panda = rtb.models.Panda().ets()
+            >>> k = panda.kinematics(panda.qr, ["T", "Je", "jacobm"])
+            >>> k.T
+            >>> k.jacobm
+
+        :seealso: :func:`eval`, :func:`jacob0`, :func:`jacobe`,
+            :func:`hessian0`, :func:`jacobm`
+        """
+
+        if isinstance(which, str):
+            which = [which]
+
+        mask = 0
+        for w in which:
+            if w not in _KIN:
+                raise ValueError(f"unknown kinematic quantity {w}")
+            mask |= _KIN[w]
+
+        qa = array(q)
+        if qa.ndim == 2:
+            # a single configuration as a row or column vector
+            if 1 not in qa.shape:
+                raise ValueError(
+                    "q must be a single joint configuration, use eval, jacob0 "
+                    "or hessian0 for a trajectory"
+                )
+            q = qa.reshape(-1)
+
+        if isinstance(tool, SE3):
+            tool = tool.A
+
+        # Use c extension
+        try:
+            return KinematicBundle(*ETS_kinematics(self._fknm, q, tool, mask))
+        except TypeError:
+            pass
+
+        # Otherwise use Python
+        T = J0 = Je = H0 = m = Jm = None
+
+        if mask & _KIN["T"]:
+            T = self.eval(q, tool=tool)
+
+        if mask & _KIN["Je"]:
+            Je = self.jacobe(q, tool=tool)
+
+        if mask & (_KIN["J0"] | _KIN["H0"] | _KIN["manipulability"] | _KIN["jacobm"]):
+            J = self.jacob0(q, tool=tool)
+            if mask & _KIN["J0"]:
+                J0 = J
+
+            if mask & (_KIN["H0"] | _KIN["jacobm"]):
+                H = self.hessian0(J0=J)
+                if mask & _KIN["H0"]:
+                    H0 = H
+
+            if mask & (_KIN["manipulability"] | _KIN["jacobm"]):
+                manip = sqrt(abs(det(J @ J.T)))
+                if mask & _KIN["manipulability"]:
+                    m = manip
+
+                if mask & _KIN["jacobm"]:
+                    b = inv(J @ J.T)
+                    Jm = zeros((self.n, 1))
+
+                    for i in range(self.n):
+                        c = J @ H[i, :, :].T
+                        Jm[i, 0] = manip * (c.flatten("F")).T @ b.flatten("F")
+
+        return KinematicBundle(T, J0, Je, H0, m, Jm)
+
     def jacob0_analytical(
         self,
         q: ArrayLike,
@@ -1671,6 +1919,68 @@ class ETS(BaseETS):
 
         return dT[-1]
 
+    @staticmethod
+    def _ik_isbatch(Tep) -> bool:
+        """
+        Test whether ``Tep`` holds more than one pose
+        """
+        if isinstance(Tep, SE3):
+            return len(Tep) > 1
+        return isinstance(Tep, ndarray) and Tep.ndim == 3
+
+    def _ik_batch(
+        self,
+        method: int,
+        Tep: Union[ndarray, SE3],
+        q0: Union[ndarray, None],
+        ilimit: int,
+        slimit: int,
+        tol: float,
+        reject_jl: bool,
+        we: Union[ndarray, None],
+        λ: float = 1.0,
+        use_pinv: int = True,
+        pinv_damping: float = 0.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
+        traj: bool = False,
+        dq_max: float = 0.0,
+    ) -> Tuple[ndarray, ndarray, ndarray, ndarray, ndarray]:
+        """
+        Solve inverse kinematics for many poses in one call
+
+        The whole batch of ``m`` poses is solved in the C extension using
+        the solver selected by ``method``. The poses are shared between
+        ``n_threads`` native threads and the GIL is released while solving.
+        If ``traj`` is set the poses are instead solved in order, see
+        :func:`ik_traj`.
+
+        :return: inverse kinematic solutions
+        :rtype: tuple (q(m,n), success(m), iterations(m), searches(m), residual(m))
+        """
+
+        if isinstance(Tep, SE3):
+            Tep = array(Tep.A)
+
+        return IK_Batch(
+            method,
+            self._fknm,
+            Tep,
+            q0,
+            ilimit,
+            slimit,
+            tol,
+            reject_jl,
+            we,
+            λ,
+            use_pinv,
+            pinv_damping,
+            n_threads,
+            seed,
+            traj,
+            dq_max,
+        )
+
     def ik_lm_chan(
         self,
         Tep: Union[ndarray, SE3],
@@ -1681,6 +1991,8 @@ class ETS(BaseETS):
         reject_jl: bool = True,
         we: Union[ndarray, None] = None,
         λ: float = 1.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
     ) -> Tuple[ndarray, int, int, int, float]:
         """
         Numerical inverse kinematics by Levenberg-Marquadt optimization (Chan's Method)
@@ -1698,6 +2010,10 @@ class ETS(BaseETS):
             Corresponds to translation in X, Y and Z and rotation about X, Y and Z
             respectively
         :param λ: value of lambda for the damping matrix Wn
+        :param n_threads: number of native threads used to solve a batch of
+            poses, a value less than 1 uses all available cores
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
 
         :return: inverse kinematic solution
         :rtype: tuple (q, success, iterations, searches, residual)
@@ -1721,6 +2037,18 @@ class ETS(BaseETS):
         solution will be in error.  The amount of error is indicated by
         the ``residual``.
 
+        **Batch operation**:
+
+        If ``Tep`` is an ``SE3`` instance with ``m`` values or an ndarray(m,4,4)
+        then all ``m`` poses are solved within a single call to the C extension.
+        ``q0`` may then be None, a single ndarray(n) seed used for every pose,
+        or an ndarray(m,n) with one seed per pose. The returned ``q`` is an
+        ndarray(m,n) and ``success``, ``iterations``, ``searches`` and
+        ``residual`` are ndarray(m) with one element per pose. Each pose draws
+        its random restarts from an independent stream derived from ``seed``
+        and the index of the pose, so a seeded batch gives the same result
+        for any value of ``n_threads``.
+
         **Joint Limits**:
 
         ``sol = robot.ikine_LM(T, slimit=100)`` which is the deafualt for this method.
@@ -1774,7 +2102,24 @@ class ETS(BaseETS):
             TODO
         """
 
-        return IK_LM_Chan(self._fknm, Tep, q0, ilimit, slimit, tol, reject_jl, we, λ)
+        if self._ik_isbatch(Tep):
+            return self._ik_batch(
+                _IK_LM_CHAN,
+                Tep,
+                q0,
+                ilimit,
+                slimit,
+                tol,
+                reject_jl,
+                we,
+                λ=λ,
+                n_threads=n_threads,
+                seed=seed,
+            )
+
+        return IK_LM_Chan(
+            self._fknm, Tep, q0, ilimit, slimit, tol, reject_jl, we, λ, seed
+        )
 
     def ik_lm_wampler(
         self,
@@ -1786,6 +2131,8 @@ class ETS(BaseETS):
         reject_jl: bool = True,
         we: Union[ndarray, None] = None,
         λ: float = 1.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
     ) -> Tuple[ndarray, int, int, int, float]:
         """
         Numerical inverse kinematics by Levenberg-Marquadt optimization (Chan's Method)
@@ -1803,6 +2150,10 @@ class ETS(BaseETS):
             Corresponds to translation in X, Y and Z and rotation about X, Y and Z
             respectively
         :param λ: value of lambda for the damping matrix Wn
+        :param n_threads: number of native threads used to solve a batch of
+            poses, a value less than 1 uses all available cores
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
 
         :return: inverse kinematic solution
         :rtype: tuple (q, success, iterations, searches, residual)
@@ -1826,6 +2177,18 @@ class ETS(BaseETS):
         solution will be in error.  The amount of error is indicated by
         the ``residual``.
 
+        **Batch operation**:
+
+        If ``Tep`` is an ``SE3`` instance with ``m`` values or an ndarray(m,4,4)
+        then all ``m`` poses are solved within a single call to the C extension.
+        ``q0`` may then be None, a single ndarray(n) seed used for every pose,
+        or an ndarray(m,n) with one seed per pose. The returned ``q`` is an
+        ndarray(m,n) and ``success``, ``iterations``, ``searches`` and
+        ``residual`` are ndarray(m) with one element per pose. Each pose draws
+        its random restarts from an independent stream derived from ``seed``
+        and the index of the pose, so a seeded batch gives the same result
+        for any value of ``n_threads``.
+
         **Joint Limits**:
 
         ``sol = robot.ikine_LM(T, slimit=100)`` which is the deafualt for this method.
@@ -1879,7 +2242,24 @@ class ETS(BaseETS):
             TODO
         """
 
-        return IK_LM_Wampler(self._fknm, Tep, q0, ilimit, slimit, tol, reject_jl, we, λ)
+        if self._ik_isbatch(Tep):
+            return self._ik_batch(
+                _IK_LM_WAMPLER,
+                Tep,
+                q0,
+                ilimit,
+                slimit,
+                tol,
+                reject_jl,
+                we,
+                λ=λ,
+                n_threads=n_threads,
+                seed=seed,
+            )
+
+        return IK_LM_Wampler(
+            self._fknm, Tep, q0, ilimit, slimit, tol, reject_jl, we, λ, seed
+        )
 
     def ik_lm_sugihara(
         self,
@@ -1891,6 +2271,8 @@ class ETS(BaseETS):
         reject_jl: bool = True,
         we: Union[ndarray, None] = None,
         λ: float = 1.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
     ) -> Tuple[ndarray, int, int, int, float]:
         """
         Numerical inverse kinematics by Levenberg-Marquadt optimization (Chan's Method)
@@ -1908,6 +2290,10 @@ class ETS(BaseETS):
             Corresponds to translation in X, Y and Z and rotation about X, Y and Z
             respectively
         :param λ: value of lambda for the damping matrix Wn
+        :param n_threads: number of native threads used to solve a batch of
+            poses, a value less than 1 uses all available cores
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
 
         :return: inverse kinematic solution
         :rtype: tuple (q, success, iterations, searches, residual)
@@ -1931,6 +2317,18 @@ class ETS(BaseETS):
         solution will be in error.  The amount of error is indicated by
         the ``residual``.
 
+        **Batch operation**:
+
+        If ``Tep`` is an ``SE3`` instance with ``m`` values or an ndarray(m,4,4)
+        then all ``m`` poses are solved within a single call to the C extension.
+        ``q0`` may then be None, a single ndarray(n) seed used for every pose,
+        or an ndarray(m,n) with one seed per pose. The returned ``q`` is an
+        ndarray(m,n) and ``success``, ``iterations``, ``searches`` and
+        ``residual`` are ndarray(m) with one element per pose. Each pose draws
+        its random restarts from an independent stream derived from ``seed``
+        and the index of the pose, so a seeded batch gives the same result
+        for any value of ``n_threads``.
+
         **Joint Limits**:
 
         ``sol = robot.ikine_LM(T, slimit=100)`` which is the deafualt for this method.
@@ -1984,8 +2382,23 @@ class ETS(BaseETS):
             TODO
         """
 
+        if self._ik_isbatch(Tep):
+            return self._ik_batch(
+                _IK_LM_SUGIHARA,
+                Tep,
+                q0,
+                ilimit,
+                slimit,
+                tol,
+                reject_jl,
+                we,
+                λ=λ,
+                n_threads=n_threads,
+                seed=seed,
+            )
+
         return IK_LM_Sugihara(
-            self._fknm, Tep, q0, ilimit, slimit, tol, reject_jl, we, λ
+            self._fknm, Tep, q0, ilimit, slimit, tol, reject_jl, we, λ, seed
         )
 
     def ik_nr(
@@ -1999,6 +2412,8 @@ class ETS(BaseETS):
         we: Union[ndarray, None] = None,
         use_pinv: int = True,
         pinv_damping: float = 0.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
     ) -> Tuple[ndarray, int, int, int, float]:
         """
         Numerical inverse kinematics by Levenberg-Marquadt optimization (Chan's Method)
@@ -2016,6 +2431,10 @@ class ETS(BaseETS):
             Corresponds to translation in X, Y and Z and rotation about X, Y and Z
             respectively
         :param λ: value of lambda for the damping matrix Wn
+        :param n_threads: number of native threads used to solve a batch of
+            poses, a value less than 1 uses all available cores
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
 
         :return: inverse kinematic solution
         :rtype: tuple (q, success, iterations, searches, residual)
@@ -2039,6 +2458,18 @@ class ETS(BaseETS):
         solution will be in error.  The amount of error is indicated by
         the ``residual``.
 
+        **Batch operation**:
+
+        If ``Tep`` is an ``SE3`` instance with ``m`` values or an ndarray(m,4,4)
+        then all ``m`` poses are solved within a single call to the C extension.
+        ``q0`` may then be None, a single ndarray(n) seed used for every pose,
+        or an ndarray(m,n) with one seed per pose. The returned ``q`` is an
+        ndarray(m,n) and ``success``, ``iterations``, ``searches`` and
+        ``residual`` are ndarray(m) with one element per pose. Each pose draws
+        its random restarts from an independent stream derived from ``seed``
+        and the index of the pose, so a seeded batch gives the same result
+        for any value of ``n_threads``.
+
         **Joint Limits**:
 
         ``sol = robot.ikine_LM(T, slimit=100)`` which is the deafualt for this method.
@@ -2092,6 +2523,22 @@ class ETS(BaseETS):
             TODO
         """
 
+        if self._ik_isbatch(Tep):
+            return self._ik_batch(
+                _IK_NR,
+                Tep,
+                q0,
+                ilimit,
+                slimit,
+                tol,
+                reject_jl,
+                we,
+                use_pinv=use_pinv,
+                pinv_damping=pinv_damping,
+                n_threads=n_threads,
+                seed=seed,
+            )
+
         return IK_NR(
             self._fknm,
             Tep,
@@ -2103,6 +2550,7 @@ class ETS(BaseETS):
             we,
             use_pinv,
             pinv_damping,
+            seed,
         )
 
     def ik_gn(
@@ -2116,6 +2564,8 @@ class ETS(BaseETS):
         we: Union[ndarray, None] = None,
         use_pinv: int = True,
         pinv_damping: float = 0.0,
+        n_threads: int = 1,
+        seed: Union[int, None] = None,
     ) -> Tuple[ndarray, int, int, int, float]:
         """
         Numerical inverse kinematics by Levenberg-Marquadt optimization (Chan's Method)
@@ -2133,6 +2583,10 @@ class ETS(BaseETS):
             Corresponds to translation in X, Y and Z and rotation about X, Y and Z
             respectively
         :param λ: value of lambda for the damping matrix Wn
+        :param n_threads: number of native threads used to solve a batch of
+            poses, a value less than 1 uses all available cores
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
 
         :return: inverse kinematic solution
         :rtype: tuple (q, success, iterations, searches, residual)
@@ -2156,6 +2610,18 @@ class ETS(BaseETS):
         solution will be in error.  The amount of error is indicated by
         the ``residual``.
 
+        **Batch operation**:
+
+        If ``Tep`` is an ``SE3`` instance with ``m`` values or an ndarray(m,4,4)
+        then all ``m`` poses are solved within a single call to the C extension.
+        ``q0`` may then be None, a single ndarray(n) seed used for every pose,
+        or an ndarray(m,n) with one seed per pose. The returned ``q`` is an
+        ndarray(m,n) and ``success``, ``iterations``, ``searches`` and
+        ``residual`` are ndarray(m) with one element per pose. Each pose draws
+        its random restarts from an independent stream derived from ``seed``
+        and the index of the pose, so a seeded batch gives the same result
+        for any value of ``n_threads``.
+
         **Joint Limits**:
 
         ``sol = robot.ikine_LM(T, slimit=100)`` which is the deafualt for this method.
@@ -2209,6 +2675,22 @@ class ETS(BaseETS):
             TODO
         """
 
+        if self._ik_isbatch(Tep):
+            return self._ik_batch(
+                _IK_GN,
+                Tep,
+                q0,
+                ilimit,
+                slimit,
+                tol,
+                reject_jl,
+                we,
+                use_pinv=use_pinv,
+                pinv_damping=pinv_damping,
+                n_threads=n_threads,
+                seed=seed,
+            )
+
         return IK_GN(
             self._fknm,
             Tep,
@@ -2220,6 +2702,101 @@ class ETS(BaseETS):
             we,
             use_pinv,
             pinv_damping,
+            seed,
+        )
+
+    def ik_traj(
+        self,
+        Tep: Union[ndarray, SE3],
+        q0: Union[ndarray, None] = None,
+        method: str = "lm_chan",
+        ilimit: int = 30,
+        slimit: int = 100,
+        tol: float = 1e-6,
+        reject_jl: bool = True,
+        we: Union[ndarray, None] = None,
+        λ: float = 1.0,
+        use_pinv: int = True,
+        pinv_damping: float = 0.0,
+        dq_max: float = 0.5,
+        seed: Union[int, None] = None,
+    ) -> Tuple[ndarray, ndarray, ndarray, ndarray, ndarray]:
+        """
+        Numerical inverse kinematics along a pose trajectory
+
+        :param Tep: The desired end-effector pose trajectory
+        :param q0: initial joint configuration for the first pose (default to
+            random valid joint configuration contrained by the joint limits of
+            the robot)
+        :param method: the solver, one of ``"lm_chan"``, ``"lm_wampler"``,
+            ``"lm_sugihara"``, ``"nr"`` or ``"gn"``
+        :param ilimit: maximum number of iterations per search
+        :param slimit: maximum number of search attempts per pose
+        :param tol: final error tolerance
+        :param reject_jl: constrain the solution to being within the joint limits of
+            the robot
+        :param we: a mask vector which weights the end-effector error priority.
+            Corresponds to translation in X, Y and Z and rotation about X, Y and Z
+            respectively
+        :param λ: value of lambda for the damping matrix Wn, for the
+            Levenberg-Marquadt solvers
+        :param use_pinv: use the pseudo-inverse of the Jacobian, for the
+            ``"nr"`` and ``"gn"`` solvers
+        :param pinv_damping: damping of the pseudo-inverse, for the ``"nr"``
+            and ``"gn"`` solvers
+        :param dq_max: largest change of any joint coordinate between
+            consecutive poses, a value of 0 does not check continuity
+        :param seed: seed for the random restarts, a given seed makes the
+            solution repeatable while None uses a fresh random seed
+        :raises ValueError: if ``method`` is unknown
+
+        :return: inverse kinematic solutions
+        :rtype: tuple (q(m,n), success(m), iterations(m), searches(m), residual(m))
+
+        ``sol = ets.ik_traj(Tep)`` solves the ``m`` poses of ``Tep``, an
+        ``SE3`` instance or an ndarray(m,4,4), in order within a single call
+        to the C extension.  The first search for each pose starts from the
+        solution of the previous pose, for a dense path such as one from
+        ``ctraj`` this converges in a few iterations.  If it fails, or its
+        solution differs from the previous one by more than ``dq_max`` in any
+        joint, the solver restarts from random configurations up to
+        ``slimit`` searches in total.  If only solutions beyond ``dq_max``
+        are found the first of them is returned, so a jump in the trajectory
+        shows in ``q`` and in the number of ``searches``.  A pose which is
+        not solved does not seed the next pose.
+
+        :seealso: :func:`ik_lm_chan`, :func:`ik_nr`
+        """
+
+        methods = {
+            "nr": _IK_NR,
+            "gn": _IK_GN,
+            "lm_chan": _IK_LM_CHAN,
+            "lm_wampler": _IK_LM_WAMPLER,
+            "lm_sugihara": _IK_LM_SUGIHARA,
+        }
+
+        if method not in methods:
+            raise ValueError(f"unknown IK method {method}")
+
+        if isinstance(Tep, SE3):
+            Tep = array(Tep.A).reshape(-1, 4, 4)
+
+        return self._ik_batch(
+            methods[method],
+            Tep,
+            q0,
+            ilimit,
+            slimit,
+            tol,
+            reject_jl,
+            we,
+            λ=λ,
+            use_pinv=use_pinv,
+            pinv_damping=pinv_damping,
+            seed=seed,
+            traj=True,
+            dq_max=dq_max,
         )
 
 
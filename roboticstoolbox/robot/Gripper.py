@@ -8,7 +8,6 @@ import spatialmath as sm
 from spatialmath.base.argcheck import getvector
 from roboticstoolbox.robot.Link import Link
 from typing import List
-from functools import lru_cache
 from typing import Union
 from fknm import Robot_link_T
 
@@ -33,6 +32,7 @@ class Gripper:
 
         self.q = np.zeros(self.n)
         self._links = elinks
+        self._link_tf_cache = None
 
         # assign the joint indices
         if all(
@@ -178,14 +178,29 @@ class Gripper:
         """
         This private method updates the local transform of each link within
         this robot according to q (or self.q if q is none)
-        """
 
-        @lru_cache(maxsize=2)
-        def get_link_ets():
-            return [link.ets._fknm for link in self.links]
+        The fknm handles of the link ETS and the link scene nodes are cached
+        until the ETS of a link is replaced.  The update is skipped if ``q``
+        is the same as in the previous call.
+        """
 
-        @lru_cache(maxsize=2)
-        def get_link_scene_node():
-            return [link._T_reference for link in self.links]
+        if q is None:
+            q = self._q
+        else:
+            q = np.asarray(q)
+            if q.dtype == object:
+                q = self._q
+
+        ets = [link.ets for link in self.links]
+        cache = self._link_tf_cache
+        if cache is None or any(a is not b for a, b in zip(ets, cache[0])):
+            cache = self._link_tf_cache = [
+                ets,
+                [e._fknm for e in ets],
+                [link._T_reference for link in self.links],
+                None,
+            ]
 
-        Robot_link_T(get_link_ets(), get_link_scene_node(), self._q, q)
+        if not np.array_equal(q, cache[3]):
+            Robot_link_T(cache[1], cache[2], self._q, q)
+            cache[3] = np.array(q, dtype=np.float64)
@@ -727,7 +727,11 @@ class IKMixin:
 
             - The objective function is rather uncommon.
             - Order of magnitude slower than ``ikine_LM`` or ``ikine_LMS``, it
-              uses a scalar cost-function and does not provide a Jacobian.
+              uses a scalar cost-function.  Its gradient is computed from the
+              manipulator Jacobian, and for methods such as ``trust-constr``
+              a Gauss-Newton approximation of its Hessian is given, but if
+              ``costfun`` is given the gradient is estimated by finite
+              differences.
 
         :author: Bryan Moutrie, for RTB-MATLAB
 
@@ -785,14 +789,23 @@ class IKMixin:
             return E
 
         for Tk in T:
+            if costfun is None:
+                # analytic gradient, and Hessian for the methods using one
+                ikcost = _IKCost(self, Tk.A, weight, stiffness, end)
+                kwargs = {"fun": ikcost.fun, "jac": ikcost.jac}
+                if method in _hess_methods:
+                    kwargs["hess"] = ikcost.hess
+            else:
+                # the gradient of the user cost is not known
+                kwargs = {"fun": cost, "args": (Tk.A, weight, costfun, stiffness)}
+
             res = opt.minimize(
-                cost,
-                q0,
-                args=(Tk.A, weight, costfun, stiffness),
+                x0=q0,
                 bounds=bounds,
                 method=method,
                 tol=tol,
                 options=options,
+                **kwargs,
             )
 
             # trust-constr seems to work better than L-BFGS-B which often
@@ -820,6 +833,13 @@ class IKMixin:
         Each global optimizer has quite a different call signature, so final
         design will need a bit of thought.
 
+        The cost is the same as for :func:`ikine_min`.  The default
+        ``differential_evolution`` optimizer evaluates each generation of its
+        population in one call to the trajectory forward kinematics, and the
+        local minimizers of ``basinhopping`` and ``dual_annealing`` are given
+        the analytic gradient of the cost.  Extra arguments of the optimizer
+        can be passed in ``options``.
+
         """
 
         # basinhopping:
@@ -836,19 +856,11 @@ class IKMixin:
 
         solutions = []
 
-        # wr = 1 / self.reach
-        # weight = np.r_[wr, wr, wr, 1, 1, 1]
-
-        optdict = {}
+        wr = 1 / self.reach
+        weight = np.r_[wr, wr, wr, 1, 1, 1]
 
         if method is None:
-            method = "differential-evolution"
-
-        if method == "brute":
-            # requires a tuple of tuples
-            optdict["ranges"] = tuple([tuple(li.qlim) for li in self])
-        else:
-            optdict["bounds"] = tuple([tuple(li.qlim) for li in self])
+            method = "differential_evolution"
 
         if method not in [
             "basinhopping",
@@ -860,27 +872,228 @@ class IKMixin:
             raise ValueError("unknown global optimizer requested")
 
         global_minimizer = opt.__dict__[method]
+        bounds = tuple([tuple(li.qlim) for li in self])
 
-        def cost(q, T, weight):
-            # T, weight, costfun, stiffness = args
-            e = _angle_axis(self.fkine(q, end=end).A, T) * weight
-            return (e**2).sum()
+        for Tk in T:
+            ikcost = _IKCost(self, Tk.A, weight, end=end)
+            optdict = {}
+
+            if method == "brute":
+                # requires a tuple of tuples
+                optdict["ranges"] = bounds
+            elif method == "basinhopping":
+                optdict["x0"] = np.mean(bounds, axis=1)
+                optdict["minimizer_kwargs"] = {
+                    "method": "L-BFGS-B",
+                    "jac": ikcost.jac,
+                    "bounds": bounds,
+                }
+            else:
+                optdict["bounds"] = bounds
+
+            if method == "differential_evolution":
+                # the whole population is evaluated in one batch
+                optdict["vectorized"] = True
+                optdict["updating"] = "deferred"
+                fun = ikcost.batch
+            else:
+                fun = ikcost.fun
+
+            if method == "dual_annealing":
+                optdict["minimizer_kwargs"] = {"jac": ikcost.jac}
+
+            optdict.update(options)
+            res = global_minimizer(fun, **optdict)
 
-        for _ in T:
-            res = global_minimizer(cost, **optdict)
+            if method == "brute":
+                q = res
+                res = opt.OptimizeResult(
+                    x=q, success=True, message="", nit=None, fun=ikcost.fun(q)
+                )
 
             solution = iksol(res.x, res.success, res.message, res.nit, res.fun)
             solutions.append(solution)
 
-            # q0 was not used so I commented it out
-            # q0 = res.x  # use this solution as initial estimate for next time
-
         if len(T) == 1:
             return solutions[0]
         else:
             return solutions
 
 
+# minimize methods which accept a Hessian
+_hess_methods = [
+    "Newton-CG",
+    "dogleg",
+    "trust-ncg",
+    "trust-krylov",
+    "trust-exact",
+    "trust-constr",
+]
+
+
+class _IKCost:
+    r"""
+    Weighted pose error cost for the optimization based IK solvers
+
+    :param robot: the robot
+    :type robot: Robot
+    :param Td: desired end-effector pose
+    :type Td: ndarray(4,4)
+    :param weight: weight of the translation and rotation errors
+    :type weight: ndarray(6)
+    :param stiffness: weight of the joint variation, defaults to 0
+    :type stiffness: float
+    :param end: the end-effector link, defaults to the robot's
+    :type end: Link, str or None
+
+    The cost is the squared norm of the weighted error vector ``e`` from
+    :func:`_angle_axis`.  Its Jacobian is
+
+    .. math::
+
+        \frac{\partial e}{\partial q} = - \left( \begin{array}{c}
+            \mat{J}_v \\ \mat{J}_r^{-1}(a) \mat{J}_\omega
+        \end{array} \right)
+
+    where :math:`\mat{J}_v, \mat{J}_\omega` are the rows of the manipulator
+    Jacobian in the world frame and :math:`\mat{J}_r^{-1}(a)` is the inverse
+    right Jacobian of SO(3) at the rotation error :math:`a`.  The pose and
+    Jacobian are computed once for each configuration and shared by
+    :func:`fun`, :func:`jac` and :func:`hess`.
+    """
+
+    def __init__(self, robot, Td, weight, stiffness=0, end=None):
+        self.robot = robot
+        self.Td = Td
+        self.w2 = weight**2
+        self.stiffness = stiffness
+        self.end = end
+        self._q = None
+
+    def _update(self, q):
+        if self._q is not None and np.array_equal(q, self._q):
+            return
+
+        if isinstance(self.robot, rtb.DHRobot):
+            kin = self.robot.kinematics(q, ("T", "J0"))
+            J = -kin.J0
+        else:
+            kin = self.robot.kinematics(q, ("T", "J0"), end=self.end)
+
+            # T includes the base but J0 is in the base frame
+            R = self.robot.base.R
+            J = -kin.J0
+            J[:3, :] = R @ J[:3, :]
+            J[3:, :] = R @ J[3:, :]
+
+        e = _angle_axis(kin.T, self.Td)
+        J[3:, :] = _so3_jacobr_inv(e[3:]) @ J[3:, :]
+
+        self._q = np.array(q, dtype=float)
+        self._e = e
+        self._J = J
+
+    def fun(self, q):
+        """
+        Cost
+
+        :param q: joint coordinates
+        :type q: ndarray(n)
+        :return: the cost
+        :rtype: float
+        """
+        self._update(q)
+        E = self.w2 @ self._e**2
+
+        if self.stiffness > 0:
+            E += np.sum(np.diff(q) ** 2) * self.stiffness
+
+        return E
+
+    def jac(self, q):
+        """
+        Gradient of the cost
+
+        :param q: joint coordinates
+        :type q: ndarray(n)
+        :return: the gradient
+        :rtype: ndarray(n)
+        """
+        self._update(q)
+        g = 2 * self._J.T @ (self.w2 * self._e)
+
+        if self.stiffness > 0:
+            dq = 2 * self.stiffness * np.diff(q)
+            g[1:] += dq
+            g[:-1] -= dq
+
+        return g
+
+    def hess(self, q):
+        """
+        Gauss-Newton approximation of the Hessian of the cost
+
+        :param q: joint coordinates
+        :type q: ndarray(n)
+        :return: the Hessian, exact at a zero error
+        :rtype: ndarray(n,n)
+        """
+        self._update(q)
+        H = 2 * self._J.T @ (self.w2[:, np.newaxis] * self._J)
+
+        if self.stiffness > 0:
+            D = np.diff(np.eye(len(q)), axis=0)
+            H += 2 * self.stiffness * D.T @ D
+
+        return H
+
+    def batch(self, Q):
+        """
+        Cost of many configurations
+
+        :param Q: joint coordinates, one configuration per column
+        :type Q: ndarray(n,m)
+        :return: the cost of each configuration
+        :rtype: ndarray(m)
+
+        The poses are computed in one call to the trajectory forward
+        kinematics.
+        """
+        T = np.reshape(self.robot.fkine(Q.T, end=self.end).A, (-1, 4, 4))
+        e = _angle_axis_traj(T, self.Td)
+        E = e**2 @ self.w2
+
+        if self.stiffness > 0:
+            E += np.sum(np.diff(Q, axis=0) ** 2, axis=0) * self.stiffness
+
+        return E
+
+
+def _so3_jacobr_inv(a):
+    r"""
+    Inverse of the right Jacobian of SO(3)
+
+    :param a: Euler vector
+    :type a: ndarray(3)
+    :return: the matrix which maps a small rotation on the right of
+        :math:`\exp([a])` to the change of its Euler vector
+    :rtype: ndarray(3,3)
+    """
+    theta = base.norm(a)
+    A = base.skew(a)
+
+    if theta < 1e-8:
+        return np.eye(3) + 0.5 * A
+
+    s = math.sin(theta)
+    if abs(s) < 1e-12:
+        c = 1 / theta**2
+    else:
+        c = 1 / theta**2 - (1 + math.cos(theta)) / (2 * theta * s)
+
+    return np.eye(3) + 0.5 * A + c * A @ A
+
+
 def _angle_axis(T, Td):
     d = base.transl(Td) - base.transl(T)
     R = base.t2r(Td) @ base.t2r(T).T
@@ -901,6 +1114,37 @@ def _angle_axis(T, Td):
     return np.r_[d, a]
 
 
+def _angle_axis_traj(T, Td):
+    """
+    Pose error for many poses, as :func:`_angle_axis`
+
+    :param T: poses
+    :type T: ndarray(m,4,4)
+    :param Td: desired pose
+    :type Td: ndarray(4,4)
+    :return: the translation and rotation error of each pose
+    :rtype: ndarray(m,6)
+    """
+    d = Td[:3, 3] - T[:, :3, 3]
+    R = Td[:3, :3] @ np.swapaxes(T[:, :3, :3], 1, 2)
+    li = np.c_[
+        R[:, 2, 1] - R[:, 1, 2], R[:, 0, 2] - R[:, 2, 0], R[:, 1, 0] - R[:, 0, 1]
+    ]
+
+    ln = np.linalg.norm(li, axis=1)
+    tr = np.trace(R, axis1=1, axis2=2)
+    zero = ln < 10 * np.finfo(np.float64).eps
+
+    a = np.empty_like(li)
+    a[~zero] = (np.arctan2(ln, tr - 1)[~zero] / ln[~zero])[:, np.newaxis] * li[~zero]
+
+    # diagonal matrix case
+    diag = np.pi / 2 * (np.diagonal(R, axis1=1, axis2=2) + 1)
+    a[zero] = np.where((tr[zero] > 0)[:, np.newaxis], 0.0, diag[zero])
+
+    return np.c_[d, a]
+
+
 def _angle_axis_sekiguchi(T, Td):
     d = base.transl(Td) - base.transl(T)
     R = base.t2r(Td) @ base.t2r(T).T
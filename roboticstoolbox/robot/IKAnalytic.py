@@ -0,0 +1,352 @@
+"""
+Closed-form inverse kinematics for 6-axis DH robots
+
+The kinematic structure of a robot is recognised from its DH parameters and
+a solver is created with the link constants of that robot.  Each solver
+evaluates every solution branch for a stack of poses with NumPy array
+operations, there is no iteration.
+"""
+
+import numpy as np
+
+_HALFPI = np.pi / 2
+
+
+def _isclose(x, y):
+    return abs(x - y) < 1e-9
+
+
+def _dh(theta, d, a, alpha):
+    """
+    Standard DH link transforms for a vector of joint angles
+
+    :return: link transforms
+    :rtype: ndarray(m,4,4)
+    """
+    ct = np.cos(theta)
+    st = np.sin(theta)
+    ca = np.cos(alpha)
+    sa = np.sin(alpha)
+
+    T = np.zeros(theta.shape + (4, 4))
+    T[..., 0, 0] = ct
+    T[..., 0, 1] = -st * ca
+    T[..., 0, 2] = st * sa
+    T[..., 0, 3] = a * ct
+    T[..., 1, 0] = st
+    T[..., 1, 1] = ct * ca
+    T[..., 1, 2] = -ct * sa
+    T[..., 1, 3] = a * st
+    T[..., 2, 1] = sa
+    T[..., 2, 2] = ca
+    T[..., 2, 3] = d
+    T[..., 3, 3] = 1.0
+    return T
+
+
+def _inv(T):
+    """
+    Inverse of a stack of SE(3) matrices
+    """
+    Ti = np.zeros_like(T)
+    R = np.swapaxes(T[..., :3, :3], -1, -2)
+    Ti[..., :3, :3] = R
+    Ti[..., :3, 3] = -np.einsum("...ij,...j->...i", R, T[..., :3, 3])
+    Ti[..., 3, 3] = 1.0
+    return Ti
+
+
+def _acos(x):
+    """
+    Arc cosine which tolerates rounding just beyond +-1, and is NaN further
+    out
+    """
+    x = np.where(np.abs(x) - 1 < 1e-10, np.clip(x, -1, 1), np.nan)
+    return np.arccos(x)
+
+
+class _AnalyticIK:
+    """
+    Closed-form solver for a DH robot
+
+    :param robot: robot whose DH parameters define the solver
+    :type robot: DHRobot
+
+    The link constants are copied when the solver is created, so it must be
+    created again if the robot changes.  Subclasses implement
+    :func:`_solve` which returns the joint angles of every branch.
+    """
+
+    name = None
+    nbranches = 8
+
+    def __init__(self, robot):
+        L = robot.links
+        self.d = np.array([link.d for link in L], dtype=np.float64)
+        self.a = np.array([link.a for link in L], dtype=np.float64)
+        self.alpha = np.array([link.alpha for link in L], dtype=np.float64)
+        self.offset = np.array([link.offset for link in L], dtype=np.float64)
+
+    def solve(self, T):
+        """
+        Joint coordinates of all branches
+
+        :param T: end-effector poses with the base and tool removed
+        :type T: ndarray(m,4,4)
+        :return: joint coordinates, NaN where a branch has no solution
+        :rtype: ndarray(m,nbranches,6)
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            theta = self._solve(T)
+
+        # joint coordinates wrapped to +-pi
+        q = theta - self.offset
+        return np.mod(q + np.pi, 2 * np.pi) - np.pi
+
+    def _A(self, j, theta):
+        return _dh(theta, self.d[j], self.a[j], self.alpha[j])
+
+
+class _SphericalWristIK(_AnalyticIK):
+    """
+    Arm with a spherical wrist
+
+    The first joint axis is perpendicular to the second, the second and
+    third are parallel, and the last three intersect at a point.  The
+    shoulder and elbow may be offset, as for the Puma 560, IRB140 and KR5.
+    The wrist centre fixes the first three joints by an elbow solution, 4
+    branches, and the wrist orientation the last three as ZYZ Euler angles,
+    2 branches.
+    """
+
+    name = "spherical"
+
+    @staticmethod
+    def matches(robot):
+        al = [link.alpha for link in robot.links]
+        return (
+            robot.isspherical()
+            and _isclose(abs(al[0]), _HALFPI)
+            and _isclose(al[1], 0)
+        )
+
+    def _solve(self, T):
+        d, a, al = self.d, self.a, self.alpha
+        m = T.shape[0]
+        R06 = T[:, :3, :3]
+
+        # wrist centre, the origin of frame 4
+        A6 = _dh(np.zeros(1), d[5], a[5], al[5])[0]
+        c = _inv(A6)[:3, 3]
+        W = T[:, :3, 3] + R06 @ c
+
+        s1 = np.sin(al[0])
+        # offsets of the elbow plane from joint 2, and the forearm vector
+        zoff = d[1] + d[2] + np.cos(al[2]) * d[3]
+        v = -s1 * zoff
+        fx = a[2]
+        fy = -np.sin(al[2]) * d[3]
+        Lf = np.hypot(fx, fy)
+        phi = np.arctan2(fy, fx)
+
+        # Rx(alpha6) is removed from the wrist rotation
+        Ra6 = _dh(np.zeros(1), 0, 0, al[5])[0, :3, :3]
+        sigma = -np.sin(al[3])
+
+        theta = np.full((m, 2, 2, 2, 6), np.nan)
+        for i, su in enumerate((1, -1)):
+            u = su * np.sqrt(W[:, 0] ** 2 + W[:, 1] ** 2 - v**2)
+            t1 = np.arctan2(W[:, 1], W[:, 0]) - np.arctan2(v, u)
+            x1 = u - a[0]
+            y1 = s1 * (W[:, 2] - d[0])
+
+            D = (x1**2 + y1**2 - a[1] ** 2 - Lf**2) / (2 * a[1] * Lf)
+            for j, sb in enumerate((1, -1)):
+                beta = sb * _acos(D)
+                t3 = beta - phi
+                t2 = np.arctan2(y1, x1) - np.arctan2(
+                    Lf * np.sin(beta), a[1] + Lf * np.cos(beta)
+                )
+
+                R03 = (self._A(0, t1) @ self._A(1, t2) @ self._A(2, t3))[:, :3, :3]
+                R = np.swapaxes(R03, 1, 2) @ R06 @ Ra6.T
+
+                for k, (t4, t5, t6) in enumerate(self._zyz(R)):
+                    theta[:, i, j, k] = np.c_[t1, t2, t3, t4, sigma * t5, t6]
+
+        return theta.reshape(m, 8, 6)
+
+    @staticmethod
+    def _zyz(R):
+        """
+        Both ZYZ Euler angle solutions of rotation matrices
+        """
+        s5 = np.hypot(R[:, 0, 2], R[:, 1, 2])
+        singular = s5 < 1e-12
+
+        # at a singularity only theta4 + theta6 is defined, set theta4 = 0
+        t6s = np.where(
+            R[:, 2, 2] > 0,
+            np.arctan2(R[:, 1, 0], R[:, 0, 0]),
+            np.arctan2(R[:, 0, 1], -R[:, 0, 0]),
+        )
+
+        out = []
+        for sign in (1, -1):
+            t5 = np.arctan2(sign * s5, R[:, 2, 2])
+            t4 = np.arctan2(sign * R[:, 1, 2], sign * R[:, 0, 2])
+            t6 = np.arctan2(sign * R[:, 2, 1], -sign * R[:, 2, 0])
+            t4 = np.where(singular, 0, t4)
+            t6 = np.where(singular, t6s, t6)
+            out.append((t4, t5, t6))
+        return out
+
+
+class _ParallelAxesIK(_AnalyticIK):
+    """
+    Arm with three parallel axes
+
+    Joints 2, 3 and 4 are parallel and joint 5 is perpendicular to joints 4
+    and 6, as for the Universal Robots arms.  The offset along the parallel
+    axes fixes joint 1, 2 branches, the approach direction joint 5, 2
+    branches, and joints 2 to 4 form a planar elbow, 2 branches.
+
+    :reference:
+        - Analytic Inverse Kinematics for the Universal Robots UR-5/UR-10
+          Arms, K. P. Hawkins, Georgia Institute of Technology, 2013
+    """
+
+    name = "parallel"
+
+    @staticmethod
+    def matches(robot):
+        L = robot.links
+        al = [link.alpha for link in L]
+        return (
+            all(link.sigma == 0 for link in L)
+            and _isclose(abs(al[0]), _HALFPI)
+            and _isclose(al[1], 0)
+            and _isclose(al[2], 0)
+            and _isclose(abs(al[3]), _HALFPI)
+            and _isclose(abs(al[4]), _HALFPI)
+            and all(_isclose(L[j].a, 0) for j in (0, 3, 4, 5))
+        )
+
+    def _solve(self, T):
+        d, a, al = self.d, self.a, self.alpha
+        m = T.shape[0]
+        sa1 = np.sin(al[0])
+        sa4 = np.sin(al[3])
+        sa5 = np.sin(al[4])
+
+        # origin of frame 5 and the offset along the parallel axes
+        P5 = T[:, :3, 3] - d[5] * T[:, :3, 2]
+        D = sa1 * (d[1] + d[2] + d[3])
+        r = np.hypot(P5[:, 0], P5[:, 1])
+        psi = np.arctan2(P5[:, 1], P5[:, 0])
+
+        # Rx(alpha6) is removed from the end-effector rotation
+        Ra6 = _dh(np.zeros(1), 0, 0, al[5])[0, :3, :3]
+        R6 = T[:, :3, :3] @ Ra6.T
+
+        theta = np.full((m, 2, 2, 2, 6), np.nan)
+        # shoulder left and right
+        gamma = np.arcsin(D / r)
+        for i, t1 in enumerate((psi + gamma, psi + np.pi - gamma)):
+            # axis of joints 2 to 4
+            z1 = sa1 * np.c_[np.sin(t1), -np.cos(t1), np.zeros(m)]
+            c5 = -sa4 * sa5 * np.einsum("ij,ij->i", T[:, :3, 2], z1)
+
+            for j, s in enumerate((1, -1)):
+                t5 = s * _acos(c5)
+
+                # z1 in frame 6 is sa4 * (c6 s5, -s6 s5, -c5 sa5)
+                w = np.einsum("ikj,ik->ij", R6, z1) / sa4
+                t6 = np.arctan2(-s * w[:, 1], s * w[:, 0])
+
+                # at the wrist singularity w gives no direction
+                singular = np.hypot(w[:, 0], w[:, 1]) < 1e-9
+                if singular.any():
+                    t6[singular] = self._singular_t6(
+                        T[singular], t1[singular], t5[singular]
+                    )
+
+                # planar elbow in frame 1
+                T14 = self._T14(T, t1, t5, t6)
+                x = T14[:, 0, 3]
+                y = T14[:, 1, 3]
+                c3 = (x**2 + y**2 - a[1] ** 2 - a[2] ** 2) / (2 * a[1] * a[2])
+
+                for k, sb in enumerate((1, -1)):
+                    t3 = sb * _acos(c3)
+                    t2 = np.arctan2(y, x) - np.arctan2(
+                        a[2] * np.sin(t3), a[1] + a[2] * np.cos(t3)
+                    )
+                    t4 = np.arctan2(T14[:, 1, 0], T14[:, 0, 0]) - t2 - t3
+                    theta[:, i, j, k] = np.c_[t1, t2, t3, t4, t5, t6]
+
+        return theta.reshape(m, 8, 6)
+
+    def _T14(self, T, t1, t5, t6):
+        """
+        Pose of frame 4 in frame 1
+        """
+        return _inv(self._A(0, t1)) @ T @ _inv(self._A(5, t6)) @ _inv(self._A(4, t5))
+
+    def _singular_t6(self, T, t1, t5):
+        """
+        Joint 6 at the wrist singularity
+
+        With joint 5 at 0 or pi joint 6 is parallel to joints 2 to 4, and the
+        pose fixes only the sum of joints 2, 3, 4 and 6.  As joint 6 turns
+        the origin of frame 4 moves on a circle in the plane of the elbow.
+        Joint 6 is chosen to put it where the elbow is square, or as near to
+        that as the circle allows, so the elbow is reachable whenever some
+        joint 6 angle makes it so.
+        """
+        a = self.a
+        m = T.shape[0]
+
+        # the circle from the origin of frame 4 for t6 = 0, pi/2 and pi
+        p0, p1, p2 = (
+            self._T14(T, t1, t5, np.full(m, t))[:, :2, 3]
+            for t in (0, _HALFPI, np.pi)
+        )
+        c = (p0 + p2) / 2
+        u = (p0 - p2) / 2
+        v = p1 - c
+
+        # x^2 + y^2 = |c|^2 + |u|^2 + 2 R cos(t6 - phi), square for a1^2 + a2^2
+        cu = np.einsum("ij,ij->i", c, u)
+        cv = np.einsum("ij,ij->i", c, v)
+        R = np.hypot(cu, cv)
+        k = (a[1] ** 2 + a[2] ** 2 - np.sum(c**2 + u**2, axis=1)) / (2 * R)
+        return np.arctan2(cv, cu) + np.arccos(np.clip(k, -1, 1))
+
+
+_solvers = [_SphericalWristIK, _ParallelAxesIK]
+
+
+def analytic_solver(robot):
+    """
+    Create a closed-form solver for a robot
+
+    :param robot: robot
+    :type robot: DHRobot
+    :return: solver for the kinematic structure of the robot, or None if it
+        is not recognised
+    :rtype: _AnalyticIK subclass instance or None
+
+    The robot must have 6 revolute joints and standard DH parameters.
+    """
+    if robot.n != 6 or robot.mdh or any(link.sigma != 0 for link in robot.links):
+        return None
+
+    if robot.symbolic:
+        return None
+
+    for solver in _solvers:
+        if solver.matches(robot):
+            return solver(robot)
+
+    return None
@@ -0,0 +1,566 @@
+import numpy as np
+from collections import namedtuple
+from spatialmath import SE3
+from scipy.spatial import cKDTree
+from scipy.spatial.transform import Rotation
+from roboticstoolbox.robot.ETS import ETS
+from roboticstoolbox.robot.DHRobot import DHRobot
+from roboticstoolbox.robot.ERobot import ERobot
+
+IKCacheInfo = namedtuple("IKCacheInfo", "hits misses maxsize currsize")
+
+
+class IKCache:
+    """
+    Inverse kinematic solution cache
+
+    Numerical inverse kinematics converges in a few iterations when started
+    close to a solution, but from a random configuration it may take many
+    iterations and restarts.  Applications such as pick and place often
+    request poses which are close to poses already solved.
+
+    The ``IKCache`` acts as a proxy for an ``ETS`` or ``Robot`` subclass
+    object and remembers the solutions it finds as (pose, q) pairs.  For a new
+    pose the solver is first started from the solutions of the nearest known
+    poses and only if these fail does it fall back to random restarts.
+
+    For example::
+
+        robot = models.Panda()
+        ikc = IKCache(robot, maxsize=50000)
+        ikc.fill(10000, seed=0)         # optional, offline
+        ikc.save("panda_ik.npz")
+
+        q, success, its, searches, residual = ikc.ik(Tep)
+
+    The distance between two poses is the distance between their origins
+    plus ``rweight`` times the angle between their orientations, so
+    ``rweight`` is the translation in metres considered equivalent to a
+    rotation of one radian.  Poses are held in a k-d tree over position and
+    unit quaternion, which is rebuilt lazily as poses are added.
+
+    The cache holds at most ``maxsize`` entries.  When it is full the least
+    recently used tenth of the entries, those that have least recently
+    seeded a solution, are evicted.  The cache is cleared automatically when
+    a robot reports a change to its kinematics through
+    :func:`~roboticstoolbox.Robot.kinchanged`, or when its base or tool
+    transform changes.
+
+    :seealso: :func:`ik`, :func:`fill`, :func:`save`, :func:`load`
+    """
+
+    def __init__(self, robot, maxsize=10000, rweight=0.2, end=None, start=None):
+        """
+        Create inverse kinematic cache instance
+
+        :param robot: robot or kinematic chain to be cached
+        :type robot: ETS or Robot subclass instance
+        :param maxsize: maximum number of cached solutions, defaults to 10000
+        :type maxsize: int, optional
+        :param rweight: translation equivalent to a rotation of one radian,
+            in metres, defaults to 0.2
+        :type rweight: float, optional
+        :param end: the particular link or gripper to solve for, for an
+            ``ERobot``
+        :type end: str or Link instance, optional
+        :param start: the link considered as the base frame, for an ``ERobot``
+        :type start: str or Link instance, optional
+        :raises ValueError: if ``maxsize`` is less than 1 or ``rweight`` is
+            negative
+        :raises TypeError: if ``robot`` is not an ``ETS`` or robot
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if rweight < 0:
+            raise ValueError("rweight must not be negative")
+
+        if not isinstance(robot, (ETS, ERobot, DHRobot)):
+            raise TypeError("robot must be an ETS, ERobot or DHRobot")
+
+        self._robot = robot
+        self._end = end
+        self._start = start
+        self._maxsize = int(maxsize)
+        self._rweight = float(rweight)
+        self._epoch = None
+        self._ets = None
+        self._update_ets()
+
+        n = self._ets.n
+        # pose features are position and unit quaternion, w >= 0
+        self._x = np.zeros((self._maxsize, 7))
+        self._q = np.zeros((self._maxsize, n))
+        self._used = np.zeros(self._maxsize, dtype=np.int64)
+        self._size = 0
+        self._clock = 0
+
+        # entries [0, _ntree) are in the k-d tree, later ones are searched
+        # exhaustively until the tree is rebuilt
+        self._tree = None
+        self._ntree = 0
+
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        """
+        Number of cached solutions
+
+        :return: number of (pose, q) pairs in the cache
+        :rtype: int
+        """
+        self._check()
+        return self._size
+
+    def __str__(self):
+        return (
+            f"IKCache({self._ets.n} joints, {self._size}/{self._maxsize} "
+            f"solutions, rweight={self._rweight})"
+        )
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def robot(self):
+        """
+        Get the cached robot
+
+        :return: the robot or kinematic chain passed to the constructor
+        :rtype: ETS or Robot subclass instance
+        """
+        return self._robot
+
+    @property
+    def rweight(self):
+        """
+        Get the rotation weight
+
+        :return: translation equivalent to a rotation of one radian
+        :rtype: float
+        """
+        return self._rweight
+
+    def cache_info(self):
+        """
+        Inverse kinematic cache statistics
+
+        :return: cache statistics
+        :rtype: IKCacheInfo named tuple
+
+        The named tuple has elements ``hits`` and ``misses``.  A hit is a pose
+        solved by a search started from a cached solution, a miss is a pose
+        which needed random restarts.  The elements ``maxsize`` and
+        ``currsize`` are the maximum and current number of cache entries.
+        The statistics are not reset by :func:`clear`.
+        """
+        return IKCacheInfo(self._hits, self._misses, self._maxsize, len(self))
+
+    def clear(self):
+        """
+        Clear the inverse kinematic cache
+
+        All cached solutions are discarded, the hit and miss statistics are
+        kept.  This is done automatically when the robot changes, see
+        :class:`IKCache`.
+        """
+        self._size = 0
+        self._clock = 0
+        self._tree = None
+        self._ntree = 0
+
+    def add(self, T, q):
+        """
+        Add solutions to the cache
+
+        :param T: end-effector poses
+        :type T: SE3 instance or ndarray(4,4) or ndarray(m,4,4)
+        :param q: joint coordinates for the poses
+        :type q: ndarray(n) or ndarray(m,n)
+        :raises ValueError: if the dimensions of ``T`` and ``q`` do not agree
+
+        The joint coordinates are assumed to be an exact solution for the
+        pose, as given by forward kinematics.
+        """
+        self._check()
+        T = self._poses(T)
+        q = np.array(q, dtype=np.float64, ndmin=2)
+
+        if q.shape != (T.shape[0], self._ets.n):
+            raise ValueError("T and q must hold the same number of solutions")
+
+        self._insert(self._features(T), q)
+
+    def fill(self, m, seed=None):
+        """
+        Fill the cache with random solutions
+
+        :param m: number of solutions to add
+        :type m: int
+        :param seed: seed for the random configurations, a given seed makes
+            the result repeatable
+        :type seed: int, optional
+
+        Random joint configurations within the joint limits are generated by
+        :func:`~roboticstoolbox.ETS.random_q` and added to the cache with
+        their forward kinematics.  This is intended to be done offline,
+        followed by :func:`save`, so that a cold start does not need random
+        restarts for most poses.
+        """
+        self._check()
+        if m < 1:
+            return
+
+        q = np.array(self._ets.random_q(m, seed=seed), ndmin=2)
+        T = np.array(self._ets.eval(q)).reshape(-1, 4, 4)
+        self._insert(self._features(T), q)
+
+    def nearest(self, T, k=1):
+        """
+        Cached solutions for the nearest poses
+
+        :param T: end-effector pose
+        :type T: SE3 instance or ndarray(4,4)
+        :param k: number of solutions, defaults to 1
+        :type k: int
+        :return: joint coordinates and pose distances of at most ``k``
+            cached solutions, nearest first
+        :rtype: ndarray(k,n), ndarray(k)
+
+        The distance is that described for :class:`IKCache`.
+        """
+        self._check()
+        idx, d = self._nearest(self._features(self._poses(T)), k)
+        return self._q[idx[0]].copy(), d[0]
+
+    def ik(
+        self,
+        Tep,
+        method="lm_chan",
+        nseeds=3,
+        slimit=100,
+        store=True,
+        **kwargs,
+    ):
+        """
+        Inverse kinematics seeded from the cache
+
+        :param Tep: The desired end-effector pose or poses
+        :type Tep: SE3 instance or ndarray(4,4) or ndarray(m,4,4)
+        :param method: the solver, one of ``"lm_chan"``, ``"lm_wampler"``,
+            ``"lm_sugihara"``, ``"nr"`` or ``"gn"``, defaults to ``"lm_chan"``
+        :type method: str
+        :param nseeds: number of cached solutions tried before random
+            restarts, for a single pose, defaults to 3
+        :type nseeds: int
+        :param slimit: maximum number of search attempts, including those
+            started from cached solutions
+        :type slimit: int
+        :param store: add the solutions found to the cache, defaults to True
+        :type store: bool
+        :param kwargs: options passed to the solver, such as ``ilimit``,
+            ``tol``, ``reject_jl``, ``we`` or ``λ``
+        :raises ValueError: if ``method`` is unknown
+        :return: inverse kinematic solution
+        :rtype: tuple (q, success, iterations, searches, residual)
+
+        The solution is as returned by the method ``ik_<method>`` of the
+        ``ETS``, for example :func:`~roboticstoolbox.ETS.ik_lm_chan`, with the
+        iterations and searches accumulated over all attempts.
+
+        For a single pose the solver makes a single search from each of the
+        ``nseeds`` nearest cached solutions in turn, then if none converged
+        makes random restarts up to ``slimit`` searches in total.  For a batch
+        of poses, given as an ``SE3`` instance with ``m`` values or an
+        ndarray(m,4,4), each pose is seeded with the solution of its nearest
+        cached pose and the batch is solved in one call to the C extension.
+
+        :seealso: :func:`nearest`, :func:`add`
+        """
+        if method not in ("nr", "gn", "lm_chan", "lm_wampler", "lm_sugihara"):
+            raise ValueError(f"unknown IK method {method}")
+
+        self._check()
+        solver = getattr(self._ets, "ik_" + method)
+        batch = ETS._ik_isbatch(Tep)
+        T = self._poses(Tep)
+        x = self._features(T)
+
+        if batch:
+            idx, d = self._nearest(x, 1)
+            q0 = self._q[idx[:, 0]] if self._size > 0 else None
+            sol = solver(T, q0=q0, slimit=slimit, **kwargs)
+            success = np.asarray(sol[1], dtype=bool)
+            hit = success & (np.asarray(sol[3]) == 1) & (q0 is not None)
+            if q0 is not None:
+                self._touch(idx[hit, 0])
+            self._hits += int(hit.sum())
+            self._misses += len(T) - int(hit.sum())
+            # don't store a pose which is already cached
+            if q0 is not None:
+                new = success & (d[:, 0] >= 1e-6)
+            else:
+                new = success
+            if store and new.any():
+                self._insert(x[new], np.asarray(sol[0])[new])
+            return sol
+
+        idx, d = self._nearest(x, max(min(nseeds, slimit), 1))
+        iterations = 0
+        searches = 0
+        sol = None
+
+        for i in idx[0, :nseeds]:
+            sol = solver(T[0], q0=self._q[i], slimit=1, **kwargs)
+            iterations += sol[2]
+            searches += sol[3]
+            if sol[1]:
+                self._touch(i)
+                self._hits += 1
+                break
+        else:
+            self._misses += 1
+            if searches < slimit:
+                sol = solver(T[0], slimit=slimit - searches, **kwargs)
+                iterations += sol[2]
+                searches += sol[3]
+
+        # don't store a pose which is already cached
+        if store and sol[1] and not (d.size > 0 and d[0, 0] < 1e-6):
+            self._insert(x, np.array(sol[0], ndmin=2))
+
+        return sol[0], sol[1], iterations, searches, sol[4]
+
+    def save(self, filename):
+        """
+        Save the cache to a file
+
+        :param filename: name of the file, the ``.npz`` extension is added if
+            not given
+        :type filename: str or Path
+
+        The cached poses and solutions are written with ``numpy.savez``,
+        most recently used last.
+
+        :seealso: :func:`load`
+        """
+        self._check()
+        order = np.argsort(self._used[: self._size], kind="stable")
+        np.savez(
+            filename,
+            x=self._x[order],
+            q=self._q[order],
+            rweight=self._rweight,
+        )
+
+    def load(self, filename):
+        """
+        Load solutions from a file
+
+        :param filename: name of a file written by :func:`save`
+        :type filename: str or Path
+        :raises ValueError: if the solutions are for a different number of
+            joints
+
+        The solutions are added to those already in the cache, if the file
+        holds more than ``maxsize`` solutions the most recently used are
+        kept.
+
+        :seealso: :func:`save`
+        """
+        self._check()
+        with np.load(filename) as data:
+            x = data["x"]
+            q = data["q"]
+
+        if q.ndim != 2 or q.shape[1] != self._ets.n:
+            raise ValueError(
+                f"file holds solutions for {q.shape[-1]} joints, "
+                f"expecting {self._ets.n}"
+            )
+
+        self._insert(x[-self._maxsize :], q[-self._maxsize :])
+
+    # --------------------------------------------------------------------- #
+
+    def _update_ets(self):
+        """
+        Get the kinematic chain of the robot
+
+        The chain is found again when the robot reports a change.
+        """
+        robot = self._robot
+        if isinstance(robot, ETS):
+            self._ets = robot
+            return
+
+        self._epoch = robot._cache_epoch
+        if isinstance(robot, ERobot):
+            self._ets = robot.ets(self._start, self._end)
+        else:
+            self._ets = robot.ets()
+
+    def _check(self):
+        """
+        Clear the cache if the robot has changed
+        """
+        if isinstance(self._robot, ETS):
+            return
+
+        if self._robot._cache_epoch != self._epoch:
+            # robot has changed, cached solutions are stale
+            self.clear()
+            self._update_ets()
+
+    @staticmethod
+    def _poses(T):
+        """
+        Convert poses to an array
+
+        :param T: pose or poses
+        :type T: SE3 instance or ndarray(4,4) or ndarray(m,4,4)
+        :return: poses
+        :rtype: ndarray(m,4,4)
+        """
+        if isinstance(T, SE3):
+            T = T.A
+        return np.array(T, dtype=np.float64).reshape(-1, 4, 4)
+
+    @staticmethod
+    def _features(T):
+        """
+        Position and unit quaternion of poses
+
+        :param T: poses
+        :type T: ndarray(m,4,4)
+        :return: position and quaternion ``(x, y, z, qx, qy, qz, qw)`` with
+            ``qw >= 0``
+        :rtype: ndarray(m,7)
+        """
+        quat = Rotation.from_matrix(T[:, :3, :3]).as_quat()
+        quat[quat[:, 3] < 0] *= -1
+        return np.c_[T[:, :3, 3], quat]
+
+    def _scale(self, x):
+        """
+        Scale features for the k-d tree
+
+        For a small angle θ between two orientations the distance between
+        their quaternions is about θ/2, so the quaternion is scaled by
+        ``2 * rweight``.
+        """
+        return np.c_[x[:, :3], 2 * self._rweight * x[:, 3:]]
+
+    def _distance(self, x, idx):
+        """
+        Distance from poses to cached poses
+
+        :param x: pose features
+        :type x: ndarray(m,7)
+        :param idx: indices of cached poses for each pose
+        :type idx: ndarray(m,k)
+        :return: pose distances
+        :rtype: ndarray(m,k)
+        """
+        y = self._x[idx]
+        dt = np.linalg.norm(y[:, :, :3] - x[:, np.newaxis, :3], axis=2)
+        dot = np.abs(np.einsum("mkj,mj->mk", y[:, :, 3:], x[:, 3:]))
+        return dt + self._rweight * 2 * np.arccos(np.minimum(dot, 1.0))
+
+    def _nearest(self, x, k):
+        """
+        Find the nearest cached poses
+
+        :param x: pose features
+        :type x: ndarray(m,7)
+        :param k: number of neighbours
+        :type k: int
+        :return: indices of, and distances to, the at most ``k`` nearest
+            cached poses of each pose, nearest first
+        :rtype: ndarray(m,k'), ndarray(m,k')
+        """
+        m = x.shape[0]
+        k = min(k, self._size)
+        if k < 1:
+            return np.zeros((m, 0), dtype=int), np.zeros((m, 0))
+
+        pending = self._size - self._ntree
+        if pending > max(32, self._ntree // 8):
+            self._tree = cKDTree(self._scale(self._x[: self._size]))
+            self._ntree = self._size
+            pending = 0
+
+        candidates = [np.broadcast_to(np.arange(self._ntree, self._size), (m, pending))]
+
+        if self._ntree > 0:
+            # q and -q are the same orientation, query with both
+            kt = min(k, self._ntree)
+            xs = self._scale(x)
+            xn = xs.copy()
+            xn[:, 3:] *= -1
+            _, i = self._tree.query(np.r_[xs, xn], kt)
+            i = np.reshape(i, (2, m, kt))
+            candidates.extend(i)
+
+        idx = np.concatenate(candidates, axis=1)
+        d = self._distance(x, idx)
+        order = np.argsort(d, axis=1, kind="stable")
+
+        # a pose may be found by both queries, keep distinct indices
+        idx = np.take_along_axis(idx, order, axis=1)
+        d = np.take_along_axis(d, order, axis=1)
+        dup = np.zeros_like(idx, dtype=bool)
+        dup[:, 1:] = idx[:, 1:] == idx[:, :-1]
+        d[dup] = np.inf
+        order = np.argsort(d, axis=1, kind="stable")[:, :k]
+
+        return (
+            np.take_along_axis(idx, order, axis=1),
+            np.take_along_axis(d, order, axis=1),
+        )
+
+    def _touch(self, idx):
+        """
+        Mark cached solutions as used
+        """
+        self._clock += 1
+        self._used[idx] = self._clock
+
+    def _insert(self, x, q):
+        """
+        Add pose features and solutions
+
+        :param x: pose features
+        :type x: ndarray(m,7)
+        :param q: joint coordinates
+        :type q: ndarray(m,n)
+
+        When the cache is full the least recently used entries are evicted,
+        at least a tenth of the cache at a time so that the k-d tree is not
+        rebuilt for every new entry.
+        """
+        m = x.shape[0]
+        if m > self._maxsize:
+            x = x[-self._maxsize :]
+            q = q[-self._maxsize :]
+            m = self._maxsize
+
+        if self._size + m > self._maxsize:
+            evict = max(self._size + m - self._maxsize, self._maxsize // 10)
+            keep = np.sort(
+                np.argsort(self._used[: self._size], kind="stable")[evict:]
+            )
+            nkeep = len(keep)
+            self._x[:nkeep] = self._x[keep]
+            self._q[:nkeep] = self._q[keep]
+            self._used[:nkeep] = self._used[keep]
+            self._size = nkeep
+            self._tree = None
+            self._ntree = 0
+
+        self._clock += 1
+        s = slice(self._size, self._size + m)
+        self._x[s] = x
+        self._q[s] = q
+        self._used[s] = self._clock
+        self._size += m
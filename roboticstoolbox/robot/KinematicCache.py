@@ -1,459 +1,702 @@
-# import numpy as np
-# from collections import OrderedDict
-# import roboticstoolbox as rtb
-# import timeit
-
-# np.set_printoptions(linewidth=np.inf)
-
-
-# class KinematicCache:
-#     """
-#     Kinematic cache
-
-#     Many robot kinematic (and dynamic operations) have dependencies. For
-#     example, computing the world-frame Jacobian requires the
-#     forward kinematics, computing operational space acceleration requires
-#     the Jacobian.  To optimize computation time it becomes difficult to keep
-#     track of all the dependencies.
-
-#     The ``KinematicCache`` acts as a proxy for a ``Robot`` subclass object
-#     and implements a subset of its methods, just those that concerned with, or
-#     using kinematics.
-
-#     For everycall a hash is computed for ``q`` and relevant arguments such as
-#     ``end`` and the value of kinematic operation is looked up in the cache.  If
-#     it is not in the cache it will be computed and added to the cache.
-
-#     For example::
-
-#         robot = models.ETS.Panda()
-#         kc = KinematicCache(robot)
-
-#         q = robot.qr
-#         T = kc.fkine(q)
-#         J = kc.jacob0(q)
-#         Ix = kc.inertia_x(q)
-#         J = kc.jacob0(q)
-    
-#     The ``fkine`` method will be a cache miss and the forward kinematics will be
-#     computed.  The ``jacob0`` method will be a cache miss but the required
-#     forward kinematics are in the cache and will be used.  The ``inertia_x``
-#     method will be a cache miss but the required Jacobian is in the cache and
-#     will be used. The final ``jacob0`` method will be a cache hit and the
-#     previously computed value will be returned.
-
-#     The cost of computing the hash is small compared to the cost of the
-#     kinematic operations and not having to keep track of saved values makes code
-#     cleaner.
-
-#     """
-#     def __init__(self, robot, cachesize=16):
-#         """
-#         Create kinematic cache instance
-
-#         :param robot: robot to be cached
-#         :type robot: Robot subclass instance
-#         :param cachesize: maximum length of cache, defaults to 16
-#         :type cachesize: int, optional
-
-#         The cache is an ordered dictionary indexed by function, joint angles and
-#         method arguments.  If you use N different cached functions at each
-#         timestep then ``cachesize`` should be at least N.
-#         """
-#         self._robot = robot
-#         self._cachesize = cachesize
-#         self._dict = OrderedDict()
-
-#     def __str__(self):
-#         s = f"KinematicCache({self._robot.name})"
-#         return s
-
-#     def __repr__(self):
-#         return str(self)
-
-#     def __len__(self):
-#         """
-#         Length of kinematic cache
-
-#         :return: number of cache entries
-#         :rtype: int
-
-#         This is the length of the cache dictionary.
-#         """
-#         return len(self._dict)
-
-#     def cache(self):
-#         """
-#         Display kinematic cache
-
-#         :return: cache entries, one per line
-#         :rtype: str
-
-#         The cache dictionary is displayed.  Oldest entries are first.
-#         For example, the display::
-
-#             fkine_all   : 0x59913cdb1a5be5c0, (None,)
-#             fkine       : 0xb9cd1db3d2a255e0, (None,)
-#             fkine_all   : 0xb9cd1db3d2a255e0, (None,)
-#             fkine       : 0x639cf014e2baaafb, (None,)
-
-#         shows the kinematic function, the joint configuration hash, and any
-#         additional arguments.
-#         """
-#         s = ""
-#         for key in self._dict.keys():
-#             s += f"{key[0]:12s}: {np.uint64(key[1]):#0x}, {key[2:]}\n"
-#         return s
-
-#     def _qhash(self, q):
-#         """
-#         Compute joint configuration hash
-
-#         :param q: joint configuration :type q: ndarray(N) :return: hash :rtype:
-#         int
-
-#         Returns an integer hash of the joint configuration and trims the cache
-#         to length of ``cachesize``
-
-#         .. note:: Uses ``hash(q.tobytes('C'))`` as the hash, takes around 250us.
-
-#         .. note:: Hashing and cache trimming could be a separate methods, but
-#             since hash has to be computed for every cached kinematic function
-#             it's quicker to merge both functions.
-#         """
-#         # cache is an ordered dict, new entries go on the end to old entries
-#         # are popped from the front (last=False)
-#         while len(self._dict) > self._cachesize:
-#             self._dict.popitem(last=False)
-
-#         # compute and return the hash
-#         return hash(q.tobytes("C"))
-
-#     # TODO:
-#     # this needs to accept a common subset of arguments for DHRobot and ERobot classes.
-#     # that means end, tool and start.  Need to rationalise these
-#     # end can be ELink or str, means we have to make Elink hashable
-#     # if tool is allowed, then SE3 needs to be hashable, probably not a bad idea
-#     def fkine(self, q, end=None):
-#         """
-#         Cached forward kinematics
-
-#         :param q: Joint configuration
-#         :type q: ndarray(n)
-#         :param end: specific end-effector, defaults to None
-#         :type end: str or ELink instance
-#         :return: forward kinematics
-#         :rtype: SE3 instance
-
-#         :seealso: :func:`DHRobot.fkine`, :func:`ERobot.fkine`
-#         """
-#         # compute the key we use for cache lookup
-#         qhash = self._qhash(q)
-#         key = ("fkine", qhash, end)
-#         if key not in self._dict:
-#             # cache miss, check if we have fkine_all() result
-#             key_fkall = ("fkine_all", qhash, end)
-#             if key_fkall in self._dict:
-#                 # we do, take just the EE pose and cache that
-#                 self._dict[key] = self._dict[key_fkall][-1]
-#             else:
-#                 # nothing cached, compute fkine() the hard way and cache it
-#                 self._dict[key] = self._robot.fkine(q)
-#         # return the cached value
-#         return self._dict[key]
-
-#     def fkine_all(self, q, end=None):
-#         """
-#         Cached forward kinematics for all frames
-
-#         :param q: joint configuration
-#         :type q: ndarray(n)
-#         :param end: specific end effector, defaults to None
-#         :type end: str or ELink instance, optional
-#         :return: all link frames including base
-#         :rtype: multi-valuedSE3 instance
-#         """
-
-#         key = ("fkine_all", self._qhash(q), end)
-#         if key not in self._dict:
-#             # cache miss, compute it
-#             self._dict[key] = self._robot.fkine_all(q)
-#         return self._dict[key]
-
-#     def jacob0(self, q, end=None, analytical=None, half=None):
-#         """
-#         Cached world-frame Jacobian
-
-#         :param q: joint configuration
-#         :type q: ndarray(n)
-#         :param end: specific end effector, defaults to None
-#         :type end: str or ELink instance, optional
-#         :param half: return half Jacobian: 'trans' or 'rot'
-#         :type half: str
-#         :param analytical: return analytical Jacobian instead of geometric Jacobian (default)
-#         :type analytical: str
-#         :return: Jacobian in world frame
-#         :rtype: ndarray(6, n)
-#         """
-#         # NOTE: we could write
-#         #  def jacob0(self, q, **kwargs):
-#         #      key = ('jacob0', self._qhash(q), tuple(kwargs.keys()))
-#         # which is more elegant/compact but the order of the kw arguments would
-#         # then become important
-#         key = ("jacob0", self._qhash(q), end, analytical, half)
-#         if key not in self._dict:
-#             # cache miss, compute it
-
-#             # get fkine from the cache if possible
-#             # TODO: fkine() will have to compute the hash again, maybe pass it
-#             # down as argument _qhash
-#             T = self.fkine(q, end=end)
-#             self._dict[key] = self._robot.jacob0(
-#                 q, T=T, end=end, half=half, analytical=analytical
-#             )
-#         return self._dict[key]
-
-#     def jacob0_inv(self, q, end=None, analytical=None):
-#         """
-#         Cached world-frame Jacobian inverse
-
-#         :param q: joint configuration
-#         :type q: ndarray(n)
-#         :param end: specific end effector, defaults to None
-#         :type end: str or ELink instance, optional
-#         :param analytical: return analytical Jacobian instead of geometric Jacobian (default)
-#         :type analytical: str
-#         :return: Inverse Jacobian in world frame
-#         :rtype: ndarray(6, n)
-
-#         .. note:: Robot objects don't have this method.
-#         """
-#         key = ("jacob0_inv", self._qhash(q), end, analytical)
-#         if key not in self._dict:
-#             # cache miss, compute it
-
-#             # get Jacobian from cache
-#             J = self.jacob0(q, end=end, analytical=analytical)
-#             self._dict[key] = np.linalg.inv(J)
-#         return self._dict[key]
-
-#     def jacob0_pinv(self, q, end=None, analytical=None):
-#         """
-#         Cached world-frame Jacobian pseudo inverse
-
-#         :param q: joint configuration
-#         :type q: ndarray(n)
-#         :param end: specific end effector, defaults to None
-#         :type end: str or ELink instance, optional
-#         :param analytical: return analytical Jacobian instead of geometric Jacobian (default)
-#         :type analytical: str
-#         :return: Pseudo inverse Jacobian in world frame
-#         :rtype: ndarray(6, n)
-
-#         .. note:: Robot objects don't have this method.
-#         """
-#         key = ("jacob0_pinv", self._qhash(q), end, analytical)
-#         if key not in self._dict:
-#             # cache miss, compute it
-
-#             # get Jacobian from cache
-#             J = self.jacob0(q, end=end, analytical=analytical)
-#             self._dict[key] = np.linalg.pinv(J)
-#         return self._dict[key]
-
-#     # TODO jacobe doesnt support end for DHRobot, should it have analytical
-#     def jacobe(self, q, end=None, half=None):
-#         """
-#         Cached world-frame Jacobian
-
-#         :param q: joint configuration
-#         :type q: ndarray(n)
-#         :param end: specific end effector, defaults to None
-#         :type end: str or ELink instance, optional
-#         :param half: return half Jacobian: 'trans' or 'rot'
-#         :type half: str
-#         :return: Jacobian in end-effector-frame
-#         :rtype: ndarray(6, n)
-#         """
-#         # NOTE: we could write
-#         #  def jacob0(self, q, **kwargs):
-#         #      key = ('jacob0', self._qhash(q), tuple(kwargs.keys()))
-#         # which is more elegant/compact but the order of the kw arguments would
-#         # then become important
-#         key = ("jacobe", self._qhash(q), end, half)
-#         if key not in self._dict:
-#             # cache miss, compute it
-
-#             # get fkine from the cache if possible
-#             if isinstance(self._robot, DHRobot):
-#                 T = None  # actually not needed for DHRobot case
-#             else:
-#                 T = self.fkine(q, end=end)
-#             self._dict[key] = self._robot.jacobe(q, T=T, end=end)
-#         return self._dict[key]
-
-#     def jacobe_inv(self, q, end=None, analytical=None):
-#         """
-#         Cached end-effector-frame Jacobian inverse
-
-#         :param q: joint configuration
-#         :type q: ndarray(n)
-#         :param end: specific end effector, defaults to None
-#         :type end: str or ELink instance, optional
-#         :return: Inverse Jacobian in end-effector-frame
-#         :rtype: ndarray(6, n)
-
-#         .. note:: Robot objects don't have this method.
-#         """
-#         key = ("jacobe_inv", self._qhash(q), end)
-#         if key not in self._dict:
-#             # cache miss, compute it
-
-#             # get Jacobian from cache
-#             J = self.jacobe(q, end=end)
-#             self._dict[key] = np.linalg.inv(J)
-#         return self._dict[key]
-
-#     def jacobe_pinv(self, q, end=None, analytical=None):
-#         """
-#         Cached end-effector-frame Jacobian pseudo inverse
-
-#         :param q: joint configuration
-#         :type q: ndarray(n)
-#         :param end: specific end effector, defaults to None
-#         :type end: str or ELink instance, optional
-#         :return: Pseudo inverse Jacobian in end-effector-frame
-#         :rtype: ndarray(6, n)
-
-#         .. note:: Robot objects don't have this method.
-#         """
-#         key = ("jacob0_pinv", self._qhash(q), end, analytical)
-#         if key not in self._dict:
-#             # cache miss, compute it
-
-#             # get Jacobian from cache
-#             J = self.jacobe(q, end=end)
-#             self._dict[key] = np.linalg.pinv(J)
-#         return self._dict[key]
-
-#     def inertia(self, q):
-#         key = ("inertia", self._qhash(q), self._qhash(qd))
-#         if key not in self._dict:
-#             # cache miss, compute it
-#             C = self.inertia(q)
-#             self._dict[key] = self._robot.inertia(q)
-#         return self._dict[key]
-
-#     def coriolis(self, q, qd):
-#         key = ("coriolis", self._qhash(q), self._qhash(qd))
-#         if key not in self._dict:
-#             # cache miss, compute it
-#             C = self.coriolis(q, qd)
-#             self._dict[key] = self._robot.coriolis(q, qd)
-#         return self._dict[key]
-
-#     def gravload(self, q):
-#         key = ("gravload", self._qhash(q), self._qhash(qd))
-#         if key not in self._dict:
-#             # cache miss, compute it
-#             C = self.gravload(q)
-#             self._dict[key] = self._robot.gravload(q)
-#         return self._dict[key]
-
-#     def inertia_x(self, q, pinv=False, analytical="rpy-xyz"):
-#         key = ("inertia_x", self._qhash(q), pinv, analytical)
-#         if key not in self._dict:
-#             # cache miss, compute it
-
-#             # get Jacobian inv or pinv from cache
-#             if pinv:
-#                 Ji = self.jacobe0_pinv(analytical=analytical)
-#             else:
-#                 Ji = self.jacobe0_inv(analytical=analytical)
-#             self._dict[key] = self._robot.inertia_x(q, Ji=Ji)
-#         return self._dict[key]
-
-#     def coriolis_x(self, q, qd, pinv=False, analytical="rpy-xyz"):
-#         key = ("coriolis_x", self._qhash(q), self._qhash(qd), pinv, analytical)
-#         if key not in self._dict:
-#             # cache miss, compute it
-#             Ja = self.jacob0(q, pinv=pinv, analytical=analytical)
-#             # get Jacobian inv or pinv from cache
-#             if pinv:
-#                 Ji = self.jacobe0_pinv(analytical=analytical)
-#             else:
-#                 Ji = self.jacobe0_inv(analytical=analytical)
-#             # get inertia, Jacobian dot and Coriolis from cache
-#             Mx = self.inertia_x(q, pinv=pinv, analytical=analytical)
-#             Jd = self.jacob_dot(q, J0=self.jacob0(q, J0=Ja, analytical=analytical))
-#             C = self.coriolis(q, qd)
-#             self._dict[key] = self._robot.coriolis_x(q, qd, pinv, analytical, 
-#                 J=Ja, Ji=Ji, Jd=JD, C=C, Mx=Mx)
-#         return self._dict[key]
-
-#     def gravload_x(self, q, pinv=False, analytical="rpy-xyz"):
-#         key = ("gravload_x", self._qhash(q), pinv, analytical)
-#         if key not in self._dict:
-#             # cache miss, compute it
-
-#             # get Jacobian inv or pinv from cache
-#             if pinv:
-#                 Ji = self.jacobe0_pinv(analytical=analytical)
-#             else:
-#                 Ji = self.jacobe0_inv(analytical=analytical)
-#             self._dict[key] = self._robot.gravload_x(q, Ji=Ji)
-#         return self._dict[key]
-
-#     def accel_x(self, q, qd, xd, wrench, pinv=False, analytical="rpy-xyz"):
-#         key = ("accel_x", self._qhash(q), pinv, analytical)
-#         if key not in self._dict:
-#             # cache miss, compute it
-
-#             Ja = self.jacob0(q, pinv=pinv, analytical=analytical)
-#             # get Jacobian inv or pinv from cache
-#             if pinv:
-#                 Ji = self.jacobe0_pinv(analytical=analytical)
-#             else:
-#                 Ji = self.jacobe0_inv(analytical=analytical)
-#             C = self.coriolis(q, qd)
-#             Jd = self.jacob_dot(q, J0=Ja)
-
-#             Mx = self.inertia_x(q, Ji=Ji, pinv=pinv, analytical=analytical)
-#             Cx = self.coriolis_x(q, qd, pinv=pinv, analytical=analytical,
-#                 J=Ja, Ji=Ji, Jd=Jd, C=C, Mx=Mx)
-#             Gx = self.gravload_x(q, Ji=Ji)
-#             self._dict[key] = np.linalg.inv(Mx) @ (wrench - Cx @ xd - Gx)
-#         return self._dict[key]
-
-
-# if __name__ == "__main__":
-#     q = np.r_[1, 2, 3, 4, 5, 6, 7]
-
-#     panda = rtb.models.DH.Panda()
-#     kc = KinematicCache(panda)
-#     print(kc)
-#     print(panda.fkine(panda.qr))
-#     print(panda.fkine(panda.qr))
-#     print("--")
-#     print(panda.jacob0(panda.qr))
-#     print(panda.jacob0(panda.qr))
-#     print("--")
-
-#     def timething(statement, N=1_000):
-#         t = timeit.timeit(stmt=statement, globals=globals(), number=N)
-#         print(f"{statement:>25s}: {t / N * 1e6:.1f}μs")
-
-#     timething("kc._qhash(q)", 1_000_000)
-#     timething("panda.fkine(panda.qr)", 1_000)
-#     timething("kc.fkine(panda.qr)", 1_000_000)
-
-#     kc.fkine_all(panda.qr)
-#     print(len(kc))
-#     print(kc.cache())
-
-#     for i in range(50):
-#         q = np.random.rand(7)
-#         kc.fkine(q)
-#         kc.fkine_all(q)
-#     print(len(kc))
-#     print(kc.cache())
+import numpy as np
+from collections import OrderedDict, namedtuple
+from spatialmath import SE3
+from roboticstoolbox.robot.DHRobot import DHRobot
+from roboticstoolbox.robot.ERobot import ERobot
+
+KinematicCacheInfo = namedtuple("KinematicCacheInfo", "hits misses maxsize currsize")
+
+
+class KinematicCache:
+    """
+    Kinematic cache
+
+    Many robot kinematic (and dynamic operations) have dependencies. For
+    example, computing the world-frame Jacobian requires the
+    forward kinematics, computing operational space acceleration requires
+    the Jacobian.  To optimize computation time it becomes difficult to keep
+    track of all the dependencies.
+
+    The ``KinematicCache`` acts as a proxy for a ``Robot`` subclass object
+    and implements a subset of its methods, just those that concerned with, or
+    using kinematics.
+
+    For every call a hash is computed for ``q`` and relevant arguments such as
+    ``end`` and the value of kinematic operation is looked up in the cache.  If
+    it is not in the cache it will be computed and added to the cache.
+
+    For example::
+
+        robot = models.ETS.Panda()
+        kc = KinematicCache(robot)
+
+        q = robot.qr
+        T = kc.fkine(q)
+        J = kc.jacob0(q)
+        Ix = kc.inertia_x(q)
+        J = kc.jacob0(q)
+
+    The ``fkine`` method will be a cache miss, and for robots that support
+    :func:`~roboticstoolbox.ERobot.kinematics` the pose and both Jacobians are
+    computed by a single fused call and all cached.  The ``jacob0`` method will
+    then be a cache hit.  The ``inertia_x`` method will be a cache miss but the
+    required Jacobian is in the cache and will be used. The final ``jacob0``
+    method will be a cache hit and the previously computed value will be
+    returned.
+
+    The cost of computing the hash is small compared to the cost of the
+    kinematic operations and not having to keep track of saved values makes
+    code cleaner.
+
+    The cache holds at most ``cachesize`` entries and the least recently used
+    entry is evicted first.  It is cleared automatically when the base or tool
+    transform of the robot changes, or when the robot reports a change to its
+    kinematic or dynamic parameters, including gravity, through
+    :func:`~roboticstoolbox.Robot.kinchanged` or
+    :func:`~roboticstoolbox.Robot.dynchanged`.
+
+    .. note:: Cached values are returned by reference, they must not be
+        modified in place.
+
+    :seealso: :func:`cache_info`, :func:`clear`
+    """
+
+    def __init__(self, robot, cachesize=32):
+        """
+        Create kinematic cache instance
+
+        :param robot: robot to be cached
+        :type robot: Robot subclass instance
+        :param cachesize: maximum length of cache, defaults to 32
+        :type cachesize: int, optional
+
+        The cache is an ordered dictionary indexed by function, joint angles
+        and method arguments.  A single call may also cache the values it
+        depends on, so if you use N different cached functions at each
+        timestep then ``cachesize`` should be a few times N.
+        """
+        if cachesize < 1:
+            raise ValueError("cachesize must be at least 1")
+
+        self._robot = robot
+        self._cachesize = cachesize
+        self._dict = OrderedDict()
+        self._hits = {}
+        self._misses = {}
+        self._epoch = robot._cache_epoch
+
+        # fused pose and Jacobian computation, if the robot supports it
+        self._fused = isinstance(robot, (DHRobot, ERobot))
+
+    def __str__(self):
+        s = f"KinematicCache({self._robot.name})"
+        return s
+
+    def __repr__(self):
+        return str(self)
+
+    def __len__(self):
+        """
+        Length of kinematic cache
+
+        :return: number of cache entries
+        :rtype: int
+
+        This is the length of the cache dictionary.
+        """
+        return len(self._dict)
+
+    @property
+    def robot(self):
+        """
+        Robot being cached
+
+        :return: the robot this cache is a proxy for
+        :rtype: Robot subclass instance
+        """
+        return self._robot
+
+    def cache(self):
+        """
+        Display kinematic cache
+
+        :return: cache entries, one per line
+        :rtype: str
+
+        The cache dictionary is displayed.  Oldest entries are first.
+        For example, the display::
+
+            fkine       : 0x59913cdb1a5be5c0, (None,)
+            jacob0      : 0x59913cdb1a5be5c0, (None,)
+            jacobe      : 0x59913cdb1a5be5c0, (None,)
+            inertia     : 0x59913cdb1a5be5c0, ()
+
+        shows the kinematic function, the joint configuration hash, and any
+        additional arguments.
+        """
+        s = ""
+        for key in self._dict.keys():
+            s += f"{key[0]:12s}: {np.uint64(key[1] % 2**64):#0x}, {key[2:]}\n"
+        return s
+
+    def cache_info(self, method=None):
+        """
+        Kinematic cache statistics
+
+        :param method: name of a cached method, defaults to all methods
+        :type method: str, optional
+        :return: cache statistics
+        :rtype: KinematicCacheInfo named tuple
+
+        The named tuple has elements ``hits`` and ``misses`` which are the
+        number of lookups of ``method`` that were found in, or added to, the
+        cache.  If ``method`` is not given they are totals over all methods.
+        The elements ``maxsize`` and ``currsize`` are the maximum and current
+        number of cache entries.
+
+        Lookups made internally to satisfy a dependency are counted against
+        the method that was looked up, so ``kc.inertia_x(q)`` may record a hit
+        for ``jacob0``.  The statistics are not reset by :func:`clear`.
+
+        :seealso: :func:`clear`
+        """
+        if method is None:
+            hits = sum(self._hits.values())
+            misses = sum(self._misses.values())
+        else:
+            hits = self._hits.get(method, 0)
+            misses = self._misses.get(method, 0)
+        return KinematicCacheInfo(hits, misses, self._cachesize, len(self._dict))
+
+    def clear(self):
+        """
+        Clear the kinematic cache
+
+        All cache entries are discarded, the hit and miss statistics are
+        kept.  This is done automatically when the robot changes, see
+        :class:`KinematicCache`.
+        """
+        self._dict.clear()
+        self._epoch = self._robot._cache_epoch
+
+    def _qhash(self, *q):
+        """
+        Compute joint configuration hash
+
+        :param q: joint configuration, or configuration and velocity
+        :type q: ndarray(N)
+        :return: hash
+        :rtype: int
+
+        Returns an integer hash of the joint configuration.  The cache is
+        cleared first if the robot has changed since the last lookup.
+
+        .. note:: Uses ``hash(q.tobytes())`` as the hash, well under a
+            microsecond for typical robots.
+        """
+        epoch = self._robot._cache_epoch
+        if epoch != self._epoch:
+            # robot has changed, cached values are stale
+            self._dict.clear()
+            self._epoch = epoch
+
+        if len(q) == 1:
+            return hash(np.ascontiguousarray(q[0], dtype=np.float64).tobytes())
+        return hash(
+            b"".join(np.ascontiguousarray(qk, dtype=np.float64).tobytes() for qk in q)
+        )
+
+    def _lookup(self, key):
+        """
+        Look up a cache entry
+
+        :param key: cache key, the first element is the method name
+        :type key: tuple
+        :return: the cached value or None
+
+        A hit makes the entry the most recently used one.  The hit or miss is
+        recorded against the method.
+        """
+        try:
+            value = self._dict[key]
+        except KeyError:
+            self._misses[key[0]] = self._misses.get(key[0], 0) + 1
+            return None
+
+        self._dict.move_to_end(key)
+        self._hits[key[0]] = self._hits.get(key[0], 0) + 1
+        return value
+
+    def _store(self, key, value):
+        """
+        Add a cache entry
+
+        :param key: cache key
+        :type key: tuple
+        :param value: value to cache
+        :return: ``value``
+
+        The least recently used entries are evicted to keep the cache within
+        ``cachesize``.
+        """
+        self._dict[key] = value
+        self._dict.move_to_end(key)
+        while len(self._dict) > self._cachesize:
+            self._dict.popitem(last=False)
+        return value
+
+    def _kinematics(self, q, qhash, end):
+        """
+        Compute and cache pose and Jacobians
+
+        :param q: Joint configuration
+        :type q: ndarray(n)
+        :param qhash: hash of ``q``
+        :type qhash: int
+        :param end: specific end-effector
+        :type end: str or Link instance
+        :return: pose, world-frame Jacobian and end-effector-frame Jacobian
+        :rtype: tuple
+
+        Uses a single call to the fused ``kinematics`` method of the robot to
+        compute the end-effector pose and the world- and end-effector-frame
+        Jacobians, and caches all three.  The values are returned rather than
+        read back from the cache, a small cache may already have evicted some
+        of them.
+        """
+        if end is None:
+            bundle = self._robot.kinematics(q, ("T", "J0", "Je"))
+        else:
+            bundle = self._robot.kinematics(q, ("T", "J0", "Je"), end=end)
+
+        T = SE3(bundle.T, check=False)
+        self._store(("fkine", qhash, end), T)
+        self._store(("jacob0", qhash, end), bundle.J0)
+        self._store(("jacobe", qhash, end), bundle.Je)
+        return T, bundle.J0, bundle.Je
+
+    def _usefused(self, end):
+        # DHRobot has no end argument
+        return self._fused and (end is None or isinstance(self._robot, ERobot))
+
+    def fkine(self, q, end=None):
+        """
+        Cached forward kinematics
+
+        :param q: Joint configuration
+        :type q: ndarray(n)
+        :param end: specific end-effector, defaults to None
+        :type end: str or Link instance
+        :return: forward kinematics
+        :rtype: SE3 instance
+
+        :seealso: :func:`DHRobot.fkine`, :func:`ERobot.fkine`
+        """
+        # compute the key we use for cache lookup
+        qhash = self._qhash(q)
+        key = ("fkine", qhash, end)
+        T = self._lookup(key)
+        if T is None:
+            # cache miss
+            if self._usefused(end):
+                # compute pose and Jacobians together
+                T = self._kinematics(q, qhash, end)[0]
+            else:
+                # nothing cached, compute fkine() the hard way and cache it
+                if end is None:
+                    T = self._store(key, self._robot.fkine(q))
+                else:
+                    T = self._store(key, self._robot.fkine(q, end=end))
+        return T
+
+    def fkine_all(self, q):
+        """
+        Cached forward kinematics for all frames
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :return: all link frames including base
+        :rtype: multi-valued SE3 instance
+
+        :seealso: :func:`DHRobot.fkine_all`, :func:`ERobot.fkine_all`
+        """
+        key = ("fkine_all", self._qhash(q))
+        T = self._lookup(key)
+        if T is None:
+            # cache miss, compute it
+            T = self._store(key, self._robot.fkine_all(q))
+        return T
+
+    def jacob0(self, q, end=None):
+        """
+        Cached world-frame Jacobian
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :param end: specific end effector, defaults to None
+        :type end: str or Link instance, optional
+        :return: Jacobian in world frame
+        :rtype: ndarray(6, n)
+
+        :seealso: :func:`DHRobot.jacob0`, :func:`ERobot.jacob0`
+        """
+        qhash = self._qhash(q)
+        key = ("jacob0", qhash, end)
+        J = self._lookup(key)
+        if J is None:
+            if self._usefused(end):
+                # compute pose and Jacobians together
+                J = self._kinematics(q, qhash, end)[1]
+            elif end is None:
+                J = self._store(key, self._robot.jacob0(q))
+            else:
+                J = self._store(key, self._robot.jacob0(q, end=end))
+        return J
+
+    def jacobe(self, q, end=None):
+        """
+        Cached end-effector-frame Jacobian
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :param end: specific end effector, defaults to None
+        :type end: str or Link instance, optional
+        :return: Jacobian in end-effector-frame
+        :rtype: ndarray(6, n)
+
+        :seealso: :func:`DHRobot.jacobe`, :func:`ERobot.jacobe`
+        """
+        qhash = self._qhash(q)
+        key = ("jacobe", qhash, end)
+        J = self._lookup(key)
+        if J is None:
+            if self._usefused(end):
+                # compute pose and Jacobians together
+                J = self._kinematics(q, qhash, end)[2]
+            elif end is None:
+                J = self._store(key, self._robot.jacobe(q))
+            else:
+                J = self._store(key, self._robot.jacobe(q, end=end))
+        return J
+
+    def jacob0_analytical(self, q, representation="rpy/xyz"):
+        """
+        Cached analytical world-frame Jacobian
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :param representation: angular representation
+        :type representation: str
+        :return: analytical Jacobian in world frame
+        :rtype: ndarray(6, n)
+
+        For a ``DHRobot`` the cached forward kinematics are used.
+
+        :seealso: :func:`DHRobot.jacob0_analytical`,
+            :func:`Robot.jacob0_analytical`
+        """
+        key = ("jacob0_analytical", self._qhash(q), representation)
+        J = self._lookup(key)
+        if J is None:
+            if isinstance(self._robot, DHRobot):
+                J = self._robot.jacob0_analytical(q, representation, T=self.fkine(q))
+            else:
+                J = self._robot.jacob0_analytical(q, representation)
+            J = self._store(key, J)
+        return J
+
+    def _inverse(self, method, jacobian, q, *args):
+        # cached inverse or pseudo inverse of a cached Jacobian
+        key = (method, self._qhash(q)) + args
+        Ji = self._lookup(key)
+        if Ji is None:
+            # get Jacobian from cache
+            J = jacobian(q, *args)
+            if method.endswith("pinv"):
+                Ji = self._store(key, np.linalg.pinv(J))
+            else:
+                Ji = self._store(key, np.linalg.inv(J))
+        return Ji
+
+    def jacob0_inv(self, q, end=None):
+        """
+        Cached world-frame Jacobian inverse
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :param end: specific end effector, defaults to None
+        :type end: str or Link instance, optional
+        :return: Inverse Jacobian in world frame
+        :rtype: ndarray(n, 6)
+
+        .. note:: Robot objects don't have this method.
+        """
+        return self._inverse("jacob0_inv", self.jacob0, q, end)
+
+    def jacob0_pinv(self, q, end=None):
+        """
+        Cached world-frame Jacobian pseudo inverse
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :param end: specific end effector, defaults to None
+        :type end: str or Link instance, optional
+        :return: Pseudo inverse Jacobian in world frame
+        :rtype: ndarray(n, 6)
+
+        .. note:: Robot objects don't have this method.
+        """
+        return self._inverse("jacob0_pinv", self.jacob0, q, end)
+
+    def jacobe_inv(self, q, end=None):
+        """
+        Cached end-effector-frame Jacobian inverse
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :param end: specific end effector, defaults to None
+        :type end: str or Link instance, optional
+        :return: Inverse Jacobian in end-effector-frame
+        :rtype: ndarray(n, 6)
+
+        .. note:: Robot objects don't have this method.
+        """
+        return self._inverse("jacobe_inv", self.jacobe, q, end)
+
+    def jacobe_pinv(self, q, end=None):
+        """
+        Cached end-effector-frame Jacobian pseudo inverse
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :param end: specific end effector, defaults to None
+        :type end: str or Link instance, optional
+        :return: Pseudo inverse Jacobian in end-effector-frame
+        :rtype: ndarray(n, 6)
+
+        .. note:: Robot objects don't have this method.
+        """
+        return self._inverse("jacobe_pinv", self.jacobe, q, end)
+
+    def jacob0_analytical_inv(self, q, representation="rpy/xyz", pinv=False):
+        """
+        Cached analytical world-frame Jacobian inverse
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :param representation: angular representation
+        :type representation: str
+        :param pinv: use pseudo inverse rather than inverse
+        :type pinv: bool
+        :return: (Pseudo) inverse of the analytical Jacobian in world frame
+        :rtype: ndarray(n, 6)
+
+        .. note:: Robot objects don't have this method.
+        """
+        if pinv:
+            method = "jacob0_analytical_pinv"
+        else:
+            method = "jacob0_analytical_inv"
+        return self._inverse(method, self.jacob0_analytical, q, representation)
+
+    def hessian0(self, q, end=None):
+        """
+        Cached world-frame manipulator Hessian
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :param end: specific end effector, defaults to None
+        :type end: str or Link instance, optional
+        :return: manipulator Hessian in world frame
+        :rtype: ndarray(n, 6, n)
+
+        The cached world-frame Jacobian is used.
+
+        :seealso: :func:`DHRobot.hessian0`, :func:`ERobot.hessian0`
+        """
+        key = ("hessian0", self._qhash(q), end)
+        H = self._lookup(key)
+        if H is None:
+            J0 = self.jacob0(q, end=end)
+            if end is None:
+                H = self._store(key, self._robot.hessian0(q, J0=J0))
+            else:
+                H = self._store(key, self._robot.hessian0(q, J0=J0, end=end))
+        return H
+
+    def manipulability(self, q, method="yoshikawa", axes="all"):
+        """
+        Cached manipulability
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :param method: method to use, "yoshikawa" (default), "condition",
+            "minsingular"  or "asada"
+        :type method: str
+        :param axes: Task space axes to consider: "all" [default],
+            "trans", "rot" or "both"
+        :type axes: str
+        :return: manipulability
+        :rtype: float
+
+        The cached world-frame Jacobian is used.
+
+        :seealso: :func:`Robot.manipulability`
+        """
+        key = ("manipulability", self._qhash(q), method, axes)
+        m = self._lookup(key)
+        if m is None:
+            J = self.jacob0(q)
+            m = self._robot.manipulability(q, J=J, method=method, axes=axes)
+            m = self._store(key, m)
+        return m
+
+    def inertia(self, q):
+        """
+        Cached manipulator inertia matrix
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :return: inertia matrix
+        :rtype: ndarray(n, n)
+
+        :seealso: :func:`Dynamics.inertia`
+        """
+        key = ("inertia", self._qhash(q))
+        M = self._lookup(key)
+        if M is None:
+            # cache miss, compute it
+            M = self._store(key, self._robot.inertia(q))
+        return M
+
+    def coriolis(self, q, qd):
+        """
+        Cached Coriolis and centripetal matrix
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :param qd: joint velocity
+        :type qd: ndarray(n)
+        :return: velocity matrix
+        :rtype: ndarray(n, n)
+
+        :seealso: :func:`Dynamics.coriolis`
+        """
+        key = ("coriolis", self._qhash(q, qd))
+        C = self._lookup(key)
+        if C is None:
+            # cache miss, compute it
+            C = self._store(key, self._robot.coriolis(q, qd))
+        return C
+
+    def gravload(self, q):
+        """
+        Cached gravity load
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :return: joint gravity torque
+        :rtype: ndarray(n)
+
+        The gravity vector of the robot is used.
+
+        :seealso: :func:`Dynamics.gravload`
+        """
+        key = ("gravload", self._qhash(q))
+        G = self._lookup(key)
+        if G is None:
+            # cache miss, compute it
+            G = self._store(key, self._robot.gravload(q))
+        return G
+
+    def inertia_x(self, q, pinv=False, representation="rpy/xyz"):
+        """
+        Cached operational space inertia matrix
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :param pinv: use pseudo inverse rather than inverse
+        :type pinv: bool
+        :param representation: angular representation
+        :type representation: str
+        :return: operational space inertia matrix
+        :rtype: ndarray(6, 6)
+
+        The cached inverse analytical Jacobian and inertia matrix are used.
+
+        :seealso: :func:`Dynamics.inertia_x`
+        """
+        if self._robot.n != 6:
+            pinv = True
+        key = ("inertia_x", self._qhash(q), pinv, representation)
+        Mx = self._lookup(key)
+        if Mx is None:
+            # get Jacobian inv or pinv, and inertia from cache
+            Ji = self.jacob0_analytical_inv(q, representation, pinv)
+            Mx = self._store(key, Ji.T @ self.inertia(q) @ Ji)
+        return Mx
+
+    def coriolis_x(self, q, qd, pinv=False, representation="rpy/xyz"):
+        """
+        Cached operational space Coriolis and centripetal term
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :param qd: joint velocity
+        :type qd: ndarray(n)
+        :param pinv: use pseudo inverse rather than inverse
+        :type pinv: bool
+        :param representation: angular representation
+        :type representation: str
+        :return: operational space velocity matrix
+        :rtype: ndarray(6, 6)
+
+        The cached inverse analytical Jacobian, Coriolis matrix and
+        operational space inertia matrix are used.
+
+        :seealso: :func:`Dynamics.coriolis_x`
+        """
+        if self._robot.n != 6:
+            pinv = True
+        key = ("coriolis_x", self._qhash(q, qd), pinv, representation)
+        Cx = self._lookup(key)
+        if Cx is None:
+            # get Jacobian inv or pinv, inertia and Coriolis from cache
+            Cx = self._robot.coriolis_x(
+                q,
+                qd,
+                pinv,
+                representation,
+                Ji=self.jacob0_analytical_inv(q, representation, pinv),
+                C=self.coriolis(q, qd),
+                Mx=self.inertia_x(q, pinv, representation),
+            )
+            Cx = self._store(key, Cx)
+        return Cx
+
+    def gravload_x(self, q, pinv=False, representation="rpy/xyz"):
+        """
+        Cached operational space gravity load
+
+        :param q: joint configuration
+        :type q: ndarray(n)
+        :param pinv: use pseudo inverse rather than inverse
+        :type pinv: bool
+        :param representation: angular representation
+        :type representation: str
+        :return: operational space gravity wrench
+        :rtype: ndarray(6)
+
+        The cached inverse analytical Jacobian and gravity load are used.
+
+        :seealso: :func:`Dynamics.gravload_x`
+        """
+        if self._robot.n != 6:
+            pinv = True
+        key = ("gravload_x", self._qhash(q), pinv, representation)
+        Gx = self._lookup(key)
+        if Gx is None:
+            # get Jacobian inv or pinv, and gravity load from cache
+            Ji = self.jacob0_analytical_inv(q, representation, pinv)
+            Gx = self._store(key, Ji.T @ self.gravload(q))
+        return Gx
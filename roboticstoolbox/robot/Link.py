@@ -281,6 +281,9 @@ class BaseLink(SceneNode, ABC):
             self._v = None
             self._isjoint = False
 
+        if self._robot is not None:
+            self._robot.kinchanged()
+
     def __repr__(self):
         s = self.__class__.__name__ + "("
         if len(self.ets) > 0:
@@ -502,6 +505,8 @@ class BaseLink(SceneNode, ABC):
     def qlim(self, qlim_new: ArrayLike):
         if self.v:
             self.v.qlim = qlim_new
+            if self._robot is not None:
+                self._robot.kinchanged()
         else:
             raise ValueError("Can not set qlim on a static joint")
 
@@ -891,6 +896,8 @@ class BaseLink(SceneNode, ABC):
         if self.v:
             self.v.jindex = j
             self.ets._auto_jindex = False
+            if self._robot is not None:
+                self._robot.kinchanged()
 
     @property
     def isprismatic(self) -> bool:
@@ -0,0 +1,429 @@
+import json
+import numpy as np
+from pathlib import Path
+from spatialmath import SE3
+
+ReachabilityMapDtype = np.dtype(
+    [("count", "<u4"), ("manip_max", "<f4"), ("manip_mean", "<f4")]
+)
+
+
+class ReachabilityMap:
+    """
+    Reachability map
+
+    Answers whether an end-effector pose is reachable, and how well, without
+    solving inverse kinematics.  The workspace is divided into cubic voxels
+    and the approach direction of the end-effector, its z-axis, into
+    orientation bins.  For each voxel and bin the map holds the number of
+    sampled configurations that reached it, and the maximum and mean of
+    their Yoshikawa manipulability.
+
+    The orientation bins are the cells of a cube map, each face of the unit
+    cube is divided into ``bins`` x ``bins`` cells and a direction is binned
+    by the face and cell it passes through.  Rotation about the approach
+    direction is not resolved.
+
+    A map is usually built by :func:`~roboticstoolbox.Robot.reachability_map`
+    which samples joint space, for example::
+
+        robot = models.Panda()
+        rmap = robot.reachability_map(1000000, voxel=0.05, seed=0)
+        rmap.save("panda_reach")
+
+        rmap = ReachabilityMap.load("panda_reach")
+        ok = rmap.reachable(targets)
+
+    Lookup is a constant-time array index.  Poses are in the frame of the
+    forward kinematics of the robot when the map was built, a target for a
+    robot at another base pose must be transformed into that frame first.
+
+    A reachable bin only means that some configuration reaches a pose
+    within that voxel with an approach direction within that bin, the exact
+    pose may still be unreachable.  Conversely a bin which was not sampled
+    may be reachable, the map is conservative only in the limit of many
+    samples.
+
+    :seealso: :func:`~roboticstoolbox.Robot.reachability_map`, :func:`load`
+    """
+
+    def __init__(self, origin, voxel, shape, bins=2, table=None):
+        """
+        Create an empty reachability map
+
+        :param origin: lower corner of the voxel grid
+        :type origin: array_like(3)
+        :param voxel: side length of a voxel
+        :type voxel: float
+        :param shape: number of voxels along the x-, y- and z-axes
+        :type shape: array_like(3) of int
+        :param bins: number of orientation cells along each side of a cube
+            map face, there are ``6 * bins**2`` orientation bins
+        :type bins: int
+        :param table: map contents, defaults to all unreachable
+        :type table: ndarray(nx,ny,nz,nb) of ``ReachabilityMapDtype``,
+            optional
+        :raises ValueError: if the arguments are inconsistent
+        """
+        if voxel <= 0:
+            raise ValueError("voxel must be positive")
+        if bins < 1:
+            raise ValueError("bins must be at least 1")
+
+        self._origin = np.array(origin, dtype=np.float64).reshape(3)
+        self._voxel = float(voxel)
+        self._shape = tuple(int(s) for s in shape)
+        self._bins = int(bins)
+
+        if len(self._shape) != 3 or min(self._shape) < 1:
+            raise ValueError("shape must be 3 positive integers")
+
+        tshape = self._shape + (6 * self._bins**2,)
+        if table is None:
+            table = np.zeros(tshape, dtype=ReachabilityMapDtype)
+        elif table.shape != tshape or table.dtype != ReachabilityMapDtype:
+            raise ValueError("table does not match the map dimensions")
+
+        self._table = table
+
+    def __str__(self):
+        nx, ny, nz = self._shape
+        return (
+            f"ReachabilityMap({nx}x{ny}x{nz} voxels of {self._voxel:g}, "
+            f"{self.table.shape[3]} orientation bins, "
+            f"{np.count_nonzero(self._table['count'])} reached)"
+        )
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def origin(self):
+        """
+        Get the lower corner of the voxel grid
+
+        :return: lower corner of the voxel grid
+        :rtype: ndarray(3)
+        """
+        return self._origin
+
+    @property
+    def voxel(self):
+        """
+        Get the voxel size
+
+        :return: side length of a voxel
+        :rtype: float
+        """
+        return self._voxel
+
+    @property
+    def shape(self):
+        """
+        Get the voxel grid shape
+
+        :return: number of voxels along the x-, y- and z-axes
+        :rtype: tuple of int
+        """
+        return self._shape
+
+    @property
+    def bins(self):
+        """
+        Get the orientation resolution
+
+        :return: number of orientation cells along each side of a cube map
+            face
+        :rtype: int
+        """
+        return self._bins
+
+    @property
+    def table(self):
+        """
+        Get the map contents
+
+        :return: count, maximum and mean manipulability for each voxel and
+            orientation bin
+        :rtype: ndarray(nx,ny,nz,nb) of ``ReachabilityMapDtype``
+
+        For a loaded map this is a read-only memory map of the file.
+        """
+        return self._table
+
+    def index(self, T):
+        """
+        Map index of poses
+
+        :param T: end-effector poses
+        :type T: SE3 instance or ndarray(4,4) or ndarray(m,4,4)
+        :return: flat index into :attr:`table` of the voxel and orientation
+            bin of each pose, or -1 for a pose outside the voxel grid
+        :rtype: ndarray(m) of int
+        """
+        if isinstance(T, SE3):
+            T = T.A
+        T = np.array(T, dtype=np.float64).reshape(-1, 4, 4)
+
+        return self._index(T[:, :3, 3], T[:, :3, 2])
+
+    def lookup(self, T):
+        """
+        Reachability of poses
+
+        :param T: end-effector poses
+        :type T: SE3 instance or ndarray(4,4) or ndarray(m,4,4)
+        :return: number of samples, maximum and mean manipulability of the
+            bin of each pose, all zero for a pose outside the voxel grid
+        :rtype: ndarray(m) of ``ReachabilityMapDtype``
+        """
+        idx = self.index(T)
+        out = np.zeros(idx.shape, dtype=ReachabilityMapDtype)
+        valid = idx >= 0
+        out[valid] = self._table.reshape(-1)[idx[valid]]
+        return out
+
+    def reachable(self, T, mincount=1):
+        """
+        Test whether poses are reachable
+
+        :param T: end-effector poses
+        :type T: SE3 instance or ndarray(4,4) or ndarray(m,4,4)
+        :param mincount: minimum number of samples for a bin to be considered
+            reachable, defaults to 1
+        :type mincount: int
+        :return: whether the bin of each pose is reachable
+        :rtype: ndarray(m) of bool
+        """
+        return self.lookup(T)["count"] >= mincount
+
+    def reachability(self, p):
+        """
+        Reachability index of positions
+
+        :param p: positions
+        :type p: array_like(3) or ndarray(m,3)
+        :return: fraction of the orientation bins reached in the voxel of
+            each position, zero outside the voxel grid
+        :rtype: ndarray(m)
+
+        This is the reachability index of Zacharias et al, a value of one
+        means the end-effector can approach the position from any direction.
+        """
+        p = np.array(p, dtype=np.float64).reshape(-1, 3)
+        v = self._voxel_index(p)
+        out = np.zeros(len(p))
+        valid = v >= 0
+
+        counts = self._table["count"].reshape(-1, self._table.shape[3])
+        out[valid] = np.count_nonzero(counts[v[valid]], axis=1) / counts.shape[1]
+        return out
+
+    def add(self, T, manipulability):
+        """
+        Add samples to the map
+
+        :param T: end-effector poses
+        :type T: ndarray(m,4,4)
+        :param manipulability: manipulability of each pose
+        :type manipulability: ndarray(m)
+
+        Samples outside the voxel grid are ignored.
+        """
+        T = np.array(T, dtype=np.float64).reshape(-1, 4, 4)
+        self._add(self._index(T[:, :3, 3], T[:, :3, 2]), manipulability)
+
+    def save(self, filename):
+        """
+        Save the map
+
+        :param filename: name of the map, without extension
+        :type filename: str or Path
+
+        The table is written to ``filename.npy`` in NumPy format so that it
+        can be memory mapped by :func:`load`, and the grid parameters to
+        ``filename.json``.
+
+        :seealso: :func:`load`
+        """
+        path = Path(filename)
+        if path.suffix in (".npy", ".json"):
+            path = path.with_suffix("")
+
+        np.save(path.with_suffix(".npy"), self._table)
+        with open(path.with_suffix(".json"), "w") as f:
+            json.dump(
+                {
+                    "origin": self._origin.tolist(),
+                    "voxel": self._voxel,
+                    "shape": list(self._shape),
+                    "bins": self._bins,
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, filename, mmap=True):
+        """
+        Load a map
+
+        :param filename: name of the map as given to :func:`save`
+        :type filename: str or Path
+        :param mmap: memory map the table rather than read it, defaults to
+            True
+        :type mmap: bool
+        :return: reachability map
+        :rtype: ReachabilityMap
+
+        A memory mapped table is read-only and only the parts of the file
+        which are looked up are read from disk, so a large map loads
+        immediately.
+
+        :seealso: :func:`save`
+        """
+        path = Path(filename)
+        if path.suffix in (".npy", ".json"):
+            path = path.with_suffix("")
+
+        with open(path.with_suffix(".json")) as f:
+            meta = json.load(f)
+
+        table = np.load(path.with_suffix(".npy"), mmap_mode="r" if mmap else None)
+        return cls(meta["origin"], meta["voxel"], meta["shape"], meta["bins"], table)
+
+    @classmethod
+    def build(
+        cls,
+        ets,
+        n=100000,
+        voxel=0.05,
+        bins=2,
+        bounds=None,
+        axes="all",
+        seed=None,
+        chunksize=10000,
+    ):
+        """
+        Build a map by sampling joint space
+
+        :param ets: kinematic chain
+        :type ets: ETS
+        :param n: number of random joint configurations, defaults to 100000
+        :type n: int
+        :param voxel: side length of a voxel, defaults to 0.05
+        :type voxel: float
+        :param bins: number of orientation cells along each side of a cube
+            map face, defaults to 2
+        :type bins: int
+        :param bounds: lower and upper corners of the workspace, defaults to
+            the bounds of the sampled positions
+        :type bounds: array_like(2,3), optional
+        :param axes: task space axes of the manipulability, "all" [default],
+            "trans" or "rot"
+        :type axes: str
+        :param seed: seed for the random configurations
+        :type seed: int, optional
+        :param chunksize: number of configurations evaluated at once,
+            defaults to 10000
+        :type chunksize: int
+        :return: reachability map
+        :rtype: ReachabilityMap
+        :raises ValueError: if ``axes`` is unknown
+
+        Configurations are drawn by :func:`~roboticstoolbox.ETS.random_q`
+        and their poses and Jacobians evaluated in bulk, ``chunksize`` at a
+        time, so memory use does not grow with ``n``.
+        """
+        rows = {"all": slice(0, 6), "trans": slice(0, 3), "rot": slice(3, 6)}
+        if axes not in rows:
+            raise ValueError(f"unknown axes {axes}")
+
+        rng = np.random.default_rng(seed)
+
+        chunks = []
+        for start in range(0, n, chunksize):
+            m = min(chunksize, n - start)
+            q = np.array(ets.random_q(m, seed=rng.integers(2**63)), ndmin=2)
+            T, J = ets._jacob0_numpy(q)
+            J = J[:, rows[axes], :]
+            manip = np.sqrt(np.abs(np.linalg.det(J @ J.transpose(0, 2, 1))))
+            chunks.append((T[:, :3, 3], T[:, :3, 2], manip))
+
+        if bounds is None:
+            p = np.concatenate([c[0] for c in chunks])
+            lo = p.min(axis=0)
+            hi = p.max(axis=0)
+        else:
+            lo, hi = np.array(bounds, dtype=np.float64).reshape(2, 3)
+
+        origin = np.floor(lo / voxel) * voxel
+        shape = np.floor((hi - origin) / voxel).astype(int) + 1
+
+        rmap = cls(origin, voxel, shape, bins)
+        for p, a, manip in chunks:
+            rmap._add(rmap._index(p, a), manip)
+
+        return rmap
+
+    # --------------------------------------------------------------------- #
+
+    def _voxel_index(self, p):
+        """
+        Flat voxel index of positions, -1 outside the grid
+        """
+        i = np.floor((p - self._origin) / self._voxel).astype(np.int64)
+        nx, ny, nz = self._shape
+        valid = np.all((i >= 0) & (i < self._shape), axis=1)
+        v = (i[:, 0] * ny + i[:, 1]) * nz + i[:, 2]
+        return np.where(valid, v, -1)
+
+    def _bin_index(self, a):
+        """
+        Cube map orientation bin of approach vectors
+        """
+        k = self._bins
+        r = np.arange(len(a))
+
+        # face is the dominant axis and its sign, the cell is found from the
+        # other two components projected onto that face
+        axis = np.argmax(np.abs(a), axis=1)
+        major = a[r, axis]
+        face = 2 * axis + (major < 0)
+        u = a[r, (axis + 1) % 3] / np.abs(major)
+        v = a[r, (axis + 2) % 3] / np.abs(major)
+
+        iu = np.clip(np.floor((u + 1) * k / 2), 0, k - 1).astype(np.int64)
+        iv = np.clip(np.floor((v + 1) * k / 2), 0, k - 1).astype(np.int64)
+        return (face * k + iu) * k + iv
+
+    def _index(self, p, a):
+        """
+        Flat table index of positions and approach vectors
+        """
+        v = self._voxel_index(p)
+        nb = 6 * self._bins**2
+        return np.where(v >= 0, v * nb + self._bin_index(a), -1)
+
+    def _add(self, idx, manip):
+        """
+        Accumulate samples into the table
+        """
+        valid = idx >= 0
+        idx = idx[valid]
+        manip = np.asarray(manip, dtype=np.float64)[valid]
+        if len(idx) == 0:
+            return
+
+        table = self._table.reshape(-1)
+        cells, inverse, count = np.unique(idx, return_inverse=True, return_counts=True)
+        msum = np.bincount(inverse, weights=manip)
+        mmax = np.full(len(cells), -np.inf)
+        np.maximum.at(mmax, inverse, manip)
+
+        old = table[cells]
+        total = old["count"] + count
+        mean = old["manip_mean"] + (msum - count * old["manip_mean"]) / total
+
+        table["count"][cells] = total
+        table["manip_max"][cells] = np.maximum(old["manip_max"], mmax)
+        table["manip_mean"][cells] = mean
@@ -16,14 +16,16 @@ from ansitable import ANSITable, Column
 from roboticstoolbox.backends.PyPlot import PyPlot
 from roboticstoolbox.backends.PyPlot.EllipsePlot import EllipsePlot
 from roboticstoolbox.robot.Dynamics import DynamicsMixin
+from roboticstoolbox.robot.ET import ET
 from roboticstoolbox.robot.ETS import ETS
 from roboticstoolbox.robot.IK import IKMixin
 from typing import Union, Dict, Tuple
 from spatialgeometry import Shape
 from fknm import Robot_link_T
-from functools import lru_cache
 from spatialgeometry import SceneNode
 from roboticstoolbox.robot.Link import BaseLink, Link
+from roboticstoolbox.robot.BroadPhase import BroadPhase, bounding_radius
+from roboticstoolbox.robot.ReachabilityMap import ReachabilityMap
 
 # from numpy import all, eye, isin
 from roboticstoolbox.robot.Gripper import Gripper
@@ -52,6 +54,10 @@ class Robot(SceneNode, ABC, DynamicsMixin, IKMixin):
 
     _color = True
 
+    # incremented when the base, tool, kinematic or dynamic parameters
+    # change, lets proxies such as KinematicCache detect stale values
+    _cache_epoch = 0
+
     def __init__(
         self,
         links,
@@ -127,6 +133,11 @@ class Robot(SceneNode, ABC, DynamicsMixin, IKMixin):
 
         self._dynchanged = False
 
+        # fknm handles and scene nodes of the links, see _update_link_tf
+        self._link_tf_cache = None
+        self._collision_cache = None
+        self._acm = None
+
         # Set up named configuration property
         if configs is None:
             configs = dict()
@@ -244,6 +255,19 @@ class Robot(SceneNode, ABC, DynamicsMixin, IKMixin):
         self._dynchanged = True
         if what != "gravity":
             self._hasdynamics = True
+        self._cache_epoch += 1
+
+    def kinchanged(self):
+        """
+        Kinematic parameters have changed (Robot superclass)
+
+        Called from a property setter to inform the robot that any cached
+        kinematic data, such as resolved ETS paths, is invalid.
+
+        :seealso: :func:`dynchanged`
+        """
+        self._cache_epoch += 1
+        self._acm = None
 
     def _getq(self, q=None):
         """
@@ -786,7 +810,7 @@ class Robot(SceneNode, ABC, DynamicsMixin, IKMixin):
         :type q: ndarray(n), or ndarray(m,n)
         :param J: Jacobian in world frame if already computed, one of J or
             q required
-        :type J: ndarray(6,n)
+        :type J: ndarray(6,n) or ndarray(m,6,n)
         :param method: method to use, "yoshikawa" (default), "condition",
             "minsingular"  or "asada"
         :type method: str
@@ -874,25 +898,32 @@ class Robot(SceneNode, ABC, DynamicsMixin, IKMixin):
         else:
             raise ValueError("axes must be all, trans, rot or both")
 
+        # The measures accept a single Jacobian (6,n) or a stack (m,6,n)
+
         def yoshikawa(robot, J, q, axes, **kwargs):
-            J = J[axes, :]
-            if J.shape[0] == J.shape[1]:
+            J = J[..., axes, :]
+            if J.shape[-2] == J.shape[-1]:
                 # simplified case for square matrix
                 return abs(np.linalg.det(J))
             else:
-                m2 = np.linalg.det(J @ J.T)
+                m2 = np.linalg.det(J @ np.swapaxes(J, -1, -2))
                 return np.sqrt(abs(m2))
 
         def condition(robot, J, q, axes, **kwargs):
-            J = J[axes, :]
+            J = J[..., axes, :]
             return 1 / np.linalg.cond(J)  # return 1/cond(J)
 
         def minsingular(robot, J, q, axes, **kwargs):
-            J = J[axes, :]
+            J = J[..., axes, :]
             s = np.linalg.svd(J, compute_uv=False)
-            return s[-1]  # return last/smallest singular value of J
+            return s[..., -1]  # return last/smallest singular value of J
 
         def asada(robot, J, q, axes, **kwargs):
+            if J.ndim == 3:
+                return np.array(
+                    [asada(robot, Jk, qk, axes) for Jk, qk in zip(J, q)]
+                )
+
             # dof = np.sum(axes)
             if np.linalg.matrix_rank(J) < 6:
                 return 0
@@ -923,31 +954,111 @@ class Robot(SceneNode, ABC, DynamicsMixin, IKMixin):
         # Otherwise use the q vector/matrix
         else:
             q = getmatrix(q, (None, self.n))
-            w = np.zeros(q.shape[0])
-
-            for k, qk in enumerate(q):
-                Jk = self.jacob0(qk, **kwargs)
-                w[k] = mfunc(self, Jk, qk, axes)
+            w = mfunc(self, self._jacob0_traj(q, **kwargs), q, axes)
 
         if len(w) == 1:
             return w[0]
         else:
             return w
 
+    def reachability_map(
+        self,
+        n=100000,
+        voxel=0.05,
+        bins=2,
+        bounds=None,
+        axes="all",
+        end=None,
+        start=None,
+        seed=None,
+    ):
+        """
+        Build a reachability map
+
+        :param n: number of random joint configurations, defaults to 100000
+        :type n: int
+        :param voxel: side length of a voxel, defaults to 0.05
+        :type voxel: float
+        :param bins: number of orientation cells along each side of a cube
+            map face, defaults to 2
+        :type bins: int
+        :param bounds: lower and upper corners of the workspace, defaults to
+            the bounds of the sampled positions
+        :type bounds: array_like(2,3), optional
+        :param axes: task space axes of the manipulability, "all" [default],
+            "trans" or "rot"
+        :type axes: str
+        :param end: the particular link or gripper whose pose is mapped, for
+            an ``ERobot``
+        :type end: str or Link instance, optional
+        :param start: the link considered as the base frame, for an
+            ``ERobot``
+        :type start: str or Link instance, optional
+        :param seed: seed for the random configurations
+        :type seed: int, optional
+        :return: reachability map
+        :rtype: ReachabilityMap
+
+        ``robot.reachability_map(n)`` samples ``n`` random configurations
+        within the joint limits and records which end-effector positions and
+        approach directions they reach, and with what manipulability, in the
+        frame of ``robot.fkine``, which includes the base.  The map can be
+        saved, and later memory mapped, so that targets can be rejected
+        without solving inverse kinematics.
+
+        Example:
+
+        .. runblock:: pycon
+
+            >>> import roboticstoolbox as rtb
+            >>> panda = rtb.models.Panda()
+            >>> rmap = panda.reachability_map(20000, voxel=0.1, seed=0)
+            >>> rmap.reachable(panda.fkine(panda.qr))
+
+        :seealso: :class:`~roboticstoolbox.ReachabilityMap`
+        """
+        if end is None and start is None:
+            ets = self.ets()
+        else:
+            ets = self.ets(start, end)
+
+        # the ETS of an ERobot excludes the base, fkine includes it
+        if isinstance(self, rtb.ERobot) and not np.array_equal(self.base.A, np.eye(4)):
+            ets = ET.SE3(self.base.A) * ets
+
+        return ReachabilityMap.build(
+            ets, n, voxel=voxel, bins=bins, bounds=bounds, axes=axes, seed=seed
+        )
+
+    def _jacob0_traj(self, q, **kwargs):
+        """
+        Manipulator Jacobians along a trajectory
+
+        :param q: Joint coordinates, one configuration per row
+        :type q: ndarray(m,n)
+        :param kwargs: extra arguments to pass to ``jacob0``
+        :return: The manipulator Jacobian for each row of ``q``
+        :rtype: ndarray(m,6,n)
+
+        This calls ``jacob0`` once per configuration, subclasses whose
+        ``jacob0`` accepts a trajectory override it to use a single call.
+        """
+        return np.array([self.jacob0(qk, **kwargs) for qk in q])
+
     def jacob0_dot(self, q=None, qd=None, J0=None, representation=None):
         r"""
         Derivative of Jacobian
 
         :param q: The joint configuration of the robot
-        :type q: float ndarray(n)
+        :type q: float ndarray(n) or ndarray(m,n)
         :param qd: The joint velocity of the robot
-        :type qd: ndarray(n)
+        :type qd: ndarray(n) or ndarray(m,n)
         :param J0: Jacobian in {0} frame
-        :type J0: ndarray(6,n)
+        :type J0: ndarray(6,n) or ndarray(m,6,n)
         :param representation: angular representation
         :type representation: str
         :return: The derivative of the manipulator Jacobian
-        :rtype:  ndarray(6,n)
+        :rtype:  ndarray(6,n) or ndarray(m,6,n)
 
         ``robot.jacob_dot(q, qd)`` computes the rate of change of the
         Jacobian elements
@@ -964,6 +1075,12 @@ class Robot(SceneNode, ABC, DynamicsMixin, IKMixin):
         It is computed as the mode-3 product of the Hessian tensor and the
         velocity vector.
 
+        If ``q`` and ``qd`` are matrices (m,n) the result is an array (m,6,n)
+        for each row, using the Jacobians and Hessians of the whole
+        trajectory computed in one call. This requires a robot whose
+        ``jacob0`` and ``hessian0`` accept a trajectory, and
+        ``representation`` to be None.
+
         The derivative of an analytical Jacobian can be obtained by setting
         ``representation`` as
 
@@ -1015,7 +1132,7 @@ class Robot(SceneNode, ABC, DynamicsMixin, IKMixin):
             )
             # Jd = Ai @ Jd
 
-        return np.tensordot(H, qd, (0, 0))
+        return np.einsum("...jab,...j->...ab", H, qd)
 
     def jacobm(self, q=None, J=None, H=None, end=None, start=None, axes="all"):
         r"""
@@ -1245,6 +1362,7 @@ class Robot(SceneNode, ABC, DynamicsMixin, IKMixin):
                 self._T = T.A
             else:
                 self._T = T
+            self._cache_epoch += 1
 
         else:
             raise ValueError("base must be set to None (no tool), SE2, or SE3")
@@ -1271,6 +1389,7 @@ class Robot(SceneNode, ABC, DynamicsMixin, IKMixin):
             self._tool = T.A
         else:
             self._tool = T
+        self._cache_epoch += 1
 
     @property
     def qlim(self):
@@ -2060,7 +2179,8 @@ class Robot(SceneNode, ABC, DynamicsMixin, IKMixin):
         world frame which connect the line of length distance between the
         shapes. If the distance is negative then the shapes are collided.
 
-        :param shape: The shape to compare distance to
+        :param shape: The shape to compare distance to, or a list of shapes
+            or a ``BroadPhase`` of shapes
         :param inf_dist: The minimum distance within which to consider
             the shape
         :param skip: Skip setting all shape transforms based on q, use this
@@ -2069,56 +2189,41 @@ class Robot(SceneNode, ABC, DynamicsMixin, IKMixin):
         :returns: d, p1, p2 where d is the distance between the shapes,
             p1 and p2 are the points in the world frame on the respective
             shapes. The points returned are [x, y, z].
-        """
-
-        if not skip:
-            self._update_link_tf(q)
-            self._propogate_scene_tree()
-            shape._propogate_scene_tree()
-
-        d = 10000
-        p1 = None
-        p2 = None
 
-        for link in self.links:
-            td, tp1, tp2 = link.closest_point(shape, inf_dist, skip=True)
+        If several shapes are given the closest of them is used.  Only the
+        robot collision shapes whose bounding spheres are within
+        ``inf_dist`` of a shape, see :class:`BroadPhase`, are tested
+        exactly.
+        """
 
-            if td is not None and td < d:
-                d = td
-                p1 = tp1
-                p2 = tp2
+        scene = self._collision_scene(q, shape, skip)
 
-        if d == 10000:
-            d = None
-
-        return d, p1, p2
+        return self._closest_point_scene(scene, inf_dist)
 
     def iscollided(self, q, shape, skip=False):
         """
         collided(shape) checks if this robot and shape have collided
-        :param shape: The shape to compare distance to
-        :type shape: Shape
+        :param shape: The shape to compare distance to, or a list of shapes
+            or a ``BroadPhase`` of shapes
+        :type shape: Shape, list of Shape or BroadPhase
         :param skip: Skip setting all shape transforms based on q, use this
             option if using this method in conjuction with Swift to save time
         :type skip: boolean
         :returns: True if shapes have collided
         :rtype: bool
+
+        Only the robot collision shapes whose bounding spheres overlap those
+        of a shape, see :class:`BroadPhase`, are tested exactly.
         """
 
-        if not skip:
-            self._update_link_tf(q)
-            self._propogate_scene_tree()
-            shape._propogate_scene_tree()
+        scene = self._collision_scene(q, shape, skip)
 
-        for link in self.links:
-            if link.iscollided(shape, skip=True):
-                return True
+        shapes, _ = self._collision_shapes(grippers=True)
 
-        if isinstance(self, rtb.ERobot):
-            for gripper in self.grippers:
-                for link in gripper.links:
-                    if link.iscollided(shape, skip=True):
-                        return True
+        for col, idx in zip(shapes, self._collision_candidates(scene, 0.0, True)):
+            for i in idx:
+                if col.iscollided(scene.shapes[i]):
+                    return True
 
         return False
 
@@ -2136,6 +2241,534 @@ class Robot(SceneNode, ABC, DynamicsMixin, IKMixin):
         warn("method collided is deprecated, use iscollided instead", FutureWarning)
         return self.iscollided(q, shape, skip=skip)
 
+    def iscollided_batch(
+        self,
+        qs,
+        shape,
+        distance=False,
+        inf_dist=1.0,
+        self_collision=False,
+        n_threads=1,
+        chunksize=1024,
+    ):
+        """
+        Check many configurations for collision
+
+        :param qs: Joint coordinates, one configuration per row
+        :type qs: ndarray(m,n)
+        :param shape: The shape to compare distance to, or a list of shapes
+            or a ``BroadPhase`` of shapes
+        :type shape: Shape, list of Shape or BroadPhase
+        :param distance: also return the distance to the shapes, defaults
+            to False
+        :type distance: bool
+        :param inf_dist: The minimum distance within which to consider the
+            shapes, used only if ``distance`` is set
+        :type inf_dist: float
+        :param self_collision: also check for self-collision, see
+            :func:`iscollided_self`, defaults to False
+        :type self_collision: bool
+        :param n_threads: number of native threads used to compute the link
+            transforms, defaults to 1
+        :type n_threads: int
+        :param chunksize: number of configurations processed at once,
+            defaults to 1024
+        :type chunksize: int
+        :returns: True for each configuration in collision and, if
+            ``distance`` is set, the distance between the robot, including
+            its grippers, and the closest shape, ``inf`` if no shape is
+            within ``inf_dist``
+        :rtype: ndarray(m) of bool, ndarray(m)
+
+        The mask is that of calling :func:`iscollided` for each row of
+        ``qs`` but the shapes, which must not move, are updated once and the
+        link transforms are computed in bulk.  The
+        robot collision shapes of all configurations are culled against the
+        shapes in one broad-phase query and only configurations with
+        candidates are tested exactly.  For example::
+
+            scene = BroadPhase(obstacles)
+            free = ~robot.iscollided_batch(qs, scene)
+
+        For ``self_collision`` the pairs of robot collision shapes whose
+        bounding spheres overlap are likewise found for all configurations at
+        once, and only the shapes of those pairs are tested exactly.
+
+        The exact tests use PyBullet which is not thread safe, ``n_threads``
+        applies to the forward kinematics only.  The robot configuration is
+        not changed.
+
+        :seealso: :func:`iscollided`, :func:`closest_point`, :class:`BroadPhase`
+        """
+        qs = getmatrix(qs, (None, self.n))
+        m = qs.shape[0]
+        margin = inf_dist if distance else 0.0
+
+        self._update_link_tf()
+        self._propogate_scene_tree()
+        scene = self._collision_scene(None, shape, True)
+        scene.update(propagate=True)
+
+        # the shapes are not moved by the exact tests, refresh them once
+        for s in scene.shapes:
+            if s.pinit:
+                s._update_pyb()
+
+        if self_collision:
+            # computed before the shape poses are overwritten
+            acm = self.acm
+
+        _, shapes, radius, _, _, body, _ = self._collision_model()
+        offset = np.array([col._T for col in shapes])
+        ns = len(shapes)
+
+        if self_collision:
+            # shape pairs of links which are not allowed to collide
+            pa, pb = np.triu_indices(ns, 1)
+            keep = ~acm[body[pa], body[pb]]
+            pa = pa[keep]
+            pb = pb[keep]
+            reach = radius[pa] + radius[pb]
+        else:
+            pa = pb = np.zeros(0, dtype=int)
+
+        collided = np.zeros(m, dtype=bool)
+        dist = np.full(m, np.inf)
+
+        try:
+            for start in range(0, m, chunksize):
+                Tb = self._collision_body_poses(
+                    qs[start : start + chunksize], n_threads
+                )
+                nc = Tb.shape[1]
+
+                # collision shape poses are only formed when tested
+                centre = np.einsum(
+                    "skij,sj->ksi", Tb[body, :, :3, :], offset[:, :, 3]
+                )
+                k, other = scene.overlaps(
+                    centre.reshape(-1, 3), np.tile(radius, nc), margin
+                )
+                config, which = np.divmod(k, max(ns, 1))
+
+                if self_collision:
+                    # self-collision candidates of all configurations, the
+                    # pairs whose bounding spheres overlap
+                    gap = np.linalg.norm(centre[:, pa] - centre[:, pb], axis=2)
+                    sconfig, spair = np.nonzero(gap <= reach)
+                    visit = np.union1d(config, sconfig)
+                    slo = np.searchsorted(sconfig, visit, side="left")
+                    shi = np.searchsorted(sconfig, visit, side="right")
+                else:
+                    visit = np.unique(config)
+                    spair = np.zeros(0, dtype=int)
+                    slo = shi = np.zeros(len(visit), dtype=int)
+
+                # only configurations with candidates need an exact test
+                lo = np.searchsorted(config, visit, side="left")
+                hi = np.searchsorted(config, visit, side="right")
+
+                for c, a, b, sa, sb in zip(visit, lo, hi, slo, shi):
+                    d = np.inf
+                    pairs = spair[sa:sb]
+
+                    # pose each shape of the candidates once
+                    for s in np.unique(np.r_[pa[pairs], pb[pairs], which[a:b]]):
+                        self._set_collision_pose(shapes[s], Tb[body[s], c] @ offset[s])
+
+                    hit = False
+                    for i, j in zip(pa[pairs], pb[pairs]):
+                        # iscollided refreshes the PyBullet pose of the
+                        # calling shape only, see _self_collision_pairs
+                        if shapes[j].pinit:
+                            shapes[j]._update_pyb()
+                        if shapes[i].iscollided(shapes[j]):
+                            hit = True
+                            break
+
+                    if hit:
+                        collided[start + c] = True
+                        if not distance:
+                            continue
+
+                    for s, i in zip(which[a:b], other[a:b]):
+                        col = shapes[s]
+
+                        if distance:
+                            td, _, _ = col.closest_point(scene.shapes[i], inf_dist)
+                            if td is not None and td < d:
+                                d = td
+                        elif col.iscollided(scene.shapes[i]):
+                            d = 0.0
+                            break
+
+                    dist[start + c] = d
+                    if d <= 0:
+                        collided[start + c] = True
+        finally:
+            # restore the collision shape poses from the link transforms
+            self._propogate_scene_tree()
+
+        if distance:
+            return collided, dist
+        else:
+            return collided
+
+    def first_contact(self, q1, q2, shape, tol=1e-3, inf_dist=1.0):
+        r"""
+        First contact along a joint-space motion
+
+        :param q1: Joint coordinates at the start of the motion
+        :type q1: ndarray(n)
+        :param q2: Joint coordinates at the end of the motion
+        :type q2: ndarray(n)
+        :param shape: The shape to compare distance to, or a list of shapes
+            or a ``BroadPhase`` of shapes
+        :type shape: Shape, list of Shape or BroadPhase
+        :param tol: distance at which the robot is considered to be in
+            contact, defaults to 1mm
+        :type tol: float
+        :param inf_dist: The minimum distance within which to consider the
+            shapes
+        :type inf_dist: float
+        :returns: the parameter :math:`s \in [0, 1]` of the first contact
+            along the motion, or None if the motion is free
+        :rtype: float or None
+
+        The motion is the straight line :math:`q(s) = q_1 + s (q_2 - q_1)`
+        in joint space, the shapes must not move.  It is checked
+        continuously, not only at samples, by conservative advancement: no
+        point of the robot moves further than
+
+        .. math::
+
+            \Delta s \sum_j | q_{2,j} - q_{1,j} | \rho_j
+
+        where :math:`\rho_j` bounds the distance of the robot collision
+        shapes, including those of the grippers, from the axis of joint
+        :math:`j`.  The parameter is advanced by the largest step that can
+        not close the current distance to the shapes, so that steps are long
+        far from the shapes and short close to them.  A contact is reported
+        once the distance falls below ``tol``, which is conservative for
+        motions passing within ``tol`` of a shape.  For example::
+
+            s = robot.first_contact(q1, q2, scene)
+            if s is None:
+                # the motion is collision free
+                ...
+
+        The bound requires collision shapes of finite size, meshes are not
+        supported.  The link transforms are left at the last configuration
+        tested.
+
+        :seealso: :func:`iscollided`, :func:`iscollided_batch`
+        """
+        q1 = getvector(q1, self.n)
+        dq = getvector(q2, self.n) - q1
+
+        scene = self._collision_scene(q1, shape, False)
+
+        moving = dq != 0
+        bound = np.abs(dq[moving]) @ self._collision_reach()[moving]
+
+        if not np.isfinite(bound):
+            raise ValueError("first_contact requires collision shapes of finite size")
+
+        s = 0.0
+
+        while True:
+            d, _, _ = self._closest_point_scene(scene, inf_dist, True)
+            if d is None:
+                d = inf_dist
+
+            if d < tol:
+                return s
+            elif s >= 1.0 or bound == 0:
+                return None
+
+            s = min(s + d / bound, 1.0)
+            self._update_link_tf(q1 + s * dq)
+            self._propogate_scene_tree()
+
+    def _collision_body_poses(self, qs, n_threads=1):
+        """
+        World transforms of the collision bodies for many configurations
+
+        :param qs: Joint coordinates, one configuration per row
+        :type qs: ndarray(m,n)
+        :return: the world transform of each body, see :func:`_collision_model`,
+            for each configuration
+        :rtype: ndarray(b,m,4,4)
+
+        The link transforms of all configurations are computed by the
+        trajectory forward kinematics of each link ETS and composed down the
+        tree.  The gripper joints are not part of ``qs``, the gripper links
+        keep their current local transforms.
+        """
+        bodies = self._collision_model()[4]
+        m = qs.shape[0]
+        T = np.empty((len(bodies), m, 4, 4))
+
+        for gripper in self.grippers:
+            gripper._update_link_tf()
+
+        base = self.base.A
+        world = {}
+        for b, link in enumerate(bodies):
+            if b < len(self.links):
+                local = link.ets.eval(qs, n_threads=n_threads).reshape(m, 4, 4)
+            else:
+                local = link._T_reference
+
+            if link.parent is None:
+                T[b] = base @ local
+            else:
+                T[b] = world[id(link.parent)] @ local
+            world[id(link)] = T[b]
+
+        return T
+
+    @staticmethod
+    def _set_collision_pose(shape, T):
+        """
+        Set the world transform of a collision shape
+
+        The transform is written directly, the scene tree is not updated.
+        """
+        shape._wT[:] = T
+        shape._wq[:] = smb.r2q(T[:3, :3], order="xyzs")
+
+    def iscollided_self(self, q=None, skip=False):
+        """
+        Check if the robot is in self-collision
+
+        :param q: Joint coordinates, defaults to ``self.q``
+        :type q: ndarray(n)
+        :param skip: Skip setting all shape transforms based on q, use this
+            option if using this method in conjuction with Swift to save time
+        :type skip: boolean
+        :returns: True if two links of the robot have collided
+        :rtype: bool
+
+        Collision shapes of links, and of gripper links, are tested against
+        each other except for pairs of links which are allowed to collide by
+        the allowed-collision matrix :attr:`acm`.  Only shapes whose bounding
+        spheres overlap are tested exactly.
+
+        :seealso: :func:`closest_point_self`, :attr:`acm`
+        """
+        shapes, i, j = self._self_collision_pairs(q, 0.0, skip)
+
+        for a, b in zip(i, j):
+            if shapes[a].iscollided(shapes[b]):
+                return True
+
+        return False
+
+    def closest_point_self(self, q=None, inf_dist=1.0, skip=False):
+        """
+        Closest points between links of the robot
+
+        :param q: Joint coordinates, defaults to ``self.q``
+        :type q: ndarray(n)
+        :param inf_dist: The minimum distance within which to consider
+            the links
+        :type inf_dist: float
+        :param skip: Skip setting all shape transforms based on q, use this
+            option if using this method in conjuction with Swift to save time
+        :type skip: boolean
+        :returns: d, p1, p2 where d is the smallest distance between two
+            links, p1 and p2 are the points in the world frame on the
+            respective links.  If the distance is negative the links have
+            collided.  All are None if no links are within ``inf_dist``.
+
+        Pairs of links which are allowed to collide by the allowed-collision
+        matrix :attr:`acm` are not considered.
+
+        :seealso: :func:`iscollided_self`, :attr:`acm`
+        """
+        shapes, i, j = self._self_collision_pairs(q, inf_dist, skip)
+
+        d = 10000
+        p1 = None
+        p2 = None
+
+        for a, b in zip(i, j):
+            td, tp1, tp2 = shapes[a].closest_point(shapes[b], inf_dist)
+
+            if td is not None and td < d:
+                d = td
+                p1 = tp1
+                p2 = tp2
+
+        if d == 10000:
+            d = None
+
+        return d, p1, p2
+
+    def _self_collision_pairs(self, q, margin, skip):
+        """
+        Pairs of robot collision shapes to test for self-collision
+
+        :return: the collision shapes and the indices of the shapes in each
+            pair
+        :rtype: list of Shape, ndarray, ndarray
+
+        The pairs are those whose bounding volumes are within ``margin`` and
+        which belong to links that are not allowed to collide.
+        """
+        acm = self.acm
+
+        if not skip:
+            self._update_link_tf(q)
+            self._propogate_scene_tree()
+
+        _, shapes, _, _, _, body, bp = self._collision_model()
+        bp.update()
+
+        pairs = bp.pairs(margin)
+        keep = ~acm[body[pairs[:, 0]], body[pairs[:, 1]]]
+        i = pairs[keep, 0]
+        j = pairs[keep, 1]
+
+        # Shape.closest_point only refreshes the PyBullet pose of the calling
+        # shape, the other shape of each pair is refreshed here
+        for b in np.unique(j):
+            if shapes[b].pinit:
+                shapes[b]._update_pyb()
+
+        return shapes, i, j
+
+    @property
+    def acm(self) -> np.ndarray:
+        """
+        Get/set the allowed-collision matrix
+
+        - ``robot.acm`` is the allowed-collision matrix, it is computed by
+          :func:`compute_acm` with default arguments on first use
+
+        :return: allowed-collision matrix
+        :rtype: ndarray(b,b) of bool
+
+        - ``robot.acm = ...`` sets the allowed-collision matrix, for example
+          one previously computed and saved with ``numpy.save``
+
+        Element ``[i, j]`` is True if link ``i`` and link ``j`` need not be
+        checked for self-collision.  The links are ``robot.links`` followed
+        by the links of the grippers, if any.  The matrix is symmetric with a
+        True diagonal.  It is discarded when the kinematic structure of the
+        robot changes, see :func:`kinchanged`.
+
+        :seealso: :func:`compute_acm`, :func:`iscollided_self`
+        """
+        if self._acm is None:
+            self.compute_acm()
+        return self._acm
+
+    @acm.setter
+    def acm(self, acm: np.ndarray):
+        acm = np.array(acm, dtype=bool)
+        nb = len(self._collision_model()[4])
+        if acm.shape != (nb, nb):
+            raise ValueError(f"acm must be a ({nb}, {nb}) matrix")
+        if not np.array_equal(acm, acm.T):
+            raise ValueError("acm must be symmetric")
+        np.fill_diagonal(acm, True)
+        self._acm = acm
+
+    def compute_acm(self, nsamples=1000, never=True, seed=0):
+        """
+        Compute the allowed-collision matrix
+
+        :param nsamples: number of random joint configurations to test,
+            defaults to 1000
+        :type nsamples: int
+        :param never: allow link pairs that never collided in the samples,
+            defaults to True
+        :type never: bool
+        :param seed: seed for the random joint configurations, defaults to 0
+        :type seed: int
+        :return: allowed-collision matrix
+        :rtype: ndarray(b,b) of bool
+
+        A pair of links is allowed to collide, and so is not checked by
+        :func:`iscollided_self`, if:
+
+        - the links are the same link
+        - one link is the parent of the other, adjacent links normally touch
+          at the joint
+        - either link has no collision shapes
+        - the links collided in every sampled configuration, they can not be
+          separated
+        - the links never collided in any sampled configuration, when
+          ``never`` is True
+
+        The configurations are drawn uniformly from the joint limits. Pairs
+        that collide only rarely can be missed by a small number of samples,
+        set ``never`` to False for a conservative matrix which only excludes
+        adjacent and always colliding links.
+
+        The matrix is stored as :attr:`acm`.
+
+        :seealso: :attr:`acm`, :func:`iscollided_self`
+        """
+        _, shapes, _, _, bodies, body, bp = self._collision_model()
+        nb = len(bodies)
+        index = {id(link): k for k, link in enumerate(bodies)}
+
+        acm = np.zeros((nb, nb), dtype=bool)
+        np.fill_diagonal(acm, True)
+
+        for k, link in enumerate(bodies):
+            if len(link.collision) == 0:
+                acm[k, :] = True
+                acm[:, k] = True
+
+            parent = getattr(link, "parent", None)
+            if parent is not None and id(parent) in index:
+                acm[k, index[id(parent)]] = True
+                acm[index[id(parent)], k] = True
+
+        # collision statistics of the remaining pairs over random configurations
+        rng = np.random.default_rng(seed)
+        qlim = self.qlim
+        count = np.zeros((nb, nb), dtype=int)
+
+        for _ in range(nsamples):
+            q = rng.uniform(qlim[0, :], qlim[1, :])
+            self._update_link_tf(q)
+            self._propogate_scene_tree()
+            bp.update()
+
+            # refresh the PyBullet pose of both shapes of each pair, see
+            # _self_collision_pairs
+            for shape in shapes:
+                if shape.pinit:
+                    shape._update_pyb()
+
+            pairs = bp.pairs()
+            bi = body[pairs[:, 0]]
+            bj = body[pairs[:, 1]]
+            hit = np.zeros((nb, nb), dtype=bool)
+
+            for a, b, i, j in zip(pairs[:, 0], pairs[:, 1], bi, bj):
+                if not acm[i, j] and not hit[i, j]:
+                    if shapes[a].iscollided(shapes[b]):
+                        hit[i, j] = hit[j, i] = True
+
+            count += hit
+
+        # restore the link transforms for the current configuration
+        self._update_link_tf()
+        self._propogate_scene_tree()
+
+        acm |= count == nsamples
+        if never:
+            acm |= count == 0
+
+        self._acm = acm
+        return acm
+
     def joint_velocity_damper(self, ps=0.05, pi=0.1, n=None, gain=1.0):
         """
         Formulates an inequality contraint which, when optimised for will
@@ -2182,19 +2815,237 @@ class Robot(SceneNode, ABC, DynamicsMixin, IKMixin):
         """
         This private method updates the local transform of each link within
         this robot according to q (or self.q if q is none)
+
+        The fknm handles of the link ETS and the link scene nodes are cached
+        until the robot reports a change, see :func:`kinchanged`.  The update
+        is skipped if ``q`` is the same as in the previous call.
         """
 
-        @lru_cache(maxsize=2)
-        def get_link_ets():
-            return [link.ets._fknm for link in self.links]
+        if q is None:
+            q = self._q
+        else:
+            q = np.asarray(q)
+            if q.dtype == object:
+                # symbolic, the link transforms use the robot configuration
+                q = self._q
+
+        cache = self._link_tf_cache
+        if cache is None or cache[0] != self._cache_epoch:
+            cache = self._link_tf_cache = [
+                self._cache_epoch,
+                [link.ets._fknm for link in self.links],
+                [link._T_reference for link in self.links],
+                None,
+            ]
+
+        if not np.array_equal(q, cache[3]):
+            Robot_link_T(cache[1], cache[2], self._q, q)
+            cache[3] = np.array(q, dtype=np.float64)
 
-        @lru_cache(maxsize=2)
-        def get_link_scene_node():
-            return [link._T_reference for link in self.links]
+        [gripper._update_link_tf() for gripper in self.grippers]
 
-        Robot_link_T(get_link_ets(), get_link_scene_node(), self._q, q)
+    def _collision_shapes(self, grippers=False):
+        """
+        Collision shapes of the robot and their bounding radii
 
-        [gripper._update_link_tf() for gripper in self.grippers]
+        :param grippers: include the collision shapes of the gripper links
+        :type grippers: bool
+        :return: the collision shapes of all links and their bounding radii
+        :rtype: list of Shape, ndarray
+
+        The list is cached, see :func:`_collision_model`.
+        """
+        cache = self._collision_model()
+
+        if grippers:
+            return cache[1], cache[2]
+        else:
+            return cache[1][: cache[3]], cache[2][: cache[3]]
+
+    def _collision_model(self):
+        """
+        Cached collision model of the robot
+
+        :return: cache key, collision shapes, bounding radii, number of
+            shapes belonging to ``links``, bodies, body index of each shape and
+            a broad phase over all shapes
+        :rtype: tuple
+
+        The bodies are the links followed by the gripper links, the body
+        index of a shape is the index of its link in that list.
+
+        The model is rebuilt when the robot reports a change, see
+        :func:`kinchanged`, or when a shape is added to or removed from the
+        collision list of a link.
+        """
+        bodies = list(self.links)
+        if isinstance(self, rtb.ERobot):
+            for gripper in self.grippers:
+                bodies += gripper.links
+
+        key = (
+            self._cache_epoch,
+            [id(col) for link in bodies for col in link.collision.scene_children],
+        )
+
+        cache = self._collision_cache
+        if cache is None or cache[0] != key:
+            n = sum(len(link.collision) for link in self.links)
+            shapes = [col for link in bodies for col in link.collision]
+            body = np.repeat(
+                np.arange(len(bodies)), [len(link.collision) for link in bodies]
+            )
+            radius = np.array([bounding_radius(col) for col in shapes])
+
+            cache = self._collision_cache = (
+                key,
+                shapes,
+                radius,
+                n,
+                bodies,
+                body,
+                BroadPhase(shapes),
+            )
+
+        return cache
+
+    def _collision_reach(self):
+        r"""
+        Reach of the robot collision shapes about each joint
+
+        :return: for each joint, a bound on the distance of the collision
+            shapes it moves from its axis, or for a prismatic joint 1
+        :rtype: ndarray(n)
+
+        A joint displacement of :math:`\Delta q_j` moves no point of the
+        robot further than :math:`\rho_j |\Delta q_j|`.  The bounds hold
+        for all configurations, they are sums of the link offsets along the
+        tree and of the bounding radius of the shapes.  The gripper joints are
+        taken to be fixed.
+        """
+        _, shapes, radius, _, bodies, body, _ = self._collision_model()
+        nlinks = len(self.links)
+
+        def offset(ets):
+            # bound on the translation of a sequence of ETs
+            length = 0.0
+            for e in ets:
+                if not e.isjoint:
+                    length += np.linalg.norm(e.A()[:3, 3])
+                elif e.istranslation:
+                    length += np.max(np.abs(self.qlim[:, e.jindex]))
+            return length
+
+        # reach of each body from its own frame, children after parents
+        reach = np.zeros(len(bodies))
+        for k, col in enumerate(shapes):
+            reach[body[k]] = max(
+                reach[body[k]], np.linalg.norm(col._T[:3, 3]) + radius[k]
+            )
+
+        index = {id(link): b for b, link in enumerate(bodies)}
+        for b in range(len(bodies) - 1, -1, -1):
+            link = bodies[b]
+            if link.parent is not None and id(link.parent) in index:
+                if b < nlinks:
+                    length = offset(link.ets)
+                else:
+                    length = np.linalg.norm(link._T_reference[:3, 3])
+
+                p = index[id(link.parent)]
+                reach[p] = max(reach[p], length + reach[b])
+
+        rho = np.zeros(self.n)
+        for link in self.links:
+            if link.isjoint:
+                ets = link.ets
+                j = [e.isjoint for e in ets].index(True)
+                if ets[j].istranslation:
+                    rho[link.jindex] = 1.0
+                else:
+                    rho[link.jindex] = offset(ets[j + 1 :]) + reach[index[id(link)]]
+
+        return rho
+
+    def _collision_scene(self, q, shape, skip):
+        """
+        Prepare a collision query
+
+        :return: the shapes to test against as a broad phase
+        :rtype: BroadPhase
+
+        Unless ``skip`` is set, the robot link transforms are updated from
+        ``q`` and the world transforms of the robot and of the shapes are
+        updated from their scene trees.
+        """
+        if not skip:
+            self._update_link_tf(q)
+            self._propogate_scene_tree()
+
+        if isinstance(shape, BroadPhase):
+            if not skip:
+                shape.update(propagate=True)
+            return shape
+
+        if not skip:
+            if isinstance(shape, (list, tuple)):
+                for s in shape:
+                    s._propogate_scene_tree()
+            else:
+                shape._propogate_scene_tree()
+
+        return BroadPhase(shape)
+
+    def _closest_point_scene(self, scene, inf_dist, grippers=False):
+        """
+        Closest points between the robot and a set of shapes
+
+        :param scene: the shapes to test against
+        :type scene: BroadPhase
+        :return: d, p1, p2 as for :func:`closest_point`
+
+        The world transforms of the robot and of the shapes must be up to
+        date.
+        """
+        d = 10000
+        p1 = None
+        p2 = None
+
+        shapes, _ = self._collision_shapes(grippers)
+        candidates = self._collision_candidates(scene, inf_dist, grippers)
+
+        for col, idx in zip(shapes, candidates):
+            for i in idx:
+                td, tp1, tp2 = col.closest_point(scene.shapes[i], inf_dist)
+
+                if td is not None and td < d:
+                    d = td
+                    p1 = tp1
+                    p2 = tp2
+
+        if d == 10000:
+            d = None
+
+        return d, p1, p2
+
+    def _collision_candidates(self, scene, margin, grippers=False):
+        """
+        Candidate shapes for each robot collision shape
+
+        :param scene: the shapes to test against
+        :type scene: BroadPhase
+        :param margin: distance within which shapes are candidates
+        :type margin: float
+        :return: for each robot collision shape, the indices of the shapes in
+            ``scene`` which may be within ``margin`` of it
+        :rtype: list of ndarray
+        """
+        shapes, radius = self._collision_shapes(grippers)
+        if len(shapes) == 0:
+            return []
+
+        centre = np.array([col._wT[:3, 3] for col in shapes])
+        return scene.candidates(centre, radius, margin)
 
     # --------------------------------------------------------------------- #
 
@@ -20,7 +20,10 @@ from roboticstoolbox.robot.ERobot import ERobot, ERobot2
 from roboticstoolbox.robot.ELink import ELink, ELink2
 from roboticstoolbox.robot.ETS import ETS, ETS2
 from roboticstoolbox.robot.Gripper import Gripper
-# from roboticstoolbox.robot.KinematicCache import KinematicCache
+from roboticstoolbox.robot.KinematicCache import KinematicCache
+from roboticstoolbox.robot.IKCache import IKCache
+from roboticstoolbox.robot.ReachabilityMap import ReachabilityMap
+from roboticstoolbox.robot.BroadPhase import BroadPhase
 from roboticstoolbox.robot.ET import ET, ET2
 
 __all__ = [
@@ -44,7 +47,10 @@ __all__ = [
     "ETS",
     "ETS2",
     "Gripper",
-    # "KinematicCache",
+    "KinematicCache",
+    "IKCache",
+    "ReachabilityMap",
+    "BroadPhase",
     "PoERobot",
     "PoELink",
     "PoEPrismatic",
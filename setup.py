@@ -67,7 +67,7 @@ frne = Extension(
         "./roboticstoolbox/core/ne.c",
         "./roboticstoolbox/core/frne.c",
     ],
-    include_dirs=["./roboticstoolbox/core/"],
+    include_dirs=["./roboticstoolbox/core/", numpy.get_include()],
 )
 
 # eig = "./roboticstoolbox/core/Eigen"
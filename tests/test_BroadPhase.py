@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import numpy.testing as nt
+import numpy as np
+import roboticstoolbox as rtb
+import spatialgeometry as gm
+import spatialmath as sm
+import unittest
+from math import inf
+from roboticstoolbox.robot.BroadPhase import bounding_radius
+
+
+class TestBroadPhase(unittest.TestCase):
+    def test_bounding_radius(self):
+        self.assertAlmostEqual(bounding_radius(gm.Sphere(0.2)), 0.2)
+        self.assertAlmostEqual(bounding_radius(gm.Cuboid([2, 3, 6])), 3.5)
+        self.assertAlmostEqual(bounding_radius(gm.Cylinder(0.3, 0.8)), 0.5)
+        self.assertEqual(bounding_radius(gm.Mesh("x.stl")), inf)
+
+    def test_candidates(self):
+        s = [gm.Sphere(0.1, pose=sm.SE3(x, 0, 0)) for x in [2, 0, 1, 3]]
+        bp = rtb.BroadPhase(s)
+        self.assertEqual(len(bp), 4)
+
+        c = bp.candidates([[0, 0, 0], [1.5, 0, 0], [1, 1, 0]], [0.1, 0.2, 0.1])
+        self.assertEqual(len(c), 3)
+        nt.assert_array_equal(c[0], [1])
+        self.assertEqual(len(c[1]), 0)
+        self.assertEqual(len(c[2]), 0)
+
+        # same candidates as flat pairs
+        k, i = bp.overlaps([[1, 1, 0], [0, 0, 0]], [0.1, 0.1])
+        nt.assert_array_equal(k, [1])
+        nt.assert_array_equal(i, [1])
+
+        # enlarged by a margin
+        c = bp.candidates([[1.5, 0, 0], [1, 1, 0]], [0.2, 0.1], margin=0.3)
+        nt.assert_array_equal(np.sort(c[0]), [0, 2])
+        self.assertEqual(len(c[1]), 0)
+
+        # shapes move
+        s[3].T = sm.SE3(0, 0, 0.1)
+        bp.update(propagate=True)
+        c = bp.candidates([[0, 0, 0]], [0.1])
+        nt.assert_array_equal(np.sort(c[0]), [1, 3])
+
+        # unbounded shapes are always candidates
+        bp.add(gm.Mesh("x.stl", pose=sm.SE3(10, 10, 10)))
+        c = bp.candidates([[1.5, 0, 0]], [0.1])
+        nt.assert_array_equal(c[0], [4])
+
+    def test_pairs(self):
+        s = [gm.Sphere(0.1, pose=sm.SE3(x, 0, 0)) for x in [0, 1, 0.15, 1.1, 5]]
+        bp = rtb.BroadPhase(s)
+        nt.assert_array_equal(bp.pairs(), [[0, 2], [1, 3]])
+        nt.assert_array_equal(bp.pairs(margin=0.7), [[0, 2], [1, 2], [1, 3]])
+        self.assertEqual(rtb.BroadPhase().pairs().shape, (0, 2))
+
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -496,6 +496,70 @@ class TestDHRobot(unittest.TestCase):
 
         nt.assert_array_almost_equal(r0.jacob0(q), J0, decimal=4)
 
+    def test_kinematics_ets_parity(self):
+        # compiled ETS path against the link by link evaluation used for
+        # symbolic joint coordinates
+        l0 = rp.PrismaticDH(theta=4, alpha=0.3, offset=0.1, qlim=[0, 1])
+        l1 = rp.RevoluteDH(a=2, d=0.2, offset=0.3, flip=True)
+        l2 = rp.RevoluteMDH(a=1, alpha=0.5)
+        l3 = rp.PrismaticMDH(theta=0.2, qlim=[0, 1])
+        robots = [
+            rp.models.DH.Puma560(),
+            rp.models.DH.Panda(),
+            rp.models.DH.Stanford(),
+            rp.DHRobot([l0, l1]),
+            rp.DHRobot([l2, l3]),
+        ]
+
+        for robot in robots:
+            robot.base = sm.SE3(0.1, 0.2, 0.3) * sm.SE3.Rx(0.4)
+            robot.tool = sm.SE3(0, 0, 0.1) * sm.SE3.Ry(0.2)
+            q = np.random.rand(4, robot.n)
+            qo = q.astype(object)
+
+            nt.assert_array_almost_equal(
+                robot.fkine(q).A, np.array(robot.fkine(qo).A, dtype=float)
+            )
+
+            for k in range(4):
+                nt.assert_array_almost_equal(
+                    robot.jacob0(q[k]), np.array(robot.jacob0(qo[k]), dtype=float)
+                )
+                nt.assert_array_almost_equal(
+                    robot.jacobe(q[k]), np.array(robot.jacobe(qo[k]), dtype=float)
+                )
+
+        # the cached ETS follows a change of kinematic parameter
+        puma = rp.models.DH.Puma560()
+        T0 = puma.fkine(puma.qn)
+        puma.links[1].a = 0.5
+        T1 = puma.fkine(puma.qn)
+        self.assertFalse(np.allclose(T0.A, T1.A))
+        nt.assert_array_almost_equal(
+            T1.A, np.array(puma.fkine(puma.qn.astype(object)).A, dtype=float)
+        )
+
+        puma.base = sm.SE3(1, 0, 0)
+        nt.assert_array_almost_equal(puma.fkine(puma.qn).t, T1.t + [1, 0, 0])
+
+    def test_jacob_traj(self):
+        puma = rp.models.DH.Puma560()
+        q = np.random.uniform(-1, 1, size=(5, 6))
+
+        J0 = puma.jacob0(q)
+        Je = puma.jacobe(q, half="rot")
+        self.assertEqual(J0.shape, (5, 6, 6))
+        self.assertEqual(Je.shape, (5, 3, 6))
+
+        for k in range(5):
+            nt.assert_array_almost_equal(J0[k], puma.jacob0(q[k]))
+            nt.assert_array_almost_equal(Je[k], puma.jacobe(q[k], half="rot"))
+
+        nt.assert_array_almost_equal(puma.jacob0(q[0].reshape(6, 1)), J0[0])
+        nt.assert_array_almost_equal(
+            puma.manipulability(q), [puma.manipulability(qk) for qk in q]
+        )
+
     def test_jacobe_panda(self):
         panda = rp.models.DH.Panda()
         q = [1, 2, 3, 4, 5, 6, 7]
@@ -994,6 +1058,96 @@ class TestDHRobot(unittest.TestCase):
         self.assertTrue(sol.success)
         self.assertAlmostEqual(np.linalg.norm(T - puma.fkine(sol.q)), 0, places=5)
 
+    def test_ikine_analytic(self):
+        for name in ["UR5", "IRB140", "KR5", "Puma560"]:
+            robot = getattr(rp.models.DH, name)()
+            self.assertTrue(robot.isanalytic())
+            robot.base = sm.SE3(0.1, 0.2, 0.3) * sm.SE3.Rz(0.4)
+            robot.tool = sm.SE3(0, 0, 0.1) * sm.SE3.Rx(0.2)
+
+            q = robot.ets().random_q(20, seed=0)
+            T = sm.SE3([robot.fkine(qk) for qk in q])
+
+            # every solution reaches the pose, one of them is q
+            sols = robot.ikine_analytic(T)
+            self.assertEqual(len(sols), 20)
+            for qk, Tk, sol in zip(q, T, sols):
+                self.assertGreaterEqual(len(sol), 2)
+                self.assertLessEqual(len(sol), 8)
+                for qs in sol:
+                    nt.assert_array_almost_equal(robot.fkine(qs).A, Tk.A)
+                d = np.linalg.norm(sm.base.angdiff(sol, qk), axis=1)
+                self.assertAlmostEqual(d.min(), 0)
+
+            # nearest solution
+            sol = robot.ikine_analytic(T, q0=q)
+            self.assertTrue(np.all(sol.success))
+            nt.assert_array_almost_equal(sm.base.angdiff(sol.q, q), 0)
+
+            sol = robot.ikine_analytic(T[0], q0=q[0])
+            self.assertTrue(sol.success)
+            nt.assert_array_almost_equal(sm.base.angdiff(sol.q, q[0]), 0)
+
+        # the Puma 560 analytic solution is one of the branches
+        puma = rp.models.DH.Puma560()
+        T = puma.fkine(puma.qn)
+        sols = puma.ikine_analytic(T)
+        for config in ["lun", "ldn", "run", "luf"]:
+            q = puma.ikine_a(T, config).q
+            self.assertAlmostEqual(
+                np.linalg.norm(sm.base.angdiff(sols, q), axis=1).min(), 0, places=6
+            )
+
+        # out of reach
+        self.assertEqual(len(puma.ikine_analytic(sm.SE3(5, 0, 0))), 0)
+        sol = puma.ikine_analytic(sm.SE3(5, 0, 0), q0=puma.qz)
+        self.assertFalse(sol.success)
+
+        # the solver follows changes to the kinematic parameters
+        puma.links[1].a = 0.5
+        sols = puma.ikine_analytic(puma.fkine(puma.qn))
+        for qs in sols:
+            nt.assert_array_almost_equal(puma.fkine(qs).A, puma.fkine(puma.qn).A)
+
+        robot = rp.models.DH.Stanford()
+        self.assertFalse(robot.isanalytic())
+        with self.assertRaises(ValueError):
+            robot.ikine_analytic(robot.fkine(robot.qz))
+
+    def test_ikine_analytic_singular(self):
+        # joint 5 at 0 or pi, only the sum of joints 2, 3, 4 and 6 is fixed
+        robot = rp.models.DH.UR5()
+        q = robot.ets().random_q(200, seed=0)
+        q[:100, 4] = 0
+        q[100:, 4] = np.pi
+        T = np.array([robot.fkine(qk).A for qk in q])
+
+        sol = robot.ikine_analytic(T, q0=q)
+        self.assertTrue(np.all(sol.success))
+        for qs, Tk in zip(sol.q, T):
+            nt.assert_array_almost_equal(robot.fkine(qs).A, Tk)
+
+        for sol in robot.ikine_analytic(T):
+            self.assertGreaterEqual(len(sol), 2)
+
+    def test_ikine_a_analytic(self):
+        # a robot without a hand-written solution uses the generated one
+        robot = rp.models.DH.UR5()
+        q = np.r_[0.1, -1, 1, 0.2, 0.3, 0.4]
+        T = robot.fkine(q)
+
+        sol = robot.ikine_a(T, q0=q + 0.1)
+        self.assertTrue(sol.success)
+        nt.assert_array_almost_equal(sol.q, q)
+
+        robot.q = q
+        nt.assert_array_almost_equal(robot.ikine_a(T).q, q)
+
+        with self.assertRaises(ValueError):
+            robot.ikine_a(T, "lun")
+        with self.assertRaises(ValueError):
+            rp.models.DH.Stanford().ikine_a(T)
+
     def test_ikine_con(self):
         puma = rp.models.DH.Puma560()
 
@@ -1008,6 +1162,55 @@ class TestDHRobot(unittest.TestCase):
         self.assertTrue(sol.success)
         self.assertAlmostEqual(np.linalg.norm(T - puma.fkine(sol.q)), 0, places=5)
 
+    def test_ikine_min_gradient(self):
+        from roboticstoolbox.robot.IK import _IKCost
+        from scipy.optimize import approx_fprime
+
+        puma = rp.models.DH.Puma560()
+        Td = puma.fkine(puma.qn).A
+        cost = _IKCost(puma, Td, np.r_[2, 2, 2, 1, 1, 1], stiffness=0.1)
+
+        q = np.r_[0.1, 0.2, -0.3, 0.4, 0.5, -0.6]
+        nt.assert_array_almost_equal(
+            cost.jac(q), approx_fprime(q, cost.fun, 1e-7), decimal=5
+        )
+
+        # batch cost, one configuration per column
+        Q = np.c_[q, puma.qn, puma.qz]
+        nt.assert_array_almost_equal(cost.batch(Q), [cost.fun(x) for x in Q.T])
+
+        # only the stiffness term remains at the solution
+        self.assertAlmostEqual(cost.fun(puma.qn), 0.1 * np.sum(np.diff(puma.qn) ** 2))
+
+    def test_ikine_min_gradient_base(self):
+        from roboticstoolbox.robot.IK import _IKCost
+        from scipy.optimize import approx_fprime
+
+        panda = rp.models.ETS.Panda()
+        panda.base = sm.SE3.Rz(1.2) * sm.SE3.Rx(0.3)
+        T = panda.fkine(panda.qr)
+        cost = _IKCost(panda, T.A, np.r_[2, 2, 2, 1, 1, 1])
+
+        q = panda.qz + 0.2
+        nt.assert_array_almost_equal(
+            cost.jac(q), approx_fprime(q, cost.fun, 1e-7), decimal=5
+        )
+
+        sol = panda.ikine_min(T, q0=panda.qz, qlim=True)
+        self.assertTrue(sol.success)
+        self.assertAlmostEqual(np.linalg.norm(T - panda.fkine(sol.q)), 0, places=4)
+
+    def test_ikine_global(self):
+        puma = rp.models.DH.Puma560()
+        T = puma.fkine(puma.qn)
+
+        sol = puma.ikine_global(T, options={"seed": 0})
+        self.assertTrue(sol.success)
+        self.assertAlmostEqual(np.linalg.norm(T - puma.fkine(sol.q)), 0, places=5)
+
+        with self.assertRaises(ValueError):
+            puma.ikine_global(T, method="foo")
+
     # def test_ikine_min(self):
     #     puma = rp.models.DH.Puma560()
     #     q = puma.qn
@@ -1075,6 +1278,31 @@ class TestDHRobot(unittest.TestCase):
         nt.assert_array_almost_equal(t0[0, :], tr0, decimal=4)
         nt.assert_array_almost_equal(t0[1, :], tr1, decimal=4)
 
+    def test_rne_out(self):
+        puma = rp.models.DH.Puma560()
+
+        z = np.zeros(6)
+        o = np.ones(6)
+
+        tr0 = [-0.0000, 31.6399, 6.0351, 0.0000, 0.0283, 0]
+        tr1 = [32.4952, 60.8670, 17.7436, 1.4545, 1.2991, 0.7138]
+
+        out = np.zeros(6)
+        t0 = puma.rne(puma.qn, z, z, out=out)
+        self.assertIs(t0, out)
+        nt.assert_array_almost_equal(out, tr0, decimal=4)
+
+        out = np.zeros((2, 6))
+        puma.rne(np.c_[puma.qn, puma.qn].T, np.c_[z, o].T, np.c_[z, o].T, out=out)
+        nt.assert_array_almost_equal(out[0, :], tr0, decimal=4)
+        nt.assert_array_almost_equal(out[1, :], tr1, decimal=4)
+
+        with self.assertRaises(ValueError):
+            puma.rne(puma.qn, z, z, out=np.zeros(5))
+
+        with self.assertRaises(ValueError):
+            puma.rne(puma.qn, z, z, out=np.zeros(6, dtype=np.float32))
+
     def test_rne_delete(self):
         puma = rp.models.DH.Puma560()
 
@@ -1106,6 +1334,73 @@ class TestDHRobot(unittest.TestCase):
         nt.assert_array_almost_equal(qdd1[0, :], res, decimal=4)
         nt.assert_array_almost_equal(qdd1[1, :], res, decimal=4)
 
+    def test_accel_aba(self):
+        puma = rp.models.DH.Puma560()
+        puma.base = sm.SE3.Rx(0.3)
+        q = np.array([[0.1, 0.5, -0.7, 0.3, 0.6, 0.2], puma.qn])
+        qd = np.array([[0.1, 0.2, 0.8, 0.2, 0.5, 1.0], [-1, 0.5, 0, 2, -0.1, 0.3]])
+        torque = np.array([[1.0, 3.2, 1.8, 0.1, 0.7, 4.6], np.zeros(6)])
+
+        qdd0 = puma.accel(q[0], qd[0], torque[0], method="aba")
+        qdd1 = puma.accel(q, qd, torque, method="aba")
+
+        nt.assert_array_almost_equal(qdd0, puma.accel(q[0], qd[0], torque[0]))
+        nt.assert_array_almost_equal(qdd1, puma.accel(q, qd, torque))
+
+        # modified DH and prismatic joints
+        for robot in [rp.models.DH.Panda(), rp.models.DH.Stanford()]:
+            q = np.random.rand(3, robot.n)
+            qd = np.random.rand(3, robot.n)
+            torque = np.random.rand(3, robot.n)
+            nt.assert_array_almost_equal(
+                robot.accel(q, qd, torque, method="aba"),
+                robot.accel(q, qd, torque),
+            )
+
+        with self.assertRaises(ValueError):
+            puma.accel(puma.qn, puma.qz, puma.qz, method="foo")
+
+    def test_fdyn_aba(self):
+        puma = rp.models.DH.Puma560().nofriction()
+
+        tg0 = puma.fdyn(0.05, puma.qn, dt=0.01)
+        tg1 = puma.fdyn(0.05, puma.qn, dt=0.01, method="aba")
+
+        nt.assert_array_almost_equal(tg1.t, tg0.t)
+        nt.assert_array_almost_equal(tg1.q, tg0.q)
+        nt.assert_array_almost_equal(tg1.qd, tg0.qd)
+
+    def test_fdyn_fixed(self):
+        puma = rp.models.DH.Puma560().nofriction()
+
+        tg = puma.fdyn(0.05, puma.qn, solver_args={"rtol": 1e-10, "atol": 1e-10})
+        tg0 = puma.fdyn(0.05, puma.qn, dt=0.01, solver="rk4")
+        tg1 = puma.fdyn(0.05, puma.qn, dt=0.0001, solver="euler")
+
+        self.assertEqual(tg0.q.shape, (6, 6))
+        nt.assert_array_almost_equal(tg0.t, np.arange(6) * 0.01)
+        nt.assert_array_almost_equal(tg0.q[-1], tg.q[-1])
+        nt.assert_array_almost_equal(tg0.qd[-1], tg.qd[-1], decimal=4)
+        nt.assert_array_almost_equal(tg1.q[-1], tg.q[-1], decimal=4)
+
+        # batch of initial states and a state feedback torque
+        q0 = np.array([puma.qn, puma.qz, puma.qr])
+
+        def damper(robot, t, q, qd):
+            return -10 * qd
+
+        tg2 = puma.fdyn(0.05, q0, damper, dt=0.01, solver="rk4", method="aba")
+        self.assertEqual(tg2.q.shape, (3, 6, 6))
+        self.assertEqual(tg2.qd.shape, (3, 6, 6))
+
+        for k in range(3):
+            tgk = puma.fdyn(0.05, q0[k], damper, dt=0.01, solver="rk4")
+            nt.assert_array_almost_equal(tg2.q[k], tgk.q)
+            nt.assert_array_almost_equal(tg2.qd[k], tgk.qd)
+
+        with self.assertRaises(ValueError):
+            puma.fdyn(0.05, puma.qn, solver="rk4")
+
     def test_inertia(self):
         puma = rp.models.DH.Puma560()
         puma.q = puma.qn
@@ -1127,6 +1422,27 @@ class TestDHRobot(unittest.TestCase):
         # nt.assert_array_almost_equal(I1[0, :, :], Ir, decimal=4)
         # nt.assert_array_almost_equal(I1[1, :, :], Ir, decimal=4)
 
+    def test_inertia_crba(self):
+        puma = rp.models.DH.Puma560()
+        q = np.array([[0.1, 0.5, -0.7, 0.3, 0.6, 0.2], puma.qn, puma.qz])
+
+        I0 = puma.inertia(q[1], method="crba")
+        I1 = puma.inertia(q, method="crba")
+
+        self.assertEqual(I0.shape, (6, 6))
+        nt.assert_array_almost_equal(I0, puma.inertia(q[1]))
+        nt.assert_array_almost_equal(I1, puma.inertia(q))
+
+        # modified DH and prismatic joints
+        for robot in [rp.models.DH.Panda(), rp.models.DH.Stanford()]:
+            q = np.random.rand(3, robot.n)
+            nt.assert_array_almost_equal(
+                robot.inertia(q, method="crba"), robot.inertia(q)
+            )
+
+        with self.assertRaises(ValueError):
+            puma.inertia(puma.qn, method="foo")
+
     def test_inertia_x(self):
         puma = rp.models.DH.Puma560()
         q = puma.qn
@@ -1169,6 +1485,36 @@ class TestDHRobot(unittest.TestCase):
         nt.assert_array_almost_equal(C1[0, :, :], Cr, decimal=4)
         nt.assert_array_almost_equal(C1[1, :, :], Cr, decimal=4)
 
+    def test_coriolis_traj(self):
+        puma = rp.models.DH.Puma560()
+        rng = np.random.default_rng(0)
+        q = rng.uniform(-1, 1, (10, 6))
+        qd = rng.uniform(-1, 1, (10, 6))
+        z = np.zeros((10, 6))
+
+        tau0 = puma.rne(q, qd, z)
+        C = puma.coriolis(q, qd)
+        self.assertEqual(C.shape, (10, 6, 6))
+
+        # C qd is the velocity dependent torque
+        tau = puma.nofriction(True, True).rne(q, qd, z, gravity=[0, 0, 0])
+        nt.assert_array_almost_equal(np.einsum("kij,kj->ki", C, qd), tau)
+
+        # friction and gravity are restored afterwards
+        nt.assert_array_almost_equal(puma.rne(q, qd, z), tau0)
+
+    def test_coriolis_x(self):
+        puma = rp.models.DH.Puma560()
+        q = [0.1, 0.5, -0.7, 0.3, 0.6, 0.2]
+        qd = [1, 2, 3, 1, 2, 3]
+
+        Cx0 = puma.coriolis_x(q, qd)
+        Cx1 = puma.coriolis_x(np.c_[q, q].T, np.c_[qd, qd].T)
+
+        self.assertEqual(Cx0.shape, (6, 6))
+        nt.assert_array_almost_equal(Cx1[0, :, :], Cx0)
+        nt.assert_array_almost_equal(Cx1[1, :, :], Cx0)
+
     def test_gravload(self):
         puma = rp.models.DH.Puma560()
         q = puma.qn
@@ -743,6 +743,36 @@ class TestERobot(unittest.TestCase):
         self.assertRaises(TypeError, panda.manipulability, "Wfgsrth")
         self.assertRaises(ValueError, panda.manipulability, [1, 3])
 
+    def test_manipulability_traj(self):
+        panda = rtb.models.ETS.Panda()
+        q = np.random.uniform(-1, 1, size=(10, 7))
+        qd = np.random.uniform(-1, 1, size=(10, 7))
+
+        for method in ["yoshikawa", "invcondition", "minsingular"]:
+            m = panda.manipulability(q, method=method, axes="trans")
+            self.assertEqual(m.shape, (10,))
+            for k in range(10):
+                self.assertAlmostEqual(
+                    m[k], panda.manipulability(q[k], method=method, axes="trans")
+                )
+
+        Jd = panda.jacob0_dot(q, qd)
+        self.assertEqual(Jd.shape, (10, 6, 7))
+        for k in range(10):
+            nt.assert_array_almost_equal(Jd[k], panda.jacob0_dot(q[k], qd[k]))
+
+    def test_kinematics(self):
+        panda = rtb.models.Panda()
+        panda.base = sm.SE3(0.1, 0.2, 0.3)
+        q = panda.qr
+
+        k = panda.kinematics(q, ["T", "Je", "manipulability", "jacobm"])
+        nt.assert_array_almost_equal(k.T, panda.fkine(q).A)
+        nt.assert_array_almost_equal(k.Je, panda.jacobe(q))
+        nt.assert_array_almost_equal(k.manipulability, panda.manipulability(q))
+        nt.assert_array_almost_equal(k.jacobm, panda.jacobm(q))
+        self.assertIsNone(k.J0)
+
     def test_jacobm(self):
         panda = rtb.models.ETS.Panda()
         q1 = np.array([1.4, 0.2, 1.8, 0.7, 0.1, 3.1, 2.9])
@@ -829,6 +859,35 @@ class TestERobot(unittest.TestCase):
         with self.assertRaises(TypeError):
             panda.ee_links = [1]  # type: ignore
 
+    def test_ets_cache(self):
+        panda = rtb.models.Panda()
+
+        e1 = panda.ets()
+        e2 = panda.ets()
+        self.assertIs(e1, e2)
+        self.assertEqual(panda.ets_cache_info().hits, 1)
+        self.assertEqual(panda.ets_cache_info().misses, 1)
+
+        panda.fkine(panda.qr, end="panda_link5")
+        panda.fkine(panda.qr, end="panda_link5")
+        info = panda.ets_cache_info()
+        self.assertEqual(info.hits, 2)
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.currsize, 2)
+
+        # changing the gripper tool gives a new ETS
+        T = panda.fkine(panda.qr)
+        panda.grippers[0].tool = SE3.Tz(0.1)
+        nt.assert_almost_equal(panda.fkine(panda.qr).A, (T * SE3.Tz(0.1 - 0.1034)).A)
+
+        # structural changes invalidate the cache
+        panda.links[2].ets = panda.links[2].ets
+        self.assertEqual(panda.ets_cache_info().currsize, 0)
+
+        panda.ets()
+        panda.ee_links = panda.links[5]
+        self.assertEqual(panda.ets_cache_info().currsize, 0)
+
     def test_qlim(self):
         panda = rtb.models.ETS.Panda()
 
@@ -910,6 +969,244 @@ class TestERobot(unittest.TestCase):
         self.assertTrue(c0)
         self.assertFalse(c1)
 
+    def test_collided_broadphase(self):
+        p = rtb.models.Panda()
+        rng = np.random.default_rng(0)
+        shapes = [
+            gm.Cuboid(rng.uniform(0.05, 0.2, 3), pose=sm.SE3(rng.uniform(-1, 1, 3)))
+            for _ in range(15)
+        ]
+        scene = rtb.BroadPhase(shapes)
+
+        for q in [p.qr, p.qz, rng.uniform(p.qlim[0], p.qlim[1])]:
+            # exhaustive narrow phase
+            p._update_link_tf(q)
+            p._propogate_scene_tree()
+            d = [link.closest_point(s, 0.2, skip=True)[0] for link in p for s in shapes]
+            d = [di for di in d if di is not None]
+
+            d0, _, _ = p.closest_point(q, scene, 0.2)
+            d1, _, _ = p.closest_point(q, shapes, 0.2)
+            if d:
+                self.assertAlmostEqual(d0, min(d))
+                self.assertAlmostEqual(d1, min(d))
+            else:
+                self.assertIsNone(d0)
+                self.assertIsNone(d1)
+
+            collided = any(p.iscollided(q, s) for s in shapes)
+            self.assertEqual(p.iscollided(q, scene), collided)
+            self.assertEqual(p.iscollided(q, shapes), collided)
+
+        # geometry added to a link after a query is seen
+        box = gm.Cuboid([0.2, 0.2, 0.2], pose=sm.SE3(2, 2, 0.5))
+        self.assertFalse(p.iscollided(p.qr, box))
+        p.links[0].collision = gm.Sphere(radius=0.2, pose=sm.SE3(2, 2, 0.5))
+        self.assertTrue(p.iscollided(p.qr, box))
+
+        p.links[0].collision = []
+        self.assertFalse(p.iscollided(p.qr, box))
+        p.links[0].collision.append(gm.Sphere(radius=0.2, pose=sm.SE3(2, 2, 0.5)))
+        self.assertTrue(p.iscollided(p.qr, box))
+
+    def test_iscollided_batch(self):
+        p = rtb.models.Panda()
+        p.base = sm.SE3(0.1, 0, 0) * sm.SE3.Rz(0.3)
+        rng = np.random.default_rng(0)
+        shapes = [
+            gm.Cuboid(rng.uniform(0.05, 0.2, 3), pose=sm.SE3(rng.uniform(-1, 1, 3)))
+            for _ in range(15)
+        ]
+        scene = rtb.BroadPhase(shapes)
+        qs = rng.uniform(p.qlim[0], p.qlim[1], (20, 7))
+        q = p.q.copy()
+
+        collided = p.iscollided_batch(qs, scene, n_threads=2)
+        self.assertEqual(collided.shape, (20,))
+        self.assertTrue(np.any(collided) and not np.all(collided))
+
+        c1, d = p.iscollided_batch(qs, shapes, distance=True, inf_dist=0.2)
+        nt.assert_array_equal(c1, collided)
+        c2 = p.iscollided_batch(qs, scene, self_collision=True)
+        nt.assert_array_equal(c2 | collided, c2)
+
+        # robot configuration and shape poses are unchanged
+        nt.assert_array_equal(p.q, q)
+        T = p.links[3].collision[0]._wT.copy()
+        p._propogate_scene_tree()
+        nt.assert_array_equal(p.links[3].collision[0]._wT, T)
+
+        for k, qk in enumerate(qs):
+            self.assertEqual(collided[k], p.iscollided(qk, scene))
+            self.assertEqual(c2[k], collided[k] or p.iscollided_self(qk))
+
+            # distance includes the gripper
+            dk = [
+                link.closest_point(s, 0.2, skip=True)[0]
+                for link in p.links + p.grippers[0].links
+                for s in shapes
+            ]
+            dk = [di for di in dk if di is not None]
+            nt.assert_almost_equal(d[k], min(dk, default=np.inf), decimal=5)
+
+    def test_first_contact(self):
+        p = rtb.models.Panda()
+        scene = rtb.BroadPhase([gm.Cuboid([0.1, 0.1, 0.1], pose=sm.SE3(0.5, 0, 0.5))])
+
+        # no shape point moves further than the bound
+        rho = p._collision_reach()
+        _, shapes, _, _, _, _, _ = p._collision_model()
+        rng = np.random.default_rng(0)
+        for _ in range(10):
+            q = rng.uniform(p.qlim[0], p.qlim[1])
+            dq = rng.normal(0, 0.05, 7)
+            p._update_link_tf(q)
+            p._propogate_scene_tree()
+            c0 = np.array([s._wT[:3, 3] for s in shapes])
+            p._update_link_tf(q + dq)
+            p._propogate_scene_tree()
+            c1 = np.array([s._wT[:3, 3] for s in shapes])
+            self.assertLessEqual(
+                np.linalg.norm(c1 - c0, axis=1).max(), np.abs(dq) @ rho
+            )
+
+        # the contact is not later than the first colliding sample
+        q1 = np.r_[0, -0.5, 0, -2, 0, 1.5, 0]
+        q2 = np.r_[0, 1, 0, -1.5, 0, 1.5, 0]
+        s = p.first_contact(q1, q2, scene)
+        self.assertIsNotNone(s)
+        samples = np.linspace(0, 1, 201)
+        collided = [p.iscollided(q1 + x * (q2 - q1), scene) for x in samples]
+        self.assertTrue(any(collided))
+        self.assertLessEqual(s, samples[np.argmax(collided)])
+        self.assertFalse(p.iscollided(q1 + 0.99 * s * (q2 - q1), scene))
+
+        self.assertIsNone(p.first_contact(q1, q1 * 0.9, scene))
+        self.assertEqual(p.first_contact(q2, q1, [scene.shapes[0]]), 0.0)
+
+    def test_acm(self):
+        p = rtb.models.Panda()
+        names = [link.name for link in p.links]
+        names += [link.name for g in p.grippers for link in g.links]
+
+        acm = p.compute_acm(nsamples=100)
+        self.assertIs(p.acm, acm)
+        self.assertEqual(acm.shape, (len(names), len(names)))
+        nt.assert_array_equal(acm, acm.T)
+        self.assertTrue(np.all(np.diag(acm)))
+
+        # adjacent links and links without collision shapes
+        self.assertTrue(acm[names.index("panda_link3"), names.index("panda_link4")])
+        self.assertTrue(acm[names.index("panda_link8"), names.index("panda_hand")])
+        self.assertTrue(np.all(acm[names.index("panda_leftfinger"), :]))
+        self.assertFalse(acm[names.index("panda_link1"), names.index("panda_hand")])
+
+        # conservative matrix checks more pairs
+        conservative = p.compute_acm(nsamples=100, never=False)
+        self.assertTrue(np.all(acm[conservative]))
+        self.assertGreater(np.sum(~conservative), np.sum(~acm))
+
+        # round trip, for example through numpy.save
+        p.acm = acm.tolist()
+        nt.assert_array_equal(p.acm, acm)
+
+        with self.assertRaises(ValueError):
+            p.acm = np.zeros((3, 3))
+        with self.assertRaises(ValueError):
+            p.acm = np.triu(np.ones(acm.shape))
+
+        p.kinchanged()
+        self.assertIsNone(p._acm)
+
+    def test_iscollided_self(self):
+        p = rtb.models.Panda()
+        p.compute_acm(nsamples=100)
+        acm = p.acm
+
+        self.assertFalse(p.iscollided_self(p.qr))
+        d, p1, p2 = p.closest_point_self(p.qr, 0.5)
+        self.assertGreater(d, 0)
+        self.assertAlmostEqual(np.linalg.norm(p2 - p1), d)
+
+        # folded back onto the base
+        q = np.r_[0, 1.7, 0, -0.3, 0, 3.7, 0]
+        self.assertTrue(p.iscollided_self(q))
+        self.assertLess(p.closest_point_self(q)[0], 0)
+
+        # same as testing all pairs of shapes not allowed to collide
+        _, shapes, _, _, _, body, _ = p._collision_model()
+        rng = np.random.default_rng(0)
+        for q in rng.uniform(p.qlim[0], p.qlim[1], (10, 7)):
+            p._update_link_tf(q)
+            p._propogate_scene_tree()
+            for s in shapes:
+                s._update_pyb()
+
+            collided = any(
+                shapes[a].iscollided(shapes[b])
+                for a in range(len(shapes))
+                for b in range(a + 1, len(shapes))
+                if not acm[body[a], body[b]]
+            )
+            self.assertEqual(p.iscollided_self(q), collided)
+
+    def test_link_collision_damper_batch(self):
+        p = rtb.models.Panda()
+        p.q = p.qr
+        p._update_link_tf(p.q)
+        p._propogate_scene_tree()
+
+        s0 = gm.Sphere(radius=0.05, pose=sm.SE3(0.52, 0.1, 0.3))
+        s0.v = [0, -0.2, 0, 0, 0, 0]
+        s1 = gm.Sphere(radius=0.05, pose=sm.SE3(0.1, 0.15, 0.65))
+        s1.v = [0.1, 0, 0.3, 0, 0, 0]
+        s2 = gm.Sphere(radius=0.05, pose=sm.SE3(3, 0, 0))
+
+        kw = dict(start=p.link_dict["panda_link1"], end=p.link_dict["panda_hand"])
+        Ain, bin = p.link_collision_damper_batch([s0, s1, s2], p.q, **kw)
+
+        # same rows as the per-shape damper, in pair-major order
+        A0, b0 = p.link_collision_damper(s0, p.q, **kw)
+        A1, b1 = p.link_collision_damper(s1, p.q, **kw)
+        self.assertIsNone(p.link_collision_damper(s2, p.q, **kw)[0])
+
+        A = np.r_[A0, A1]
+        b = np.r_[b0, b1]
+        i0 = np.lexsort(np.c_[A, b].T)
+        i1 = np.lexsort(np.c_[Ain, bin].T)
+        nt.assert_array_almost_equal(Ain[i1], A[i0])
+        nt.assert_array_almost_equal(bin[i1], b[i0])
+
+        Ain, bin = p.link_collision_damper_batch([s2], p.q, **kw)
+        self.assertEqual(Ain.shape, (0, 7))
+        self.assertEqual(bin.shape, (0,))
+
+    def test_update_link_tf(self):
+        p = rtb.models.Panda()
+        link = p.links[5]
+
+        p._update_link_tf(p.qr)
+        handles = p._link_tf_cache[1]
+        nt.assert_array_almost_equal(link._T, link.ets.eval(p.qr))
+
+        # same q, the update is skipped
+        link._T_reference[:] = np.eye(4)
+        p._update_link_tf(p.qr.copy())
+        nt.assert_array_almost_equal(link._T, np.eye(4))
+        self.assertIs(p._link_tf_cache[1], handles)
+
+        # new q, the update is done with the cached handles
+        p._update_link_tf(p.qz)
+        nt.assert_array_almost_equal(link._T, link.ets.eval(p.qz))
+        self.assertIs(p._link_tf_cache[1], handles)
+
+        # a structural change rebuilds the cache
+        p.kinchanged()
+        link._T_reference[:] = np.eye(4)
+        p._update_link_tf(p.qz)
+        nt.assert_array_almost_equal(link._T, link.ets.eval(p.qz))
+        self.assertIsNot(p._link_tf_cache[1], handles)
+
     def test_invdyn(self):
         # create a 2 link robot
         # Example from Spong etal. 2nd edition, p. 260
@@ -967,6 +1264,170 @@ class TestERobot(unittest.TestCase):
         tau = robot.rne(q, z, [1, 1])
         nt.assert_array_almost_equal(tau, np.r_[d11 + d12, d21 + d22])
 
+    def test_rne_traj(self):
+        b0 = Link(ETS(ET.Rz()), m=2, r=[0.1, 0, 0.2], name="b0")
+        b1 = Link(
+            ETS(ET.tz(0.3)) * ET.tx(0.5) * ET.Ry(), m=1, r=[0.2, 0.1, 0], parent=b0
+        )
+        b2 = Link(
+            ETS(ET.tz(0.3)) * ET.ty(0.4) * ET.Rx(), m=1.5, r=[0, 0.2, 0.1], parent=b0
+        )
+        b3 = Link(ETS(ET.tx(0.3)) * ET.tz(), m=0.7, r=[0.1, 0, 0], parent=b2)
+        robot = ERobot([b0, b1, b2, b3])
+
+        qt = np.array([[0.1, 0.2, 0.3, 0.4], [-1, 0.5, 2, -0.3], [0, 0, 0, 0]])
+        qdt = np.array([[1, -1, 0.5, 0.2], [0, 0.3, -2, 1], [1, 2, 3, 4]])
+        qddt = np.array([[0, 1, 0, 2], [-1, 0.3, 0, 1], [0.5, 0.5, 0.5, 0.5]])
+
+        tau = robot.rne(qt, qdt, qddt)
+        self.assertEqual(tau.shape, (3, 4))
+        nt.assert_array_almost_equal(tau, robot.rne(qt, qdt, qddt, n_threads=2))
+
+        for k in range(3):
+            nt.assert_array_almost_equal(
+                robot.rne(qt[k], qdt[k], qddt[k]),
+                robot.rne_python(qt[k], qdt[k], qddt[k]),
+            )
+
+        # changed dynamic parameters are picked up
+        b3.I = [0.1, 0.2, 0.3, 0, 0, 0]
+        b3.Jm = 0.5
+        b3.G = 1
+        tau = robot.rne(qt[0], np.zeros(4), [0, 0, 0, 1], gravity=[0, 0, 0])
+        nt.assert_array_almost_equal(tau, robot.inertia(qt[0], method="crba")[:, 3])
+        self.assertAlmostEqual(tau[3], 0.7 + 0.5)
+
+    def test_coriolis(self):
+        # Example from Spong etal. 2nd edition, p. 260
+        l1 = Link(ets=ETS(ET.Ry()), m=1, r=[0.5, 0, 0], name="l1")
+        l2 = Link(ets=ETS(ET.tx(1)) * ET.Ry(), m=1, r=[0.5, 0, 0], parent=l1, name="l2")
+        robot = ERobot([l1, l2], name="simple 2 link")
+
+        q = [0, -pi / 2]
+        h = -0.5 * sin(q[1])
+
+        C = robot.coriolis(q, [1, 1])
+        nt.assert_array_almost_equal(C @ [1, 1], np.r_[3, -1] * h)
+
+        qt = np.array([[0, -pi / 2], [0.3, 0.2], [-1, 1]])
+        qdt = np.array([[1, 1], [0.5, -2], [3, 0.1]])
+        C = robot.coriolis(qt, qdt)
+        self.assertEqual(C.shape, (3, 2, 2))
+
+        for k in range(3):
+            tau = robot.rne(qt[k], qdt[k], np.zeros(2), gravity=[0, 0, 0])
+            nt.assert_array_almost_equal(C[k] @ qdt[k], tau)
+
+    def test_coriolis_urdf(self):
+        panda = rtb.models.Panda()
+
+        # the same chain with the static links folded into the joints
+        links = []
+        ets = ETS()
+        for link in panda.links:
+            ets = ets * link.ets
+            if link.isjoint:
+                link.m = 1 + link.jindex
+                link.r = [0.01, -0.02, 0.05]
+                links.append(
+                    Link(
+                        ets,
+                        m=link.m,
+                        r=link.r,
+                        parent=links[-1] if links else None,
+                    )
+                )
+                ets = ETS()
+        robot = ERobot(links)
+
+        q = [0.1, -0.3, 0.2, -1.5, 0.4, 1.2, -0.6]
+        qd = [0.5, -1, 0.3, 0.8, -0.2, 1.1, 0.4]
+        C = panda.coriolis(q, qd)
+        nt.assert_array_almost_equal(C, robot.coriolis(q, qd))
+
+        tau = robot.rne(q, qd, np.zeros(7), gravity=[0, 0, 0])
+        nt.assert_array_almost_equal(C @ qd, tau)
+
+    def test_inertia_crba(self):
+        # Example from Spong etal. 2nd edition, p. 260
+        l1 = Link(ets=ETS(ET.Ry()), m=1, r=[0.5, 0, 0], name="l1")
+        l2 = Link(ets=ETS(ET.tx(1)) * ET.Ry(), m=1, r=[0.5, 0, 0], parent=l1, name="l2")
+        robot = ERobot([l1, l2], name="simple 2 link")
+
+        q = [0, -pi / 2]
+        d11 = 1.5 + cos(q[1])
+        d12 = 0.25 + 0.5 * cos(q[1])
+        d22 = 0.25
+
+        M = robot.inertia(q, method="crba")
+        nt.assert_array_almost_equal(M, np.array([[d11, d12], [d12, d22]]))
+
+        # branched robot, checked against rne
+        b0 = Link(ETS(ET.Rz()), m=2, r=[0.1, 0, 0.2], name="b0")
+        b1 = Link(
+            ETS(ET.tz(0.3)) * ET.tx(0.5) * ET.Ry(), m=1, r=[0.2, 0.1, 0], parent=b0
+        )
+        b2 = Link(
+            ETS(ET.tz(0.3)) * ET.ty(0.4) * ET.Rx(), m=1.5, r=[0, 0.2, 0.1], parent=b0
+        )
+        b3 = Link(ETS(ET.tx(0.3)) * ET.tz(), m=0.7, r=[0.1, 0, 0], parent=b2)
+        robot = ERobot([b0, b1, b2, b3])
+
+        qt = np.array([[0.1, 0.2, 0.3, 0.4], [-1, 0.5, 2, -0.3]])
+        M = robot.inertia(qt, method="crba")
+        self.assertEqual(M.shape, (2, 4, 4))
+
+        for k in range(2):
+            for j in range(4):
+                tau = robot.rne(qt[k], np.zeros(4), np.eye(4)[j], gravity=[0, 0, 0])
+                nt.assert_array_almost_equal(M[k, :, j], tau)
+
+    def test_accel_aba(self):
+        b0 = Link(ETS(ET.Rz()), m=2, r=[0.1, 0, 0.2], name="b0")
+        b1 = Link(
+            ETS(ET.tz(0.3)) * ET.tx(0.5) * ET.Ry(), m=1, r=[0.2, 0.1, 0], parent=b0
+        )
+        b2 = Link(
+            ETS(ET.tz(0.3)) * ET.ty(0.4) * ET.Rx(), m=1.5, r=[0, 0.2, 0.1], parent=b0
+        )
+        b3 = Link(ETS(ET.tx(0.3)) * ET.tz(), m=0.7, r=[0.1, 0, 0], parent=b2)
+        robot = ERobot([b0, b1, b2, b3])
+
+        qt = np.array([[0.1, 0.2, 0.3, 0.4], [-1, 0.5, 2, -0.3]])
+        qdt = np.array([[1, -1, 0.5, 0.2], [0, 0.3, -2, 1]])
+        taut = np.array([[1, 2, 3, 4], [0, 0, 0, 0]])
+
+        qdd = robot.accel(qt, qdt, taut, method="aba")
+        self.assertEqual(qdd.shape, (2, 4))
+        nt.assert_array_almost_equal(
+            robot.accel(qt[0], qdt[0], taut[0], method="aba"), qdd[0]
+        )
+
+        # M qdd + C qd + g = tau
+        M = robot.inertia(qt, method="crba")
+        for k in range(2):
+            tau = M[k] @ qdd[k] + robot.rne(qt[k], qdt[k], np.zeros(4))
+            nt.assert_array_almost_equal(tau, taut[k])
+
+    def test_inertia_crba_static(self):
+        # a static link is rigidly attached to its parent joint
+        def make(joint):
+            l1 = Link(ETS(ET.Rz()), m=2, r=[0.1, 0, 0.2], name="l1")
+            l2 = Link(
+                ETS(ET.tz(0.3)) * ET.Rx(0.2) * (ET.Ry() if joint else ET.Ry(0)),
+                m=0.4,
+                r=[0, 0.1, 0.3],
+                I=[0.1, 0.2, 0.3, 0.01, 0.02, 0.03],
+                parent=l1,
+                name="l2",
+            )
+            l3 = Link(ETS(ET.tx(0.5)) * ET.Ry(), m=1, r=[0.2, 0.1, 0], parent=l2)
+            return ERobot([l1, l2, l3])
+
+        M3 = make(True).inertia([0.3, 0, 0.7], method="crba")
+        M2 = make(False).inertia([0.3, 0.7], method="crba")
+        nt.assert_array_almost_equal(M2, M3[np.ix_([0, 2], [0, 2])])
+
 
 class TestERobot2(unittest.TestCase):
     def test_plot(self):
@@ -982,6 +1443,14 @@ class TestERobot2(unittest.TestCase):
         e = robot.teach(robot.qz, block=False, name=True)
         e.close()
 
+    def test_rbd_model(self):
+        # no rigid-body model, only the rne methods are available
+        robot = rtb.models.ETS.Planar2()
+        with self.assertRaises(ValueError):
+            robot.inertia(robot.qz, method="crba")
+        with self.assertRaises(ValueError):
+            robot.accel(robot.qz, robot.qz, robot.qz, method="aba")
+
     def test_plot_with_vellipse(self):
         robot = rtb.models.ETS.Planar2()
         e = robot.plot(
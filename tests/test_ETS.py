@@ -1739,6 +1739,200 @@ class TestETS(unittest.TestCase):
         nt.assert_almost_equal(r.hessian0(J0=J0), ans)
         nt.assert_almost_equal(r.hessiane(Je=Je), ans)
 
+    def test_ik_batch(self):
+        ets = rtb.models.Panda().ets()
+        q = ets.random_q(10)
+        Tep = np.array([ets.eval(qk) for qk in q])
+
+        for method in [ets.ik_lm_chan, ets.ik_nr, ets.ik_gn]:
+            qs, success, its, searches, E = method(Tep)
+
+            self.assertEqual(qs.shape, (10, 7))
+            self.assertEqual(success.shape, (10,))
+            self.assertEqual(its.shape, (10,))
+            self.assertEqual(searches.shape, (10,))
+            self.assertEqual(E.shape, (10,))
+
+            self.assertTrue(np.all(E[success == 1] < 1e-6))
+
+        # SE3 with many values and one seed per pose
+        sol = ets.ik_lm_chan(SE3(list(Tep)), q0=q)
+        nt.assert_array_equal(sol[1], np.ones(10))
+        nt.assert_array_equal(sol[3], np.ones(10))
+
+        with self.assertRaises(ValueError):
+            ets.ik_lm_chan(Tep, q0=q[:3])
+
+    def test_ik_wrap(self):
+        # a joint with limits beyond pi is not wrapped out of its limits
+        ets = rtb.models.Panda().ets()
+        q = np.array([0.2, 0.3, -0.1, -1.5, 0.2, 3.5, 0.4])
+        Tep = ets.eval(q)
+
+        for method in [ets.ik_lm_chan, ets.ik_nr, ets.ik_gn]:
+            sol = method(Tep, q0=q, slimit=1)
+            self.assertEqual(sol[1], 1)
+            nt.assert_array_almost_equal(sol[0], q)
+
+    def test_jacob0_numpy(self):
+        for ets in [rtb.models.Panda().ets(), rtb.models.DH.Stanford().ets()]:
+            q = ets.random_q(10, seed=0)
+            T, J = ets._jacob0_numpy(q)
+            nt.assert_almost_equal(T, ets.eval(q))
+            for k in range(10):
+                nt.assert_almost_equal(J[k], ets.jacob0(q[k]))
+
+    def test_fkine_traj_threads(self):
+        ets = rtb.models.Panda().ets()
+        q = ets.random_q(50)
+
+        T = ets.eval(q)
+        self.assertEqual(T.shape, (50, 4, 4))
+
+        for k in range(50):
+            nt.assert_almost_equal(T[k], ets.eval(q[k]))
+
+        nt.assert_almost_equal(ets.eval(q, n_threads=4), T)
+        nt.assert_almost_equal(ets.eval(q, n_threads=0), T)
+
+    def test_eval_numpy(self):
+        ets = rtb.models.Panda().ets()
+        ets2 = rtb.ET.tz(0.3) * rtb.ET.Ry(flip=True) * rtb.ET.tx(0.5) * rtb.ET.tz()
+        base = SE3(1, 2, 3).A
+        tool = SE3.Rx(0.3).A
+
+        for e in [ets, ets2]:
+            q = np.random.uniform(-1, 1, size=(10, e.n))
+            nt.assert_almost_equal(e._eval_numpy(q), e.eval(q))
+            nt.assert_almost_equal(
+                e._eval_numpy(q, base, tool), e.eval(q, base=base, tool=tool)
+            )
+
+        self.assertEqual(ets._eval_numpy(ets.random_q(1)).shape, (1, 4, 4))
+
+    def test_jacob_traj(self):
+        ets = rtb.models.Panda().ets()
+        tool = SE3(0.1, 0, 0.2)
+        q = np.random.uniform(-1, 1, size=(10, ets.n))
+
+        J0 = ets.jacob0(q, tool=tool)
+        Je = ets.jacobe(q, tool=tool)
+        H0 = ets.hessian0(q, tool=tool)
+        He = ets.hessiane(q)
+        self.assertEqual(J0.shape, (10, 6, 7))
+        self.assertEqual(H0.shape, (10, 7, 6, 7))
+
+        for k in range(10):
+            nt.assert_almost_equal(J0[k], ets.jacob0(q[k], tool=tool))
+            nt.assert_almost_equal(Je[k], ets.jacobe(q[k], tool=tool))
+            nt.assert_almost_equal(H0[k], ets.hessian0(q[k], tool=tool))
+            nt.assert_almost_equal(He[k], ets.hessiane(q[k]))
+
+        nt.assert_almost_equal(ets.hessian0(J0=J0), H0)
+        nt.assert_almost_equal(ets.hessian0(q[0]), ets.hessian0(J0=ets.jacob0(q[0])))
+        self.assertEqual(ets.jacob0(q[:1]).shape, (6, 7))
+
+    def test_kinematics(self):
+        ets = rtb.models.Panda().ets()
+        tool = SE3(0.1, 0, 0.2)
+        q = np.random.uniform(-1, 1, size=ets.n)
+        which = ["T", "J0", "Je", "H0", "manipulability", "jacobm"]
+
+        k = ets.kinematics(q, which, tool=tool)
+        nt.assert_almost_equal(k.T, ets.eval(q, tool=tool))
+        nt.assert_almost_equal(k.J0, ets.jacob0(q, tool=tool))
+        nt.assert_almost_equal(k.Je, ets.jacobe(q, tool=tool))
+        nt.assert_almost_equal(k.H0, ets.hessian0(q, tool=tool))
+        nt.assert_almost_equal(
+            k.manipulability, np.sqrt(np.linalg.det(k.J0 @ k.J0.T))
+        )
+
+        k = ets.kinematics(q, which)
+        nt.assert_almost_equal(k.jacobm, ets.jacobm(q))
+
+        k = ets.kinematics(q, "Je")
+        self.assertIsNone(k.T)
+        self.assertIsNone(k.jacobm)
+        nt.assert_almost_equal(k.Je, ets.jacobe(q))
+
+        # symbolic fallback
+        k = ets.kinematics(q.astype(object), ["T", "J0", "H0"])
+        nt.assert_almost_equal(np.array(k.T, dtype=float), ets.eval(q))
+        nt.assert_almost_equal(np.array(k.J0, dtype=float), ets.jacob0(q))
+        nt.assert_almost_equal(np.array(k.H0, dtype=float), ets.hessian0(q))
+
+        with self.assertRaises(ValueError):
+            ets.kinematics(q, ["T", "J"])
+
+        # a single configuration as a row or column, but not a trajectory
+        k = ets.kinematics(q[np.newaxis, :], "T")
+        nt.assert_almost_equal(k.T, ets.eval(q))
+        k = ets.kinematics(q[:, np.newaxis], "J0")
+        nt.assert_almost_equal(k.J0, ets.jacob0(q))
+
+        with self.assertRaises(ValueError):
+            ets.kinematics(np.c_[q, q].T, "T")
+
+    def test_ik_batch_threads(self):
+        ets = rtb.models.Panda().ets()
+        q = ets.random_q(20)
+        Tep = ets.eval(q)
+
+        sol = ets.ik_lm_chan(Tep, n_threads=4)
+        self.assertEqual(sol[0].shape, (20, 7))
+        self.assertTrue(np.all(sol[4][sol[1] == 1] < 1e-6))
+
+    def test_random_q_seed(self):
+        ets = rtb.models.Panda().ets()
+
+        nt.assert_array_equal(ets.random_q(seed=1), ets.random_q(seed=1))
+        nt.assert_array_equal(ets.random_q(5, seed=1), ets.random_q(5, seed=1))
+        self.assertEqual(ets.random_q(5, seed=1).shape, (5, 7))
+
+        q = ets.random_q(100, seed=2)
+        self.assertTrue(np.all(q >= ets.qlim[0, :]))
+        self.assertTrue(np.all(q <= ets.qlim[1, :]))
+
+    def test_ik_seed(self):
+        ets = rtb.models.Panda().ets()
+        Tep = ets.eval(ets.random_q(10, seed=0))
+
+        sol0 = ets.ik_lm_chan(Tep[0], seed=3)
+        sol1 = ets.ik_lm_chan(Tep[0], seed=3)
+        nt.assert_array_equal(sol0[0], sol1[0])
+        self.assertEqual(sol0[2], sol1[2])
+
+        sol0 = ets.ik_gn(Tep, seed=3)
+        sol1 = ets.ik_gn(Tep, seed=3, n_threads=3)
+        nt.assert_array_equal(sol0[0], sol1[0])
+        nt.assert_array_equal(sol0[2], sol1[2])
+
+    def test_ik_traj(self):
+        panda = rtb.models.Panda()
+        ets = panda.ets()
+        qs = np.linspace(panda.qr, panda.qr + 0.3, 50)
+        Tep = ets.eval(qs)
+
+        q, success, its, searches, E = ets.ik_traj(Tep, q0=qs[0], seed=0)
+        self.assertEqual(q.shape, (50, 7))
+        nt.assert_array_equal(success, np.ones(50))
+        nt.assert_array_equal(searches, np.ones(50))
+        self.assertLessEqual(its.mean(), 5)
+        self.assertTrue(np.all(E < 1e-6))
+
+        # the solutions follow the path without jumps
+        self.assertLess(np.abs(np.diff(q, axis=0)).max(), 0.1)
+
+        sol = panda.ik_traj(SE3(list(Tep)), q0=qs[0], method="nr", seed=0)
+        nt.assert_array_equal(sol[1], np.ones(50))
+        nt.assert_array_equal(sol[0], ets.ik_traj(Tep, qs[0], "nr", seed=0)[0])
+
+        with self.assertRaises(ValueError):
+            ets.ik_traj(Tep, method="foo")
+
+        with self.assertRaises(ValueError):
+            ets.ik_traj(Tep, q0=qs)
+
     def test_plot(self):
         q2 = np.array([0, 1, 2, 3, 4, 5])
         rx = rtb.ETS(rtb.ET.Rx(jindex=0))
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+import numpy.testing as nt
+import roboticstoolbox as rtb
+import numpy as np
+from spatialmath import SE3
+import os
+import tempfile
+import unittest
+
+
+class TestIKCache(unittest.TestCase):
+    def test_nearest(self):
+        robot = rtb.models.Panda()
+        ikc = rtb.IKCache(robot, rweight=0.5)
+        self.assertEqual(len(ikc), 0)
+
+        ets = robot.ets()
+        qs = ets.random_q(100, seed=0)
+        ikc.add(ets.eval(qs), qs)
+        self.assertEqual(len(ikc), 100)
+
+        # brute force search with the exact pose distance
+        T = SE3(0.4, 0.1, 0.5) * SE3.Rx(np.pi)
+        d = []
+        for q in qs:
+            Tq = ets.eval(q)
+            c = (np.trace(Tq[:3, :3].T @ T.R) - 1) / 2
+            d.append(
+                np.linalg.norm(Tq[:3, 3] - T.t) + 0.5 * np.arccos(np.clip(c, -1, 1))
+            )
+        order = np.argsort(d)
+
+        q, dist = ikc.nearest(T, k=3)
+        nt.assert_array_almost_equal(q, qs[order[:3]])
+        nt.assert_array_almost_equal(dist, np.array(d)[order[:3]])
+
+        # the same once the k-d tree is built, q and -q are one orientation
+        ikc.fill(1000, seed=1)
+        q, dist = ikc.nearest(ets.eval(qs[5]), k=1)
+        nt.assert_array_almost_equal(q[0], qs[5])
+        nt.assert_almost_equal(dist[0], 0)
+
+        with self.assertRaises(ValueError):
+            ikc.add(ets.eval(qs[:2]), qs[:3])
+
+    def test_ik(self):
+        robot = rtb.models.Panda()
+        ikc = rtb.IKCache(robot)
+        ikc.fill(2000, seed=0)
+
+        ets = robot.ets()
+        q0 = ets.random_q(20, seed=1)
+        Tep = ets.eval(q0)
+
+        for T in Tep:
+            q, success, _, searches, _ = ikc.ik(T, seed=0)
+            self.assertTrue(success)
+            nt.assert_array_almost_equal(ets.eval(q), T, decimal=2)
+
+        info = ikc.cache_info()
+        self.assertEqual(info.hits + info.misses, 20)
+        self.assertGreater(info.hits, 10)
+        self.assertEqual(info.currsize, 2020)
+
+        # solved poses are cached, a repeated pose is found in one search
+        q, success, _, searches, _ = ikc.ik(Tep[3])
+        self.assertTrue(success)
+        self.assertEqual(searches, 1)
+        self.assertEqual(len(ikc), 2020)
+
+        # batch
+        Ts = SE3([SE3(T, check=False) for T in Tep])
+        q, success, _, searches, _ = ikc.ik(Ts, seed=0)
+        self.assertTrue(np.all(success))
+        self.assertTrue(np.all(searches == 1))
+        for qk, T in zip(q, Tep):
+            nt.assert_array_almost_equal(ets.eval(qk), T, decimal=2)
+        self.assertEqual(len(ikc), 2020)
+
+        with self.assertRaises(ValueError):
+            ikc.ik(Tep[0], method="foo")
+
+    def test_evict(self):
+        robot = rtb.models.DH.Puma560()
+        ikc = rtb.IKCache(robot, maxsize=100)
+        ikc.fill(90, seed=0)
+
+        # a used entry survives eviction
+        T = robot.fkine(robot.qn)
+        ikc.add(T, robot.qn)
+        ikc.ik(T)
+        ikc.fill(60, seed=1)
+        self.assertLessEqual(len(ikc), 100)
+        q, dist = ikc.nearest(T)
+        nt.assert_array_almost_equal(q[0], robot.qn)
+
+        # changing the robot clears the cache
+        robot.base = SE3(1, 0, 0)
+        self.assertEqual(len(ikc), 0)
+
+    def test_save(self):
+        robot = rtb.models.Panda()
+        ikc = rtb.IKCache(robot)
+        ikc.fill(50, seed=0)
+
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "cache.npz")
+            ikc.save(filename)
+
+            ikc2 = rtb.IKCache(robot)
+            ikc2.load(filename)
+            self.assertEqual(len(ikc2), 50)
+            T = robot.fkine(robot.qr)
+            nt.assert_array_almost_equal(ikc2.nearest(T, 5)[0], ikc.nearest(T, 5)[0])
+
+            with self.assertRaises(ValueError):
+                rtb.IKCache(rtb.models.DH.Puma560()).load(filename)
+
+
+if __name__ == "__main__":
+
+    unittest.main()
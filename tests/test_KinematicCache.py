@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+import numpy.testing as nt
+import roboticstoolbox as rtb
+import numpy as np
+from spatialmath import SE3
+import unittest
+
+
+class TestKinematicCache(unittest.TestCase):
+    def test_values(self):
+        for robot in [rtb.models.ETS.Panda(), rtb.models.DH.Puma560()]:
+            kc = rtb.KinematicCache(robot)
+            q = np.array(robot.qr) + 0.1
+
+            nt.assert_array_almost_equal(kc.fkine(q).A, robot.fkine(q).A)
+            nt.assert_array_almost_equal(kc.jacob0(q), robot.jacob0(q))
+            nt.assert_array_almost_equal(kc.jacobe(q), robot.jacobe(q))
+            nt.assert_array_almost_equal(kc.hessian0(q), robot.hessian0(q))
+            nt.assert_array_almost_equal(
+                kc.jacob0_pinv(q), np.linalg.pinv(robot.jacob0(q))
+            )
+            nt.assert_almost_equal(kc.manipulability(q), robot.manipulability(q))
+
+        # dynamics and operational space
+        robot = rtb.models.DH.Puma560()
+        kc = rtb.KinematicCache(robot)
+        q = robot.qn
+        qd = np.full(6, 0.5)
+
+        nt.assert_array_almost_equal(kc.inertia(q), robot.inertia(q))
+        nt.assert_array_almost_equal(kc.coriolis(q, qd), robot.coriolis(q, qd))
+        nt.assert_array_almost_equal(kc.gravload(q), robot.gravload(q))
+        nt.assert_array_almost_equal(kc.inertia_x(q), robot.inertia_x(q))
+        nt.assert_array_almost_equal(kc.coriolis_x(q, qd), robot.coriolis_x(q, qd))
+
+    def test_hits(self):
+        robot = rtb.models.ETS.Panda()
+        kc = rtb.KinematicCache(robot)
+        q = robot.qr
+
+        # one fused miss fills pose and both Jacobians
+        kc.fkine(q)
+        kc.jacob0(q)
+        kc.jacobe(q)
+        self.assertEqual(kc.cache_info("fkine").misses, 1)
+        self.assertEqual(kc.cache_info("jacob0"), (1, 0, 32, 3))
+        self.assertEqual(kc.cache_info("jacobe").hits, 1)
+
+        # dependent value reuses the cached Jacobian
+        kc.manipulability(q)
+        self.assertEqual(kc.cache_info("jacob0").hits, 2)
+        self.assertEqual(kc.cache_info(), (3, 2, 32, 4))
+
+        # returned values are the cached ones
+        self.assertIs(kc.jacob0(q), kc.jacob0(q.copy()))
+
+    def test_eviction(self):
+        robot = rtb.models.DH.Puma560()
+        kc = rtb.KinematicCache(robot, cachesize=4)
+
+        qs = [np.full(6, x) for x in np.linspace(0, 1, 5)]
+        for q in qs:
+            kc.inertia(q)
+        self.assertEqual(len(kc), 4)
+
+        # least recently used entry, the first, was evicted
+        kc.inertia(qs[1])
+        kc.inertia(qs[0])
+        self.assertEqual(kc.cache_info("inertia"), (1, 6, 4, 4))
+
+        # the hit on qs[1] kept it, qs[2] was evicted instead
+        kc.inertia(qs[1])
+        self.assertEqual(kc.cache_info("inertia").hits, 2)
+        kc.inertia(qs[2])
+        self.assertEqual(kc.cache_info("inertia").misses, 7)
+
+        with self.assertRaises(ValueError):
+            rtb.KinematicCache(robot, cachesize=0)
+
+    def test_small(self):
+        # a fused miss stores more entries than the cache can hold
+        for cachesize in (1, 2):
+            robot = rtb.models.Panda()
+            q = robot.qr
+            kc = rtb.KinematicCache(robot, cachesize=cachesize)
+
+            nt.assert_array_almost_equal(kc.fkine(q).A, robot.fkine(q).A)
+            nt.assert_array_almost_equal(kc.jacob0(q), robot.jacob0(q))
+            nt.assert_array_almost_equal(kc.jacobe(q), robot.jacobe(q))
+            self.assertEqual(len(kc), cachesize)
+
+    def test_invalidate(self):
+        robot = rtb.models.DH.Puma560()
+        kc = rtb.KinematicCache(robot)
+        q = robot.qn
+
+        kc.fkine(q)
+        robot.base = SE3(1, 2, 3)
+        nt.assert_array_almost_equal(kc.fkine(q).A, robot.fkine(q).A)
+
+        robot.tool = SE3(0, 0, 0.1)
+        nt.assert_array_almost_equal(kc.jacobe(q), robot.jacobe(q))
+
+        G = kc.gravload(q)
+        robot.gravity = [0, 0, -1]
+        nt.assert_array_almost_equal(kc.gravload(q), robot.gravload(q))
+        self.assertFalse(np.allclose(kc.gravload(q), G))
+
+        M = kc.inertia(q)
+        robot.links[2].m *= 2
+        nt.assert_array_almost_equal(kc.inertia(q), robot.inertia(q))
+        self.assertFalse(np.allclose(kc.inertia(q), M))
+
+        robot.links[1].a = 0.5
+        nt.assert_array_almost_equal(kc.fkine(q).A, robot.fkine(q).A)
+
+        self.assertEqual(kc.cache_info("fkine").hits, 0)
+        kc.clear()
+        self.assertEqual(len(kc), 0)
+
+
+if __name__ == "__main__":
+
+    unittest.main()
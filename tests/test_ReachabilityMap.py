@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import numpy.testing as nt
+import roboticstoolbox as rtb
+import numpy as np
+from spatialmath import SE3
+import os
+import tempfile
+import unittest
+
+
+class TestReachabilityMap(unittest.TestCase):
+    def test_add(self):
+        rmap = rtb.ReachabilityMap([-1, -1, -1], 0.1, [20, 20, 20], bins=2)
+        self.assertEqual(rmap.table.shape, (20, 20, 20, 24))
+
+        T = [SE3(0.22, 0.03, -0.47), SE3(0.28, 0.07, -0.43), SE3(0.35, 0.05, -0.47)]
+        rmap.add(np.array([Tk.A for Tk in T]), [0.1, 0.3, 0.2])
+
+        # the first two poses share a voxel and approach direction
+        rec = rmap.lookup(T[0])
+        self.assertEqual(rec["count"][0], 2)
+        nt.assert_almost_equal(rec["manip_max"][0], 0.3)
+        nt.assert_almost_equal(rec["manip_mean"][0], 0.2)
+        self.assertEqual(rmap.lookup(T[2])["count"][0], 1)
+
+        # other approach directions and positions outside the grid
+        self.assertFalse(rmap.reachable(T[0] * SE3.Rx(np.pi))[0])
+        self.assertFalse(rmap.reachable(SE3(5, 0, 0))[0])
+        self.assertEqual(rmap.index(SE3(5, 0, 0))[0], -1)
+        nt.assert_almost_equal(
+            rmap.reachability([[0.25, 0.05, -0.45], [5, 0, 0]]), [1 / 24, 0]
+        )
+
+        # each face of the cube map has its own bins
+        R = [SE3(), SE3.Rx(np.pi), SE3.Rx(np.pi / 2), SE3.Rx(-np.pi / 2)]
+        R += [SE3.Ry(np.pi / 2), SE3.Ry(-np.pi / 2)]
+        idx = rmap.index(SE3([Rk for Rk in R]))
+        self.assertEqual(len(np.unique(idx)), 6)
+
+        with self.assertRaises(ValueError):
+            rtb.ReachabilityMap([0, 0, 0], 0, [1, 1, 1])
+
+    def test_build(self):
+        robot = rtb.models.DH.Puma560()
+        rmap = robot.reachability_map(5000, voxel=0.1, seed=0)
+        self.assertEqual(rmap.table["count"].sum(), 5000)
+
+        # the largest manipulability of any sample
+        q = robot.ets().random_q(200, seed=1)
+        m = robot.manipulability(q)
+        self.assertGreater(rmap.table["manip_max"].max(), 0.5 * np.max(m))
+
+        # repeatable
+        rmap2 = robot.reachability_map(5000, voxel=0.1, seed=0)
+        nt.assert_array_equal(rmap.table, rmap2.table)
+
+        # samples outside the bounds are ignored
+        rmap = robot.reachability_map(
+            2000, voxel=0.1, bounds=[[0, 0, 0], [0.5, 0.5, 0.5]], seed=0
+        )
+        self.assertLess(rmap.table["count"].sum(), 2000)
+
+        with self.assertRaises(ValueError):
+            robot.reachability_map(10, axes="foo")
+
+    def test_base(self):
+        # the map is in the frame of fkine, which includes the base
+        for robot in [rtb.models.Panda(), rtb.models.DH.Panda()]:
+            robot.base = SE3(1, 0, 0.5) * SE3.Rz(2)
+            rmap = robot.reachability_map(5000, voxel=0.2, seed=0)
+            nt.assert_array_almost_equal(rmap.origin, [0, -1, 0])
+
+            q = robot.ets().random_q(100, seed=1)
+            p = robot.fkine(q).t
+            self.assertGreater(np.mean(rmap.reachability(p) > 0), 0.9)
+
+    def test_save(self):
+        robot = rtb.models.Panda()
+        rmap = robot.reachability_map(2000, voxel=0.1, seed=0)
+        T = robot.ets().eval(robot.ets().random_q(50, seed=1))
+
+        with tempfile.TemporaryDirectory() as d:
+            filename = os.path.join(d, "panda")
+            rmap.save(filename)
+            self.assertTrue(os.path.exists(filename + ".npy"))
+
+            rmap2 = rtb.ReachabilityMap.load(filename)
+            self.assertIsInstance(rmap2.table, np.memmap)
+            self.assertEqual(rmap2.shape, rmap.shape)
+            nt.assert_array_almost_equal(rmap2.origin, rmap.origin)
+            nt.assert_array_equal(rmap2.lookup(T), rmap.lookup(T))
+
+            rmap2 = rtb.ReachabilityMap.load(filename + ".npy", mmap=False)
+            nt.assert_array_equal(rmap2.table, rmap.table)
+            del rmap2
+
+
+if __name__ == "__main__":
+
+    unittest.main()